@@ -68,6 +68,8 @@ def create_app(configuracion=None):
         print("✅ ManejadorPedidoEntregado importado")
         from aplicacion.eventos.consumidor_pedido_estado_actualizado import manejador as manejador_estado_actualizado
         print("✅ ManejadorPedidoEstadoActualizado importado")
+        from aplicacion.eventos.consumidor_proyeccion_estado_pedido import manejador as manejador_proyeccion_estado
+        print("✅ ManejadorProyeccionEstadoPedido importado")
 
         # Endpoint de verificación de estado
         @app.route("/")
@@ -83,6 +85,7 @@ def create_app(configuracion=None):
                     "POST /logistica/api/inventario/reservar",
                     "POST /logistica/api/inventario/descontar",
                     "GET /logistica/api/inventario/producto/<id>",
+                    "POST /logistica/api/inventario/productos",
                     "GET /logistica/api/inventario/stream",
                     "GET /logistica/api/inventario/stream/test",
                     "POST /logistica/api/entregas/creartemp",
@@ -106,11 +109,14 @@ def create_app(configuracion=None):
 
         @app.route("/logistica/health")
         def logistica_health():
+            from seedwork.infraestructura.cliente_http import obtener_cliente_http
             return {
                 "status": "up",
                 "service": "logistica",
                 "version": "1.0.0",
                 "mode": "simplified",
+                "metricas_http": obtener_cliente_http().metricas.instantanea(),
+                "resiliencia_http": obtener_cliente_http().estado_resiliencia(),
                 "endpoints": [
                     "GET /logistica/api/entregas-programadas",
                     "GET /logistica/api/inventario",
@@ -118,6 +124,7 @@ def create_app(configuracion=None):
                     "POST /logistica/api/inventario/reservar",
                     "POST /logistica/api/inventario/descontar",
                     "GET /logistica/api/inventario/producto/<id>",
+                    "POST /logistica/api/inventario/productos",
                     "GET /logistica/api/inventario/stream",
                     "GET /logistica/api/inventario/stream/test",
                     "GET /logistica/api/bodegas/",
@@ -157,6 +164,10 @@ try:
     # Suscribirse al topic de pedidos-confirmados (para PedidoConfirmado - reserva + crear entrega)
     consumidor_pubsub.suscribirse_a_topic('pedidos-confirmados', 'logistica-pedidos-confirmados-subscription')
     logger.info("✅ Consumidor suscrito al topic pedidos-confirmados")
+
+    # Suscribirse al topic de pedidos-estado-actualizado (para la proyección local de estados)
+    consumidor_pubsub.suscribirse_a_topic('pedidos-estado-actualizado', 'logistica-pedidos-estado-actualizado-subscription')
+    logger.info("✅ Consumidor suscrito al topic pedidos-estado-actualizado")
     
     # Pasar la app Flask al consumidor para tener contexto cuando procese eventos
     consumidor_pubsub.app = app
@@ -6,7 +6,8 @@ from aplicacion.consultas.obtener_entregas import ObtenerEntregas
 from seedwork.aplicacion.consultas import ejecutar_consulta
 from aplicacion.mapeadores import MapeadorEntregaDTOJson
 from infraestructura.servicio_pedidos import obtener_pedido_random
-from seedwork.presentacion.paginacion import paginar_resultados, extraer_parametros_paginacion
+from seedwork.presentacion.paginacion import paginar_resultados, extraer_parametros_paginacion, extraer_cursor, paginar_lista_por_cursor, CursorInvalido
+from seedwork.infraestructura.cliente_http import registrar_degradacion, anotar_degradacion
 
 import random
 from datetime import datetime, timedelta
@@ -127,7 +128,9 @@ def obtener_entregas():
             con_ruta=con_ruta,
             cliente_id=cliente_id
         )
-        entregas_dto = ejecutar_consulta(consulta)
+        # Si Ventas no responde, los estados salen de la proyección local y la respuesta se marca como degradada
+        with registrar_degradacion() as servicios_degradados:
+            entregas_dto = ejecutar_consulta(consulta)
 
         # Aplicar filtro manual (por seguridad)
         if fecha_inicio and fecha_fin:
@@ -144,12 +147,26 @@ def obtener_entregas():
                     if fecha_inicio.date() <= e.fecha_entrega.date() <= fecha_fin.date()
                 ]
 
-        # Mapear DTO → JSON externo
         mapeador = MapeadorEntregaDTOJson()
-        entregas_json = [mapeador.dto_a_externo(e) for e in entregas_dto]
-
-        # Aplicar paginación
-        resultado_paginado = paginar_resultados(entregas_json, page=page, page_size=page_size)
+        cursor = extraer_cursor(request.args)
+        if cursor is not None:
+            # Modo cursor: misma clave de orden que el repositorio (fecha_entrega desc) con el id como desempate;
+            # solo se mapean las entregas de la página
+            try:
+                pagina = paginar_lista_por_cursor(
+                    entregas_dto, clave=lambda e: (e.fecha_entrega, str(e.id)), cursor=cursor, page_size=page_size
+                )
+            except CursorInvalido as e:
+                return Response(json.dumps({'error': str(e)}), status=400, mimetype='application/json')
+            entregas_json = [mapeador.dto_a_externo(e) for e in pagina.items]
+            resultado_paginado = pagina.con_items(entregas_json).a_dict()
+        else:
+            # Mapear DTO → JSON externo
+            entregas_json = [mapeador.dto_a_externo(e) for e in entregas_dto]
+
+            # Aplicar paginación
+            resultado_paginado = paginar_resultados(entregas_json, page=page, page_size=page_size)
+        anotar_degradacion(resultado_paginado, servicios_degradados)
 
         logger.info(f"✅ {len(entregas_json)} entregas consultadas correctamente")
         return Response(json.dumps(resultado_paginado), status=200, mimetype='application/json')
@@ -6,6 +6,7 @@ import os
 from flask import request, Response, Blueprint, stream_with_context, send_from_directory
 from aplicacion.comandos.reservar_inventario import ReservarInventario
 from aplicacion.comandos.descontar_inventario import DescontarInventario
+from aplicacion.comandos.reconciliar_stock import ReconciliarStockProducto
 from aplicacion.consultas.buscar_productos_con_inventario import BuscarProductosConInventario
 from seedwork.aplicacion.comandos import ejecutar_comando
 from seedwork.aplicacion.consultas import ejecutar_consulta
@@ -19,6 +20,38 @@ logger = logging.getLogger(__name__)
 
 bp = api.crear_blueprint('inventario', '/logistica/api/inventario')
 
+MAX_PRODUCTOS_POR_CONSULTA = 500
+
+
+def _agrupar_inventario_por_bodega(producto_id, lotes_inventario) -> dict:
+    """Agrupa los lotes de un producto por bodega con sus ubicaciones y totales."""
+    por_bodega = {}
+    for lote in lotes_inventario:
+        bid = lote.bodega_id or 'sin_asignar'
+        if bid not in por_bodega:
+            por_bodega[bid] = {
+                'bodega_id': lote.bodega_id,
+                'ubicaciones': [],
+                'total_disponible': 0,
+                'total_reservado': 0
+            }
+        
+        por_bodega[bid]['total_disponible'] += lote.cantidad_disponible
+        por_bodega[bid]['total_reservado'] += lote.cantidad_reservada
+        por_bodega[bid]['ubicaciones'].append({
+            'pasillo': lote.pasillo,
+            'estante': lote.estante,
+            'ubicacion': f"Bodega #{lote.bodega_id} - Pasillo {lote.pasillo} - Estante {lote.estante}" if lote.bodega_id else None,
+            'cantidad_disponible': lote.cantidad_disponible,
+            'cantidad_reservada': lote.cantidad_reservada,
+            'fecha_vencimiento': lote.fecha_vencimiento.isoformat()
+        })
+    
+    return {
+        'producto_id': producto_id,
+        'bodegas': list(por_bodega.values())
+    }
+
 @bp.route('/buscar', methods=['GET'])
 def buscar_productos_con_inventario():
     """Buscar productos con inventario disponible"""
@@ -172,33 +205,7 @@ def obtener_inventario_producto(producto_id):
                 mimetype='application/json'
             )
         
-        # Agrupar por bodega
-        por_bodega = {}
-        for lote in lotes_inventario:
-            bid = lote.bodega_id or 'sin_asignar'
-            if bid not in por_bodega:
-                por_bodega[bid] = {
-                    'bodega_id': lote.bodega_id,
-                    'ubicaciones': [],
-                    'total_disponible': 0,
-                    'total_reservado': 0
-                }
-            
-            por_bodega[bid]['total_disponible'] += lote.cantidad_disponible
-            por_bodega[bid]['total_reservado'] += lote.cantidad_reservada
-            por_bodega[bid]['ubicaciones'].append({
-                'pasillo': lote.pasillo,
-                'estante': lote.estante,
-                'ubicacion': f"Bodega #{lote.bodega_id} - Pasillo {lote.pasillo} - Estante {lote.estante}" if lote.bodega_id else None,
-                'cantidad_disponible': lote.cantidad_disponible,
-                'cantidad_reservada': lote.cantidad_reservada,
-                'fecha_vencimiento': lote.fecha_vencimiento.isoformat()
-            })
-        
-        response_data = {
-            'producto_id': producto_id,
-            'bodegas': list(por_bodega.values())
-        }
+        response_data = _agrupar_inventario_por_bodega(producto_id, lotes_inventario)
         
         return Response(
             json.dumps(response_data), 
@@ -214,6 +221,112 @@ def obtener_inventario_producto(producto_id):
             mimetype='application/json'
         )
 
+@bp.route('/producto/<producto_id>/stock', methods=['GET'])
+def obtener_stock_producto(producto_id):
+    """Obtener los totales de stock de un producto desde el resumen por producto, sin leer sus lotes"""
+    try:
+        repositorio = RepositorioInventarioSQLite()
+        stock = repositorio.obtener_stock(producto_id)
+        
+        if stock is None:
+            return Response(
+                json.dumps({'error': 'Producto no encontrado en inventario'}), 
+                status=404, 
+                mimetype='application/json'
+            )
+        
+        cantidad_disponible, cantidad_reservada = stock
+        return Response(
+            json.dumps({
+                'producto_id': producto_id,
+                'total_disponible': cantidad_disponible,
+                'total_reservado': cantidad_reservada
+            }), 
+            status=200, 
+            mimetype='application/json'
+        )
+        
+    except Exception as e:
+        logger.error(f"Error obteniendo stock del producto {producto_id}: {e}")
+        return Response(
+            json.dumps({'error': f'Error interno del servidor: {str(e)}'}), 
+            status=500, 
+            mimetype='application/json'
+        )
+
+@bp.route('/stock/reconciliar', methods=['POST'])
+def reconciliar_stock():
+    """Recalcular el resumen de stock por producto desde los lotes (opcionalmente solo "producto_ids")"""
+    try:
+        data = request.get_json(silent=True) or {}
+        producto_ids = data.get('producto_ids')
+        
+        if producto_ids is not None and not isinstance(producto_ids, list):
+            return Response(
+                json.dumps({'error': 'El campo "producto_ids" debe ser una lista'}), 
+                status=400, 
+                mimetype='application/json'
+            )
+        
+        resultado = ejecutar_comando(ReconciliarStockProducto(producto_ids=producto_ids))
+        
+        return Response(
+            json.dumps(resultado), 
+            status=200 if resultado.get('success') else 500, 
+            mimetype='application/json'
+        )
+        
+    except Exception as e:
+        logger.error(f"Error reconciliando stock: {e}")
+        return Response(
+            json.dumps({'error': f'Error interno del servidor: {str(e)}'}), 
+            status=500, 
+            mimetype='application/json'
+        )
+
+@bp.route('/productos', methods=['POST'])
+def obtener_inventario_productos():
+    """Obtener el inventario de varios productos en una sola llamada (los productos sin lotes se omiten)"""
+    try:
+        datos = request.get_json(silent=True) or {}
+        producto_ids = datos.get('producto_ids')
+        
+        if not isinstance(producto_ids, list) or not producto_ids:
+            return Response(
+                json.dumps({'error': 'producto_ids debe ser una lista no vacía'}), 
+                status=400, 
+                mimetype='application/json'
+            )
+        
+        if len(producto_ids) > MAX_PRODUCTOS_POR_CONSULTA:
+            return Response(
+                json.dumps({'error': f'Máximo {MAX_PRODUCTOS_POR_CONSULTA} productos por consulta'}), 
+                status=400, 
+                mimetype='application/json'
+            )
+        
+        repositorio = RepositorioInventarioSQLite()
+        lotes_por_producto = repositorio.obtener_por_producto_ids(producto_ids)
+        
+        inventarios = {
+            producto_id: _agrupar_inventario_por_bodega(producto_id, lotes)
+            for producto_id, lotes in lotes_por_producto.items()
+        }
+        
+        return Response(
+            json.dumps({'inventarios': inventarios}), 
+            status=200, 
+            mimetype='application/json'
+        )
+        
+    except Exception as e:
+        logger.error(f"Error obteniendo inventario de productos: {e}")
+        return Response(
+            json.dumps({'error': f'Error interno del servidor: {str(e)}'}), 
+            status=500, 
+            mimetype='application/json'
+        )
+
 @bp.route('/', methods=['GET'])
 def obtener_todo_inventario():
     """Obtener todo el inventario agrupado por producto"""
@@ -282,23 +395,16 @@ def stream_inventario():
             sse_client_manager.agregar_cliente(client_queue)
             logger.info("Cliente SSE conectado")
             
-            # Enviar estado inicial del inventario
+            # Enviar estado inicial del inventario desde el resumen de stock por producto
             repositorio = RepositorioInventarioSQLite()
-            lotes_inventario = repositorio.obtener_todos()
-            
-            # Agrupar por producto_id y calcular total disponible
-            inventario_por_producto = {}
-            for lote in lotes_inventario:
-                producto_id = lote.producto_id
-                if producto_id not in inventario_por_producto:
-                    inventario_por_producto[producto_id] = {
-                        'producto_id': producto_id,
-                        'cantidad_disponible': 0
-                    }
-                inventario_por_producto[producto_id]['cantidad_disponible'] += lote.cantidad_disponible
+            stock_por_producto = repositorio.obtener_stock_todos()
             
             # Enviar estado inicial
-            for producto_data in inventario_por_producto.values():
+            for producto_id, (cantidad_disponible, _) in stock_por_producto.items():
+                producto_data = {
+                    'producto_id': producto_id,
+                    'cantidad_disponible': cantidad_disponible
+                }
                 evento_initial = f"event: inventory\ndata: {json.dumps(producto_data)}\n\n"
                 yield evento_initial
             
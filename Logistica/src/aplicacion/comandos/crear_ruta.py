@@ -36,11 +36,16 @@ class CrearRutaHandler:
 
         entregas_asignadas: list[EntregaAsignada] = []
         entregas_detalle: list[RutaEntregaDTO] = []
-        entregas_unicas = set(comando.entregas)
+        entregas_unicas = list(dict.fromkeys(comando.entregas))
+
+        # Se cargan solo las entregas de la ruta y su pertenencia a otras rutas en una consulta cada una
+        entregas_por_id = {
+            str(entrega.id): entrega for entrega in self._repo_entregas.obtener_por_ids(entregas_unicas)
+        }
+        entregas_con_ruta = self._repo_rutas.entregas_ya_asignadas(entregas_unicas)
 
         for entrega_id in entregas_unicas:
-            entregas_dto = self._repo_entregas.obtener_todos()
-            entrega_dto = next((e for e in entregas_dto if str(e.id) == entrega_id), None)
+            entrega_dto = entregas_por_id.get(str(entrega_id))
             if not entrega_dto:
                 raise ValueError(f"La entrega {entrega_id} no existe")
 
@@ -55,7 +60,7 @@ class CrearRutaHandler:
             if estado_pedido != 'confirmado':
                 raise ValueError(f"La entrega {entrega_id} no tiene un pedido confirmado")
 
-            if self._repo_rutas.entrega_ya_asignada(entrega_id):
+            if str(entrega_id) in entregas_con_ruta:
                 raise ValueError(f"La entrega {entrega_id} ya está asignada a otra ruta")
 
             entregas_asignadas.append(
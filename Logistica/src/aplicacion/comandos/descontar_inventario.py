@@ -4,8 +4,6 @@ from seedwork.aplicacion.comandos import ejecutar_comando as comando
 from seedwork.dominio.eventos import despachador_eventos
 from infraestructura.repositorios import RepositorioInventarioSQLite
 from aplicacion.dto import InventarioDTO
-from dominio.objetos_valor import ProductoID, Cantidad
-from dominio.entidades import Inventario
 from dominio.eventos import InventarioDescontado
 from infraestructura.sse_manager import sse_client_manager
 import logging
@@ -16,126 +14,72 @@ logger = logging.getLogger(__name__)
 class DescontarInventario(Comando):
     items: list[dict]  # [{"producto_id": str, "cantidad": int}, ...]
 
+class DescuentoNoPosible(Exception):
+    """El descuento no se puede completar; `mensaje` se retorna como error del comando"""
+    def __init__(self, mensaje: str):
+        super().__init__(mensaje)
+        self.mensaje = mensaje
+
 class DescontarInventarioHandler:
     def __init__(self):
         self._repositorio: RepositorioInventarioSQLite = RepositorioInventarioSQLite()
-    
+
     def handle(self, comando: DescontarInventario) -> dict:
-        """Descuenta inventario reservado (sale del sistema definitivamente)"""
+        """
+        Descuenta inventario reservado (sale del sistema definitivamente).
+
+        Bloquea en una consulta los lotes con cantidad reservada de todos los productos, asigna
+        en memoria por fecha de vencimiento y aplica todos los descuentos en una transacción; si
+        algún producto no alcanza, no se descuenta nada. Retorna la asignación por lote en
+        'asignaciones'.
+        """
         try:
-            # Validar que todos los productos tengan cantidad reservada suficiente
+            # Validar datos antes de bloquear lotes
+            cantidades = {}  # {producto_id: cantidad total a descontar}
             for item in comando.items:
                 producto_id = item.get('producto_id')
                 cantidad_a_descontar = item.get('cantidad', 0)
-                
+
                 if not producto_id or cantidad_a_descontar <= 0:
                     return {
                         'success': False,
                         'error': f'Datos inválidos para producto {producto_id}'
                     }
-                
-                # Obtener TODOS los lotes de inventario del producto (retorna lista)
-                lotes_inventario = self._repositorio.obtener_por_producto_id(producto_id)
-                if not lotes_inventario:
-                    return {
-                        'success': False,
-                        'error': f'Producto {producto_id} no encontrado en inventario'
-                    }
-                
-                # Sumar cantidad reservada total de todos los lotes
-                total_reservado = sum(lote.cantidad_reservada for lote in lotes_inventario)
-                
-                if total_reservado < cantidad_a_descontar:
-                    return {
-                        'success': False,
-                        'error': f'Cantidad reservada insuficiente para producto {producto_id}. Reservada: {total_reservado}, A descontar: {cantidad_a_descontar}'
-                    }
-            
-            # Si todas las validaciones pasan, proceder con el descuento
-            for item in comando.items:
-                producto_id = item.get('producto_id')
-                cantidad_a_descontar = item.get('cantidad', 0)
-                cantidad_restante = cantidad_a_descontar
-                
-                # Obtener TODOS los lotes de inventario del producto
-                lotes_inventario = self._repositorio.obtener_por_producto_id(producto_id)
-                
-                # Descontar de los lotes con cantidad reservada (FIFO)
-                # Actualización directa sin validaciones de dominio para fechas históricas
-                from infraestructura.modelos import InventarioModel
-                from config.db import db
-                
-                for lote_dto in lotes_inventario:
-                    if cantidad_restante <= 0:
-                        break
-                    
-                    if lote_dto.cantidad_reservada <= 0:
-                        continue  # Este lote no tiene cantidad reservada
-                    
-                    # Calcular cuánto descontar de este lote
-                    cantidad_de_este_lote = min(cantidad_restante, lote_dto.cantidad_reservada)
-                    
-                    # Validar que tenemos suficiente cantidad reservada
-                    if cantidad_de_este_lote > lote_dto.cantidad_reservada:
-                        logger.error(f"Cantidad insuficiente en lote para producto {producto_id}")
-                        return {
-                            'success': False,
-                            'error': f'Error descontando inventario para producto {producto_id}'
-                        }
-                    
-                    # Actualizar directamente en la BD sin pasar por validaciones de dominio
-                    # (para soportar fechas de vencimiento históricas)
-                    inventario_model = InventarioModel.query.filter_by(
-                        producto_id=lote_dto.producto_id,
-                        fecha_vencimiento=lote_dto.fecha_vencimiento,
-                        bodega_id=lote_dto.bodega_id
-                    ).first()
-                    
-                    if inventario_model:
-                        # Descontar: reduce cantidad reservada (ya no está disponible ni reservada)
-                        inventario_model.cantidad_reservada -= cantidad_de_este_lote
-                        db.session.commit()
-                        cantidad_restante -= cantidad_de_este_lote
-                    else:
-                        logger.error(f"Lote de inventario no encontrado para producto {producto_id}")
-                        return {
-                            'success': False,
-                            'error': f'Lote de inventario no encontrado para producto {producto_id}'
-                        }
-            
-            # Publicar eventos y notificar clientes SSE para cada producto afectado
-            productos_afectados = set()
-            for item in comando.items:
-                productos_afectados.add(item.get('producto_id'))
-            
-            for producto_id in productos_afectados:
-                # Obtener cantidad disponible actualizada
-                inventarios_actualizados = self._repositorio.obtener_por_producto_id(producto_id)
-                if inventarios_actualizados:
-                    cantidad_disponible_total = sum(inv.cantidad_disponible for inv in inventarios_actualizados)
-                    cantidad_reservada_total = sum(inv.cantidad_reservada for inv in inventarios_actualizados)
-                    
-                    # Crear y publicar evento localmente
-                    evento = InventarioDescontado(
-                        producto_id=producto_id,
-                        cantidad_descontada=cantidad_reservada_total,
-                        cantidad_reservada_restante=cantidad_reservada_total
+                cantidades[producto_id] = cantidades.get(producto_id, 0) + cantidad_a_descontar
+
+            # Bloquear en una consulta los lotes de todos los productos y asignarlos en memoria
+            asignaciones = []
+            try:
+                lotes_por_producto = self._repositorio.bloquear_lotes_para_descuento(list(cantidades))
+                sin_lotes = [p for p in cantidades if not lotes_por_producto.get(p)]
+                con_inventario = self._repositorio.productos_con_inventario(sin_lotes) if sin_lotes else set()
+                for producto_id, cantidad_a_descontar in cantidades.items():
+                    if producto_id in sin_lotes and producto_id not in con_inventario:
+                        raise DescuentoNoPosible(f'Producto {producto_id} no encontrado en inventario')
+                    asignaciones.extend(
+                        self._asignar_lotes(producto_id, cantidad_a_descontar, lotes_por_producto.get(producto_id, []))
                     )
-                    despachador_eventos.publicar_evento(evento, publicar_externamente=False)
-                    logger.info(f"Evento InventarioDescontado publicado para producto {producto_id}")
-                    
-                    # Notificar clientes SSE
-                    sse_client_manager.notificar_todos('update', {
-                        'producto_id': producto_id,
-                        'cantidad_disponible': cantidad_disponible_total
-                    })
-                    logger.info(f"Clientes SSE notificados de actualización para producto {producto_id}")
-            
+
+                # Actualización directa sin validaciones de dominio para soportar fechas de vencimiento históricas
+                self._repositorio.aplicar_descuentos(asignaciones)
+            except DescuentoNoPosible as e:
+                self._repositorio.revertir()
+                return {
+                    'success': False,
+                    'error': e.mensaje
+                }
+            except Exception:
+                self._repositorio.revertir()
+                raise
+
+            self._publicar_descuentos(cantidades)
+
             return {
                 'success': True,
-                'message': f'Inventario descontado exitosamente para {len(comando.items)} productos'
+                'message': f'Inventario descontado exitosamente para {len(comando.items)} productos',
+                'asignaciones': asignaciones
             }
-            
+
         except Exception as e:
             logger.error(f"Error en descontar inventario: {e}")
             return {
@@ -143,6 +87,55 @@ class DescontarInventarioHandler:
                 'error': f'Error interno: {str(e)}'
             }
 
+    def _asignar_lotes(self, producto_id: str, cantidad_a_descontar: int, lotes: list[InventarioDTO]) -> list[dict]:
+        """Reparte la cantidad entre los lotes con cantidad reservada, en el orden recibido (por vencimiento)"""
+        total_reservado = sum(lote.cantidad_reservada for lote in lotes)
+        if total_reservado < cantidad_a_descontar:
+            raise DescuentoNoPosible(
+                f'Cantidad reservada insuficiente para producto {producto_id}. Reservada: {total_reservado}, A descontar: {cantidad_a_descontar}'
+            )
+
+        asignaciones = []
+        cantidad_restante = cantidad_a_descontar
+        for lote in lotes:
+            if cantidad_restante <= 0:
+                break
+
+            cantidad_de_este_lote = min(cantidad_restante, lote.cantidad_reservada)
+            asignaciones.append({
+                'producto_id': producto_id,
+                'lote_id': lote.id,
+                'bodega_id': lote.bodega_id,
+                'fecha_vencimiento': lote.fecha_vencimiento.isoformat(),
+                'cantidad': cantidad_de_este_lote
+            })
+            cantidad_restante -= cantidad_de_este_lote
+        return asignaciones
+
+    def _publicar_descuentos(self, cantidades: dict[str, int]):
+        """Publica eventos y notifica clientes SSE con los totales actualizados de cada producto"""
+        totales = self._repositorio.obtener_totales_por_producto(list(cantidades))
+        for producto_id, cantidad_descontada in cantidades.items():
+            if producto_id not in totales:
+                continue
+            cantidad_disponible_total, cantidad_reservada_total = totales[producto_id]
+
+            # Crear y publicar evento localmente
+            evento = InventarioDescontado(
+                producto_id=producto_id,
+                cantidad_descontada=cantidad_descontada,
+                cantidad_reservada_restante=cantidad_reservada_total
+            )
+            despachador_eventos.publicar_evento(evento, publicar_externamente=False)
+            logger.info(f"Evento InventarioDescontado publicado para producto {producto_id}")
+
+            # Notificar clientes SSE
+            sse_client_manager.notificar_todos('update', {
+                'producto_id': producto_id,
+                'cantidad_disponible': cantidad_disponible_total
+            })
+            logger.info(f"Clientes SSE notificados de actualización para producto {producto_id}")
+
 @comando.register(DescontarInventario)
 def ejecutar_descontar_inventario(comando: DescontarInventario):
     handler = DescontarInventarioHandler()
@@ -3,8 +3,6 @@ from seedwork.aplicacion.comandos import Comando
 from seedwork.aplicacion.comandos import ejecutar_comando as comando
 from infraestructura.repositorios import RepositorioInventarioSQLite
 from aplicacion.dto import InventarioDTO
-from dominio.objetos_valor import ProductoID, Cantidad
-from dominio.entidades import Inventario
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,14 +11,27 @@ logger = logging.getLogger(__name__)
 class EntregaInventario(Comando):
     items: list[dict]  # [{"producto_id": str, "cantidad": int}, ...]
 
+class EntregaNoPosible(Exception):
+    """La entrega no se puede completar; `mensaje` se retorna como error del comando"""
+    def __init__(self, mensaje: str):
+        super().__init__(mensaje)
+        self.mensaje = mensaje
+
 class EntregaInventarioHandler:
     def __init__(self):
         self._repositorio: RepositorioInventarioSQLite = RepositorioInventarioSQLite()
     
     def handle(self, comando: EntregaInventario) -> dict:
-        """Descuenta inventario reservado cuando el pedido es entregado (sale del sistema definitivamente)"""
+        """
+        Descuenta inventario reservado cuando el pedido es entregado (sale del sistema definitivamente).
+
+        Bloquea los lotes con cantidad reservada de todos los productos, asigna por fecha de
+        vencimiento y aplica todas las entregas en una transacción a través del repositorio, que
+        mantiene el resumen de stock por producto; si algún producto no alcanza, no se entrega nada.
+        """
         try:
-            # Validar que todos los productos tengan cantidad reservada suficiente
+            # Validar datos antes de bloquear lotes
+            cantidades = {}  # {producto_id: cantidad total a entregar}
             for item in comando.items:
                 producto_id = item.get('producto_id')
                 cantidad_a_entregar = item.get('cantidad', 0)
@@ -30,79 +41,36 @@ class EntregaInventarioHandler:
                         'success': False,
                         'error': f'Datos inválidos para producto {producto_id}'
                     }
-                
-                # Obtener TODOS los lotes de inventario del producto (retorna lista)
-                lotes_inventario = self._repositorio.obtener_por_producto_id(producto_id)
-                if not lotes_inventario:
-                    return {
-                        'success': False,
-                        'error': f'Producto {producto_id} no encontrado en inventario'
-                    }
-                
-                # Sumar cantidad reservada total de todos los lotes
-                total_reservado = sum(lote.cantidad_reservada for lote in lotes_inventario)
-                
-                if total_reservado < cantidad_a_entregar:
-                    return {
-                        'success': False,
-                        'error': f'Cantidad reservada insuficiente para producto {producto_id}. Reservada: {total_reservado}, A entregar: {cantidad_a_entregar}'
-                    }
+                cantidades[producto_id] = cantidades.get(producto_id, 0) + cantidad_a_entregar
             
-            # Si todas las validaciones pasan, proceder con la entrega
-            for item in comando.items:
-                producto_id = item.get('producto_id')
-                cantidad_a_entregar = item.get('cantidad', 0)
-                cantidad_restante = cantidad_a_entregar
-                
-                # Obtener TODOS los lotes de inventario del producto
-                lotes_inventario = self._repositorio.obtener_por_producto_id(producto_id)
+            asignaciones = []
+            try:
+                lotes_por_producto = self._repositorio.bloquear_lotes_para_descuento(list(cantidades))
+                sin_lotes = [p for p in cantidades if not lotes_por_producto.get(p)]
+                con_inventario = self._repositorio.productos_con_inventario(sin_lotes) if sin_lotes else set()
+                for producto_id, cantidad_a_entregar in cantidades.items():
+                    if producto_id in sin_lotes and producto_id not in con_inventario:
+                        raise EntregaNoPosible(f'Producto {producto_id} no encontrado en inventario')
+                    asignaciones.extend(
+                        self._asignar_lotes(producto_id, cantidad_a_entregar, lotes_por_producto.get(producto_id, []))
+                    )
                 
-                # Descontar de los lotes con cantidad reservada (FIFO)
-                # Actualización directa sin validaciones de dominio para fechas históricas
-                from infraestructura.modelos import InventarioModel
-                from config.db import db
-                
-                for lote_dto in lotes_inventario:
-                    if cantidad_restante <= 0:
-                        break
-                    
-                    if lote_dto.cantidad_reservada <= 0:
-                        continue  # Este lote no tiene cantidad reservada
-                    
-                    # Calcular cuánto entregar de este lote
-                    cantidad_de_este_lote = min(cantidad_restante, lote_dto.cantidad_reservada)
-                    
-                    # Validar que tenemos suficiente cantidad reservada
-                    if cantidad_de_este_lote > lote_dto.cantidad_reservada:
-                        logger.error(f"Cantidad insuficiente en lote para producto {producto_id}")
-                        return {
-                            'success': False,
-                            'error': f'Error entregando inventario para producto {producto_id}'
-                        }
-                    
-                    # Actualizar directamente en la BD sin pasar por validaciones de dominio
-                    # (para soportar fechas de vencimiento históricas)
-                    inventario_model = InventarioModel.query.filter_by(
-                        producto_id=lote_dto.producto_id,
-                        fecha_vencimiento=lote_dto.fecha_vencimiento,
-                        bodega_id=lote_dto.bodega_id
-                    ).first()
-                    
-                    if inventario_model:
-                        # Entregar: reduce cantidad reservada (ya no está disponible ni reservada)
-                        inventario_model.cantidad_reservada -= cantidad_de_este_lote
-                        db.session.commit()
-                        cantidad_restante -= cantidad_de_este_lote
-                    else:
-                        logger.error(f"Lote de inventario no encontrado para producto {producto_id}")
-                        return {
-                            'success': False,
-                            'error': f'Lote de inventario no encontrado para producto {producto_id}'
-                        }
+                # Actualización directa sin validaciones de dominio para soportar fechas de vencimiento históricas
+                self._repositorio.aplicar_descuentos(asignaciones)
+            except EntregaNoPosible as e:
+                self._repositorio.revertir()
+                return {
+                    'success': False,
+                    'error': e.mensaje
+                }
+            except Exception:
+                self._repositorio.revertir()
+                raise
             
             return {
                 'success': True,
-                'message': f'Inventario entregado exitosamente para {len(comando.items)} productos'
+                'message': f'Inventario entregado exitosamente para {len(comando.items)} productos',
+                'asignaciones': asignaciones
             }
             
         except Exception as e:
@@ -111,9 +79,33 @@ class EntregaInventarioHandler:
                 'success': False,
                 'error': f'Error interno: {str(e)}'
             }
+    
+    def _asignar_lotes(self, producto_id: str, cantidad_a_entregar: int, lotes: list[InventarioDTO]) -> list[dict]:
+        """Reparte la cantidad entre los lotes con cantidad reservada, en el orden recibido (por vencimiento)"""
+        total_reservado = sum(lote.cantidad_reservada for lote in lotes)
+        if total_reservado < cantidad_a_entregar:
+            raise EntregaNoPosible(
+                f'Cantidad reservada insuficiente para producto {producto_id}. Reservada: {total_reservado}, A entregar: {cantidad_a_entregar}'
+            )
+        
+        asignaciones = []
+        cantidad_restante = cantidad_a_entregar
+        for lote in lotes:
+            if cantidad_restante <= 0:
+                break
+            
+            cantidad_de_este_lote = min(cantidad_restante, lote.cantidad_reservada)
+            asignaciones.append({
+                'producto_id': producto_id,
+                'lote_id': lote.id,
+                'bodega_id': lote.bodega_id,
+                'fecha_vencimiento': lote.fecha_vencimiento.isoformat(),
+                'cantidad': cantidad_de_este_lote
+            })
+            cantidad_restante -= cantidad_de_este_lote
+        return asignaciones
 
 @comando.register(EntregaInventario)
 def ejecutar_entrega_inventario(comando: EntregaInventario):
     handler = EntregaInventarioHandler()
     return handler.handle(comando)
-
@@ -0,0 +1,37 @@
+from dataclasses import dataclass, field
+from typing import Optional
+from seedwork.aplicacion.comandos import Comando
+from seedwork.aplicacion.comandos import ejecutar_comando as comando
+from infraestructura.repositorios import RepositorioInventarioSQLite
+import logging
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class ReconciliarStockProducto(Comando):
+    producto_ids: Optional[list[str]] = field(default=None)  # None reconcilia todos los productos
+
+class ReconciliarStockProductoHandler:
+    def __init__(self):
+        self._repositorio: RepositorioInventarioSQLite = RepositorioInventarioSQLite()
+
+    def handle(self, comando: ReconciliarStockProducto) -> dict:
+        """Recalcula el resumen `stock_producto` desde los lotes y corrige las diferencias"""
+        try:
+            corregidos = self._repositorio.reconciliar_stock(comando.producto_ids)
+            return {
+                'success': True,
+                'message': f'Resumen de stock reconciliado: {corregidos} productos corregidos',
+                'productos_corregidos': corregidos
+            }
+        except Exception as e:
+            logger.error(f"Error reconciliando stock: {e}")
+            return {
+                'success': False,
+                'error': f'Error interno: {str(e)}'
+            }
+
+@comando.register(ReconciliarStockProducto)
+def ejecutar_reconciliar_stock(comando: ReconciliarStockProducto):
+    handler = ReconciliarStockProductoHandler()
+    return handler.handle(comando)
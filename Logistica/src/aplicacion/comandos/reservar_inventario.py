@@ -4,7 +4,7 @@ from seedwork.aplicacion.comandos import ejecutar_comando as comando
 from seedwork.dominio.eventos import EventoDominio, despachador_eventos
 from infraestructura.repositorios import RepositorioInventarioSQLite
 from aplicacion.dto import InventarioDTO
-from dominio.objetos_valor import ProductoID, Cantidad
+from dominio.objetos_valor import ProductoID, Cantidad, FechaVencimiento
 from dominio.entidades import Inventario
 from dominio.eventos import InventarioReservado
 from infraestructura.sse_manager import sse_client_manager
@@ -16,124 +16,72 @@ logger = logging.getLogger(__name__)
 class ReservarInventario(Comando):
     items: list[dict]  # [{"producto_id": str, "cantidad": int}, ...]
 
+class ReservaNoPosible(Exception):
+    """La reserva no se puede completar; `mensaje` se retorna como error del comando"""
+    def __init__(self, mensaje: str):
+        super().__init__(mensaje)
+        self.mensaje = mensaje
+
 class ReservarInventarioHandler:
     def __init__(self):
         self._repositorio: RepositorioInventarioSQLite = RepositorioInventarioSQLite()
-    
+
     def handle(self, comando: ReservarInventario) -> dict:
-        """Reserva inventario para múltiples productos de forma transaccional"""
+        """
+        Reserva inventario para múltiples productos en una sola transacción.
+
+        Bloquea en una consulta los lotes candidatos de todos los productos, ordenados por
+        vencimiento (FEFO), asigna en memoria y aplica todas las reservas juntas; si algún
+        producto no alcanza, no se reserva nada. Retorna la asignación por lote en 'asignaciones'.
+        """
         try:
-            # Validar que todos los productos tengan stock suficiente
+            # Validar datos antes de bloquear lotes
+            cantidades = {}  # {producto_id: cantidad total solicitada}
             for item in comando.items:
                 producto_id = item.get('producto_id')
                 cantidad_solicitada = item.get('cantidad', 0)
-                
+
                 if not producto_id or cantidad_solicitada <= 0:
                     return {
                         'success': False,
                         'error': f'❌ Datos inválidos para producto {producto_id}: ID del producto o cantidad inválida'
                     }
-                
-                # Obtener inventario actual (puede haber múltiples lotes)
-                inventarios_dto = self._repositorio.obtener_por_producto_id(producto_id)
-                if not inventarios_dto:
-                    return {
-                        'success': False,
-                        'error': f'❌ Producto {producto_id} no encontrado en inventario: El producto no existe o no está disponible para la venta'
-                    }
-                
-                # Sumar las cantidades disponibles de todos los lotes
-                total_disponible = sum(inv.cantidad_disponible for inv in inventarios_dto)
-                
-                if total_disponible < cantidad_solicitada:
-                    return {
-                        'success': False,
-                        'error': f'⚠️ Stock insuficiente para producto {producto_id}: Disponible: {total_disponible} unidades, Solicitado: {cantidad_solicitada} unidades'
-                    }
-            
-            # Si todas las validaciones pasan, proceder con la reserva
-            for item in comando.items:
-                producto_id = item.get('producto_id')
-                cantidad_solicitada = item.get('cantidad', 0)
-                
-                # Obtener inventario actual (múltiples lotes)
-                inventarios_dto = self._repositorio.obtener_por_producto_id(producto_id)
-                
-                # Reservar de los lotes ordenados por fecha de vencimiento (FIFO)
-                inventarios_dto_ordenados = sorted(inventarios_dto, key=lambda x: x.fecha_vencimiento)
-                
-                cantidad_restante = cantidad_solicitada
-                for inventario_dto in inventarios_dto_ordenados:
-                    if cantidad_restante <= 0:
-                        break
-                    
-                    # Crear entidad de dominio
-                    from dominio.objetos_valor import FechaVencimiento
-                    inventario = Inventario(
-                        id=inventario_dto.producto_id,
-                        producto_id=ProductoID(inventario_dto.producto_id),
-                        cantidad_disponible=Cantidad(inventario_dto.cantidad_disponible),
-                        cantidad_reservada=Cantidad(inventario_dto.cantidad_reservada),
-                        fecha_vencimiento=FechaVencimiento(inventario_dto.fecha_vencimiento)
-                    )
-                    
-                    # Calcular cuánto reservar de este lote
-                    cantidad_a_reservar_de_este_lote = min(cantidad_restante, inventario_dto.cantidad_disponible)
-                    
-                    if cantidad_a_reservar_de_este_lote > 0:
-                        # Reservar cantidad
-                        if not inventario.reservar_cantidad(cantidad_a_reservar_de_este_lote):
-                            logger.error(f"Error reservando cantidad para producto {producto_id}")
-                            return {
-                                'success': False,
-                                'error': f'Error reservando inventario para producto {producto_id}'
-                            }
-                        
-                        # Actualizar en base de datos
-                        nuevo_inventario_dto = InventarioDTO(
-                            producto_id=inventario.producto_id.valor,
-                            cantidad_disponible=inventario.cantidad_disponible.valor,
-                            cantidad_reservada=inventario.cantidad_reservada.valor,
-                            fecha_vencimiento=inventario_dto.fecha_vencimiento
+                cantidades[producto_id] = cantidades.get(producto_id, 0) + cantidad_solicitada
+
+            # Bloquear en una consulta los lotes de todos los productos y asignarlos en memoria (FEFO)
+            asignaciones = []
+            try:
+                lotes_por_producto = self._repositorio.bloquear_lotes_para_reserva(list(cantidades))
+                sin_lotes = [p for p in cantidades if not lotes_por_producto.get(p)]
+                con_inventario = self._repositorio.productos_con_inventario(sin_lotes) if sin_lotes else set()
+                for producto_id, cantidad_solicitada in cantidades.items():
+                    if producto_id in sin_lotes and producto_id not in con_inventario:
+                        raise ReservaNoPosible(
+                            f'❌ Producto {producto_id} no encontrado en inventario: El producto no existe o no está disponible para la venta'
                         )
-                        
-                        self._repositorio.crear_o_actualizar(nuevo_inventario_dto)
-                        
-                        cantidad_restante -= cantidad_a_reservar_de_este_lote
-            
-            # Publicar eventos y notificar clientes SSE para cada producto afectado
-            productos_afectados = set()
-            for item in comando.items:
-                productos_afectados.add(item.get('producto_id'))
-            
-            for producto_id in productos_afectados:
-                # Obtener cantidad disponible actualizada
-                inventarios_actualizados = self._repositorio.obtener_por_producto_id(producto_id)
-                if inventarios_actualizados:
-                    cantidad_disponible_total = sum(inv.cantidad_disponible for inv in inventarios_actualizados)
-                    cantidad_reservada_total = sum(inv.cantidad_reservada for inv in inventarios_actualizados)
-                    
-                    # Crear y publicar evento localmente
-                    evento = InventarioReservado(
-                        producto_id=producto_id,
-                        cantidad_reservada=cantidad_reservada_total,
-                        cantidad_disponible_restante=cantidad_disponible_total
+                    asignaciones.extend(
+                        self._asignar_lotes(producto_id, cantidad_solicitada, lotes_por_producto.get(producto_id, []))
                     )
-                    despachador_eventos.publicar_evento(evento, publicar_externamente=False)
-                    logger.info(f"Evento InventarioReservado publicado para producto {producto_id}")
-                    
-                    # Notificar clientes SSE
-                    sse_client_manager.notificar_todos('update', {
-                        'producto_id': producto_id,
-                        'cantidad_disponible': cantidad_disponible_total
-                    })
-                    logger.info(f"Clientes SSE notificados de actualización para producto {producto_id}")
-            
+
+                self._repositorio.aplicar_reservas(asignaciones)
+            except ReservaNoPosible as e:
+                self._repositorio.revertir()
+                return {
+                    'success': False,
+                    'error': e.mensaje
+                }
+            except Exception:
+                self._repositorio.revertir()
+                raise
+
+            self._publicar_reservas(list(cantidades))
+
             return {
                 'success': True,
-                'message': f'Inventario reservado exitosamente para {len(comando.items)} productos'
+                'message': f'Inventario reservado exitosamente para {len(comando.items)} productos',
+                'asignaciones': asignaciones
             }
-            
+
         except ValueError as e:
             # Error específico de validación (fecha de vencimiento, etc.)
             logger.error(f"Error en reservar inventario: {e}")
@@ -148,6 +96,66 @@ class ReservarInventarioHandler:
                 'error': f'Error interno: {str(e)}'
             }
 
+    def _asignar_lotes(self, producto_id: str, cantidad_solicitada: int, lotes: list[InventarioDTO]) -> list[dict]:
+        """Reparte la cantidad entre los lotes en el orden recibido (por vencimiento)"""
+        total_disponible = sum(lote.cantidad_disponible for lote in lotes)
+        if total_disponible < cantidad_solicitada:
+            raise ReservaNoPosible(
+                f'⚠️ Stock insuficiente para producto {producto_id}: Disponible: {total_disponible} unidades, Solicitado: {cantidad_solicitada} unidades'
+            )
+
+        asignaciones = []
+        cantidad_restante = cantidad_solicitada
+        for lote in lotes:
+            if cantidad_restante <= 0:
+                break
+
+            inventario = Inventario(
+                id=lote.id,
+                producto_id=ProductoID(lote.producto_id),
+                cantidad_disponible=Cantidad(lote.cantidad_disponible),
+                cantidad_reservada=Cantidad(lote.cantidad_reservada),
+                fecha_vencimiento=FechaVencimiento(lote.fecha_vencimiento)
+            )
+            cantidad_de_este_lote = min(cantidad_restante, lote.cantidad_disponible)
+            if not inventario.reservar_cantidad(cantidad_de_este_lote):
+                logger.error(f"Error reservando cantidad para producto {producto_id}")
+                raise ReservaNoPosible(f'Error reservando inventario para producto {producto_id}')
+
+            asignaciones.append({
+                'producto_id': producto_id,
+                'lote_id': lote.id,
+                'bodega_id': lote.bodega_id,
+                'fecha_vencimiento': lote.fecha_vencimiento.isoformat(),
+                'cantidad': cantidad_de_este_lote
+            })
+            cantidad_restante -= cantidad_de_este_lote
+        return asignaciones
+
+    def _publicar_reservas(self, producto_ids: list[str]):
+        """Publica eventos y notifica clientes SSE con los totales actualizados de cada producto"""
+        totales = self._repositorio.obtener_totales_por_producto(producto_ids)
+        for producto_id in producto_ids:
+            if producto_id not in totales:
+                continue
+            cantidad_disponible_total, cantidad_reservada_total = totales[producto_id]
+
+            # Crear y publicar evento localmente
+            evento = InventarioReservado(
+                producto_id=producto_id,
+                cantidad_reservada=cantidad_reservada_total,
+                cantidad_disponible_restante=cantidad_disponible_total
+            )
+            despachador_eventos.publicar_evento(evento, publicar_externamente=False)
+            logger.info(f"Evento InventarioReservado publicado para producto {producto_id}")
+
+            # Notificar clientes SSE
+            sse_client_manager.notificar_todos('update', {
+                'producto_id': producto_id,
+                'cantidad_disponible': cantidad_disponible_total
+            })
+            logger.info(f"Clientes SSE notificados de actualización para producto {producto_id}")
+
 @comando.register(ReservarInventario)
 def ejecutar_reservar_inventario(comando: ReservarInventario):
     handler = ReservarInventarioHandler()
@@ -37,43 +37,38 @@ class BuscarProductosConInventarioHandler:
             if not productos:
                 return []
             
-            # Obtener inventario de todos los productos encontrados
-            inventario_por_producto = {}
-            for producto in productos:
-                producto_id = producto.get('id')
-                if producto_id:
-                    lotes_inventario = self._repositorio.obtener_por_producto_id(producto_id)
-                    inventario_por_producto[producto_id] = lotes_inventario
+            # Totales de todos los productos encontrados desde el resumen de stock (una consulta por clave
+            # primaria) y sus lotes en una sola consulta, solo para los que tienen inventario registrado
+            producto_ids = [producto.get('id') for producto in productos if producto.get('id')]
+            totales = self._repositorio.obtener_totales_por_producto(producto_ids) if producto_ids else {}
+            lotes_por_producto = self._repositorio.obtener_por_producto_ids(list(totales)) if totales else {}
             
             # Combinar datos del catálogo con inventario
             productos_con_inventario = []
             for producto in productos:
                 producto_id = producto.get('id')
-                lotes_inventario = inventario_por_producto.get(producto_id, [])
-                
-                # Calcular total disponible y reservado de todos los lotes
-                total_disponible = sum(lote.cantidad_disponible for lote in lotes_inventario)
-                total_reservado = sum(lote.cantidad_reservada for lote in lotes_inventario)
+                if producto_id not in totales:
+                    continue
+                total_disponible, total_reservado = totales[producto_id]
+                lotes_inventario = lotes_por_producto.get(producto_id, [])
                 
-                # Solo incluir productos que tengan inventario registrado
-                if lotes_inventario:
-                    producto_con_inventario = {
-                        'id': producto.get('id'),
-                        'nombre': producto.get('nombre', ''),
-                        'descripcion': producto.get('descripcion', ''),
-                        'precio': producto.get('precio', 0.0),
-                        'categoria': producto.get('categoria', ''),
-                        'cantidad_disponible': total_disponible,
-                        'cantidad_reservada': total_reservado,
-                        'lotes': [
-                            {
-                                'fecha_vencimiento': lote.fecha_vencimiento.isoformat(),
-                                'cantidad_disponible': lote.cantidad_disponible,
-                                'cantidad_reservada': lote.cantidad_reservada
-                            } for lote in lotes_inventario
-                        ]
-                    }
-                    productos_con_inventario.append(producto_con_inventario)
+                producto_con_inventario = {
+                    'id': producto.get('id'),
+                    'nombre': producto.get('nombre', ''),
+                    'descripcion': producto.get('descripcion', ''),
+                    'precio': producto.get('precio', 0.0),
+                    'categoria': producto.get('categoria', ''),
+                    'cantidad_disponible': total_disponible,
+                    'cantidad_reservada': total_reservado,
+                    'lotes': [
+                        {
+                            'fecha_vencimiento': lote.fecha_vencimiento.isoformat(),
+                            'cantidad_disponible': lote.cantidad_disponible,
+                            'cantidad_reservada': lote.cantidad_reservada
+                        } for lote in lotes_inventario
+                    ]
+                }
+                productos_con_inventario.append(producto_con_inventario)
             
             return productos_con_inventario
             
@@ -148,9 +148,9 @@ class ManejadorInventarioAsignado(ManejadorEvento):
                     repo_inventario.crear_o_actualizar(inventario_dto_actualizado)
                     logger.info(f"✅ Inventario actualizado exitosamente para producto {evento.producto_id}. Stock total: {cantidad_total} (anterior: {cantidad_anterior}, nuevo: {cantidad_nueva})")
                     
-                    # Obtener cantidad disponible total actualizada (sumando todos los lotes del producto)
-                    lotes_actualizados = repo_inventario.obtener_por_producto_id(str(evento.producto_id))
-                    cantidad_disponible_total = sum(lote.cantidad_disponible for lote in lotes_actualizados) if lotes_actualizados else cantidad_total
+                    # Obtener cantidad disponible total actualizada del resumen de stock del producto
+                    stock = repo_inventario.obtener_stock(str(evento.producto_id))
+                    cantidad_disponible_total = stock[0] if stock else cantidad_total
                     
                     # Notificar clientes SSE
                     sse_client_manager.notificar_todos('update', {
@@ -0,0 +1,51 @@
+from datetime import datetime
+import logging
+
+from seedwork.dominio.eventos import ManejadorEvento
+from infraestructura.repositorios import RepositorioEstadoPedidoSQLite
+
+logger = logging.getLogger(__name__)
+
+
+class ManejadorProyeccionEstadoPedido(ManejadorEvento):
+    """Mantiene la proyección local `estados_pedido` a partir de los eventos de pedidos."""
+
+    ESTADO_POR_EVENTO = {
+        'PedidoConfirmado': 'confirmado',
+        'PedidoEntregado': 'entregado'
+    }
+
+    def __init__(self):
+        self._repositorio = RepositorioEstadoPedidoSQLite()
+
+    def manejar(self, evento):
+        try:
+            tipo_evento = evento.__class__.__name__
+            estado = getattr(evento, 'estado', None) or self.ESTADO_POR_EVENTO.get(tipo_evento)
+            if not getattr(evento, 'pedido_id', None) or not estado:
+                return
+
+            self._repositorio.registrar(
+                pedido_id=str(evento.pedido_id),
+                estado=str(estado),
+                fecha_estado=self._obtener_fecha(evento)
+            )
+        except Exception as error:
+            logger.error(f"Error actualizando proyección de estado para pedido {getattr(evento, 'pedido_id', None)}: {error}")
+
+    def _obtener_fecha(self, evento):
+        """Fecha en que Ventas publicó el cambio (UTC); el consumidor Pub/Sub la conserva del mensaje."""
+        fecha = getattr(evento, 'fecha_actualizacion', None) or evento.fecha_evento
+        if fecha is None or isinstance(fecha, datetime):
+            return fecha
+        try:
+            return datetime.fromisoformat(str(fecha))
+        except ValueError:
+            return None
+
+
+from seedwork.dominio.eventos import despachador_eventos
+
+manejador = ManejadorProyeccionEstadoPedido()
+for tipo_evento in ('PedidoConfirmado', 'PedidoEstadoActualizado', 'PedidoEntregado'):
+    despachador_eventos.registrar_manejador(tipo_evento, manejador)
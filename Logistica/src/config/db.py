@@ -5,6 +5,23 @@ import os
 db = SQLAlchemy()
 
 def init_db(app: Flask):
+    configurar_db(app)
+    
+    # Crear tablas si no existen
+    with app.app_context():
+        migrar_esquema()
+        
+        # Ejecutar seed data
+        from config.seed import seed_data
+        seed_data(app)
+
+        # Poblar el resumen de stock por producto la primera vez (lotes existentes o recién sembrados)
+        from infraestructura.repositorios import RepositorioInventarioSQLite
+        repositorio_inventario = RepositorioInventarioSQLite()
+        if repositorio_inventario.stock_esta_vacio():
+            repositorio_inventario.reconciliar_stock()
+
+def configurar_db(app: Flask):
     if 'SQLALCHEMY_DATABASE_URI' not in app.config:
         # Configurar PostgreSQL para producción
         db_host = os.getenv('DB_HOST', 'logistica-db')
@@ -24,12 +41,13 @@ def init_db(app: Flask):
         'pool_timeout': 20         # Timeout para obtener conexión del pool
     }
     db.init_app(app)
-    
-    # Crear tablas si no existen
-    with app.app_context():
-        db.create_all()
-        
-        # Ejecutar seed data
-        from config.seed import seed_data
-        seed_data(app)
-    
\ No newline at end of file
+
+def migrar_esquema():
+    """Crea las tablas nuevas y aplica las migraciones pendientes (requiere un contexto de aplicación)."""
+    # Registrar los modelos antes de create_all para que se creen todas sus tablas
+    import infraestructura.modelos  # noqa: F401
+    db.create_all()
+
+    # Aplicar cambios de esquema sobre tablas existentes
+    from config.migraciones import ejecutar_migraciones
+    ejecutar_migraciones(db)
@@ -0,0 +1,241 @@
+"""
+Migraciones de esquema versionadas.
+
+`db.create_all()` solo crea tablas nuevas; las columnas e índices añadidos a tablas
+que ya existen en producción se aplican aquí. Cada migración tiene una versión y se
+registra en `schema_migraciones` al aplicarse, de modo que solo se ejecutan las
+pendientes y en orden. Los pasos además son idempotentes, por lo que volver a
+ejecutar una migración a medio aplicar es seguro.
+
+Se ejecutan en cada arranque después de `create_all` y también en el despliegue con
+`python src/migrar.py`, antes de que la nueva versión reciba tráfico.
+"""
+import json
+import logging
+from datetime import datetime
+
+from sqlalchemy import bindparam, func, inspect, text
+
+logger = logging.getLogger(__name__)
+
+TAMANO_LOTE_BACKFILL = 500
+
+# Clave del advisory lock de PostgreSQL que serializa réplicas migrando a la vez
+CLAVE_BLOQUEO_MIGRACIONES = 72100312
+
+# Índices secundarios de las consultas frecuentes: (tabla, nombre, columnas)
+INDICES_SECUNDARIOS = [
+    ('inventario', 'ix_inventario_bodega_id', ['bodega_id']),
+    ('ruta_entregas', 'ix_ruta_entregas_ruta_id', ['ruta_id']),
+    ('ruta_entregas', 'ix_ruta_entregas_entrega_id', ['entrega_id']),
+    ('rutas', 'ix_rutas_fecha_ruta_repartidor_id', ['fecha_ruta', 'repartidor_id']),
+    ('entregas', 'ix_entregas_fecha_entrega', ['fecha_entrega']),
+]
+
+
+def ejecutar_migraciones(db):
+    """Aplica en orden las migraciones pendientes sobre la base de datos configurada."""
+    conexion_bloqueo = _adquirir_bloqueo(db)
+    try:
+        _crear_tabla_versiones(db)
+        aplicadas = set(db.session.execute(text("SELECT version FROM schema_migraciones")).scalars())
+
+        for version, nombre, migracion in MIGRACIONES:
+            if version in aplicadas:
+                continue
+            logger.info(f"Aplicando migración {version}: {nombre}")
+            migracion(db)
+            db.session.execute(
+                text("INSERT INTO schema_migraciones (version, nombre, aplicada_en) VALUES (:version, :nombre, :fecha)"),
+                {'version': version, 'nombre': nombre, 'fecha': datetime.utcnow()}
+            )
+            db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    finally:
+        _liberar_bloqueo(conexion_bloqueo)
+
+
+def _crear_tabla_versiones(db):
+    with db.engine.begin() as conexion:
+        conexion.execute(text(
+            "CREATE TABLE IF NOT EXISTS schema_migraciones ("
+            "version INTEGER PRIMARY KEY, nombre VARCHAR(100) NOT NULL, aplicada_en TIMESTAMP NOT NULL)"
+        ))
+
+
+def _adquirir_bloqueo(db):
+    if db.engine.dialect.name != 'postgresql':
+        return None
+    conexion = db.engine.connect()
+    conexion.execute(text("SELECT pg_advisory_lock(:clave)"), {'clave': CLAVE_BLOQUEO_MIGRACIONES})
+    return conexion
+
+
+def _liberar_bloqueo(conexion):
+    if conexion is None:
+        return
+    try:
+        conexion.execute(text("SELECT pg_advisory_unlock(:clave)"), {'clave': CLAVE_BLOQUEO_MIGRACIONES})
+    finally:
+        conexion.close()
+
+
+def migrar_claves_pedido_entregas(db):
+    """Agrega las columnas indexadas pedido_id/estado_pedido a `entregas` y las rellena desde el JSON."""
+    from infraestructura.modelos import EntregaModel
+
+    inspector = inspect(db.engine)
+    if 'entregas' not in inspector.get_table_names():
+        return
+
+    columnas = {columna['name'] for columna in inspector.get_columns('entregas')}
+    with db.engine.begin() as conexion:
+        if 'pedido_id' not in columnas:
+            conexion.execute(text("ALTER TABLE entregas ADD COLUMN pedido_id VARCHAR(36)"))
+            logger.info("Columna entregas.pedido_id creada")
+        if 'estado_pedido' not in columnas:
+            conexion.execute(text("ALTER TABLE entregas ADD COLUMN estado_pedido VARCHAR(20)"))
+            logger.info("Columna entregas.estado_pedido creada")
+        conexion.execute(text("CREATE INDEX IF NOT EXISTS ix_entregas_pedido_id ON entregas (pedido_id)"))
+        conexion.execute(text("CREATE INDEX IF NOT EXISTS ix_entregas_estado_pedido ON entregas (estado_pedido)"))
+
+    rellenadas = 0
+    ultimo_id = ''
+    while True:
+        pendientes = (
+            db.session.query(EntregaModel.id, EntregaModel.pedido)
+            .filter(EntregaModel.pedido_id.is_(None), EntregaModel.pedido.isnot(None))
+            .filter(EntregaModel.id > ultimo_id)
+            .order_by(EntregaModel.id)
+            .limit(TAMANO_LOTE_BACKFILL)
+            .all()
+        )
+        if not pendientes:
+            break
+        ultimo_id = pendientes[-1][0]
+
+        cambios = []
+        for entrega_id, pedido in pendientes:
+            try:
+                pedido_data = json.loads(pedido) if isinstance(pedido, str) else pedido
+            except Exception:
+                pedido_data = None
+            pedido_id, estado = EntregaModel.extraer_claves_pedido(pedido_data)
+            if pedido_id:
+                cambios.append({'b_id': entrega_id, 'b_pedido_id': pedido_id, 'b_estado': estado})
+
+        if cambios:
+            tabla = EntregaModel.__table__
+            db.session.execute(
+                tabla.update()
+                .where(tabla.c.id == bindparam('b_id'))
+                .values(pedido_id=bindparam('b_pedido_id'), estado_pedido=bindparam('b_estado')),
+                cambios
+            )
+            db.session.commit()
+            rellenadas += len(cambios)
+
+    if rellenadas:
+        logger.info(f"Backfill de claves de pedido completado para {rellenadas} entregas")
+
+
+def crear_indices_secundarios(db):
+    """Crea los índices de las columnas filtradas en las consultas frecuentes de inventario, rutas y entregas."""
+    tablas = set(inspect(db.engine).get_table_names())
+    with db.engine.begin() as conexion:
+        for tabla, nombre, columnas in INDICES_SECUNDARIOS:
+            if tabla in tablas:
+                conexion.execute(text(f"CREATE INDEX IF NOT EXISTS {nombre} ON {tabla} ({', '.join(columnas)})"))
+
+
+def _fusionar_lotes_duplicados(db, filtro):
+    """
+    Fusiona en el lote más antiguo los lotes con la misma (producto_id, fecha_vencimiento,
+    bodega_id) que cumplen `filtro`, sumando sus cantidades; los totales por producto no cambian.
+    """
+    from infraestructura.modelos import InventarioModel
+
+    clave = (InventarioModel.producto_id, InventarioModel.fecha_vencimiento, InventarioModel.bodega_id)
+    duplicados = (
+        db.session.query(*clave)
+        .filter(filtro)
+        .group_by(*clave)
+        .having(func.count(InventarioModel.id) > 1)
+        .all()
+    )
+    if not duplicados:
+        return
+
+    claves_duplicadas = set(duplicados)
+    lotes = (
+        InventarioModel.query
+        .filter(InventarioModel.producto_id.in_({producto_id for producto_id, _, _ in duplicados}))
+        .order_by(InventarioModel.created_at, InventarioModel.id)
+        .all()
+    )
+    conservados = {}
+    for lote in lotes:
+        clave_lote = (lote.producto_id, lote.fecha_vencimiento, lote.bodega_id)
+        if clave_lote not in claves_duplicadas:
+            continue
+        conservado = conservados.setdefault(clave_lote, lote)
+        if conservado is not lote:
+            conservado.cantidad_disponible += lote.cantidad_disponible
+            conservado.cantidad_reservada += lote.cantidad_reservada
+            db.session.delete(lote)
+    db.session.commit()
+    logger.info(f"{len(duplicados)} grupos de lotes duplicados fusionados")
+
+
+def crear_clave_unica_lote(db):
+    """
+    Crea la clave única (producto_id, fecha_vencimiento, bodega_id) de `inventario`.
+
+    Los lotes duplicados existentes se fusionan antes en el más antiguo sumando sus
+    cantidades, por lo que los totales por producto no cambian.
+    """
+    from infraestructura.modelos import InventarioModel
+
+    if 'inventario' not in inspect(db.engine).get_table_names():
+        return
+
+    _fusionar_lotes_duplicados(db, InventarioModel.bodega_id.isnot(None))
+
+    with db.engine.begin() as conexion:
+        conexion.execute(text(
+            "CREATE UNIQUE INDEX IF NOT EXISTS uq_inventario_lote "
+            "ON inventario (producto_id, fecha_vencimiento, bodega_id)"
+        ))
+
+
+def crear_clave_unica_lote_sin_bodega(db):
+    """
+    Crea la clave única parcial (producto_id, fecha_vencimiento) de los lotes sin bodega.
+
+    En `uq_inventario_lote` dos NULL de bodega_id nunca chocan, así que los lotes sin
+    bodega necesitan su propio índice; los duplicados existentes se fusionan igual que
+    en `crear_clave_unica_lote`.
+    """
+    from infraestructura.modelos import InventarioModel
+
+    if 'inventario' not in inspect(db.engine).get_table_names():
+        return
+
+    _fusionar_lotes_duplicados(db, InventarioModel.bodega_id.is_(None))
+
+    with db.engine.begin() as conexion:
+        conexion.execute(text(
+            "CREATE UNIQUE INDEX IF NOT EXISTS uq_inventario_lote_sin_bodega "
+            "ON inventario (producto_id, fecha_vencimiento) WHERE bodega_id IS NULL"
+        ))
+
+
+# Migraciones en orden de aplicación: (versión, nombre, función). No reordenar ni renumerar.
+MIGRACIONES = [
+    (1, 'claves_pedido_entregas', migrar_claves_pedido_entregas),
+    (2, 'indices_secundarios', crear_indices_secundarios),
+    (3, 'clave_unica_lote', crear_clave_unica_lote),
+    (4, 'clave_unica_lote_sin_bodega', crear_clave_unica_lote_sin_bodega),
+]
@@ -1,19 +1,37 @@
 from config.db import db
+import json
 import uuid
 from datetime import datetime
+from typing import Optional
 from sqlalchemy.dialects.sqlite import JSON
-from sqlalchemy import Boolean
+from sqlalchemy import Boolean, text
 
 class EntregaModel(db.Model):
     __tablename__ = 'entregas'
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     direccion = db.Column(db.String(255), nullable=False)
-    fecha_entrega = db.Column(db.DateTime, nullable=False)
+    fecha_entrega = db.Column(db.DateTime, nullable=False, index=True)
     pedido = db.Column(JSON, nullable=True)
+    # Claves extraídas del JSON del pedido para buscar/actualizar sin decodificarlo
+    pedido_id = db.Column(db.String(36), nullable=True, index=True)
+    estado_pedido = db.Column(db.String(20), nullable=True, index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    @staticmethod
+    def extraer_claves_pedido(pedido: Optional[dict]) -> tuple[Optional[str], Optional[str]]:
+        """Retorna (pedido_id, estado) a partir del pedido almacenado como JSON."""
+        if not isinstance(pedido, dict):
+            return None, None
+        pedido_id = pedido.get('id')
+        return (str(pedido_id) if pedido_id else None), pedido.get('estado')
+
+    def asignar_pedido(self, pedido: Optional[dict]):
+        """Guarda el pedido como JSON manteniendo sincronizadas las columnas indexadas."""
+        self.pedido = json.dumps(pedido or {})
+        self.pedido_id, self.estado_pedido = self.extraer_claves_pedido(pedido)
+
     def to_dict(self):
         return {
             "id": self.id,
@@ -24,6 +42,23 @@ class EntregaModel(db.Model):
             "updated_at": self.updated_at.isoformat()
         }
 
+class EstadoPedidoModel(db.Model):
+    """Proyección local del estado de los pedidos de Ventas, alimentada por eventos."""
+    __tablename__ = 'estados_pedido'
+
+    pedido_id = db.Column(db.String(36), primary_key=True)
+    estado = db.Column(db.String(20), nullable=False, index=True)
+    fecha_estado = db.Column(db.DateTime, nullable=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            'pedido_id': self.pedido_id,
+            'estado': self.estado,
+            'fecha_estado': self.fecha_estado.isoformat() if self.fecha_estado else None,
+            'updated_at': self.updated_at.isoformat()
+        }
+
 class BodegaModel(db.Model):
     __tablename__ = 'bodegas'
     
@@ -47,8 +82,8 @@ class RutaEntregaModel(db.Model):
     __tablename__ = 'ruta_entregas'
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    ruta_id = db.Column(db.String(36), db.ForeignKey('rutas.id'), nullable=False)
-    entrega_id = db.Column(db.String(36), db.ForeignKey('entregas.id'), nullable=False)
+    ruta_id = db.Column(db.String(36), db.ForeignKey('rutas.id'), nullable=False, index=True)
+    entrega_id = db.Column(db.String(36), db.ForeignKey('entregas.id'), nullable=False, index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     entrega = db.relationship('EntregaModel', lazy='joined', overlaps="rutas,entregas,asignaciones")
@@ -64,6 +99,9 @@ class RutaEntregaModel(db.Model):
 
 class RutaModel(db.Model):
     __tablename__ = 'rutas'
+    __table_args__ = (
+        db.Index('ix_rutas_fecha_ruta_repartidor_id', 'fecha_ruta', 'repartidor_id'),
+    )
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     fecha_ruta = db.Column(db.Date, nullable=False)
@@ -103,13 +141,22 @@ class RutaModel(db.Model):
 
 class InventarioModel(db.Model):
     __tablename__ = 'inventario'
+    __table_args__ = (
+        # Un lote es único por producto, vencimiento y bodega; también sirve las búsquedas por producto_id
+        db.Index('uq_inventario_lote', 'producto_id', 'fecha_vencimiento', 'bodega_id', unique=True),
+        # Los NULL de bodega_id no chocan en el índice anterior: los lotes sin bodega tienen el suyo
+        db.Index(
+            'uq_inventario_lote_sin_bodega', 'producto_id', 'fecha_vencimiento', unique=True,
+            postgresql_where=text('bodega_id IS NULL'), sqlite_where=text('bodega_id IS NULL')
+        ),
+    )
     
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     producto_id = db.Column(db.String(36), nullable=False)
     cantidad_disponible = db.Column(db.Integer, nullable=False, default=0)
     cantidad_reservada = db.Column(db.Integer, nullable=False, default=0)
     fecha_vencimiento = db.Column(db.DateTime, nullable=False)
-    bodega_id = db.Column(db.String(36), nullable=True)
+    bodega_id = db.Column(db.String(36), nullable=True, index=True)
     pasillo = db.Column(db.String(10), nullable=True)
     estante = db.Column(db.String(10), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -129,4 +176,17 @@ class InventarioModel(db.Model):
             'ubicacion_fisica': f"Bodega #{self.bodega_id} - Pasillo {self.pasillo} - Estante {self.estante}" if self.bodega_id else None,
             'created_at': self.created_at.isoformat(),
             'updated_at': self.updated_at.isoformat()
-        }
\ No newline at end of file
+        }
+
+class StockProductoModel(db.Model):
+    """Resumen de stock por producto: la suma de las cantidades de todos sus lotes en `inventario`.
+
+    RepositorioInventarioSQLite lo actualiza en la misma transacción que cada escritura de lotes;
+    `reconciliar_stock` lo recalcula desde los lotes.
+    """
+    __tablename__ = 'stock_producto'
+
+    producto_id = db.Column(db.String(36), primary_key=True)
+    cantidad_disponible = db.Column(db.Integer, nullable=False, default=0)
+    cantidad_reservada = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -1,27 +1,143 @@
 from config.db import db
-from infraestructura.modelos import EntregaModel, InventarioModel, BodegaModel, RutaModel, RutaEntregaModel
+from sqlalchemy import bindparam, func
+from sqlalchemy.dialects.postgresql import insert as insert_postgresql
+from sqlalchemy.dialects.sqlite import insert as insert_sqlite
+from sqlalchemy.orm import joinedload, selectinload
+from infraestructura.modelos import EntregaModel, InventarioModel, BodegaModel, RutaModel, RutaEntregaModel, EstadoPedidoModel, StockProductoModel
 from aplicacion.dto import EntregaDTO, InventarioDTO, BodegaDTO, RutaDTO, RutaEntregaDTO
 from aplicacion.mapeadores import MapeadorEntregaDTOJson
 from infraestructura.servicio_pedidos import ServicioPedidos
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
+import logging
+import os
 import uuid
 import json
-from typing import Optional
+from typing import Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+class RepositorioEstadoPedidoSQLite:
+    """Proyección local del estado de los pedidos, mantenida por los consumidores de eventos.
+
+    Las lecturas se resuelven contra la tabla `estados_pedido`. Solo los pedidos sin fila,
+    o con una fila más antigua que ESTADO_PEDIDO_MAX_EDAD_SEGUNDOS (0 = nunca caduca),
+    se consultan en Ventas, y únicamente si ESTADO_PEDIDO_FALLBACK_VENTAS está activo.
+    """
+
+    ESTADOS_FINALES = {'entregado', 'cancelado'}
+
+    def __init__(self):
+        self._servicio_pedidos = ServicioPedidos()
+        self._fallback_ventas = os.getenv('ESTADO_PEDIDO_FALLBACK_VENTAS', 'true').lower() == 'true'
+        self._max_edad = timedelta(seconds=int(os.getenv('ESTADO_PEDIDO_MAX_EDAD_SEGUNDOS', '0')))
+
+    def registrar(self, pedido_id: str, estado: str, fecha_estado: Optional[datetime] = None) -> bool:
+        """Registra el estado de un pedido; ignora eventos más antiguos que el último aplicado."""
+        try:
+            estado_model = db.session.get(EstadoPedidoModel, str(pedido_id))
+
+            if estado_model and self._es_anterior(fecha_estado, estado_model.fecha_estado):
+                logger.info(f"Evento de estado desordenado para pedido {pedido_id}, se ignora '{estado}'")
+                return False
+
+            if not estado_model:
+                estado_model = EstadoPedidoModel(pedido_id=str(pedido_id))
+                db.session.add(estado_model)
+
+            estado_model.estado = estado
+            estado_model.fecha_estado = fecha_estado or datetime.utcnow()
+            estado_model.updated_at = datetime.utcnow()
+
+            db.session.commit()
+            return True
+        except Exception as e:
+            db.session.rollback()
+            raise e
+
+    def obtener_estados(self, pedido_ids: Iterable[str]) -> dict[str, str]:
+        """Obtener {pedido_id: estado}; solo las filas faltantes o caducadas van a Ventas."""
+        ids_unicos = list(dict.fromkeys(str(pedido_id) for pedido_id in pedido_ids if pedido_id))
+        if not ids_unicos:
+            return {}
+
+        filas = EstadoPedidoModel.query.filter(EstadoPedidoModel.pedido_id.in_(ids_unicos)).all()
+        estados = {fila.pedido_id: fila.estado for fila in filas}
+
+        if not self._fallback_ventas:
+            return estados
+
+        vigentes = {fila.pedido_id for fila in filas if not self._esta_caducada(fila)}
+        pendientes = [pedido_id for pedido_id in ids_unicos if pedido_id not in vigentes]
+        if not pendientes:
+            return estados
+
+        remotos = self._servicio_pedidos.obtener_estados_pedidos(pendientes)
+        if remotos:
+            self._guardar_estados_remotos(remotos)
+            estados.update(remotos)
+
+        return estados
+
+    def _esta_caducada(self, fila: EstadoPedidoModel) -> bool:
+        if not self._max_edad or fila.estado in self.ESTADOS_FINALES or not fila.updated_at:
+            return False
+        return fila.updated_at < datetime.utcnow() - self._max_edad
+
+    def _guardar_estados_remotos(self, estados: dict[str, str]) -> None:
+        try:
+            ahora = datetime.utcnow()
+            existentes = {
+                fila.pedido_id: fila
+                for fila in EstadoPedidoModel.query.filter(EstadoPedidoModel.pedido_id.in_(list(estados))).all()
+            }
+            for pedido_id, estado in estados.items():
+                estado_model = existentes.get(pedido_id)
+                if not estado_model:
+                    estado_model = EstadoPedidoModel(pedido_id=pedido_id)
+                    db.session.add(estado_model)
+                estado_model.estado = estado
+                estado_model.fecha_estado = ahora
+                estado_model.updated_at = ahora
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.warning(f"No se pudo actualizar la proyección de estados de pedido: {e}")
+
+    @staticmethod
+    def _es_anterior(fecha: Optional[datetime], referencia: Optional[datetime]) -> bool:
+        if not fecha or not referencia:
+            return False
+        try:
+            return fecha < referencia
+        except TypeError:
+            return False
+
+def _sincronizar_estados_pedidos(repositorio_estados: RepositorioEstadoPedidoSQLite, pedidos: list[Optional[dict]]) -> None:
+    """Actualiza en sitio el `estado` de cada pedido a partir de la proyección local."""
+    pedidos_con_id = [p for p in pedidos if isinstance(p, dict) and p.get('id')]
+    if not pedidos_con_id:
+        return
+
+    estados = repositorio_estados.obtener_estados(str(p['id']) for p in pedidos_con_id)
+    for pedido_data in pedidos_con_id:
+        estado_actual = estados.get(str(pedido_data['id']))
+        if estado_actual:
+            pedido_data['estado'] = estado_actual
 
 class RepositorioEntregaSQLite:
     """Repositorio para acceder a las entregas programadas (SQLite)."""
 
     def __init__(self):
-        self._servicio_pedidos = ServicioPedidos()
+        self._estados_pedido = RepositorioEstadoPedidoSQLite()
 
     def crear(self, entrega_dto: EntregaDTO) -> EntregaDTO:
         """Crear una nueva entrega en SQLite con el pedido almacenado como JSON."""
         entrega_model = EntregaModel(
             id=str(entrega_dto.id),
             direccion=entrega_dto.direccion,
-            fecha_entrega=entrega_dto.fecha_entrega,
-            pedido=json.dumps(entrega_dto.pedido or {})  # ✅ guardamos JSON
+            fecha_entrega=entrega_dto.fecha_entrega
         )
+        entrega_model.asignar_pedido(entrega_dto.pedido)  # ✅ guardamos JSON + columnas indexadas
 
         db.session.add(entrega_model)
         db.session.commit()
@@ -30,32 +146,26 @@ class RepositorioEntregaSQLite:
     def obtener_todos(self, con_ruta: Optional[bool] = None) -> list[EntregaDTO]:
         query = EntregaModel.query.order_by(EntregaModel.fecha_entrega.desc())
         query = self._aplicar_filtro_con_ruta(query, con_ruta)
-        entregas_model = query.all()
-        entregas_dto = []
+        return self._mapear_modelos_a_dto(query.all())
 
-        for entrega_model in entregas_model:
-            pedido_data = None
-            if entrega_model.pedido:
-                try:
-                    pedido_data = json.loads(entrega_model.pedido)
-                except Exception:
-                    pedido_data = None
-
-            pedido_data = self._sincronizar_estado_pedido(pedido_data)
+    def obtener_por_ids(self, entrega_ids: Iterable[str]) -> list[EntregaDTO]:
+        """Obtener en una sola consulta las entregas cuyos IDs se indican; los inexistentes se omiten."""
+        entrega_ids = list(dict.fromkeys(str(e) for e in entrega_ids if e))
+        if not entrega_ids:
+            return []
 
-            entregas_dto.append(EntregaDTO(
-                id=uuid.UUID(entrega_model.id),
-                direccion=entrega_model.direccion,
-                fecha_entrega=entrega_model.fecha_entrega,
-                pedido=pedido_data
-            ))
+        entregas_model = EntregaModel.query.filter(EntregaModel.id.in_(entrega_ids)).all()
+        return self._mapear_modelos_a_dto(entregas_model)
 
-        return entregas_dto
+    def obtener_por_pedido_id(self, pedido_id: str) -> list[EntregaDTO]:
+        """Obtener las entregas asociadas a un pedido usando la columna indexada pedido_id."""
+        entregas_model = EntregaModel.query.filter_by(pedido_id=str(pedido_id)).all()
+        return self._mapear_modelos_a_dto(entregas_model)
 
     def actualizar_estado_pedido(self, pedido_id: str, nuevo_estado: str, fecha_actualizacion: Optional[datetime] = None) -> int:
         """Actualiza el estado del pedido almacenado en las entregas relacionadas."""
         try:
-            entregas = EntregaModel.query.filter(EntregaModel.pedido.isnot(None)).all()
+            entregas = EntregaModel.query.filter_by(pedido_id=str(pedido_id)).all()
             actualizadas = 0
 
             for entrega in entregas:
@@ -64,17 +174,14 @@ class RepositorioEntregaSQLite:
                 except Exception:
                     pedido_data = None
 
-                if not pedido_data:
-                    continue
-
-                if str(pedido_data.get('id')) != str(pedido_id):
+                if not isinstance(pedido_data, dict):
                     continue
 
                 pedido_data['estado'] = nuevo_estado
                 if fecha_actualizacion:
                     pedido_data['fecha_actualizacion_estado'] = fecha_actualizacion.isoformat()
 
-                entrega.pedido = json.dumps(pedido_data)
+                entrega.asignar_pedido(pedido_data)
                 actualizadas += 1
 
             if actualizadas:
@@ -100,23 +207,7 @@ class RepositorioEntregaSQLite:
         ).order_by(EntregaModel.fecha_entrega.desc())
 
         query = self._aplicar_filtro_con_ruta(query, con_ruta)
-        entregas_model = query.all()
-
-        entregas_dto = []
-        for entrega_model in entregas_model:
-            try:
-                pedido_data = json.loads(entrega_model.pedido) if entrega_model.pedido else None
-            except Exception:
-                pedido_data = None
-
-            entregas_dto.append(EntregaDTO(
-                id=uuid.UUID(entrega_model.id),
-                direccion=entrega_model.direccion,
-                fecha_entrega=entrega_model.fecha_entrega,
-                pedido=self._sincronizar_estado_pedido(pedido_data)
-            ))
-
-        return entregas_dto
+        return self._mapear_modelos_a_dto(query.all())
 
     def _aplicar_filtro_con_ruta(self, query, con_ruta: Optional[bool]):
         if con_ruta is True:
@@ -125,20 +216,25 @@ class RepositorioEntregaSQLite:
             return query.filter(~EntregaModel.rutas.any())
         return query
 
-    def _sincronizar_estado_pedido(self, pedido_data: Optional[dict]) -> Optional[dict]:
-        if not pedido_data or not isinstance(pedido_data, dict):
-            return pedido_data
+    def _mapear_modelos_a_dto(self, entregas_model: list[EntregaModel]) -> list[EntregaDTO]:
+        pedidos = []
+        for entrega_model in entregas_model:
+            try:
+                pedidos.append(json.loads(entrega_model.pedido) if entrega_model.pedido else None)
+            except Exception:
+                pedidos.append(None)
 
-        pedido_id = pedido_data.get('id')
-        if not pedido_id:
-            return pedido_data
+        _sincronizar_estados_pedidos(self._estados_pedido, pedidos)
 
-        pedido_actual = self._servicio_pedidos.obtener_pedido_por_id(pedido_id)
-        if pedido_actual and isinstance(pedido_actual, dict):
-            estado_actual = pedido_actual.get('estado')
-            if estado_actual:
-                pedido_data['estado'] = estado_actual
-        return pedido_data
+        return [
+            EntregaDTO(
+                id=uuid.UUID(entrega_model.id),
+                direccion=entrega_model.direccion,
+                fecha_entrega=entrega_model.fecha_entrega,
+                pedido=pedido_data
+            )
+            for entrega_model, pedido_data in zip(entregas_model, pedidos)
+        ]
 
 class RepositorioBodegaSQLite:
     """Repositorio para acceder a las bodegas (SQLite)."""
@@ -181,7 +277,12 @@ class RepositorioBodegaSQLite:
             .all()
 
 class RepositorioInventarioSQLite:
-    """Repositorio para acceder al inventario (SQLite)."""
+    """
+    Repositorio para acceder al inventario (SQLite).
+
+    Cada escritura de lotes actualiza en la misma transacción el resumen `stock_producto`, de
+    modo que los totales por producto se leen por clave primaria sin sumar los lotes.
+    """
 
     def obtener_por_producto_id(self, producto_id: str) -> list[InventarioDTO]:
         """Obtener todos los lotes de inventario de un producto específico."""
@@ -190,21 +291,258 @@ class RepositorioInventarioSQLite:
         if not inventarios_model:
             return []
         
-        inventarios_dto = []
+        return [self._mapear_modelo_a_dto(inventario_model) for inventario_model in inventarios_model]
+
+    def obtener_por_producto_ids(self, producto_ids: Iterable[str]) -> dict[str, list[InventarioDTO]]:
+        """Obtener en una sola consulta los lotes de varios productos, agrupados por producto_id."""
+        producto_ids = list(dict.fromkeys(str(p) for p in producto_ids if p))
+        if not producto_ids:
+            return {}
+
+        inventarios_model = InventarioModel.query.filter(InventarioModel.producto_id.in_(producto_ids)).all()
+
+        lotes_por_producto: dict[str, list[InventarioDTO]] = {}
         for inventario_model in inventarios_model:
-            inventarios_dto.append(InventarioDTO(
-                producto_id=inventario_model.producto_id,
-                cantidad_disponible=inventario_model.cantidad_disponible,
-                cantidad_reservada=inventario_model.cantidad_reservada,
-                fecha_vencimiento=inventario_model.fecha_vencimiento,
-                requiere_cadena_frio=inventario_model.requiere_cadena_frio, 
-                bodega_id=inventario_model.bodega_id,
-                pasillo=inventario_model.pasillo,
-                estante=inventario_model.estante,
-                id=inventario_model.id
-            ))
-        
-        return inventarios_dto
+            lotes_por_producto.setdefault(inventario_model.producto_id, []).append(
+                self._mapear_modelo_a_dto(inventario_model)
+            )
+        return lotes_por_producto
+
+    def bloquear_lotes_para_reserva(self, producto_ids: Iterable[str]) -> dict[str, list[InventarioDTO]]:
+        """
+        Bloquea en una consulta los lotes vigentes con stock disponible de varios productos, con
+        SELECT ... FOR UPDATE SKIP LOCKED, y los agrupa por producto ordenados por fecha de
+        vencimiento (FEFO).
+
+        Los lotes que otra transacción ya tiene bloqueados se omiten en lugar de esperarlos. Los
+        bloqueos se mantienen hasta `aplicar_reservas` o `revertir`.
+        """
+        return self._bloquear_lotes(
+            producto_ids,
+            [InventarioModel.cantidad_disponible > 0, InventarioModel.fecha_vencimiento >= datetime.now()],
+            skip_locked=True
+        )
+
+    def bloquear_lotes_para_descuento(self, producto_ids: Iterable[str]) -> dict[str, list[InventarioDTO]]:
+        """
+        Bloquea en una consulta los lotes con cantidad reservada de varios productos, con
+        SELECT ... FOR UPDATE, agrupados por producto y ordenados por fecha de vencimiento.
+
+        A diferencia de la reserva, aquí se espera a los lotes bloqueados: la cantidad reservada
+        ya pertenece a pedidos y omitirla daría un faltante que no existe. Incluye lotes vencidos.
+        """
+        return self._bloquear_lotes(producto_ids, [InventarioModel.cantidad_reservada > 0], skip_locked=False)
+
+    def _bloquear_lotes(self, producto_ids: Iterable[str], condiciones: list, skip_locked: bool) -> dict[str, list[InventarioDTO]]:
+        producto_ids = list(dict.fromkeys(str(p) for p in producto_ids if p))
+        if not producto_ids:
+            return {}
+
+        inventarios_model = (
+            InventarioModel.query
+            .filter(InventarioModel.producto_id.in_(producto_ids), *condiciones)
+            .order_by(InventarioModel.fecha_vencimiento, InventarioModel.id)
+            .with_for_update(skip_locked=skip_locked)
+            .all()
+        )
+
+        lotes_por_producto: dict[str, list[InventarioDTO]] = {}
+        for inventario_model in inventarios_model:
+            lotes_por_producto.setdefault(inventario_model.producto_id, []).append(
+                self._mapear_modelo_a_dto(inventario_model)
+            )
+        return lotes_por_producto
+
+    def productos_con_inventario(self, producto_ids: Iterable[str]) -> set[str]:
+        """Retorna cuáles de los productos tienen al menos un lote de inventario."""
+        producto_ids = list(dict.fromkeys(str(p) for p in producto_ids if p))
+        if not producto_ids:
+            return set()
+
+        filas = (
+            db.session.query(InventarioModel.producto_id)
+            .filter(InventarioModel.producto_id.in_(producto_ids))
+            .distinct()
+            .all()
+        )
+        return {producto_id for producto_id, in filas}
+
+    def aplicar_reservas(self, asignaciones: list[dict]) -> None:
+        """
+        Mueve de disponible a reservada la cantidad de cada asignación {'lote_id', 'producto_id',
+        'cantidad'} con un solo UPDATE por lotes y confirma la transacción, liberando los bloqueos.
+        """
+        tabla = InventarioModel.__table__
+        self._actualizar_lotes(asignaciones, {
+            'cantidad_disponible': tabla.c.cantidad_disponible - bindparam('b_cantidad'),
+            'cantidad_reservada': tabla.c.cantidad_reservada + bindparam('b_cantidad')
+        }, lambda cantidad: (-cantidad, cantidad))
+
+    def aplicar_descuentos(self, asignaciones: list[dict]) -> None:
+        """
+        Descuenta de la cantidad reservada de cada asignación {'lote_id', 'producto_id', 'cantidad'}
+        con un solo UPDATE por lotes y confirma la transacción, liberando los bloqueos.
+        """
+        tabla = InventarioModel.__table__
+        self._actualizar_lotes(asignaciones, {
+            'cantidad_reservada': tabla.c.cantidad_reservada - bindparam('b_cantidad')
+        }, lambda cantidad: (0, -cantidad))
+
+    def _actualizar_lotes(self, asignaciones: list[dict], valores: dict, delta_stock) -> None:
+        try:
+            if asignaciones:
+                tabla = InventarioModel.__table__
+                db.session.execute(
+                    tabla.update()
+                    .where(tabla.c.id == bindparam('b_id'))
+                    .values(updated_at=datetime.utcnow(), **valores),
+                    [{'b_id': a['lote_id'], 'b_cantidad': a['cantidad']} for a in asignaciones]
+                )
+                deltas = {}
+                for a in asignaciones:
+                    disponible, reservada = deltas.get(a['producto_id'], (0, 0))
+                    delta_disponible, delta_reservada = delta_stock(a['cantidad'])
+                    deltas[a['producto_id']] = (disponible + delta_disponible, reservada + delta_reservada)
+                self._sumar_stock(deltas)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+    def revertir(self) -> None:
+        """Descarta la transacción en curso y libera los lotes bloqueados."""
+        db.session.rollback()
+
+    def obtener_totales_por_producto(self, producto_ids: Iterable[str]) -> dict[str, tuple[int, int]]:
+        """Obtener {producto_id: (cantidad_disponible, cantidad_reservada)} del resumen de stock, por clave primaria."""
+        producto_ids = list(dict.fromkeys(str(p) for p in producto_ids if p))
+        if not producto_ids:
+            return {}
+
+        filas = (
+            db.session.query(
+                StockProductoModel.producto_id,
+                StockProductoModel.cantidad_disponible,
+                StockProductoModel.cantidad_reservada
+            )
+            .filter(StockProductoModel.producto_id.in_(producto_ids))
+            .all()
+        )
+        return {producto_id: (disponible, reservada) for producto_id, disponible, reservada in filas}
+
+    def obtener_stock(self, producto_id: str) -> Optional[tuple[int, int]]:
+        """Obtener (cantidad_disponible, cantidad_reservada) de un producto, o None si no tiene lotes."""
+        stock = db.session.get(StockProductoModel, str(producto_id))
+        if not stock:
+            return None
+        return stock.cantidad_disponible, stock.cantidad_reservada
+
+    def obtener_stock_todos(self) -> dict[str, tuple[int, int]]:
+        """Obtener {producto_id: (cantidad_disponible, cantidad_reservada)} de todos los productos."""
+        filas = db.session.query(
+            StockProductoModel.producto_id,
+            StockProductoModel.cantidad_disponible,
+            StockProductoModel.cantidad_reservada
+        ).all()
+        return {producto_id: (disponible, reservada) for producto_id, disponible, reservada in filas}
+
+    def stock_esta_vacio(self) -> bool:
+        return db.session.query(StockProductoModel.producto_id).first() is None
+
+    def reconciliar_stock(self, producto_ids: Optional[Iterable[str]] = None) -> int:
+        """
+        Recalcula el resumen `stock_producto` desde los lotes (de todos los productos o de los
+        indicados) y corrige las filas que difieren. Retorna cuántos productos se corrigieron.
+        """
+        consulta_lotes = db.session.query(
+            InventarioModel.producto_id,
+            func.sum(InventarioModel.cantidad_disponible),
+            func.sum(InventarioModel.cantidad_reservada)
+        ).group_by(InventarioModel.producto_id)
+        consulta_stock = db.session.query(
+            StockProductoModel.producto_id,
+            StockProductoModel.cantidad_disponible,
+            StockProductoModel.cantidad_reservada
+        )
+        if producto_ids is not None:
+            producto_ids = list(dict.fromkeys(str(p) for p in producto_ids if p))
+            consulta_lotes = consulta_lotes.filter(InventarioModel.producto_id.in_(producto_ids))
+            consulta_stock = consulta_stock.filter(StockProductoModel.producto_id.in_(producto_ids))
+
+        try:
+            esperado = {p: (int(d or 0), int(r or 0)) for p, d, r in consulta_lotes.all()}
+            actual = {p: (d, r) for p, d, r in consulta_stock.all()}
+
+            tabla = StockProductoModel.__table__
+            sobrantes = [p for p in actual if p not in esperado]
+            nuevos = [p for p in esperado if p not in actual]
+            distintos = [p for p in esperado if p in actual and actual[p] != esperado[p]]
+            ahora = datetime.utcnow()
+
+            if sobrantes:
+                db.session.execute(tabla.delete().where(tabla.c.producto_id.in_(sobrantes)))
+            if nuevos:
+                db.session.execute(tabla.insert(), [
+                    {'producto_id': p, 'cantidad_disponible': esperado[p][0],
+                     'cantidad_reservada': esperado[p][1], 'updated_at': ahora}
+                    for p in nuevos
+                ])
+            if distintos:
+                db.session.execute(
+                    tabla.update()
+                    .where(tabla.c.producto_id == bindparam('b_producto_id'))
+                    .values(cantidad_disponible=bindparam('b_disponible'),
+                            cantidad_reservada=bindparam('b_reservada'), updated_at=ahora),
+                    [{'b_producto_id': p, 'b_disponible': esperado[p][0], 'b_reservada': esperado[p][1]}
+                     for p in distintos]
+                )
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        corregidos = len(sobrantes) + len(nuevos) + len(distintos)
+        if corregidos:
+            logger.info(f"Resumen de stock reconciliado: {corregidos} productos corregidos")
+        return corregidos
+
+    def _sumar_stock(self, deltas: dict[str, tuple[int, int]]) -> None:
+        """
+        Suma {producto_id: (delta_disponible, delta_reservada)} al resumen de stock dentro de la
+        transacción en curso, creando la fila del producto si aún no existe (INSERT ... ON CONFLICT).
+        """
+        deltas = {p: d for p, d in deltas.items() if d != (0, 0)}
+        if not deltas:
+            return
+
+        insert = insert_postgresql if db.session.get_bind().dialect.name == 'postgresql' else insert_sqlite
+        sentencia = insert(StockProductoModel.__table__)
+        sentencia = sentencia.on_conflict_do_update(
+            index_elements=['producto_id'],
+            set_={
+                'cantidad_disponible': StockProductoModel.__table__.c.cantidad_disponible + sentencia.excluded.cantidad_disponible,
+                'cantidad_reservada': StockProductoModel.__table__.c.cantidad_reservada + sentencia.excluded.cantidad_reservada,
+                'updated_at': sentencia.excluded.updated_at
+            }
+        )
+        ahora = datetime.utcnow()
+        db.session.execute(sentencia, [
+            {'producto_id': p, 'cantidad_disponible': d, 'cantidad_reservada': r, 'updated_at': ahora}
+            for p, (d, r) in deltas.items()
+        ])
+
+    def _mapear_modelo_a_dto(self, inventario_model: InventarioModel) -> InventarioDTO:
+        return InventarioDTO(
+            producto_id=inventario_model.producto_id,
+            cantidad_disponible=inventario_model.cantidad_disponible,
+            cantidad_reservada=inventario_model.cantidad_reservada,
+            fecha_vencimiento=inventario_model.fecha_vencimiento,
+            requiere_cadena_frio=inventario_model.requiere_cadena_frio, 
+            bodega_id=inventario_model.bodega_id,
+            pasillo=inventario_model.pasillo,
+            estante=inventario_model.estante,
+            id=inventario_model.id
+        )
 
     def crear(self, inventario_dto: InventarioDTO) -> InventarioDTO:
         """Crear un nuevo lote de inventario."""
@@ -220,6 +558,7 @@ class RepositorioInventarioSQLite:
             requiere_cadena_frio=inventario_dto.requiere_cadena_frio
         )
         db.session.add(inventario_model)
+        self._sumar_stock({inventario_dto.producto_id: (inventario_dto.cantidad_disponible, inventario_dto.cantidad_reservada)})
         db.session.commit()
         return inventario_dto
 
@@ -236,17 +575,26 @@ class RepositorioInventarioSQLite:
             estante=inventario_dto.estante if hasattr(inventario_dto, 'estante') else None
         )
         db.session.add(inventario_model)
+        self._sumar_stock({inventario_dto.producto_id: (inventario_dto.cantidad_disponible, inventario_dto.cantidad_reservada)})
         db.session.commit()
         return inventario_dto
 
     def actualizar_cantidades_lote(self, lote_id: str, cantidad_disponible: int, cantidad_reservada: int) -> bool:
-        """Actualizar cantidades de un lote específico."""
+        """Actualizar cantidades de un lote específico.
+
+        El lote se lee con SELECT ... FOR UPDATE: el delta del resumen de stock se calcula sobre
+        cantidades que ninguna reserva o descuento concurrente puede cambiar antes del commit.
+        """
         try:
-            inventario_model = InventarioModel.query.get(lote_id)
+            inventario_model = db.session.get(InventarioModel, lote_id, with_for_update=True, populate_existing=True)
             
             if not inventario_model:
                 return False
             
+            self._sumar_stock({inventario_model.producto_id: (
+                cantidad_disponible - inventario_model.cantidad_disponible,
+                cantidad_reservada - inventario_model.cantidad_reservada
+            )})
             inventario_model.cantidad_disponible = cantidad_disponible
             inventario_model.cantidad_reservada = cantidad_reservada
             
@@ -257,28 +605,42 @@ class RepositorioInventarioSQLite:
             return False
 
     def crear_o_actualizar(self, inventario_dto: InventarioDTO) -> InventarioDTO:
-        """Crear o actualizar un lote de inventario basado en producto_id y fecha_vencimiento, o por ID si está disponible."""
+        """
+        Crear o actualizar un lote de inventario por ID si está disponible, o por su clave única
+        (producto_id, fecha_vencimiento, bodega_id). Un lote existente no cambia de bodega.
+
+        El lote existente se bloquea (FOR UPDATE) antes de calcular el delta del resumen de stock,
+        igual que en `actualizar_cantidades_lote`.
+        """
         try:
             inventario_model = None
             
             # Si el DTO tiene un ID, intentar buscar por ID primero
             if inventario_dto.id:
-                inventario_model = InventarioModel.query.get(inventario_dto.id)
+                inventario_model = db.session.get(
+                    InventarioModel, inventario_dto.id, with_for_update=True, populate_existing=True
+                )
             
-            # Si no se encontró por ID, buscar por producto_id y fecha_vencimiento
+            # Si no se encontró por ID, buscar por la clave del lote (uq_inventario_lote)
             if not inventario_model:
                 inventario_model = InventarioModel.query.filter_by(
                     producto_id=inventario_dto.producto_id,
-                    fecha_vencimiento=inventario_dto.fecha_vencimiento
-                ).first()
+                    fecha_vencimiento=inventario_dto.fecha_vencimiento,
+                    bodega_id=inventario_dto.bodega_id
+                ).populate_existing().with_for_update().first()
 
             if inventario_model:
+                self._sumar_stock({inventario_model.producto_id: (
+                    inventario_dto.cantidad_disponible - inventario_model.cantidad_disponible,
+                    inventario_dto.cantidad_reservada - inventario_model.cantidad_reservada
+                )})
                 # Actualizar el lote existente con todos los campos
                 inventario_model.cantidad_disponible = inventario_dto.cantidad_disponible
                 inventario_model.cantidad_reservada = inventario_dto.cantidad_reservada
                 inventario_model.requiere_cadena_frio = inventario_dto.requiere_cadena_frio
-                # Actualizar ubicación si está disponible
-                if inventario_dto.bodega_id is not None:
+                # Actualizar ubicación si está disponible; la bodega es parte de la clave del lote,
+                # así que solo se asigna a lotes que aún no tienen una
+                if inventario_dto.bodega_id is not None and inventario_model.bodega_id is None:
                     inventario_model.bodega_id = inventario_dto.bodega_id
                 if inventario_dto.pasillo is not None:
                     inventario_model.pasillo = inventario_dto.pasillo
@@ -298,6 +660,7 @@ class RepositorioInventarioSQLite:
                     requiere_cadena_frio=inventario_dto.requiere_cadena_frio
                 )
                 db.session.add(inventario_model)
+                self._sumar_stock({inventario_dto.producto_id: (inventario_dto.cantidad_disponible, inventario_dto.cantidad_reservada)})
             
             db.session.commit()
             return inventario_dto
@@ -331,6 +694,8 @@ class RepositorioInventarioSQLite:
             
             for inventario_model in inventarios_model:
                 db.session.delete(inventario_model)
+            tabla = StockProductoModel.__table__
+            db.session.execute(tabla.delete().where(tabla.c.producto_id == producto_id))
             
             db.session.commit()
             return True
@@ -342,7 +707,7 @@ class RepositorioRutaSQLite:
     """Repositorio para acceder a las rutas (SQLite)."""
     def __init__(self):
         self._mapeador_entrega = MapeadorEntregaDTOJson()
-        self._servicio_pedidos = ServicioPedidos()
+        self._estados_pedido = RepositorioEstadoPedidoSQLite()
 
     def crear(self, ruta_dto: RutaDTO) -> RutaDTO:
         ruta_id = getattr(ruta_dto, 'id', None)
@@ -375,18 +740,18 @@ class RepositorioRutaSQLite:
         return self.obtener_por_id(ruta_model.id)
 
     def obtener_por_id(self, ruta_id: str) -> Optional[RutaDTO]:
-        ruta_model = RutaModel.query.get(ruta_id)
+        ruta_model = self._query_rutas().filter(RutaModel.id == ruta_id).first()
         if not ruta_model:
             return None
 
-        return self._mapear_modelo_a_dto(ruta_model)
+        return self._mapear_modelos_a_dto([ruta_model])[0]
 
     def obtener_por_fecha_y_repartidor(
         self,
         fecha: Optional[date] = None,
         repartidor_id: Optional[str] = None
     ) -> list[RutaDTO]:
-        query = RutaModel.query
+        query = self._query_rutas()
 
         if fecha:
             query = query.filter(RutaModel.fecha_ruta == fecha)
@@ -395,58 +760,84 @@ class RepositorioRutaSQLite:
             query = query.filter(RutaModel.repartidor_id == repartidor_id)
 
         rutas = query.order_by(RutaModel.fecha_ruta.desc()).all()
-        return [self._mapear_modelo_a_dto(ruta) for ruta in rutas]
+        return self._mapear_modelos_a_dto(rutas)
 
     def obtener_entregas_asignadas(self, ruta_id: str) -> list[RutaEntregaDTO]:
-        asignaciones = RutaEntregaModel.query.filter_by(ruta_id=ruta_id).all()
-        entregas_dto = []
+        asignaciones = (
+            RutaEntregaModel.query
+            .options(joinedload(RutaEntregaModel.entrega))
+            .filter_by(ruta_id=ruta_id)
+            .all()
+        )
+        entregas = [asignacion.entrega for asignacion in asignaciones]
+        pedidos = [self._normalizar_pedido(entrega) for entrega in entregas]
 
-        for asignacion in asignaciones:
-            entrega = asignacion.entrega
-            pedido = None
+        _sincronizar_estados_pedidos(self._estados_pedido, pedidos)
 
-            pedido = self._normalizar_pedido(entrega)
+        return self._mapear_entregas_a_dto(entregas, pedidos)
 
-            entregas_dto.append(
-                RutaEntregaDTO(
-                    entrega_id=entrega.id,
-                    direccion=entrega.direccion,
-                    fecha_entrega=entrega.fecha_entrega,
-                    pedido=pedido
-                )
-            )
+    def _query_rutas(self):
+        """Consulta de rutas que carga asignaciones y entregas en un número fijo de consultas."""
+        return RutaModel.query.options(
+            selectinload(RutaModel.asignaciones).joinedload(RutaEntregaModel.entrega)
+        )
 
-        return entregas_dto
-
-    def _sincronizar_estado_pedido(self, pedido_data: Optional[dict]) -> Optional[dict]:
-        if not pedido_data or not isinstance(pedido_data, dict):
-            return pedido_data
-
-        pedido_id = pedido_data.get('id')
-        if not pedido_id:
-            return pedido_data
-
-        pedido_actual = self._servicio_pedidos.obtener_pedido_por_id(pedido_id)
-        if pedido_actual and isinstance(pedido_actual, dict):
-            estado_actual = pedido_actual.get('estado')
-            if estado_actual:
-                pedido_data['estado'] = estado_actual
-        return pedido_data
-
-    def _mapear_modelo_a_dto(self, ruta_model: RutaModel) -> RutaDTO:
-        entregas = self.obtener_entregas_asignadas(ruta_model.id)
-        return RutaDTO(
-            id=ruta_model.id,
-            fecha_ruta=ruta_model.fecha_ruta,
-            repartidor_id=ruta_model.repartidor_id,
-            bodega_id=ruta_model.bodega_id,
-            estado=ruta_model.estado,
-            entregas=entregas
+    def _mapear_modelos_a_dto(self, rutas_model: list[RutaModel]) -> list[RutaDTO]:
+        """Mapear rutas ya cargadas, resolviendo los estados de todos sus pedidos en un solo lote."""
+        entregas_por_ruta = [
+            [asignacion.entrega for asignacion in ruta_model.asignaciones]
+            for ruta_model in rutas_model
+        ]
+        pedidos_por_ruta = [
+            [self._normalizar_pedido(entrega) for entrega in entregas]
+            for entregas in entregas_por_ruta
+        ]
+
+        _sincronizar_estados_pedidos(
+            self._estados_pedido,
+            [pedido for pedidos in pedidos_por_ruta for pedido in pedidos]
         )
 
+        return [
+            RutaDTO(
+                id=ruta_model.id,
+                fecha_ruta=ruta_model.fecha_ruta,
+                repartidor_id=ruta_model.repartidor_id,
+                bodega_id=ruta_model.bodega_id,
+                estado=ruta_model.estado,
+                entregas=self._mapear_entregas_a_dto(entregas, pedidos)
+            )
+            for ruta_model, entregas, pedidos in zip(rutas_model, entregas_por_ruta, pedidos_por_ruta)
+        ]
+
+    def _mapear_entregas_a_dto(self, entregas: list[EntregaModel], pedidos: list[Optional[dict]]) -> list[RutaEntregaDTO]:
+        return [
+            RutaEntregaDTO(
+                entrega_id=entrega.id,
+                direccion=entrega.direccion,
+                fecha_entrega=entrega.fecha_entrega,
+                pedido=pedido
+            )
+            for entrega, pedido in zip(entregas, pedidos)
+        ]
+
     def entrega_ya_asignada(self, entrega_id: str) -> bool:
         return RutaEntregaModel.query.filter_by(entrega_id=entrega_id).first() is not None
 
+    def entregas_ya_asignadas(self, entrega_ids: Iterable[str]) -> set[str]:
+        """Devuelve, con una sola consulta a ruta_entregas, cuáles de las entregas ya pertenecen a una ruta."""
+        entrega_ids = list(dict.fromkeys(str(e) for e in entrega_ids if e))
+        if not entrega_ids:
+            return set()
+
+        filas = (
+            db.session.query(RutaEntregaModel.entrega_id)
+            .filter(RutaEntregaModel.entrega_id.in_(entrega_ids))
+            .distinct()
+            .all()
+        )
+        return {entrega_id for (entrega_id,) in filas}
+
     def _normalizar_pedido(self, entrega: EntregaModel) -> Optional[dict]:
         if not entrega.pedido:
             return None
@@ -466,14 +857,4 @@ class RepositorioRutaSQLite:
             pedido=pedido_data
         )
         externo = self._mapeador_entrega.dto_a_externo(entrega_dto)
-        pedido_normalizado = externo.get('pedido')
-
-        pedido_id = pedido_normalizado.get('id') if isinstance(pedido_normalizado, dict) else None
-        if pedido_id:
-            pedido_actual = self._servicio_pedidos.obtener_pedido_por_id(pedido_id)
-            if pedido_actual:
-                estado_actual = pedido_actual.get('estado')
-                if estado_actual:
-                    pedido_normalizado['estado'] = estado_actual
-
-        return pedido_normalizado
\ No newline at end of file
+        return externo.get('pedido')
@@ -2,20 +2,24 @@ import logging
 import os
 import random
 import uuid
-from typing import Optional, Dict, Any
-import requests
+from typing import Optional, Dict, Any, Iterable
+from seedwork.infraestructura.cliente_http import obtener_cliente_http
 
 logger = logging.getLogger(__name__)
 
+# Cantidad de pedidos consultados por llamada a /pedidos/estados en Ventas
+TAMANO_LOTE_ESTADOS = 200
+
 
 class ServicioPedidos:
     def __init__(self):
         self.base_url = os.getenv('VENTAS_SERVICE_URL', 'http://ventas:5002/ventas/api')
+        self._http = obtener_cliente_http()
 
     def obtener_pedido_por_id(self, pedido_id: str) -> Optional[Dict[str, Any]]:
         try:
             url = f"{self.base_url}/pedidos/{pedido_id}"
-            response = requests.get(url, timeout=5)
+            response = self._http.get(url)
 
             if response.status_code == 200:
                 return response.json()
@@ -29,6 +33,30 @@ class ServicioPedidos:
             logger.error(f"Error consultando Ventas para pedido {pedido_id}: {error}")
             return None
 
+    def obtener_estados_pedidos(self, pedido_ids: Iterable[str]) -> Dict[str, str]:
+        """Obtener el estado actual de varios pedidos con una llamada a Ventas por lote.
+
+        Los pedidos que Ventas no reconoce, o cuyo lote falla, no aparecen en el resultado.
+        """
+        ids_unicos = list(dict.fromkeys(str(pedido_id) for pedido_id in pedido_ids if pedido_id))
+        estados: Dict[str, str] = {}
+        url = f"{self.base_url}/pedidos/estados"
+
+        for inicio in range(0, len(ids_unicos), TAMANO_LOTE_ESTADOS):
+            lote = ids_unicos[inicio:inicio + TAMANO_LOTE_ESTADOS]
+            try:
+                response = self._http.post(url, json={'pedido_ids': lote})
+
+                if response.status_code == 200:
+                    estados.update(response.json().get('estados') or {})
+                    continue
+
+                logger.error(f"Error obteniendo estados de {len(lote)} pedidos en Ventas: {response.status_code}")
+            except Exception as error:
+                logger.error(f"Error consultando Ventas para estados de {len(lote)} pedidos: {error}")
+
+        return estados
+
 
 def obtener_pedido_random():
     """Genera un pedido simulado (mock) para las pruebas locales."""
@@ -1,19 +1,24 @@
-import requests
 import os
 import logging
 import time
+from seedwork.infraestructura.cliente_http import obtener_cliente_http, TIMEOUT_CONEXION
 
 logger = logging.getLogger(__name__)
 
+# El listado completo trae miles de productos por página: conserva el timeout de lectura de 30 s
+# que tenía antes del cliente compartido, cuyo valor por defecto (10 s) es para lecturas puntuales
+TIMEOUT_LISTADO = (TIMEOUT_CONEXION, float(os.getenv('PRODUCTOS_TIMEOUT_LECTURA_LISTADO', '30')))
+
 class ServicioProductos:
     def __init__(self):
         self.base_url = os.getenv('PRODUCTOS_SERVICE_URL', 'http://localhost:5000/productos/api')
+        self._http = obtener_cliente_http()
     
     def obtener_producto_por_id(self, producto_id: str) -> dict:
         """Obtener producto por ID desde el servicio de Productos"""
         try:
             url = f"{self.base_url}/productos/{producto_id}"
-            response = requests.get(url, timeout=30)
+            response = self._http.get(url)
             
             if response.status_code == 200:
                 return response.json()
@@ -35,7 +40,7 @@ class ServicioProductos:
                 'q': termino,
                 'limite': limite
             }
-            response = requests.get(url, params=params, timeout=30)
+            response = self._http.get(url, params=params)
             
             if response.status_code == 200:
                 return response.json()
@@ -61,7 +66,7 @@ class ServicioProductos:
             while True:
                 inicio_pagina = time.time()
                 params = {'page': page, 'page_size': page_size}
-                response = requests.get(url, params=params, timeout=30)
+                response = self._http.get(url, params=params, timeout=TIMEOUT_LISTADO)
                 tiempo_pagina = time.time() - inicio_pagina
                 logger.info(f"⏱️ Servicio Productos - Página {page}: {tiempo_pagina:.3f}s - Status: {response.status_code}")
                 
@@ -1,19 +1,20 @@
-import requests
 import os
 import logging
+from seedwork.infraestructura.cliente_http import obtener_cliente_http
 
 logger = logging.getLogger(__name__)
 
 class ServicioUsuarios:
     def __init__(self):
         self.base_url = os.getenv('USUARIOS_SERVICE_URL', 'http://localhost:5001/usuarios/api')
+        self._http = obtener_cliente_http()
     
     def obtener_cliente_por_id(self, cliente_id: str) -> dict:
         """Obtener cliente por ID desde el servicio de Usuarios"""
         try:
             url = f"{self.base_url}/clientes/{cliente_id}"
             logger.info(f"Consultando cliente en: {url}")
-            response = requests.get(url, timeout=5)
+            response = self._http.get(url)
             
             if response.status_code == 200:
                 cliente = response.json()
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Aplica las migraciones de esquema de Logistica sin levantar el servicio.
+
+Se ejecuta como paso previo al arranque del contenedor (CMD del Dockerfile, usado
+por docker-compose y por el Deployment de k8s); si falla, el servicio no arranca:
+    python src/migrar.py
+"""
+
+import os
+import sys
+import logging
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from flask import Flask
+from config.db import configurar_db, migrar_esquema
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    app = Flask(__name__)
+    if os.getenv('SQLALCHEMY_DATABASE_URI'):
+        app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('SQLALCHEMY_DATABASE_URI')
+    configurar_db(app)
+
+    with app.app_context():
+        migrar_esquema()
+    logger.info("Migraciones de Logistica aplicadas")
+
+
+if __name__ == '__main__':
+    main()
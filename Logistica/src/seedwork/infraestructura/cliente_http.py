@@ -0,0 +1,390 @@
+# src/seedwork/infraestructura/cliente_http.py
+"""
+Cliente HTTP compartido por los adaptadores que llaman a otros servicios.
+
+Reutiliza una única sesión de `requests` con un pool de conexiones keep-alive por host,
+aplica el mismo timeout a todas las llamadas, reintenta los GET (idempotentes) ante fallos
+transitorios con espera exponencial y jitter, y acumula métricas de latencia por host.
+Un GET con sus reintentos cuenta como una sola llamada para el circuit breaker.
+
+Cada host remoto tiene además un circuit breaker (deja de llamar a un servicio que falla
+repetidamente y lo sondea con una sola llamada al cumplirse el tiempo de apertura) y un
+bulkhead que limita las llamadas simultáneas. Las llamadas rechazadas lanzan
+`ServicioNoDisponible`, que los adaptadores tratan como cualquier error de red.
+"""
+import logging
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+TIMEOUT_CONEXION = float(os.getenv('HTTP_TIMEOUT_CONEXION', '3'))
+TIMEOUT_LECTURA = float(os.getenv('HTTP_TIMEOUT_LECTURA', '10'))
+TIMEOUT_POR_DEFECTO = (TIMEOUT_CONEXION, TIMEOUT_LECTURA)
+
+REINTENTOS_GET = int(os.getenv('HTTP_REINTENTOS_GET', '2'))
+ESPERA_BASE_REINTENTO = float(os.getenv('HTTP_ESPERA_BASE_REINTENTO', '0.1'))
+TAMANO_POOL_POR_HOST = int(os.getenv('HTTP_TAMANO_POOL_POR_HOST', '20'))
+
+UMBRAL_FALLOS_CIRCUITO = int(os.getenv('HTTP_CB_UMBRAL_FALLOS', '5'))
+SEGUNDOS_APERTURA_CIRCUITO = float(os.getenv('HTTP_CB_SEGUNDOS_APERTURA', '30'))
+MAX_CONCURRENTES_POR_HOST = int(os.getenv('HTTP_MAX_CONCURRENTES_POR_HOST', '10'))
+ESPERA_BULKHEAD = float(os.getenv('HTTP_ESPERA_BULKHEAD', '0.1'))
+
+# Respuestas que indican un fallo transitorio del servicio remoto o de la red
+ESTADOS_REINTENTABLES = {502, 503, 504}
+
+
+class ServicioNoDisponible(requests.exceptions.RequestException):
+    """La llamada no se realizó porque el servicio remoto está protegido (circuito abierto o bulkhead lleno)."""
+
+
+class CircuitoAbierto(ServicioNoDisponible):
+    pass
+
+
+class BulkheadLleno(ServicioNoDisponible):
+    pass
+
+
+# ---------------------------------------------------------------
+# Registro de degradación por petición
+# ---------------------------------------------------------------
+_servicios_degradados: ContextVar[Optional[set]] = ContextVar('servicios_degradados', default=None)
+
+
+@contextmanager
+def registrar_degradacion():
+    """Recolecta los hosts remotos que fallaron o fueron rechazados durante el bloque.
+
+    Solo registra las llamadas hechas en el mismo hilo que abre el bloque.
+    """
+    degradados: set[str] = set()
+    token = _servicios_degradados.set(degradados)
+    try:
+        yield degradados
+    finally:
+        _servicios_degradados.reset(token)
+
+
+def anotar_degradacion(respuesta: dict, degradados: set) -> dict:
+    """Marca una respuesta como parcial si algún servicio remoto no respondió."""
+    if degradados:
+        respuesta['datos_degradados'] = True
+        respuesta['servicios_no_disponibles'] = sorted(degradados)
+    return respuesta
+
+
+def _marcar_degradado(host: str) -> None:
+    degradados = _servicios_degradados.get()
+    if degradados is not None:
+        degradados.add(host)
+
+
+# ---------------------------------------------------------------
+# Resiliencia: circuit breaker y bulkhead
+# ---------------------------------------------------------------
+class CircuitBreaker:
+    """Circuit breaker por conteo de fallos consecutivos con sondeo semiabierto."""
+
+    CERRADO = 'cerrado'
+    ABIERTO = 'abierto'
+    SEMIABIERTO = 'semiabierto'
+
+    def __init__(self, umbral_fallos: int = UMBRAL_FALLOS_CIRCUITO,
+                 segundos_apertura: float = SEGUNDOS_APERTURA_CIRCUITO, reloj=time.monotonic):
+        self.umbral_fallos = umbral_fallos
+        self.segundos_apertura = segundos_apertura
+        self._reloj = reloj
+        self._lock = threading.Lock()
+        self.estado = self.CERRADO
+        self.fallos_consecutivos = 0
+        self.aperturas = 0
+        self.rechazos = 0
+        self._abierto_desde = 0.0
+        self._sonda_en_curso = False
+
+    def permitir(self) -> bool:
+        with self._lock:
+            if self.estado == self.ABIERTO and self._reloj() - self._abierto_desde >= self.segundos_apertura:
+                self.estado = self.SEMIABIERTO
+                self._sonda_en_curso = False
+
+            if self.estado == self.CERRADO:
+                return True
+            if self.estado == self.SEMIABIERTO and not self._sonda_en_curso:
+                # Solo una llamada de prueba mientras el circuito está semiabierto
+                self._sonda_en_curso = True
+                return True
+
+            self.rechazos += 1
+            return False
+
+    def registrar_exito(self) -> None:
+        with self._lock:
+            self.estado = self.CERRADO
+            self.fallos_consecutivos = 0
+            self._sonda_en_curso = False
+
+    def liberar_sonda(self) -> None:
+        with self._lock:
+            self._sonda_en_curso = False
+
+    def registrar_fallo(self) -> None:
+        with self._lock:
+            self.fallos_consecutivos += 1
+            if self.estado == self.SEMIABIERTO or self.fallos_consecutivos >= self.umbral_fallos:
+                if self.estado != self.ABIERTO:
+                    self.aperturas += 1
+                self.estado = self.ABIERTO
+                self._abierto_desde = self._reloj()
+                self._sonda_en_curso = False
+
+    def instantanea(self) -> dict:
+        with self._lock:
+            return {
+                'estado': self.estado,
+                'fallos_consecutivos': self.fallos_consecutivos,
+                'aperturas': self.aperturas,
+                'rechazos': self.rechazos
+            }
+
+
+class Bulkhead:
+    """Limita las llamadas simultáneas a un host para que un servicio lento no acapare los hilos."""
+
+    def __init__(self, max_concurrentes: int = MAX_CONCURRENTES_POR_HOST, espera: float = ESPERA_BULKHEAD):
+        self.max_concurrentes = max_concurrentes
+        self.espera = espera
+        self._semaforo = threading.BoundedSemaphore(max_concurrentes)
+        self._lock = threading.Lock()
+        self.en_curso = 0
+        self.rechazos = 0
+
+    def adquirir(self) -> bool:
+        if not self._semaforo.acquire(timeout=self.espera):
+            with self._lock:
+                self.rechazos += 1
+            return False
+        with self._lock:
+            self.en_curso += 1
+        return True
+
+    def liberar(self) -> None:
+        with self._lock:
+            self.en_curso -= 1
+        self._semaforo.release()
+
+    def instantanea(self) -> dict:
+        with self._lock:
+            return {
+                'max_concurrentes': self.max_concurrentes,
+                'en_curso': self.en_curso,
+                'rechazos': self.rechazos
+            }
+
+
+class MetricasHTTP:
+    """Acumula, por método y host, el número de llamadas, errores, reintentos y latencias."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metricas: dict[str, dict] = {}
+
+    def registrar(self, metodo: str, url: str, duracion_ms: float, exitosa: bool, reintentos: int = 0) -> None:
+        clave = f"{metodo} {urlparse(url).netloc}"
+        with self._lock:
+            metrica = self._metricas.setdefault(clave, {
+                'llamadas': 0,
+                'errores': 0,
+                'reintentos': 0,
+                'latencia_total_ms': 0.0,
+                'latencia_max_ms': 0.0
+            })
+            metrica['llamadas'] += 1
+            metrica['errores'] += 0 if exitosa else 1
+            metrica['reintentos'] += reintentos
+            metrica['latencia_total_ms'] += duracion_ms
+            metrica['latencia_max_ms'] = max(metrica['latencia_max_ms'], duracion_ms)
+
+    def instantanea(self) -> dict:
+        with self._lock:
+            return {
+                clave: {
+                    **metrica,
+                    'latencia_promedio_ms': round(metrica['latencia_total_ms'] / metrica['llamadas'], 2)
+                }
+                for clave, metrica in self._metricas.items()
+            }
+
+    def reiniciar(self) -> None:
+        with self._lock:
+            self._metricas.clear()
+
+
+class ClienteHTTP:
+    """Cliente HTTP con pool de conexiones, timeout uniforme, reintentos de GET, resiliencia y métricas."""
+
+    def __init__(
+        self,
+        timeout=TIMEOUT_POR_DEFECTO,
+        reintentos_get: int = REINTENTOS_GET,
+        espera_base: float = ESPERA_BASE_REINTENTO,
+        tamano_pool: int = TAMANO_POOL_POR_HOST,
+        umbral_fallos: int = UMBRAL_FALLOS_CIRCUITO,
+        segundos_apertura: float = SEGUNDOS_APERTURA_CIRCUITO,
+        max_concurrentes: int = MAX_CONCURRENTES_POR_HOST,
+        espera_bulkhead: float = ESPERA_BULKHEAD
+    ):
+        self.timeout = timeout
+        self.reintentos_get = reintentos_get
+        self.espera_base = espera_base
+        self.umbral_fallos = umbral_fallos
+        self.segundos_apertura = segundos_apertura
+        self.max_concurrentes = max_concurrentes
+        self.espera_bulkhead = espera_bulkhead
+        self.metricas = MetricasHTTP()
+
+        self._lock = threading.Lock()
+        self._circuitos: dict[str, CircuitBreaker] = {}
+        self._bulkheads: dict[str, Bulkhead] = {}
+
+        self._session = requests.Session()
+        adaptador = HTTPAdapter(pool_connections=tamano_pool, pool_maxsize=tamano_pool)
+        self._session.mount('http://', adaptador)
+        self._session.mount('https://', adaptador)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """GET con reintentos ante errores de conexión, timeouts y respuestas 502/503/504.
+
+        El circuit breaker evalúa la llamada lógica completa: se consulta una vez antes del primer
+        intento y registra un solo éxito o fallo con el resultado final, no uno por reintento.
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        inicio = time.perf_counter()
+        intento = 0
+
+        def llamada():
+            nonlocal intento
+            while True:
+                try:
+                    response = self._session.get(url, **kwargs)
+                except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                    if intento >= self.reintentos_get:
+                        raise
+                else:
+                    if response.status_code not in ESTADOS_REINTENTABLES or intento >= self.reintentos_get:
+                        return response
+
+                intento += 1
+                self._esperar(intento)
+
+        try:
+            response = self._ejecutar(url, llamada)
+        except Exception:
+            self._registrar('GET', url, inicio, exitosa=False, reintentos=intento)
+            raise
+
+        self._registrar('GET', url, inicio, exitosa=response.status_code < 500, reintentos=intento)
+        return response
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """POST sin reintentos (no es idempotente)."""
+        kwargs.setdefault('timeout', self.timeout)
+        inicio = time.perf_counter()
+        try:
+            response = self._ejecutar(url, lambda: self._session.post(url, **kwargs))
+        except Exception:
+            self._registrar('POST', url, inicio, exitosa=False)
+            raise
+
+        self._registrar('POST', url, inicio, exitosa=response.status_code < 500)
+        return response
+
+    def estado_resiliencia(self) -> dict:
+        """Estado del circuit breaker y del bulkhead de cada host, para los endpoints de salud."""
+        with self._lock:
+            hosts = sorted(set(self._circuitos) | set(self._bulkheads))
+            return {
+                host: {
+                    'circuito': self._circuitos[host].instantanea(),
+                    'bulkhead': self._bulkheads[host].instantanea()
+                }
+                for host in hosts
+            }
+
+    def reiniciar(self) -> None:
+        """Descarta el estado de circuitos, bulkheads y métricas."""
+        with self._lock:
+            self._circuitos.clear()
+            self._bulkheads.clear()
+        self.metricas.reiniciar()
+
+    def _ejecutar(self, url: str, llamada) -> requests.Response:
+        host = urlparse(url).netloc
+        circuito, bulkhead = self._protecciones(host)
+
+        if not circuito.permitir():
+            _marcar_degradado(host)
+            raise CircuitoAbierto(f"Circuito abierto para {host}")
+
+        if not bulkhead.adquirir():
+            # La llamada no llegó al servicio: no cuenta como fallo, pero deja libre la sonda si se había concedido
+            circuito.liberar_sonda()
+            _marcar_degradado(host)
+            raise BulkheadLleno(f"Demasiadas llamadas simultáneas a {host}")
+
+        try:
+            response = llamada()
+        except Exception:
+            circuito.registrar_fallo()
+            _marcar_degradado(host)
+            raise
+        finally:
+            bulkhead.liberar()
+
+        if response.status_code >= 500:
+            circuito.registrar_fallo()
+            _marcar_degradado(host)
+        else:
+            circuito.registrar_exito()
+        return response
+
+    def _protecciones(self, host: str) -> tuple[CircuitBreaker, Bulkhead]:
+        with self._lock:
+            if host not in self._circuitos:
+                self._circuitos[host] = CircuitBreaker(self.umbral_fallos, self.segundos_apertura)
+                self._bulkheads[host] = Bulkhead(self.max_concurrentes, self.espera_bulkhead)
+            return self._circuitos[host], self._bulkheads[host]
+
+    def _esperar(self, intento: int) -> None:
+        # Espera exponencial con jitter completo para no sincronizar los reintentos de varios clientes
+        time.sleep(random.uniform(0, self.espera_base * (2 ** (intento - 1))))
+
+    def _registrar(self, metodo: str, url: str, inicio: float, exitosa: bool, reintentos: int = 0) -> None:
+        duracion_ms = (time.perf_counter() - inicio) * 1000
+        self.metricas.registrar(metodo, url, duracion_ms, exitosa, reintentos)
+        logger.debug(f"HTTP {metodo} {url} - {duracion_ms:.1f} ms - reintentos: {reintentos}")
+
+
+_cliente_http: Optional[ClienteHTTP] = None
+_lock_cliente = threading.Lock()
+
+
+def obtener_cliente_http() -> ClienteHTTP:
+    """Retorna el cliente HTTP compartido del proceso (se crea en el primer uso)."""
+    global _cliente_http
+    if _cliente_http is None:
+        with _lock_cliente:
+            if _cliente_http is None:
+                _cliente_http = ClienteHTTP()
+    return _cliente_http
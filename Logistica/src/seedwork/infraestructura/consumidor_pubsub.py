@@ -264,11 +264,16 @@ class ConsumidorPubSub:
             elif tipo_evento == 'PedidoConfirmado':
                 # Importar evento PedidoConfirmado local
                 from dominio.eventos import PedidoConfirmado
+                from datetime import datetime
 
                 datos_evento = data.get('datos', {})
 
-                # Crear instancia del evento PedidoConfirmado
+                fecha_evento = data.get('fecha_evento')
+
+                # Crear instancia del evento PedidoConfirmado conservando la fecha de publicación:
+                # la proyección de estados la usa para descartar entregas tardías o repetidas
                 evento = PedidoConfirmado(
+                    fecha_evento=datetime.fromisoformat(fecha_evento),
                     pedido_id=datos_evento.get('pedido_id', ''),
                     cliente_id=datos_evento.get('cliente_id', ''),
                     vendedor_id=datos_evento.get('vendedor_id', ''),
@@ -278,6 +283,22 @@ class ConsumidorPubSub:
 
                 return evento
 
+            elif tipo_evento == 'PedidoEstadoActualizado':
+                from dominio.eventos import PedidoEstadoActualizado
+                from datetime import datetime
+
+                datos_evento = data.get('datos', {})
+                fecha_actualizacion = datos_evento.get('fecha_actualizacion')
+
+                evento = PedidoEstadoActualizado(
+                    fecha_evento=datetime.fromisoformat(data.get('fecha_evento')),
+                    pedido_id=datos_evento.get('pedido_id', ''),
+                    estado=datos_evento.get('estado', ''),
+                    fecha_actualizacion=datetime.fromisoformat(fecha_actualizacion) if fecha_actualizacion else None
+                )
+
+                return evento
+
             elif tipo_evento == 'InventarioAsignado':
                 # Importar el evento InventarioAsignado
                 from dominio.eventos import InventarioAsignado
@@ -313,12 +334,12 @@ class ConsumidorPubSub:
                 producto_id = str(evento.producto_id)
             
             if producto_id:
-                # Obtener cantidad disponible actualizada del repositorio
+                # Obtener cantidad disponible actualizada del resumen de stock del producto
                 repo_inventario = RepositorioInventarioSQLite()
-                lotes_inventario = repo_inventario.obtener_por_producto_id(producto_id)
+                stock = repo_inventario.obtener_stock(producto_id)
                 
-                if lotes_inventario:
-                    cantidad_disponible_total = sum(lote.cantidad_disponible for lote in lotes_inventario)
+                if stock:
+                    cantidad_disponible_total = stock[0]
                     
                     # Notificar clientes SSE
                     sse_client_manager.notificar_todos('update', {
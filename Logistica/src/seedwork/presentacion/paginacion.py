@@ -1,11 +1,92 @@
 """
 Utilidades para paginación de resultados en APIs REST
+
+Hay dos modos:
+- Por página (`page`/`page_size`): offset clásico con total de items y de páginas.
+- Por cursor (`cursor`, opcional): keyset sobre una clave de orden estable, típicamente
+  (created_at, id). El costo de cada página no depende de qué tan profundo se navegue y
+  los items insertados mientras se recorre la lista no desplazan las páginas siguientes.
 """
-from typing import List, Dict, Any, TypeVar
+import base64
+import json
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import List, Dict, Any, TypeVar, Generic, Callable, Optional, Sequence, Tuple
 from math import ceil
 
+from sqlalchemy import and_, or_
+
 T = TypeVar('T')
 
+
+@dataclass
+class Pagina(Generic[T]):
+    """Página de resultados con los metadatos necesarios para la respuesta paginada."""
+    items: List[T]
+    page: int
+    page_size: int
+    total_items: int
+
+    @property
+    def total_pages(self) -> int:
+        return ceil(self.total_items / self.page_size) if self.total_items > 0 else 1
+
+    def con_items(self, items: List[Any]) -> 'Pagina':
+        """Retorna la misma página con otros items (p. ej. los items ya mapeados a JSON)."""
+        return replace(self, items=items)
+
+    def a_dict(self) -> Dict[str, Any]:
+        return {
+            'items': self.items,
+            'pagination': {
+                'page': self.page,
+                'page_size': self.page_size,
+                'total_items': self.total_items,
+                'total_pages': self.total_pages,
+                'has_next': self.page < self.total_pages,
+                'has_prev': self.page > 1
+            }
+        }
+
+
+def normalizar_paginacion(page: int, page_size: int, max_page_size: int = 100) -> tuple[int, int]:
+    """Ajusta page y page_size a valores válidos (page >= 1, 1 <= page_size <= max_page_size)."""
+    if page < 1:
+        page = 1
+    if page_size < 1:
+        page_size = 100
+    if page_size > max_page_size:
+        page_size = max_page_size
+    return page, page_size
+
+
+def paginar_consulta(query, page: int = 1, page_size: int = 100, max_page_size: int = 100) -> Pagina:
+    """
+    Pagina una consulta SQLAlchemy en la base de datos.
+
+    Ejecuta un COUNT para `total_items` y trae solo las filas de la página con LIMIT/OFFSET,
+    de modo que el costo de la página no depende del tamaño de la tabla. La consulta debe
+    venir ya filtrada y con un orden total (incluir una columna única como desempate).
+
+    Args:
+        query: Consulta SQLAlchemy (Query) filtrada y ordenada
+        page: Número de página (empieza en 1)
+        page_size: Cantidad de items por página
+        max_page_size: Tamaño máximo permitido por página
+
+    Returns:
+        Pagina con los modelos de la página actual
+    """
+    page, page_size = normalizar_paginacion(page, page_size, max_page_size)
+
+    total_items = query.order_by(None).count()
+    total_pages = ceil(total_items / page_size) if total_items > 0 else 1
+    if page > total_pages:
+        page = total_pages
+
+    items = query.limit(page_size).offset((page - 1) * page_size).all() if total_items else []
+    return Pagina(items=items, page=page, page_size=page_size, total_items=total_items)
+
 def paginar_resultados(
     items: List[T], 
     page: int = 1, 
@@ -43,15 +124,7 @@ def paginar_resultados(
         >>> result['pagination']['total_pages']
         4
     """
-    # Validar y ajustar page
-    if page < 1:
-        page = 1
-    
-    # Validar y ajustar page_size
-    if page_size < 1:
-        page_size = 100
-    if page_size > max_page_size:
-        page_size = max_page_size
+    page, page_size = normalizar_paginacion(page, page_size, max_page_size)
     
     # Calcular totales
     total_items = len(items)
@@ -65,20 +138,12 @@ def paginar_resultados(
     start_index = (page - 1) * page_size
     end_index = start_index + page_size
     
-    # Obtener items de la página actual
-    paginated_items = items[start_index:end_index]
-    
-    return {
-        'items': paginated_items,
-        'pagination': {
-            'page': page,
-            'page_size': page_size,
-            'total_items': total_items,
-            'total_pages': total_pages,
-            'has_next': page < total_pages,
-            'has_prev': page > 1
-        }
-    }
+    return Pagina(
+        items=items[start_index:end_index],
+        page=page,
+        page_size=page_size,
+        total_items=total_items
+    ).a_dict()
 
 
 def extraer_parametros_paginacion(request_args: dict) -> tuple[int, int]:
@@ -107,3 +172,206 @@ def extraer_parametros_paginacion(request_args: dict) -> tuple[int, int]:
     
     return page, page_size
 
+
+SIGUIENTE = 'siguiente'
+ANTERIOR = 'anterior'
+
+
+class CursorInvalido(ValueError):
+    """El cursor recibido no fue generado por `codificar_cursor` o no corresponde a la consulta."""
+
+
+@dataclass
+class PaginaCursor(Generic[T]):
+    """Página de resultados navegada por cursor."""
+    items: List[T]
+    page_size: int
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+    def con_items(self, items: List[Any]) -> 'PaginaCursor':
+        """Retorna la misma página con otros items (p. ej. los items ya mapeados a JSON)."""
+        return replace(self, items=items)
+
+    def a_dict(self) -> Dict[str, Any]:
+        return {
+            'items': self.items,
+            'pagination': {
+                'mode': 'cursor',
+                'page_size': self.page_size,
+                'next_cursor': self.next_cursor,
+                'prev_cursor': self.prev_cursor,
+                'has_next': self.next_cursor is not None,
+                'has_prev': self.prev_cursor is not None
+            }
+        }
+
+
+def codificar_cursor(clave: Sequence[Any], direccion: str = SIGUIENTE) -> str:
+    """Codifica la clave de orden de un item y la dirección de navegación en un cursor opaco."""
+    valores = [{'dt': v.isoformat()} if isinstance(v, datetime) else v for v in clave]
+    crudo = json.dumps({'k': valores, 'd': direccion}, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(crudo).decode('ascii').rstrip('=')
+
+
+def decodificar_cursor(cursor: str) -> Tuple[tuple, str]:
+    """
+    Decodifica un cursor generado por `codificar_cursor`.
+
+    Returns:
+        Tupla (clave de orden, dirección)
+
+    Raises:
+        CursorInvalido: Si el cursor no es válido
+    """
+    try:
+        relleno = '=' * (-len(cursor) % 4)
+        datos = json.loads(base64.urlsafe_b64decode(cursor + relleno).decode('utf-8'))
+        direccion = datos['d']
+        if direccion not in (SIGUIENTE, ANTERIOR) or not isinstance(datos['k'], list):
+            raise ValueError
+        clave = tuple(datetime.fromisoformat(v['dt']) if isinstance(v, dict) else v for v in datos['k'])
+    except Exception:
+        raise CursorInvalido('Cursor inválido')
+    return clave, direccion
+
+
+def extraer_cursor(request_args: dict) -> Optional[str]:
+    """
+    Retorna el cursor del request, o None si el cliente no pidió el modo cursor.
+
+    Un `cursor` vacío (`?cursor=`) pide la primera página en modo cursor.
+    """
+    if 'cursor' not in request_args:
+        return None
+    return (request_args.get('cursor') or '').strip()
+
+
+def _armar_pagina_cursor(items: list, clave: Callable[[Any], tuple], hay_mas: bool, cursor: Optional[str],
+                         direccion: str, page_size: int) -> PaginaCursor:
+    if direccion == ANTERIOR:
+        # Se llegó desde la página siguiente: siempre hay una página después
+        hay_siguiente, hay_anterior = bool(items), hay_mas
+    else:
+        hay_siguiente, hay_anterior = hay_mas, bool(cursor) and bool(items)
+
+    return PaginaCursor(
+        items=items,
+        page_size=page_size,
+        next_cursor=codificar_cursor(clave(items[-1]), SIGUIENTE) if hay_siguiente else None,
+        prev_cursor=codificar_cursor(clave(items[0]), ANTERIOR) if hay_anterior else None
+    )
+
+
+def paginar_lista_por_cursor(
+    items: List[T],
+    clave: Callable[[T], tuple],
+    cursor: Optional[str] = None,
+    page_size: int = 100,
+    max_page_size: int = 100,
+    descendente: bool = True
+) -> PaginaCursor:
+    """
+    Pagina por cursor una lista ya cargada en memoria.
+
+    Útil cuando los filtros se aplican después de la consulta; la navegación es estable
+    aunque se inserten items, pero el costo sigue siendo el de ordenar la lista completa.
+
+    Args:
+        items: Lista completa de items
+        clave: Función que retorna la clave de orden única de un item, p. ej. (created_at, id)
+        cursor: Cursor recibido del cliente (None o vacío para la primera página)
+        page_size: Cantidad de items por página
+        max_page_size: Tamaño máximo permitido por página
+        descendente: Si la lista se recorre de la clave mayor a la menor
+
+    Raises:
+        CursorInvalido: Si el cursor no es válido
+    """
+    _, page_size = normalizar_paginacion(1, page_size, max_page_size)
+    ordenados = sorted(items, key=clave, reverse=descendente)
+
+    if not cursor:
+        pagina = ordenados[:page_size]
+        return _armar_pagina_cursor(pagina, clave, len(ordenados) > page_size, None, SIGUIENTE, page_size)
+
+    referencia, direccion = decodificar_cursor(cursor)
+
+    def despues(item) -> bool:
+        return clave(item) < referencia if descendente else clave(item) > referencia
+
+    if direccion == SIGUIENTE:
+        restantes = [item for item in ordenados if despues(item)]
+        pagina = restantes[:page_size]
+        hay_mas = len(restantes) > page_size
+    else:
+        previos = [item for item in ordenados if not despues(item) and clave(item) != referencia]
+        pagina = previos[-page_size:]
+        hay_mas = len(previos) > page_size
+
+    return _armar_pagina_cursor(pagina, clave, hay_mas, cursor, direccion, page_size)
+
+
+def paginar_consulta_por_cursor(
+    query,
+    columnas: Sequence[Any],
+    cursor: Optional[str] = None,
+    page_size: int = 100,
+    max_page_size: int = 100,
+    descendente: bool = True
+) -> PaginaCursor:
+    """
+    Pagina por cursor (keyset) una consulta SQLAlchemy.
+
+    La consulta solo trae `page_size + 1` filas a partir de la clave del cursor, de modo que
+    el costo de cada página es constante con un índice sobre las columnas de orden. No se
+    calcula el total de items.
+
+    Args:
+        query: Consulta SQLAlchemy (Query) ya filtrada y sin orden
+        columnas: Columnas de la clave de orden; la última debe ser única (p. ej. created_at, id)
+        cursor: Cursor recibido del cliente (None o vacío para la primera página)
+        page_size: Cantidad de items por página
+        max_page_size: Tamaño máximo permitido por página
+        descendente: Si se recorre de la clave mayor a la menor
+
+    Returns:
+        PaginaCursor con los modelos de la página
+
+    Raises:
+        CursorInvalido: Si el cursor no es válido
+    """
+    _, page_size = normalizar_paginacion(1, page_size, max_page_size)
+
+    def clave(modelo) -> tuple:
+        return tuple(getattr(modelo, columna.key) for columna in columnas)
+
+    direccion = SIGUIENTE
+    if cursor:
+        referencia, direccion = decodificar_cursor(cursor)
+        if len(referencia) != len(columnas):
+            raise CursorInvalido('Cursor inválido')
+        # Hacia adelante en orden descendente se buscan claves menores; hacia atrás, mayores
+        buscar_mayores = (direccion == SIGUIENTE) != descendente
+        query = query.filter(_condicion_keyset(columnas, referencia, buscar_mayores))
+
+    invertir = direccion == ANTERIOR
+    orden_descendente = descendente != invertir
+    query = query.order_by(*[c.desc() if orden_descendente else c.asc() for c in columnas])
+
+    filas = query.limit(page_size + 1).all()
+    hay_mas = len(filas) > page_size
+    filas = filas[:page_size]
+    if invertir:
+        filas.reverse()
+
+    return _armar_pagina_cursor(filas, clave, hay_mas, cursor, direccion, page_size)
+
+
+def _condicion_keyset(columnas: Sequence[Any], valores: Sequence[Any], mayores: bool):
+    """Comparación lexicográfica (c1, c2, ...) > (v1, v2, ...) (o <) portable entre motores."""
+    condicion = None
+    for columna, valor in reversed(list(zip(columnas, valores))):
+        comparacion = columna > valor if mayores else columna < valor
+        condicion = comparacion if condicion is None else or_(comparacion, and_(columna == valor, condicion))
+    return condicion
@@ -54,6 +54,13 @@ SERVICE_URLS = {
     'ventas_service': f"{BASE_URLS['ventas']}{API_ROUTES['ventas']['pedidos']}"
 }
 
+@pytest.fixture(autouse=True)
+def reiniciar_cliente_http():
+    """Evita que el estado de los circuit breakers del cliente HTTP compartido pase de un test a otro"""
+    from seedwork.infraestructura.cliente_http import obtener_cliente_http
+    obtener_cliente_http().reiniciar()
+    yield
+
 @pytest.fixture(scope='session')
 def app():
     os.environ['TESTING'] = 'True'
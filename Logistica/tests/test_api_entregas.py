@@ -51,6 +51,57 @@ class TestAPIEntregas:
         assert len(data['items']) > 0
         assert "pedido" in data['items'][0]
         assert "productos" in data['items'][0]["pedido"]
+        assert 'datos_degradados' not in data
+
+    @patch('api.entregas.ejecutar_consulta')
+    def test_obtener_entregas_por_cursor(self, mock_ejecutar_consulta):
+        base = datetime(2025, 11, 10, 9, 0)
+        entregas = [EntregaDTO(direccion=f"Calle {i}", fecha_entrega=base + timedelta(days=i)) for i in range(3)]
+        mock_ejecutar_consulta.return_value = entregas
+
+        url = get_logistica_url('entregas') + '/'
+        primera = json.loads(self.client.get(url + '?cursor=&page_size=2').data)
+        segunda = json.loads(self.client.get(url + f"?cursor={primera['pagination']['next_cursor']}&page_size=2").data)
+
+        assert [e['direccion'] for e in primera['items']] == ['Calle 2', 'Calle 1']
+        assert [e['direccion'] for e in segunda['items']] == ['Calle 0']
+        assert primera['pagination']['mode'] == 'cursor'
+        assert segunda['pagination']['has_next'] is False
+
+    @patch('api.entregas.ejecutar_consulta')
+    def test_obtener_entregas_cursor_invalido(self, mock_ejecutar_consulta):
+        mock_ejecutar_consulta.return_value = []
+
+        response = self.client.get(get_logistica_url('entregas') + '/?cursor=invalido')
+
+        assert response.status_code == 400
+
+    @patch('requests.Session.post')
+    @patch('api.entregas.ejecutar_consulta')
+    def test_obtener_entregas_marca_respuesta_degradada_si_ventas_no_responde(self, mock_ejecutar_consulta, mock_post):
+        import requests
+        from infraestructura.servicio_pedidos import ServicioPedidos
+
+        entrega_dto = EntregaDTO(
+            direccion="Calle 123 #45-67",
+            fecha_entrega=datetime.now() + timedelta(days=1),
+            pedido={"id": "pedido-001", "estado": "confirmado"}
+        )
+        mock_post.side_effect = requests.exceptions.ConnectionError("Ventas caído")
+
+        def consultar_con_ventas_caido(consulta):
+            ServicioPedidos().obtener_estados_pedidos(['pedido-001'])
+            return [entrega_dto]
+
+        mock_ejecutar_consulta.side_effect = consultar_con_ventas_caido
+
+        response = self.client.get(get_logistica_url('entregas') + '/')
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['datos_degradados'] is True
+        assert len(data['servicios_no_disponibles']) == 1
+        assert data['items'][0]['pedido']['estado'] == 'confirmado'
 
     @patch('api.entregas.ejecutar_consulta')
     def test_obtener_entregas_vacio(self, mock_ejecutar_consulta):
@@ -383,4 +383,92 @@ class TestAPIInventarioCompleto:
         response = self.client.get(get_logistica_url('inventario') + '/')
         assert response.status_code == 500
         data = response.get_json()
-        assert 'error' in data
\ No newline at end of file
+        assert 'error' in data
+
+class TestAPIInventarioProductosEnLote:
+    def setup_method(self):
+        from flask import Flask
+        from api.inventario import bp
+
+        self.app = Flask(__name__)
+        self.app.register_blueprint(bp)
+        self.app.config['TESTING'] = True
+        self.client = self.app.test_client()
+
+    def _lote(self, producto_id, bodega_id, disponible):
+        lote = Mock()
+        lote.producto_id = producto_id
+        lote.bodega_id = bodega_id
+        lote.pasillo = 'A'
+        lote.estante = '1'
+        lote.cantidad_disponible = disponible
+        lote.cantidad_reservada = 0
+        lote.fecha_vencimiento = datetime(2026, 12, 31)
+        return lote
+
+    def test_obtener_inventario_productos_agrupa_por_producto_y_bodega(self):
+        """Test que el inventario de varios productos se resuelve con una sola consulta al repositorio"""
+        with patch('api.inventario.RepositorioInventarioSQLite') as mock_repo:
+            mock_repo.return_value.obtener_por_producto_ids.return_value = {
+                'prod-1': [self._lote('prod-1', 'b1', 10), self._lote('prod-1', 'b2', 5)],
+                'prod-2': [self._lote('prod-2', 'b1', 3)]
+            }
+
+            response = self.client.post('/logistica/api/inventario/productos',
+                                        json={'producto_ids': ['prod-1', 'prod-2', 'prod-3']})
+
+        assert response.status_code == 200
+        inventarios = response.get_json()['inventarios']
+        mock_repo.return_value.obtener_por_producto_ids.assert_called_once_with(['prod-1', 'prod-2', 'prod-3'])
+        assert sum(b['total_disponible'] for b in inventarios['prod-1']['bodegas']) == 15
+        assert inventarios['prod-2']['bodegas'][0]['total_disponible'] == 3
+        assert 'prod-3' not in inventarios
+
+    def test_obtener_inventario_productos_sin_lista(self):
+        """Test que se rechaza una petición sin producto_ids"""
+        response = self.client.post('/logistica/api/inventario/productos', json={})
+        assert response.status_code == 400
+
+    def test_obtener_inventario_productos_excede_maximo(self):
+        """Test que se rechazan más productos de los permitidos por consulta"""
+        from api.inventario import MAX_PRODUCTOS_POR_CONSULTA
+
+        response = self.client.post('/logistica/api/inventario/productos',
+                                    json={'producto_ids': [f'p{i}' for i in range(MAX_PRODUCTOS_POR_CONSULTA + 1)]})
+        assert response.status_code == 400
+
+    def test_obtener_stock_producto_desde_resumen(self):
+        """Test que el stock de un producto se lee del resumen por producto"""
+        with patch('api.inventario.RepositorioInventarioSQLite') as mock_repo:
+            mock_repo.return_value.obtener_stock.return_value = (15, 3)
+
+            response = self.client.get('/logistica/api/inventario/producto/prod-1/stock')
+
+        assert response.status_code == 200
+        assert response.get_json() == {'producto_id': 'prod-1', 'total_disponible': 15, 'total_reservado': 3}
+        mock_repo.return_value.obtener_por_producto_id.assert_not_called()
+
+    def test_obtener_stock_producto_no_encontrado(self):
+        """Test que un producto sin resumen de stock retorna 404"""
+        with patch('api.inventario.RepositorioInventarioSQLite') as mock_repo:
+            mock_repo.return_value.obtener_stock.return_value = None
+
+            response = self.client.get('/logistica/api/inventario/producto/prod-x/stock')
+
+        assert response.status_code == 404
+
+    def test_reconciliar_stock(self):
+        """Test que el endpoint de reconciliación ejecuta el comando con los productos indicados"""
+        with patch('api.inventario.ejecutar_comando') as mock_ejecutar:
+            mock_ejecutar.return_value = {'success': True, 'productos_corregidos': 1}
+
+            response = self.client.post('/logistica/api/inventario/stock/reconciliar',
+                                        json={'producto_ids': ['prod-1']})
+
+        assert response.status_code == 200
+        assert mock_ejecutar.call_args[0][0].producto_ids == ['prod-1']
+
+    def test_reconciliar_stock_producto_ids_invalido(self):
+        """Test que se rechaza producto_ids que no es una lista"""
+        response = self.client.post('/logistica/api/inventario/stock/reconciliar', json={'producto_ids': 'prod-1'})
+        assert response.status_code == 400
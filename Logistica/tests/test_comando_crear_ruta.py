@@ -20,11 +20,11 @@ def build_entrega(entrega_id, fecha, estado='confirmado'):
 @pytest.fixture
 def handler_mocks():
     repo_rutas = MagicMock()
-    repo_rutas.entrega_ya_asignada.return_value = False
+    repo_rutas.entregas_ya_asignadas.return_value = set()
     repo_rutas.crear.return_value = RutaDTO()
 
     repo_entregas = MagicMock()
-    repo_entregas.obtener_todos.return_value = []
+    repo_entregas.obtener_por_ids.return_value = []
 
     repo_bodegas = MagicMock()
     bodega_model = MagicMock()
@@ -48,7 +48,7 @@ def test_crear_ruta_exitoso(handler_mocks):
     handler, repo_rutas, repo_entregas, repo_bodegas, mapeador = handler_mocks
 
     fecha = datetime.now().replace(microsecond=0) + timedelta(days=1)
-    repo_entregas.obtener_todos.return_value = [
+    repo_entregas.obtener_por_ids.return_value = [
         build_entrega('e1', fecha, estado='confirmado'),
         build_entrega('e2', fecha, estado='confirmado')
     ]
@@ -62,7 +62,9 @@ def test_crear_ruta_exitoso(handler_mocks):
 
     handler.handle(comando)
 
-    assert repo_rutas.entrega_ya_asignada.call_count == 2
+    repo_entregas.obtener_por_ids.assert_called_once_with(['e1', 'e2'])
+    repo_rutas.entregas_ya_asignadas.assert_called_once_with(['e1', 'e2'])
+    repo_entregas.obtener_todos.assert_not_called()
     assert repo_rutas.crear.called
     assert mapeador.entidad_a_dto.called
 
@@ -70,7 +72,7 @@ def test_crear_ruta_exitoso(handler_mocks):
 def test_crear_ruta_entrega_no_encontrada(handler_mocks):
     handler, repo_rutas, repo_entregas, repo_bodegas, _ = handler_mocks
 
-    repo_entregas.obtener_todos.return_value = []
+    repo_entregas.obtener_por_ids.return_value = []
 
     comando = CrearRuta(
         fecha_ruta=datetime(2025, 11, 10).date(),
@@ -87,7 +89,7 @@ def test_crear_ruta_entrega_con_estado_invalido(handler_mocks):
     handler, repo_rutas, repo_entregas, repo_bodegas, _ = handler_mocks
 
     fecha = datetime(2025, 11, 10, 10, 0, 0)
-    repo_entregas.obtener_todos.return_value = [
+    repo_entregas.obtener_por_ids.return_value = [
         build_entrega('e1', fecha, estado='en_proceso')
     ]
 
@@ -105,7 +107,7 @@ def test_crear_ruta_entrega_con_estado_invalido(handler_mocks):
 def test_crear_ruta_entrega_fecha_distinta(handler_mocks):
     handler, repo_rutas, repo_entregas, repo_bodegas, _ = handler_mocks
 
-    repo_entregas.obtener_todos.return_value = [
+    repo_entregas.obtener_por_ids.return_value = [
         build_entrega('e1', datetime(2025, 11, 11, 9, 0, 0))
     ]
 
@@ -124,10 +126,10 @@ def test_crear_ruta_entrega_ya_asignada(handler_mocks):
     handler, repo_rutas, repo_entregas, repo_bodegas, _ = handler_mocks
 
     fecha = datetime(2025, 11, 10, 9, 0, 0)
-    repo_entregas.obtener_todos.return_value = [
+    repo_entregas.obtener_por_ids.return_value = [
         build_entrega('e1', fecha)
     ]
-    repo_rutas.entrega_ya_asignada.return_value = True
+    repo_rutas.entregas_ya_asignadas.return_value = {'e1'}
 
     comando = CrearRuta(
         fecha_ruta=fecha.date(),
@@ -144,7 +146,7 @@ def test_crear_ruta_bodega_no_encontrada(handler_mocks):
     handler, repo_rutas, repo_entregas, repo_bodegas, _ = handler_mocks
 
     fecha = datetime(2025, 11, 10, 9, 0, 0)
-    repo_entregas.obtener_todos.return_value = [
+    repo_entregas.obtener_por_ids.return_value = [
         build_entrega('e1', fecha)
     ]
     repo_bodegas.obtener_por_id.return_value = None
@@ -159,3 +161,22 @@ def test_crear_ruta_bodega_no_encontrada(handler_mocks):
     with pytest.raises(ValueError, match='bodega.*no existe'):
         handler.handle(comando)
 
+
+
+def test_crear_ruta_entregas_duplicadas_se_consultan_una_vez(handler_mocks):
+    handler, repo_rutas, repo_entregas, repo_bodegas, _ = handler_mocks
+
+    fecha = datetime.now().replace(microsecond=0) + timedelta(days=1)
+    repo_entregas.obtener_por_ids.return_value = [build_entrega('e1', fecha)]
+
+    comando = CrearRuta(
+        fecha_ruta=fecha.date(),
+        repartidor_id='repartidor-1',
+        bodega_id='bodega-1',
+        entregas=['e1', 'e1']
+    )
+
+    handler.handle(comando)
+
+    repo_entregas.obtener_por_ids.assert_called_once_with(['e1'])
+    repo_rutas.entregas_ya_asignadas.assert_called_once_with(['e1'])
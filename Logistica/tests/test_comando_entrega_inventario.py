@@ -1,16 +1,16 @@
-from types import SimpleNamespace
+from datetime import datetime, timedelta
 from unittest.mock import MagicMock, patch
 
 from src.aplicacion.comandos.entrega_inventario import EntregaInventario, EntregaInventarioHandler
 from src.aplicacion.dto import InventarioDTO
 
 
-def build_lote(producto_id, reservada, disponible=0, fecha=0, bodega_id='b1'):
+def build_lote(producto_id, reservada, disponible=0, dias=30, bodega_id='b1'):
     return InventarioDTO(
         producto_id=producto_id,
         cantidad_disponible=disponible,
         cantidad_reservada=reservada,
-        fecha_vencimiento=fecha,
+        fecha_vencimiento=datetime.now() + timedelta(days=dias),
         bodega_id=bodega_id,
         pasillo='A',
         estante='1',
@@ -18,97 +18,66 @@ def build_lote(producto_id, reservada, disponible=0, fecha=0, bodega_id='b1'):
     )
 
 
-def setup_repo(lotes_side_effect):
+def setup_repo(lotes_por_producto, con_inventario=frozenset()):
     repo = MagicMock()
-    repo.obtener_por_producto_id.side_effect = lotes_side_effect
+    repo.bloquear_lotes_para_descuento.return_value = lotes_por_producto
+    repo.productos_con_inventario.return_value = set(con_inventario)
     return repo
 
 
-def setup_model(instance):
-    class FakeQuery:
-        def __init__(self, inst):
-            self.instance = inst
-        def filter_by(self, **kwargs):
-            return self
-        def first(self):
-            return self.instance
-
-    class FakeInventarioModel:
-        query = FakeQuery(instance)
-
-    return FakeInventarioModel
+def entregar(repo, items):
+    with patch('src.aplicacion.comandos.entrega_inventario.RepositorioInventarioSQLite', return_value=repo):
+        return EntregaInventarioHandler().handle(EntregaInventario(items=items))
 
 
 def test_entrega_inventario_exitoso():
-    repo = setup_repo([[build_lote('p1', 6)], [build_lote('p1', 6)]])
-    inventario_instance = SimpleNamespace(cantidad_reservada=6)
-    fake_model = setup_model(inventario_instance)
-    fake_db = SimpleNamespace(session=MagicMock())
+    proximo, tardio = build_lote('p1', 3, dias=10), build_lote('p1', 6, dias=90)
+    repo = setup_repo({'p1': [proximo, tardio]})
 
-    fake_modules = {
-        'infraestructura.modelos': SimpleNamespace(InventarioModel=fake_model),
-        'config.db': SimpleNamespace(db=fake_db)
-    }
-
-    with patch('src.aplicacion.comandos.entrega_inventario.RepositorioInventarioSQLite', return_value=repo), \
-            patch.dict('sys.modules', fake_modules, clear=False):
-
-        handler = EntregaInventarioHandler()
-        resultado = handler.handle(EntregaInventario(items=[{'producto_id': 'p1', 'cantidad': 5}]))
+    resultado = entregar(repo, [{'producto_id': 'p1', 'cantidad': 5}])
 
     assert resultado['success'] is True
-    assert inventario_instance.cantidad_reservada == 1
-    fake_db.session.commit.assert_called()
+    repo.bloquear_lotes_para_descuento.assert_called_once_with(['p1'])
+    repo.aplicar_descuentos.assert_called_once_with(resultado['asignaciones'])
+    assert [(a['lote_id'], a['cantidad']) for a in resultado['asignaciones']] == [(proximo.id, 3), (tardio.id, 2)]
 
 
 def test_entrega_inventario_producto_no_encontrado():
-    repo = setup_repo([[]])
+    repo = setup_repo({})
 
-    with patch('src.aplicacion.comandos.entrega_inventario.RepositorioInventarioSQLite', return_value=repo):
-        handler = EntregaInventarioHandler()
-        resultado = handler.handle(EntregaInventario(items=[{'producto_id': 'p1', 'cantidad': 1}]))
+    resultado = entregar(repo, [{'producto_id': 'p1', 'cantidad': 1}])
 
     assert resultado['success'] is False
     assert 'no encontrado' in resultado['error']
+    repo.revertir.assert_called_once()
+    repo.aplicar_descuentos.assert_not_called()
 
 
 def test_entrega_inventario_cantidad_insuficiente():
-    repo = setup_repo([[build_lote('p1', 1)]])
+    repo = setup_repo({'p1': [build_lote('p1', 1)]})
 
-    with patch('src.aplicacion.comandos.entrega_inventario.RepositorioInventarioSQLite', return_value=repo):
-        handler = EntregaInventarioHandler()
-        resultado = handler.handle(EntregaInventario(items=[{'producto_id': 'p1', 'cantidad': 5}]))
+    resultado = entregar(repo, [{'producto_id': 'p1', 'cantidad': 5}])
 
     assert resultado['success'] is False
     assert 'insuficiente' in resultado['error']
+    repo.aplicar_descuentos.assert_not_called()
 
 
 def test_entrega_inventario_datos_invalidos():
-    repo = setup_repo([])
+    repo = setup_repo({})
 
-    with patch('src.aplicacion.comandos.entrega_inventario.RepositorioInventarioSQLite', return_value=repo):
-        handler = EntregaInventarioHandler()
-        resultado = handler.handle(EntregaInventario(items=[{'producto_id': '', 'cantidad': 0}]))
+    resultado = entregar(repo, [{'producto_id': '', 'cantidad': 0}])
 
     assert resultado['success'] is False
+    repo.bloquear_lotes_para_descuento.assert_not_called()
 
 
-def test_entrega_inventario_lote_no_encontrado():
-    repo = setup_repo([[build_lote('p1', 2)], [build_lote('p1', 2)]])
-    fake_model = setup_model(None)
-    fake_db = SimpleNamespace(session=MagicMock())
-
-    fake_modules = {
-        'infraestructura.modelos': SimpleNamespace(InventarioModel=fake_model),
-        'config.db': SimpleNamespace(db=fake_db)
-    }
+def test_entrega_inventario_error_al_aplicar_revierte():
+    repo = setup_repo({'p1': [build_lote('p1', 2)]})
+    repo.aplicar_descuentos.side_effect = Exception('Error en DB')
 
-    with patch('src.aplicacion.comandos.entrega_inventario.RepositorioInventarioSQLite', return_value=repo), \
-            patch.dict('sys.modules', fake_modules, clear=False):
-
-        handler = EntregaInventarioHandler()
-        resultado = handler.handle(EntregaInventario(items=[{'producto_id': 'p1', 'cantidad': 1}]))
+    resultado = entregar(repo, [{'producto_id': 'p1', 'cantidad': 1}])
 
     assert resultado['success'] is False
-    assert 'Lote de inventario no encontrado' in resultado['error']
-
+    assert 'Error interno' in resultado['error']
+    repo.revertir.assert_called_once()
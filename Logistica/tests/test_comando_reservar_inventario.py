@@ -0,0 +1,351 @@
+import uuid
+from dataclasses import replace
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql
+
+from config.db import db
+from infraestructura.modelos import InventarioModel, StockProductoModel
+from infraestructura.repositorios import RepositorioInventarioSQLite
+from aplicacion.comandos.reservar_inventario import ReservarInventario, ReservarInventarioHandler
+from aplicacion.comandos.descontar_inventario import DescontarInventario, DescontarInventarioHandler
+
+
+def crear_lote(producto_id, cantidad_disponible, dias, cantidad_reservada=0, bodega_id='bodega-1'):
+    lote = InventarioModel(
+        id=str(uuid.uuid4()),
+        producto_id=producto_id,
+        cantidad_disponible=cantidad_disponible,
+        cantidad_reservada=cantidad_reservada,
+        fecha_vencimiento=datetime.now() + timedelta(days=dias),
+        bodega_id=bodega_id
+    )
+    db.session.add(lote)
+    return lote
+
+
+@pytest.fixture
+def lotes(app_context):
+    creados = {
+        'tardio': crear_lote('prod-1', 10, dias=90),
+        'proximo': crear_lote('prod-1', 4, dias=10),
+        'vencido': crear_lote('prod-1', 50, dias=-1),
+        'agotado': crear_lote('prod-1', 0, dias=5, cantidad_reservada=7),
+        'otro': crear_lote('prod-2', 8, dias=30),
+    }
+    db.session.commit()
+    # Los lotes se insertan sin pasar por el repositorio: poblar el resumen como en el arranque
+    RepositorioInventarioSQLite().reconciliar_stock()
+    ids = {nombre: lote.id for nombre, lote in creados.items()}
+
+    yield ids
+
+    db.session.rollback()
+    InventarioModel.query.delete()
+    StockProductoModel.query.delete()
+    db.session.commit()
+
+
+def cantidades(lote_id):
+    lote = db.session.get(InventarioModel, lote_id)
+    return lote.cantidad_disponible, lote.cantidad_reservada
+
+
+def reservar(items):
+    with patch('aplicacion.comandos.reservar_inventario.sse_client_manager'), \
+            patch('aplicacion.comandos.reservar_inventario.despachador_eventos') as despachador:
+        resultado = ReservarInventarioHandler().handle(ReservarInventario(items=items))
+    return resultado, despachador
+
+
+def test_reserva_por_vencimiento_y_retorna_asignacion_por_lote(lotes):
+    resultado, despachador = reservar([{'producto_id': 'prod-1', 'cantidad': 6}])
+
+    assert resultado['success'] is True
+    assert [(a['lote_id'], a['cantidad']) for a in resultado['asignaciones']] == [
+        (lotes['proximo'], 4), (lotes['tardio'], 2)
+    ]
+    assert cantidades(lotes['proximo']) == (0, 4)
+    assert cantidades(lotes['tardio']) == (8, 2)
+    # Los lotes vencidos no se reservan
+    assert cantidades(lotes['vencido']) == (50, 0)
+
+    evento = despachador.publicar_evento.call_args[0][0]
+    assert evento.cantidad_disponible_restante == 8 + 50
+    assert evento.cantidad_reservada == 4 + 2 + 7
+
+
+def test_items_repetidos_se_reservan_como_un_solo_total(lotes):
+    resultado, _ = reservar([
+        {'producto_id': 'prod-1', 'cantidad': 3},
+        {'producto_id': 'prod-1', 'cantidad': 3},
+    ])
+
+    assert resultado['success'] is True
+    assert cantidades(lotes['proximo']) == (0, 4)
+    assert cantidades(lotes['tardio']) == (8, 2)
+
+
+def test_stock_insuficiente_no_reserva_ningun_producto(lotes):
+    resultado, despachador = reservar([
+        {'producto_id': 'prod-2', 'cantidad': 5},
+        {'producto_id': 'prod-1', 'cantidad': 15},
+    ])
+
+    assert resultado['success'] is False
+    assert 'Disponible: 14 unidades' in resultado['error']
+    assert cantidades(lotes['otro']) == (8, 0)
+    despachador.publicar_evento.assert_not_called()
+
+
+def test_producto_sin_lotes_no_encontrado(lotes):
+    resultado, _ = reservar([{'producto_id': 'prod-inexistente', 'cantidad': 1}])
+
+    assert resultado['success'] is False
+    assert 'no encontrado en inventario' in resultado['error']
+
+
+def test_una_consulta_de_bloqueo_y_una_transaccion_para_todo_el_pedido(lotes):
+    sentencias = []
+    contar = lambda conn, cursor, sql, params, context, executemany: sentencias.append(sql)
+    event.listen(db.engine, 'before_cursor_execute', contar)
+    try:
+        with patch.object(db.session, 'commit', wraps=db.session.commit) as commit:
+            resultado, _ = reservar([
+                {'producto_id': 'prod-1', 'cantidad': 6},
+                {'producto_id': 'prod-2', 'cantidad': 1},
+            ])
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', contar)
+
+    assert resultado['success'] is True
+    commit.assert_called_once()
+    selects = [s for s in sentencias if s.lstrip().upper().startswith('SELECT')]
+    updates = [s for s in sentencias if s.lstrip().upper().startswith('UPDATE')]
+    # Un bloqueo para todos los productos y los totales de todos para los eventos
+    assert len(selects) == 2
+    # Todas las reservas en un solo UPDATE por lotes
+    assert len(updates) == 1
+
+
+def test_bloqueo_usa_for_update_skip_locked(app_context):
+    with patch('infraestructura.repositorios.InventarioModel.query') as query:
+        cadena = query.filter.return_value.order_by.return_value
+        cadena.with_for_update.return_value.all.return_value = []
+        RepositorioInventarioSQLite().bloquear_lotes_para_reserva(['prod-1'])
+
+    cadena.with_for_update.assert_called_once_with(skip_locked=True)
+
+    sql = str(
+        InventarioModel.query.filter(InventarioModel.producto_id == 'prod-1')
+        .with_for_update(skip_locked=True)
+        .statement.compile(dialect=postgresql.dialect())
+    )
+    assert 'FOR UPDATE SKIP LOCKED' in sql
+
+
+def descontar(items):
+    with patch('aplicacion.comandos.descontar_inventario.sse_client_manager'), \
+            patch('aplicacion.comandos.descontar_inventario.despachador_eventos') as despachador:
+        resultado = DescontarInventarioHandler().handle(DescontarInventario(items=items))
+    return resultado, despachador
+
+
+def test_descuento_de_varios_productos_en_una_transaccion(lotes):
+    reservar([{'producto_id': 'prod-1', 'cantidad': 6}, {'producto_id': 'prod-2', 'cantidad': 3}])
+
+    sentencias = []
+    contar = lambda conn, cursor, sql, params, context, executemany: sentencias.append(sql)
+    event.listen(db.engine, 'before_cursor_execute', contar)
+    try:
+        with patch.object(db.session, 'commit', wraps=db.session.commit) as commit:
+            resultado, despachador = descontar([
+                {'producto_id': 'prod-1', 'cantidad': 10},
+                {'producto_id': 'prod-2', 'cantidad': 2},
+            ])
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', contar)
+
+    assert resultado['success'] is True
+    # Reservados en prod-1: agotado (7, vence primero), próximo (4) y tardío (2)
+    assert [(a['lote_id'], a['cantidad']) for a in resultado['asignaciones']] == [
+        (lotes['agotado'], 7), (lotes['proximo'], 3), (lotes['otro'], 2)
+    ]
+    assert cantidades(lotes['agotado']) == (0, 0)
+    assert cantidades(lotes['proximo']) == (0, 1)
+    assert cantidades(lotes['tardio']) == (8, 2)
+    assert cantidades(lotes['otro']) == (5, 1)
+    commit.assert_called_once()
+    assert len([s for s in sentencias if s.lstrip().upper().startswith('UPDATE')]) == 1
+    assert len([s for s in sentencias if s.lstrip().upper().startswith('SELECT')]) == 2
+
+    eventos = {e.producto_id: e for e in (c[0][0] for c in despachador.publicar_evento.call_args_list)}
+    assert eventos['prod-1'].cantidad_descontada == 10
+    assert eventos['prod-1'].cantidad_reservada_restante == 3
+
+
+def test_descuento_insuficiente_no_descuenta_ningun_producto(lotes):
+    reservar([{'producto_id': 'prod-2', 'cantidad': 3}])
+
+    resultado, _ = descontar([
+        {'producto_id': 'prod-2', 'cantidad': 3},
+        {'producto_id': 'prod-1', 'cantidad': 8},
+    ])
+
+    assert resultado['success'] is False
+    assert 'Reservada: 7, A descontar: 8' in resultado['error']
+    assert cantidades(lotes['otro']) == (5, 3)
+
+
+def stock(producto_id):
+    return RepositorioInventarioSQLite().obtener_stock(producto_id)
+
+
+def totales_lotes(producto_id):
+    lotes = InventarioModel.query.filter_by(producto_id=producto_id).all()
+    return sum(l.cantidad_disponible for l in lotes), sum(l.cantidad_reservada for l in lotes)
+
+
+def test_resumen_de_stock_consistente_tras_reservar_y_descontar(lotes):
+    assert stock('prod-1') == (64, 7)
+
+    reservar([{'producto_id': 'prod-1', 'cantidad': 6}, {'producto_id': 'prod-2', 'cantidad': 3}])
+    assert stock('prod-1') == totales_lotes('prod-1') == (58, 13)
+    assert stock('prod-2') == totales_lotes('prod-2') == (5, 3)
+
+    descontar([{'producto_id': 'prod-1', 'cantidad': 10}])
+    assert stock('prod-1') == totales_lotes('prod-1') == (58, 3)
+
+
+def test_reserva_fallida_no_modifica_el_resumen(lotes):
+    reservar([{'producto_id': 'prod-2', 'cantidad': 5}, {'producto_id': 'prod-1', 'cantidad': 15}])
+
+    assert stock('prod-1') == (64, 7)
+    assert stock('prod-2') == (8, 0)
+
+
+def test_escrituras_de_lotes_del_repositorio_mantienen_el_resumen(lotes):
+    from aplicacion.dto import InventarioDTO
+
+    repositorio = RepositorioInventarioSQLite()
+    nuevo = InventarioDTO(
+        producto_id='prod-3', cantidad_disponible=12, cantidad_reservada=0,
+        fecha_vencimiento=datetime.now() + timedelta(days=40), bodega_id='bodega-1'
+    )
+    repositorio.crear_o_actualizar(nuevo)
+    assert stock('prod-3') == (12, 0)
+
+    repositorio.crear_o_actualizar(replace(nuevo, cantidad_disponible=20))
+    assert stock('prod-3') == (20, 0)
+
+    repositorio.actualizar_cantidades_lote(lotes['otro'], 6, 2)
+    assert stock('prod-2') == (6, 2)
+
+    repositorio.eliminar('prod-3')
+    assert stock('prod-3') is None
+
+
+def test_reconciliar_corrige_el_resumen_desviado(lotes):
+    repositorio = RepositorioInventarioSQLite()
+    db.session.get(StockProductoModel, 'prod-1').cantidad_disponible = 999
+    db.session.delete(db.session.get(StockProductoModel, 'prod-2'))
+    db.session.add(StockProductoModel(producto_id='prod-huerfano', cantidad_disponible=3, cantidad_reservada=0))
+    db.session.commit()
+
+    assert repositorio.reconciliar_stock() == 3
+    assert repositorio.obtener_stock_todos() == {'prod-1': (64, 7), 'prod-2': (8, 0)}
+    assert repositorio.reconciliar_stock() == 0
+
+
+def test_lectura_de_stock_por_clave_primaria_sin_leer_lotes(lotes):
+    sentencias = []
+    contar = lambda conn, cursor, sql, params, context, executemany: sentencias.append(sql)
+    event.listen(db.engine, 'before_cursor_execute', contar)
+    try:
+        assert stock('prod-1') == (64, 7)
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', contar)
+
+    assert len(sentencias) == 1
+    assert 'FROM stock_producto' in sentencias[0]
+    assert 'inventario' not in sentencias[0]
+
+
+def test_entrega_de_pedido_actualiza_el_resumen_de_stock(lotes):
+    from aplicacion.comandos.entrega_inventario import EntregaInventario, EntregaInventarioHandler
+
+    reservar([{'producto_id': 'prod-2', 'cantidad': 4}])
+    assert stock('prod-2') == (4, 4)
+
+    resultado = EntregaInventarioHandler().handle(EntregaInventario(items=[{'producto_id': 'prod-2', 'cantidad': 4}]))
+
+    assert resultado['success'] is True
+    assert cantidades(lotes['otro']) == (4, 0)
+    assert stock('prod-2') == totales_lotes('prod-2') == (4, 0)
+
+
+def test_crear_o_actualizar_usa_la_clave_del_lote_con_bodega(lotes):
+    from aplicacion.dto import InventarioDTO
+
+    repositorio = RepositorioInventarioSQLite()
+    vencimiento = db.session.get(InventarioModel, lotes['otro']).fecha_vencimiento
+    # Mismo producto y vencimiento que el lote 'otro' (bodega-1), en otra bodega
+    repositorio.crear_o_actualizar(InventarioDTO(
+        producto_id='prod-2', cantidad_disponible=3, cantidad_reservada=0,
+        fecha_vencimiento=vencimiento, bodega_id='bodega-2'
+    ))
+    assert cantidades(lotes['otro']) == (8, 0)
+    assert db.session.get(InventarioModel, lotes['otro']).bodega_id == 'bodega-1'
+
+    repositorio.crear_o_actualizar(InventarioDTO(
+        producto_id='prod-2', cantidad_disponible=5, cantidad_reservada=0,
+        fecha_vencimiento=vencimiento, bodega_id='bodega-2'
+    ))
+    lotes_prod_2 = {l.bodega_id: l.cantidad_disponible for l in InventarioModel.query.filter_by(producto_id='prod-2')}
+    assert lotes_prod_2 == {'bodega-1': 8, 'bodega-2': 5}
+    assert stock('prod-2') == (13, 0)
+
+
+def reserva_concurrente(lote_id, producto_id, cantidad):
+    """Otra transacción reserva sobre el lote y confirma, como lo haría ReservarInventarioHandler."""
+    lotes, resumen = InventarioModel.__table__, StockProductoModel.__table__
+    with db.engine.begin() as conexion:
+        conexion.execute(lotes.update().where(lotes.c.id == lote_id).values(
+            cantidad_disponible=lotes.c.cantidad_disponible - cantidad,
+            cantidad_reservada=lotes.c.cantidad_reservada + cantidad
+        ))
+        conexion.execute(resumen.update().where(resumen.c.producto_id == producto_id).values(
+            cantidad_disponible=resumen.c.cantidad_disponible - cantidad,
+            cantidad_reservada=resumen.c.cantidad_reservada + cantidad
+        ))
+
+
+@pytest.mark.parametrize('escritura', ['actualizar_cantidades_lote', 'crear_o_actualizar'])
+def test_escrituras_absolutas_calculan_el_delta_sobre_el_lote_bloqueado(lotes, escritura):
+    from aplicacion.dto import InventarioDTO
+
+    repositorio = RepositorioInventarioSQLite()
+    lote = db.session.get(InventarioModel, lotes['otro'])
+    assert (lote.cantidad_disponible, lote.cantidad_reservada) == (8, 0)
+    reserva_concurrente(lotes['otro'], 'prod-2', 2)
+
+    sentencias = []
+    registrar = lambda conn, cursor, sql, params, context, executemany: sentencias.append(context.compiled.statement)
+    event.listen(db.engine, 'before_cursor_execute', registrar)
+    try:
+        if escritura == 'actualizar_cantidades_lote':
+            assert repositorio.actualizar_cantidades_lote(lotes['otro'], 10, 0)
+        else:
+            repositorio.crear_o_actualizar(InventarioDTO(
+                id=lotes['otro'], producto_id='prod-2', cantidad_disponible=10, cantidad_reservada=0,
+                fecha_vencimiento=lote.fecha_vencimiento, bodega_id='bodega-1'
+            ))
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', registrar)
+
+    lectura = str(sentencias[0].compile(dialect=postgresql.dialect()))
+    assert lectura.startswith('SELECT') and lectura.endswith('FOR UPDATE')
+    assert stock('prod-2') == totales_lotes('prod-2') == (10, 0)
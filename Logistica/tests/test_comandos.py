@@ -30,12 +30,14 @@ class TestDescontarInventario:
 
     def test_handle_producto_no_encontrado(self):
         comando = DescontarInventario(items=[{"producto_id": "prod-1", "cantidad": 5}])
-        self.mock_repositorio.obtener_por_producto_id.return_value = None
+        self.mock_repositorio.bloquear_lotes_para_descuento.return_value = {}
+        self.mock_repositorio.productos_con_inventario.return_value = set()
         
         resultado = self.handler.handle(comando)
         
         assert resultado['success'] == False
         assert 'no encontrado en inventario' in resultado['error']
+        self.mock_repositorio.revertir.assert_called_once()
 
     def test_handle_cantidad_reservada_insuficiente(self):
         comando = DescontarInventario(items=[{"producto_id": "prod-1", "cantidad": 10}])
@@ -45,12 +47,13 @@ class TestDescontarInventario:
             cantidad_reservada=5,
             fecha_vencimiento=datetime.now() + timedelta(days=30)
         )
-        self.mock_repositorio.obtener_por_producto_id.return_value = [inventario_dto]
+        self.mock_repositorio.bloquear_lotes_para_descuento.return_value = {"prod-1": [inventario_dto]}
         
         resultado = self.handler.handle(comando)
         
         assert resultado['success'] == False
         assert 'Cantidad reservada insuficiente' in resultado['error']
+        self.mock_repositorio.aplicar_descuentos.assert_not_called()
 
     def test_handle_exitoso(self):
         comando = DescontarInventario(items=[{"producto_id": "prod-1", "cantidad": 5}])
@@ -61,25 +64,16 @@ class TestDescontarInventario:
             fecha_vencimiento=datetime.now() + timedelta(days=30),
             bodega_id="bodega-1"
         )
-        self.mock_repositorio.obtener_por_producto_id.return_value = [inventario_dto]
-        
-        with patch('infraestructura.modelos.InventarioModel') as mock_inventario_model, \
-             patch('config.db.db') as mock_db:
-            # Mock del modelo de inventario
-            mock_lote = Mock()
-            mock_lote.cantidad_disponible = 20
-            mock_lote.cantidad_reservada = 10
-            mock_lote.fecha_vencimiento = datetime.now() + timedelta(days=30)
-            mock_inventario_model.query.filter_by.return_value.first.return_value = mock_lote
-            
-            # Mock de la sesión de DB
-            mock_db.session.commit.return_value = None
-            
-            resultado = self.handler.handle(comando)
-            
-            assert resultado['success'] == True
-            assert 'Inventario descontado exitosamente' in resultado['message']
-            mock_db.session.commit.assert_called()
+        self.mock_repositorio.bloquear_lotes_para_descuento.return_value = {"prod-1": [inventario_dto]}
+        self.mock_repositorio.obtener_totales_por_producto.return_value = {"prod-1": (20, 5)}
+        
+        resultado = self.handler.handle(comando)
+        
+        assert resultado['success'] == True
+        assert 'Inventario descontado exitosamente' in resultado['message']
+        self.mock_repositorio.aplicar_descuentos.assert_called_once_with(resultado['asignaciones'])
+        assert resultado['asignaciones'][0]['cantidad'] == 5
+        assert resultado['asignaciones'][0]['bodega_id'] == "bodega-1"
 
     def test_handle_error_descontar_cantidad(self):
         comando = DescontarInventario(items=[{"producto_id": "prod-1", "cantidad": 5}])
@@ -90,28 +84,18 @@ class TestDescontarInventario:
             fecha_vencimiento=datetime.now() + timedelta(days=30),
             bodega_id="bodega-1"
         )
-        self.mock_repositorio.obtener_por_producto_id.return_value = [inventario_dto]
-        
-        with patch('infraestructura.modelos.InventarioModel') as mock_inventario_model, \
-             patch('config.db.db') as mock_db:
-            # Mock del modelo de inventario
-            mock_lote = Mock()
-            mock_lote.cantidad_disponible = 20
-            mock_lote.cantidad_reservada = 10
-            mock_lote.fecha_vencimiento = datetime.now() + timedelta(days=30)
-            mock_inventario_model.query.filter_by.return_value.first.return_value = mock_lote
-            
-            # Mock de la sesión de DB que falla
-            mock_db.session.commit.side_effect = Exception("Error en DB")
-            
-            resultado = self.handler.handle(comando)
-            
-            assert resultado['success'] == False
-            assert 'Error interno' in resultado['error']
+        self.mock_repositorio.bloquear_lotes_para_descuento.return_value = {"prod-1": [inventario_dto]}
+        self.mock_repositorio.aplicar_descuentos.side_effect = Exception("Error en DB")
+        
+        resultado = self.handler.handle(comando)
+        
+        assert resultado['success'] == False
+        assert 'Error interno' in resultado['error']
+        self.mock_repositorio.revertir.assert_called_once()
 
     def test_handle_excepcion(self):
         comando = DescontarInventario(items=[{"producto_id": "prod-1", "cantidad": 5}])
-        self.mock_repositorio.obtener_por_producto_id.side_effect = Exception("Error de BD")
+        self.mock_repositorio.bloquear_lotes_para_descuento.side_effect = Exception("Error de BD")
         
         resultado = self.handler.handle(comando)
         
@@ -138,12 +122,15 @@ class TestReservarInventario:
 
     def test_handle_producto_no_encontrado(self):
         comando = ReservarInventario(items=[{"producto_id": "prod-1", "cantidad": 5}])
-        self.mock_repositorio.obtener_por_producto_id.return_value = None
+        self.mock_repositorio.bloquear_lotes_para_reserva.return_value = {}
+        self.mock_repositorio.productos_con_inventario.return_value = set()
         
         resultado = self.handler.handle(comando)
         
         assert resultado['success'] == False
         assert 'no encontrado en inventario' in resultado['error']
+        self.mock_repositorio.revertir.assert_called_once()
+        self.mock_repositorio.aplicar_reservas.assert_not_called()
 
     def test_handle_stock_insuficiente(self):
         comando = ReservarInventario(items=[{"producto_id": "prod-1", "cantidad": 10}])
@@ -153,7 +140,7 @@ class TestReservarInventario:
             cantidad_reservada=0,
             fecha_vencimiento=datetime.now() + timedelta(days=30)
         )
-        self.mock_repositorio.obtener_por_producto_id.return_value = [inventario_dto]
+        self.mock_repositorio.bloquear_lotes_para_reserva.return_value = {"prod-1": [inventario_dto]}
         
         resultado = self.handler.handle(comando)
         
@@ -168,7 +155,8 @@ class TestReservarInventario:
             cantidad_reservada=0,
             fecha_vencimiento=datetime.now() + timedelta(days=30)
         )
-        self.mock_repositorio.obtener_por_producto_id.return_value = [inventario_dto]
+        self.mock_repositorio.bloquear_lotes_para_reserva.return_value = {"prod-1": [inventario_dto]}
+        self.mock_repositorio.obtener_totales_por_producto.return_value = {"prod-1": (5, 5)}
         
         with patch('aplicacion.comandos.reservar_inventario.Inventario') as mock_inventario_class:
             mock_inventario = Mock()
@@ -182,7 +170,9 @@ class TestReservarInventario:
             
             assert resultado['success'] == True
             assert 'Inventario reservado exitosamente' in resultado['message']
-            self.mock_repositorio.crear_o_actualizar.assert_called_once()
+            self.mock_repositorio.aplicar_reservas.assert_called_once_with(resultado['asignaciones'])
+            assert resultado['asignaciones'][0]['lote_id'] == inventario_dto.id
+            assert resultado['asignaciones'][0]['cantidad'] == 5
 
     def test_handle_error_reservar_cantidad(self):
         comando = ReservarInventario(items=[{"producto_id": "prod-1", "cantidad": 5}])
@@ -192,7 +182,7 @@ class TestReservarInventario:
             cantidad_reservada=0,
             fecha_vencimiento=datetime.now() + timedelta(days=30)
         )
-        self.mock_repositorio.obtener_por_producto_id.return_value = [inventario_dto]
+        self.mock_repositorio.bloquear_lotes_para_reserva.return_value = {"prod-1": [inventario_dto]}
         
         with patch('aplicacion.comandos.reservar_inventario.Inventario') as mock_inventario_class:
             mock_inventario = Mock()
@@ -203,12 +193,15 @@ class TestReservarInventario:
             
             assert resultado['success'] == False
             assert 'Error reservando inventario' in resultado['error']
+            self.mock_repositorio.revertir.assert_called_once()
+            self.mock_repositorio.aplicar_reservas.assert_not_called()
 
     def test_handle_excepcion(self):
         comando = ReservarInventario(items=[{"producto_id": "prod-1", "cantidad": 5}])
-        self.mock_repositorio.obtener_por_producto_id.side_effect = Exception("Error de BD")
+        self.mock_repositorio.bloquear_lotes_para_reserva.side_effect = Exception("Error de BD")
         
         resultado = self.handler.handle(comando)
         
         assert resultado['success'] == False
         assert 'Error interno' in resultado['error']
+        self.mock_repositorio.revertir.assert_called_once()
@@ -0,0 +1,153 @@
+import json
+import os
+import tempfile
+from unittest.mock import Mock, patch
+
+import pytest
+from flask import Flask
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import IntegrityError
+
+from config.db import db
+from config.migraciones import MIGRACIONES, ejecutar_migraciones
+
+
+@pytest.fixture
+def app_legacy():
+    """App con una tabla `entregas` creada con el esquema anterior (sin columnas de pedido)."""
+    db_fd, db_path = tempfile.mkstemp()
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{db_path}'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+
+    with app.app_context():
+        with db.engine.begin() as conexion:
+            conexion.execute(text(
+                "CREATE TABLE entregas (id VARCHAR(36) PRIMARY KEY, direccion VARCHAR(255) NOT NULL, "
+                "fecha_entrega DATETIME NOT NULL, pedido JSON, created_at DATETIME, updated_at DATETIME)"
+            ))
+            filas = [
+                ('e1', json.dumps(json.dumps({'id': 'pedido-1', 'estado': 'confirmado'}))),
+                ('e2', json.dumps(json.dumps({'cliente_id': 'c1'}))),
+                ('e3', None),
+            ]
+            for entrega_id, pedido in filas:
+                conexion.execute(
+                    text("INSERT INTO entregas (id, direccion, fecha_entrega, pedido) "
+                         "VALUES (:id, 'Calle 1', '2025-11-10 09:00:00', :pedido)"),
+                    {'id': entrega_id, 'pedido': pedido}
+                )
+        yield app
+        db.session.remove()
+
+    os.close(db_fd)
+    os.unlink(db_path)
+
+
+def test_migracion_agrega_columnas_indices_y_rellena(app_legacy):
+    with app_legacy.app_context():
+        ejecutar_migraciones(db)
+
+        inspector = inspect(db.engine)
+        columnas = {c['name'] for c in inspector.get_columns('entregas')}
+        indices = {i['name'] for i in inspector.get_indexes('entregas')}
+        assert {'pedido_id', 'estado_pedido'} <= columnas
+        assert {'ix_entregas_pedido_id', 'ix_entregas_estado_pedido'} <= indices
+
+        filas = dict(db.session.execute(text("SELECT id, pedido_id FROM entregas")).all())
+        assert filas == {'e1': 'pedido-1', 'e2': None, 'e3': None}
+
+
+def test_migracion_es_idempotente(app_legacy):
+    with app_legacy.app_context():
+        ejecutar_migraciones(db)
+        ejecutar_migraciones(db)
+
+        estado = db.session.execute(text("SELECT estado_pedido FROM entregas WHERE id = 'e1'")).scalar()
+        assert estado == 'confirmado'
+
+
+def test_migraciones_se_registran_por_version_y_crean_indices(app_legacy):
+    with app_legacy.app_context():
+        ejecutar_migraciones(db)
+
+        versiones = db.session.execute(text("SELECT version FROM schema_migraciones ORDER BY version")).scalars().all()
+        assert versiones == [version for version, _, _ in MIGRACIONES]
+        indices = {i['name'] for i in inspect(db.engine).get_indexes('entregas')}
+        assert 'ix_entregas_fecha_entrega' in indices
+
+
+def test_solo_se_aplican_migraciones_pendientes(app_legacy):
+    nueva = Mock()
+    with app_legacy.app_context(), \
+            patch('config.migraciones.MIGRACIONES', MIGRACIONES + [(99, 'prueba', nueva)]):
+        ejecutar_migraciones(db)
+        ejecutar_migraciones(db)
+
+    nueva.assert_called_once_with(db)
+
+
+def test_clave_unica_de_lote_fusiona_duplicados(app_legacy):
+    with app_legacy.app_context():
+        with db.engine.begin() as conexion:
+            conexion.execute(text(
+                "CREATE TABLE inventario (id VARCHAR(36) PRIMARY KEY, producto_id VARCHAR(36) NOT NULL, "
+                "cantidad_disponible INTEGER NOT NULL, cantidad_reservada INTEGER NOT NULL, "
+                "fecha_vencimiento DATETIME NOT NULL, bodega_id VARCHAR(36), pasillo VARCHAR(10), "
+                "estante VARCHAR(10), created_at DATETIME, updated_at DATETIME, requiere_cadena_frio BOOLEAN NOT NULL)"
+            ))
+            for lote_id, bodega_id, disponible, reservada, creado in [
+                ('l1', 'b1', 10, 1, '2025-01-01 00:00:00'),
+                ('l2', 'b1', 5, 2, '2025-02-01 00:00:00'),
+                ('l3', 'b2', 7, 0, '2025-01-01 00:00:00'),
+            ]:
+                conexion.execute(
+                    text("INSERT INTO inventario VALUES (:id, 'prod-1', :disp, :res, '2026-06-30 00:00:00', "
+                         ":bodega, NULL, NULL, :creado, :creado, 0)"),
+                    {'id': lote_id, 'disp': disponible, 'res': reservada, 'bodega': bodega_id, 'creado': creado}
+                )
+
+        ejecutar_migraciones(db)
+
+        filas = db.session.execute(text(
+            "SELECT id, cantidad_disponible, cantidad_reservada FROM inventario ORDER BY id"
+        )).all()
+        assert [tuple(f) for f in filas] == [('l1', 15, 3), ('l3', 7, 0)]
+        indices = {i['name']: i for i in inspect(db.engine).get_indexes('inventario')}
+        assert indices['uq_inventario_lote']['unique']
+        assert 'ix_inventario_bodega_id' in indices
+
+
+def test_clave_unica_de_lote_sin_bodega_fusiona_duplicados(app_legacy):
+    with app_legacy.app_context():
+        with db.engine.begin() as conexion:
+            conexion.execute(text(
+                "CREATE TABLE inventario (id VARCHAR(36) PRIMARY KEY, producto_id VARCHAR(36) NOT NULL, "
+                "cantidad_disponible INTEGER NOT NULL, cantidad_reservada INTEGER NOT NULL, "
+                "fecha_vencimiento DATETIME NOT NULL, bodega_id VARCHAR(36), pasillo VARCHAR(10), "
+                "estante VARCHAR(10), created_at DATETIME, updated_at DATETIME, requiere_cadena_frio BOOLEAN NOT NULL)"
+            ))
+            for lote_id, bodega_id, disponible, reservada, creado in [
+                ('l1', None, 10, 1, '2025-01-01 00:00:00'),
+                ('l2', None, 5, 2, '2025-02-01 00:00:00'),
+                ('l3', 'b1', 7, 0, '2025-01-01 00:00:00'),
+            ]:
+                conexion.execute(
+                    text("INSERT INTO inventario VALUES (:id, 'prod-1', :disp, :res, '2026-06-30 00:00:00', "
+                         ":bodega, NULL, NULL, :creado, :creado, 0)"),
+                    {'id': lote_id, 'disp': disponible, 'res': reservada, 'bodega': bodega_id, 'creado': creado}
+                )
+
+        ejecutar_migraciones(db)
+
+        filas = db.session.execute(text(
+            "SELECT id, cantidad_disponible, cantidad_reservada FROM inventario ORDER BY id"
+        )).all()
+        assert [tuple(f) for f in filas] == [('l1', 15, 3), ('l3', 7, 0)]
+        with pytest.raises(IntegrityError):
+            with db.engine.begin() as conexion:
+                conexion.execute(text(
+                    "INSERT INTO inventario VALUES ('l4', 'prod-1', 1, 0, '2026-06-30 00:00:00', "
+                    "NULL, NULL, NULL, NULL, NULL, 0)"
+                ))
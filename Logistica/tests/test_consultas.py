@@ -79,7 +79,8 @@ class TestBuscarProductosConInventario:
             cantidad_reservada=5,
             fecha_vencimiento=fecha_vencimiento
         )
-        self.mock_repositorio.obtener_por_producto_id.return_value = [inventario_dto]
+        self.mock_repositorio.obtener_totales_por_producto.return_value = {"prod-1": (10, 5)}
+        self.mock_repositorio.obtener_por_producto_ids.return_value = {"prod-1": [inventario_dto]}
         
         resultado = self.handler.handle(consulta)
         
@@ -108,11 +109,12 @@ class TestBuscarProductosConInventario:
         self.mock_servicio_productos.buscar_productos.return_value = productos
         
         # Mock de sin inventario
-        self.mock_repositorio.obtener_por_producto_id.return_value = []
+        self.mock_repositorio.obtener_totales_por_producto.return_value = {}
         
         resultado = self.handler.handle(consulta)
         
         assert resultado == []
+        self.mock_repositorio.obtener_por_producto_ids.assert_not_called()
 
     def test_handle_multiples_lotes(self):
         consulta = BuscarProductosConInventario(termino="test")
@@ -146,7 +148,8 @@ class TestBuscarProductosConInventario:
                 fecha_vencimiento=fecha2
             )
         ]
-        self.mock_repositorio.obtener_por_producto_id.return_value = lotes
+        self.mock_repositorio.obtener_totales_por_producto.return_value = {"prod-1": (13, 5)}
+        self.mock_repositorio.obtener_por_producto_ids.return_value = {"prod-1": lotes}
         
         resultado = self.handler.handle(consulta)
         
@@ -174,6 +177,31 @@ class TestBuscarProductosConInventario:
         
         assert resultado == []
         # No debe llamar al repositorio si no hay ID
+        self.mock_repositorio.obtener_totales_por_producto.assert_not_called()
+        self.mock_repositorio.obtener_por_producto_ids.assert_not_called()
+
+    def test_handle_varios_productos_consulta_inventario_en_bloque(self):
+        consulta = BuscarProductosConInventario(termino="test")
+        self.mock_servicio_productos.buscar_productos.return_value = [
+            {"id": "prod-1", "nombre": "Producto 1"},
+            {"id": "prod-2", "nombre": "Producto 2"},
+            {"id": "prod-3", "nombre": "Producto 3"}
+        ]
+        lote = InventarioDTO(
+            producto_id="prod-3",
+            cantidad_disponible=4,
+            cantidad_reservada=1,
+            fecha_vencimiento=datetime.now() + timedelta(days=30)
+        )
+        self.mock_repositorio.obtener_totales_por_producto.return_value = {"prod-1": (7, 0), "prod-3": (4, 1)}
+        self.mock_repositorio.obtener_por_producto_ids.return_value = {"prod-3": [lote]}
+        
+        resultado = self.handler.handle(consulta)
+        
+        assert [p["id"] for p in resultado] == ["prod-1", "prod-3"]
+        assert resultado[0]["cantidad_disponible"] == 7
+        self.mock_repositorio.obtener_totales_por_producto.assert_called_once_with(["prod-1", "prod-2", "prod-3"])
+        self.mock_repositorio.obtener_por_producto_ids.assert_called_once_with(["prod-1", "prod-3"])
         self.mock_repositorio.obtener_por_producto_id.assert_not_called()
 
     def test_handle_excepcion(self):
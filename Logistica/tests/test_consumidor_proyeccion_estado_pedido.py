@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from aplicacion.eventos.consumidor_proyeccion_estado_pedido import ManejadorProyeccionEstadoPedido
+from config.db import db
+from dominio.eventos import PedidoConfirmado, PedidoEstadoActualizado
+from infraestructura.modelos import EstadoPedidoModel
+from seedwork.infraestructura.consumidor_pubsub import ConsumidorPubSub
+
+
+def _crear_manejador():
+    repo = MagicMock()
+    with patch('aplicacion.eventos.consumidor_proyeccion_estado_pedido.RepositorioEstadoPedidoSQLite', return_value=repo):
+        manejador = ManejadorProyeccionEstadoPedido()
+    return manejador, repo
+
+
+def test_registra_estado_actualizado():
+    manejador, repo = _crear_manejador()
+    fecha = datetime(2025, 11, 10, 8, 30)
+
+    manejador.manejar(PedidoEstadoActualizado(pedido_id='p1', estado='en_transito', fecha_actualizacion=fecha))
+
+    repo.registrar.assert_called_once_with(pedido_id='p1', estado='en_transito', fecha_estado=fecha)
+
+
+def test_registra_confirmado_desde_pedido_confirmado():
+    manejador, repo = _crear_manejador()
+
+    manejador.manejar(PedidoConfirmado(pedido_id='p2'))
+
+    assert repo.registrar.call_args.kwargs['estado'] == 'confirmado'
+
+
+def test_ignora_evento_sin_pedido():
+    manejador, repo = _crear_manejador()
+
+    manejador.manejar(PedidoEstadoActualizado(pedido_id='', estado='entregado'))
+
+    repo.registrar.assert_not_called()
+
+
+def test_error_en_repositorio_no_propaga():
+    manejador, repo = _crear_manejador()
+    repo.registrar.side_effect = Exception('fallo')
+
+    manejador.manejar(PedidoEstadoActualizado(pedido_id='p3', estado='entregado'))
+
+
+@pytest.fixture
+def consumidor():
+    with patch.object(ConsumidorPubSub, '_initialize_subscriber'):
+        yield ConsumidorPubSub()
+
+
+@pytest.fixture
+def proyeccion(app_context):
+    yield ManejadorProyeccionEstadoPedido()
+    EstadoPedidoModel.query.delete()
+    db.session.commit()
+
+
+def _mensaje(tipo_evento, fecha_evento, **datos):
+    return {'tipo_evento': tipo_evento, 'fecha_evento': fecha_evento.isoformat(), 'datos': datos}
+
+
+def test_pedido_confirmado_conserva_fecha_del_publicador(consumidor):
+    publicado = datetime(2025, 11, 10, 8, 0)
+
+    evento = consumidor._crear_evento_desde_datos(_mensaje('PedidoConfirmado', publicado, pedido_id='p1'))
+
+    assert evento.fecha_evento == publicado
+
+
+@pytest.mark.parametrize('estado', ['en_transito', 'entregado'])
+def test_pedido_confirmado_tardio_no_sobrescribe_estado_posterior(consumidor, proyeccion, estado):
+    confirmado = datetime.utcnow() - timedelta(minutes=10)
+    actualizado = confirmado + timedelta(minutes=5)
+    mensajes = [
+        _mensaje('PedidoConfirmado', confirmado, pedido_id='p1'),
+        _mensaje('PedidoEstadoActualizado', actualizado, pedido_id='p1', estado=estado,
+                 fecha_actualizacion=actualizado.isoformat()),
+    ]
+
+    # El estado posterior llega primero y el PedidoConfirmado se entrega (o reentrega) después
+    for mensaje in reversed(mensajes):
+        proyeccion.manejar(consumidor._crear_evento_desde_datos(mensaje))
+
+    fila = db.session.get(EstadoPedidoModel, 'p1')
+    assert fila.estado == estado
+    assert fila.fecha_estado == actualizado
@@ -0,0 +1,157 @@
+"""
+Regresión de planes de consulta: las consultas frecuentes de inventario, rutas y entregas
+deben resolverse con índices. Se capturan las sentencias que emiten los repositorios y se
+revisa su plan:
+
+- SQLite (siempre): EXPLAIN QUERY PLAN; un `SCAN <tabla>` sin índice equivale a un seq scan.
+- PostgreSQL (solo con TEST_LOGISTICA_DATABASE_URL): EXPLAIN con `enable_seqscan = off`, para
+  que con tablas pequeñas el planificador use un índice siempre que exista uno aplicable;
+  un `Seq Scan on <tabla>` que sobrevive indica que falta el índice.
+"""
+import os
+import uuid
+from datetime import date, datetime, timedelta
+
+import pytest
+from flask import Flask
+from sqlalchemy import event
+
+from config.db import configurar_db, db, migrar_esquema
+from infraestructura.modelos import EntregaModel, InventarioModel, RutaModel, RutaEntregaModel
+from infraestructura.repositorios import (
+    RepositorioBodegaSQLite,
+    RepositorioEntregaSQLite,
+    RepositorioInventarioSQLite,
+    RepositorioRutaSQLite,
+)
+
+TABLAS_FRECUENTES = {'inventario', 'entregas', 'rutas', 'ruta_entregas'}
+URL_POSTGRESQL = os.getenv('TEST_LOGISTICA_DATABASE_URL')
+
+
+@pytest.fixture(params=[
+    'sqlite',
+    pytest.param('postgresql', marks=pytest.mark.skipif(
+        not URL_POSTGRESQL, reason='TEST_LOGISTICA_DATABASE_URL no configurada'
+    )),
+])
+def contexto(request):
+    if request.param == 'sqlite':
+        yield request.getfixturevalue('app_context')
+        return
+
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = URL_POSTGRESQL
+    configurar_db(app)
+    with app.app_context():
+        migrar_esquema()
+        yield app
+        db.session.remove()
+
+
+@pytest.fixture
+def datos(contexto):
+    entrega = EntregaModel(id=str(uuid.uuid4()), direccion='Calle 1', fecha_entrega=datetime(2025, 11, 10, 9))
+    ruta = RutaModel(id=str(uuid.uuid4()), fecha_ruta=date(2025, 11, 10), repartidor_id='rep-1', bodega_id='bodega-1')
+    db.session.add_all([entrega, ruta])
+    db.session.flush()
+    db.session.add(RutaEntregaModel(ruta_id=ruta.id, entrega_id=entrega.id))
+    db.session.add(InventarioModel(
+        producto_id='prod-1', cantidad_disponible=5, cantidad_reservada=1,
+        fecha_vencimiento=datetime.now() + timedelta(days=30), bodega_id='bodega-1'
+    ))
+    db.session.commit()
+
+    yield {'entrega_id': entrega.id, 'ruta_id': ruta.id}
+
+    db.session.rollback()
+    for modelo in (RutaEntregaModel, RutaModel, EntregaModel, InventarioModel):
+        modelo.query.delete()
+    db.session.commit()
+
+
+def capturar_sentencias(funcion):
+    sentencias = []
+
+    def registrar(conn, cursor, sql, params, context, executemany):
+        if sql.lstrip().upper().startswith('SELECT') and not executemany:
+            sentencias.append((sql, params))
+
+    event.listen(db.engine, 'before_cursor_execute', registrar)
+    try:
+        funcion()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', registrar)
+    return sentencias
+
+
+def escaneos_secuenciales(sentencias):
+    if db.engine.dialect.name == 'postgresql':
+        return escaneos_secuenciales_postgresql(sentencias)
+
+    escaneos = []
+    conexion = db.session.connection().connection.driver_connection
+    for sql, params in sentencias:
+        for fila in conexion.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall():
+            detalle = fila[-1]
+            partes = detalle.split()
+            if partes[0] == 'SCAN' and partes[1] in TABLAS_FRECUENTES and 'INDEX' not in detalle:
+                escaneos.append(f"{detalle}  <-  {sql}")
+    return escaneos
+
+
+def escaneos_secuenciales_postgresql(sentencias):
+    escaneos = []
+    with db.session.connection().connection.driver_connection.cursor() as cursor:
+        cursor.execute("SET LOCAL enable_seqscan = off")
+        for sql, params in sentencias:
+            cursor.execute(f"EXPLAIN {sql}", params)
+            for (detalle,) in cursor.fetchall():
+                partes = detalle.split()
+                if 'Seq Scan on' in detalle and partes[partes.index('on') + 1] in TABLAS_FRECUENTES:
+                    escaneos.append(f"{detalle.strip()}  <-  {sql}")
+    return escaneos
+
+
+def consultas_inventario(datos):
+    repositorio = RepositorioInventarioSQLite()
+    repositorio.obtener_por_producto_id('prod-1')
+    repositorio.obtener_por_producto_ids(['prod-1', 'prod-2'])
+    repositorio.bloquear_lotes_para_reserva(['prod-1', 'prod-2'])
+    repositorio.bloquear_lotes_para_descuento(['prod-1'])
+    repositorio.revertir()
+    repositorio.productos_con_inventario(['prod-1'])
+    RepositorioBodegaSQLite().obtener_inventario_por_bodega('bodega-1')
+
+
+def consultas_rutas(datos):
+    repositorio = RepositorioRutaSQLite()
+    repositorio.obtener_por_fecha_y_repartidor(fecha=date(2025, 11, 10), repartidor_id='rep-1')
+    repositorio.obtener_por_fecha_y_repartidor(fecha=date(2025, 11, 10))
+    repositorio.obtener_entregas_asignadas(datos['ruta_id'])
+    repositorio.entrega_ya_asignada(datos['entrega_id'])
+    repositorio.entregas_ya_asignadas([datos['entrega_id']])
+
+
+def consultas_entregas(datos):
+    repositorio = RepositorioEntregaSQLite()
+    inicio, fin = datetime(2025, 11, 1), datetime(2025, 11, 30)
+    repositorio.obtener_por_rango(inicio, fin)
+    repositorio.obtener_por_rango(inicio, fin, con_ruta=True)
+    repositorio.obtener_por_rango(inicio, fin, con_ruta=False)
+
+
+@pytest.mark.parametrize('consultas', [consultas_inventario, consultas_rutas, consultas_entregas])
+def test_consultas_frecuentes_usan_indices(datos, consultas):
+    sentencias = capturar_sentencias(lambda: consultas(datos))
+
+    assert sentencias
+    assert escaneos_secuenciales(sentencias) == []
+
+
+def test_detecta_escaneo_secuencial(datos):
+    sentencias = capturar_sentencias(
+        lambda: InventarioModel.query.filter(InventarioModel.pasillo == 'A').all()
+    )
+
+    assert escaneos_secuenciales(sentencias)
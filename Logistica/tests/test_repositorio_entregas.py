@@ -0,0 +1,246 @@
+import json
+import uuid
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import event
+
+from config.db import db
+from infraestructura.modelos import EntregaModel, RutaModel, RutaEntregaModel, EstadoPedidoModel
+from infraestructura.repositorios import RepositorioEntregaSQLite, RepositorioRutaSQLite, RepositorioEstadoPedidoSQLite
+
+
+@pytest.fixture
+def entregas(app_context):
+    fecha = datetime(2025, 11, 10, 9, 0)
+    creadas = []
+    for i in range(3):
+        entrega = EntregaModel(
+            id=str(uuid.uuid4()),
+            direccion=f'Calle {i}',
+            fecha_entrega=fecha + timedelta(hours=i),
+            pedido=json.dumps({'id': f'pedido-{i}', 'estado': 'confirmado'})
+        )
+        db.session.add(entrega)
+        creadas.append(entrega)
+    db.session.commit()
+
+    yield creadas
+
+    RutaEntregaModel.query.delete()
+    RutaModel.query.delete()
+    EstadoPedidoModel.query.delete()
+    EntregaModel.query.delete()
+    db.session.commit()
+
+
+def test_obtener_todos_sincroniza_estados_en_una_llamada(entregas):
+    repo = RepositorioEntregaSQLite()
+
+    with patch.object(repo._estados_pedido._servicio_pedidos, 'obtener_estados_pedidos',
+                      return_value={'pedido-0': 'entregado', 'pedido-2': 'en_transito'}) as mock_estados, \
+            patch.object(repo._estados_pedido._servicio_pedidos, 'obtener_pedido_por_id') as mock_individual:
+        resultado = repo.obtener_todos()
+
+    mock_estados.assert_called_once()
+    mock_individual.assert_not_called()
+    estados = {e.pedido['id']: e.pedido['estado'] for e in resultado}
+    assert estados == {'pedido-0': 'entregado', 'pedido-1': 'confirmado', 'pedido-2': 'en_transito'}
+
+
+def test_obtener_por_rango_sincroniza_estados_en_una_llamada(entregas):
+    repo = RepositorioEntregaSQLite()
+    fecha = datetime(2025, 11, 10)
+
+    with patch.object(repo._estados_pedido._servicio_pedidos, 'obtener_estados_pedidos',
+                      return_value={'pedido-1': 'entregado'}) as mock_estados:
+        resultado = repo.obtener_por_rango(fecha, fecha)
+
+    mock_estados.assert_called_once()
+    assert {e.pedido['id']: e.pedido['estado'] for e in resultado}['pedido-1'] == 'entregado'
+
+
+def test_obtener_entregas_asignadas_sincroniza_estados_en_una_llamada(entregas):
+    ruta = RutaModel(id=str(uuid.uuid4()), fecha_ruta=datetime(2025, 11, 10).date(),
+                     repartidor_id='repartidor-1', bodega_id='bodega-1')
+    db.session.add(ruta)
+    for entrega in entregas:
+        db.session.add(RutaEntregaModel(id=str(uuid.uuid4()), ruta_id=ruta.id, entrega_id=entrega.id))
+    db.session.commit()
+
+    repo = RepositorioRutaSQLite()
+    with patch.object(repo._estados_pedido._servicio_pedidos, 'obtener_estados_pedidos',
+                      return_value={'pedido-0': 'en_transito'}) as mock_estados:
+        resultado = repo.obtener_entregas_asignadas(ruta.id)
+
+    mock_estados.assert_called_once()
+    assert {e.pedido['id']: e.pedido['estado'] for e in resultado}['pedido-0'] == 'en_transito'
+
+
+def test_obtener_todos_usa_proyeccion_local_sin_llamar_a_ventas(entregas):
+    repo = RepositorioEntregaSQLite()
+    for i in range(3):
+        repo._estados_pedido.registrar(f'pedido-{i}', 'en_transito')
+
+    with patch.object(repo._estados_pedido._servicio_pedidos, 'obtener_estados_pedidos') as mock_estados:
+        resultado = repo.obtener_todos()
+
+    mock_estados.assert_not_called()
+    assert {e.pedido['estado'] for e in resultado} == {'en_transito'}
+
+
+def test_proyeccion_consulta_ventas_solo_para_filas_faltantes(entregas):
+    repo = RepositorioEstadoPedidoSQLite()
+    repo.registrar('pedido-0', 'en_transito')
+
+    with patch.object(repo._servicio_pedidos, 'obtener_estados_pedidos',
+                      return_value={'pedido-1': 'confirmado'}) as mock_estados:
+        estados = repo.obtener_estados(['pedido-0', 'pedido-1'])
+
+    mock_estados.assert_called_once_with(['pedido-1'])
+    assert estados == {'pedido-0': 'en_transito', 'pedido-1': 'confirmado'}
+    assert db.session.get(EstadoPedidoModel, 'pedido-1').estado == 'confirmado'
+
+
+def test_proyeccion_sin_fallback_no_consulta_ventas(entregas, monkeypatch):
+    monkeypatch.setenv('ESTADO_PEDIDO_FALLBACK_VENTAS', 'false')
+    repo = RepositorioEstadoPedidoSQLite()
+
+    with patch.object(repo._servicio_pedidos, 'obtener_estados_pedidos') as mock_estados:
+        estados = repo.obtener_estados(['pedido-0'])
+
+    mock_estados.assert_not_called()
+    assert estados == {}
+
+
+def test_proyeccion_refresca_filas_caducadas(entregas, monkeypatch):
+    monkeypatch.setenv('ESTADO_PEDIDO_MAX_EDAD_SEGUNDOS', '60')
+    repo = RepositorioEstadoPedidoSQLite()
+    repo.registrar('pedido-0', 'confirmado')
+    repo.registrar('pedido-1', 'entregado')
+    antigua = datetime.utcnow() - timedelta(minutes=5)
+    EstadoPedidoModel.query.update({EstadoPedidoModel.updated_at: antigua})
+    db.session.commit()
+
+    with patch.object(repo._servicio_pedidos, 'obtener_estados_pedidos',
+                      return_value={'pedido-0': 'en_transito'}) as mock_estados:
+        estados = repo.obtener_estados(['pedido-0', 'pedido-1'])
+
+    mock_estados.assert_called_once_with(['pedido-0'])
+    assert estados == {'pedido-0': 'en_transito', 'pedido-1': 'entregado'}
+
+
+def test_proyeccion_ignora_eventos_desordenados(entregas):
+    repo = RepositorioEstadoPedidoSQLite()
+    ahora = datetime.utcnow()
+
+    assert repo.registrar('pedido-0', 'entregado', ahora) is True
+    assert repo.registrar('pedido-0', 'en_transito', ahora - timedelta(minutes=1)) is False
+    assert db.session.get(EstadoPedidoModel, 'pedido-0').estado == 'entregado'
+
+
+def test_crear_guarda_claves_indexadas(app_context):
+    from aplicacion.dto import EntregaDTO
+
+    repo = RepositorioEntregaSQLite()
+    entrega_id = uuid.uuid4()
+    repo.crear(EntregaDTO(id=entrega_id, direccion='Calle 9', fecha_entrega=datetime(2025, 11, 10),
+                          pedido={'id': 'pedido-9', 'estado': 'confirmado'}))
+
+    entrega = db.session.get(EntregaModel, str(entrega_id))
+    assert (entrega.pedido_id, entrega.estado_pedido) == ('pedido-9', 'confirmado')
+
+    db.session.delete(entrega)
+    db.session.commit()
+
+
+def test_actualizar_estado_pedido_por_clave(entregas):
+    for entrega in entregas:
+        entrega.asignar_pedido({'id': f"pedido-{entrega.direccion[-1]}", 'estado': 'confirmado'})
+    db.session.commit()
+    repo = RepositorioEntregaSQLite()
+
+    actualizadas = repo.actualizar_estado_pedido('pedido-1', 'en_transito', datetime(2025, 11, 10, 10, 0))
+
+    assert actualizadas == 1
+    entrega = EntregaModel.query.filter_by(pedido_id='pedido-1').one()
+    assert entrega.estado_pedido == 'en_transito'
+    assert json.loads(entrega.pedido)['estado'] == 'en_transito'
+    assert EntregaModel.query.filter_by(estado_pedido='confirmado').count() == 2
+
+
+def test_actualizar_estado_pedido_inexistente(entregas):
+    assert RepositorioEntregaSQLite().actualizar_estado_pedido('no-existe', 'entregado') == 0
+
+
+def test_obtener_por_ids_solo_carga_las_solicitadas(entregas):
+    repo = RepositorioEntregaSQLite()
+    ids = [entregas[0].id, entregas[2].id, 'no-existe']
+
+    with patch.object(repo._estados_pedido._servicio_pedidos, 'obtener_estados_pedidos', return_value={}):
+        resultado = repo.obtener_por_ids(ids)
+
+    assert {str(e.id) for e in resultado} == {entregas[0].id, entregas[2].id}
+    assert repo.obtener_por_ids([]) == []
+
+
+def test_entregas_ya_asignadas_en_una_consulta(entregas):
+    ruta = RutaModel(id=str(uuid.uuid4()), fecha_ruta=datetime(2025, 11, 10).date(),
+                     repartidor_id='repartidor-1', bodega_id='bodega-1')
+    db.session.add(ruta)
+    db.session.add(RutaEntregaModel(id=str(uuid.uuid4()), ruta_id=ruta.id, entrega_id=entregas[1].id))
+    db.session.commit()
+
+    repo = RepositorioRutaSQLite()
+
+    assert repo.entregas_ya_asignadas([e.id for e in entregas]) == {entregas[1].id}
+    assert repo.entregas_ya_asignadas([]) == set()
+
+
+def _crear_rutas_con_entregas(cantidad_rutas, entregas_por_ruta=2):
+    fecha = datetime(2025, 11, 10)
+    for r in range(cantidad_rutas):
+        ruta = RutaModel(id=str(uuid.uuid4()), fecha_ruta=fecha.date(),
+                         repartidor_id='repartidor-1', bodega_id='bodega-1')
+        db.session.add(ruta)
+        for i in range(entregas_por_ruta):
+            entrega = EntregaModel(id=str(uuid.uuid4()), direccion=f'Calle {r}-{i}', fecha_entrega=fecha)
+            entrega.asignar_pedido({'id': f'pedido-{r}-{i}', 'estado': 'confirmado'})
+            db.session.add(entrega)
+            db.session.add(RutaEntregaModel(id=str(uuid.uuid4()), ruta_id=ruta.id, entrega_id=entrega.id))
+    db.session.commit()
+
+
+def _contar_consultas_listado(repo):
+    consultas = []
+
+    def _registrar(conn, cursor, statement, parameters, context, executemany):
+        consultas.append(statement)
+
+    db.session.expire_all()
+    event.listen(db.engine, 'before_cursor_execute', _registrar)
+    try:
+        with patch.object(repo._estados_pedido._servicio_pedidos, 'obtener_estados_pedidos',
+                          return_value={}) as mock_estados:
+            rutas = repo.obtener_por_fecha_y_repartidor(repartidor_id='repartidor-1')
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', _registrar)
+    return rutas, len(consultas), mock_estados
+
+
+def test_listado_de_rutas_usa_numero_acotado_de_consultas(entregas):
+    repo = RepositorioRutaSQLite()
+
+    _crear_rutas_con_entregas(2)
+    rutas, consultas_pocas, mock_estados = _contar_consultas_listado(repo)
+    assert len(rutas) == 2
+    mock_estados.assert_called_once()
+
+    _crear_rutas_con_entregas(6, entregas_por_ruta=3)
+    rutas, consultas_muchas, mock_estados = _contar_consultas_listado(repo)
+    assert len(rutas) == 8
+    assert sum(len(r.entregas) for r in rutas) == 22
+    mock_estados.assert_called_once()
+
+    assert consultas_muchas == consultas_pocas <= 4
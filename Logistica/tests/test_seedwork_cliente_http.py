@@ -0,0 +1,212 @@
+import pytest
+import sys
+import os
+from unittest.mock import Mock, patch
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from seedwork.infraestructura.cliente_http import (
+    ClienteHTTP, CircuitBreaker, CircuitoAbierto, BulkheadLleno, TIMEOUT_POR_DEFECTO,
+    obtener_cliente_http, registrar_degradacion, anotar_degradacion
+)
+
+
+def _respuesta(status_code):
+    response = Mock()
+    response.status_code = status_code
+    return response
+
+
+class TestClienteHTTP:
+    def setup_method(self):
+        self.cliente = ClienteHTTP(reintentos_get=2, espera_base=0)
+
+    @patch('requests.Session.get')
+    def test_get_aplica_timeout_uniforme(self, mock_get):
+        mock_get.return_value = _respuesta(200)
+
+        self.cliente.get('http://servicio/recurso', params={'q': 'x'})
+
+        mock_get.assert_called_once_with('http://servicio/recurso', params={'q': 'x'}, timeout=TIMEOUT_POR_DEFECTO)
+
+    @patch('seedwork.infraestructura.cliente_http.time.sleep')
+    @patch('requests.Session.get')
+    def test_get_reintenta_errores_transitorios(self, mock_get, mock_sleep):
+        mock_get.side_effect = [requests.exceptions.ConnectionError('caído'), _respuesta(503), _respuesta(200)]
+
+        response = self.cliente.get('http://servicio/recurso')
+
+        assert response.status_code == 200
+        assert mock_get.call_count == 3
+        assert mock_sleep.call_count == 2
+        assert self.cliente.metricas.instantanea()['GET servicio']['reintentos'] == 2
+
+    @patch('seedwork.infraestructura.cliente_http.time.sleep')
+    @patch('requests.Session.get')
+    def test_get_propaga_error_al_agotar_reintentos(self, mock_get, mock_sleep):
+        mock_get.side_effect = requests.exceptions.Timeout('lento')
+
+        with pytest.raises(requests.exceptions.Timeout):
+            self.cliente.get('http://servicio/recurso')
+
+        assert mock_get.call_count == 3
+        assert self.cliente.metricas.instantanea()['GET servicio']['errores'] == 1
+
+    @patch('requests.Session.get')
+    def test_get_no_reintenta_errores_del_cliente_ni_500(self, mock_get):
+        mock_get.return_value = _respuesta(500)
+
+        response = self.cliente.get('http://servicio/recurso')
+
+        assert response.status_code == 500
+        assert mock_get.call_count == 1
+
+    @patch('requests.Session.post')
+    def test_post_no_se_reintenta(self, mock_post):
+        mock_post.side_effect = requests.exceptions.ConnectionError('caído')
+
+        with pytest.raises(requests.exceptions.ConnectionError):
+            self.cliente.post('http://servicio/recurso', json={'a': 1})
+
+        assert mock_post.call_count == 1
+
+    @patch('requests.Session.get')
+    def test_metricas_de_latencia_por_host(self, mock_get):
+        mock_get.return_value = _respuesta(200)
+
+        self.cliente.get('http://ventas:5002/pedidos/1')
+        self.cliente.get('http://ventas:5002/pedidos/2')
+
+        metrica = self.cliente.metricas.instantanea()['GET ventas:5002']
+        assert metrica['llamadas'] == 2
+        assert metrica['errores'] == 0
+        assert metrica['latencia_promedio_ms'] >= 0
+
+    def test_cliente_compartido_es_unico(self):
+        assert obtener_cliente_http() is obtener_cliente_http()
+
+
+def test_health_expone_metricas_http(client):
+    response = client.get('/logistica/health')
+
+    assert response.status_code == 200
+    assert isinstance(response.get_json()['metricas_http'], dict)
+
+
+class TestCircuitBreaker:
+    def setup_method(self):
+        self.ahora = 0.0
+        self.circuito = CircuitBreaker(umbral_fallos=2, segundos_apertura=10, reloj=lambda: self.ahora)
+
+    def test_abre_al_alcanzar_el_umbral_y_rechaza(self):
+        self.circuito.registrar_fallo()
+        assert self.circuito.permitir()
+        self.circuito.registrar_fallo()
+
+        assert self.circuito.estado == CircuitBreaker.ABIERTO
+        assert not self.circuito.permitir()
+        assert self.circuito.instantanea()['rechazos'] == 1
+
+    def test_semiabierto_permite_una_sola_sonda(self):
+        self.circuito.registrar_fallo()
+        self.circuito.registrar_fallo()
+        self.ahora = 10
+
+        assert self.circuito.permitir()
+        assert self.circuito.estado == CircuitBreaker.SEMIABIERTO
+        assert not self.circuito.permitir()
+
+        self.circuito.registrar_exito()
+        assert self.circuito.estado == CircuitBreaker.CERRADO
+        assert self.circuito.permitir()
+
+    def test_sonda_fallida_vuelve_a_abrir(self):
+        self.circuito.registrar_fallo()
+        self.circuito.registrar_fallo()
+        self.ahora = 10
+        assert self.circuito.permitir()
+
+        self.circuito.registrar_fallo()
+
+        assert self.circuito.estado == CircuitBreaker.ABIERTO
+        assert self.circuito.instantanea()['aperturas'] == 2
+        assert not self.circuito.permitir()
+
+
+class TestResilienciaClienteHTTP:
+    def setup_method(self):
+        self.cliente = ClienteHTTP(reintentos_get=0, espera_base=0, umbral_fallos=2,
+                                   segundos_apertura=60, max_concurrentes=1, espera_bulkhead=0)
+
+    @patch('requests.Session.get')
+    def test_circuito_abierto_no_llama_al_servicio(self, mock_get):
+        mock_get.return_value = _respuesta(500)
+        self.cliente.get('http://usuarios/clientes/1')
+        self.cliente.get('http://usuarios/clientes/2')
+
+        with pytest.raises(CircuitoAbierto):
+            self.cliente.get('http://usuarios/clientes/3')
+
+        assert mock_get.call_count == 2
+        estado = self.cliente.estado_resiliencia()['usuarios']
+        assert estado['circuito']['estado'] == 'abierto'
+        assert estado['circuito']['rechazos'] == 1
+
+    @patch('requests.Session.get')
+    def test_circuito_es_por_host(self, mock_get):
+        mock_get.return_value = _respuesta(500)
+        self.cliente.get('http://usuarios/clientes/1')
+        self.cliente.get('http://usuarios/clientes/2')
+
+        mock_get.return_value = _respuesta(200)
+        assert self.cliente.get('http://productos/productos/1').status_code == 200
+
+    @patch('seedwork.infraestructura.cliente_http.time.sleep')
+    @patch('requests.Session.get')
+    def test_reintentos_de_un_get_cuentan_como_una_llamada_del_circuito(self, mock_get, mock_sleep):
+        cliente = ClienteHTTP(reintentos_get=2, espera_base=0, umbral_fallos=2, segundos_apertura=60)
+        mock_get.return_value = _respuesta(503)
+
+        cliente.get('http://productos/productos')
+
+        assert mock_get.call_count == 3
+        circuito = cliente.estado_resiliencia()['productos']['circuito']
+        assert circuito['estado'] == 'cerrado'
+        assert circuito['fallos_consecutivos'] == 1
+
+        mock_get.side_effect = [_respuesta(503), _respuesta(200)]
+        assert cliente.get('http://productos/productos').status_code == 200
+        assert cliente.estado_resiliencia()['productos']['circuito']['fallos_consecutivos'] == 0
+
+    def test_bulkhead_rechaza_llamadas_por_encima_del_limite(self):
+        _, bulkhead = self.cliente._protecciones('ventas')
+        assert bulkhead.adquirir()
+        try:
+            with pytest.raises(BulkheadLleno):
+                self.cliente.post('http://ventas/pedidos/estados', json={})
+        finally:
+            bulkhead.liberar()
+
+        assert self.cliente.estado_resiliencia()['ventas']['bulkhead']['rechazos'] == 1
+
+    @patch('requests.Session.get')
+    def test_registrar_degradacion_recolecta_hosts_fallidos(self, mock_get):
+        mock_get.side_effect = [_respuesta(503), _respuesta(200)]
+
+        with registrar_degradacion() as degradados:
+            self.cliente.get('http://usuarios/clientes/1')
+            self.cliente.get('http://productos/productos/1')
+
+        assert degradados == {'usuarios'}
+        assert anotar_degradacion({}, degradados) == {
+            'datos_degradados': True,
+            'servicios_no_disponibles': ['usuarios']
+        }
+        assert anotar_degradacion({}, set()) == {}
+
+
+def test_health_expone_estado_de_resiliencia(client):
+    response = client.get('/logistica/health')
+
+    assert isinstance(response.get_json()['resiliencia_http'], dict)
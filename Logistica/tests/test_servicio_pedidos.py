@@ -2,7 +2,7 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
-from infraestructura.servicio_pedidos import ServicioPedidos
+from infraestructura.servicio_pedidos import ServicioPedidos, TAMANO_LOTE_ESTADOS
 
 
 @pytest.fixture
@@ -15,7 +15,7 @@ def test_obtener_pedido_por_id_exitoso(servicio):
     response.status_code = 200
     response.json.return_value = {'id': 'pedido-1'}
 
-    with patch('infraestructura.servicio_pedidos.requests.get', return_value=response) as mock_get:
+    with patch('requests.Session.get', return_value=response) as mock_get:
         pedido = servicio.obtener_pedido_por_id('pedido-1')
 
     mock_get.assert_called_once()
@@ -26,7 +26,7 @@ def test_obtener_pedido_por_id_no_encontrado(servicio):
     response = MagicMock()
     response.status_code = 404
 
-    with patch('infraestructura.servicio_pedidos.requests.get', return_value=response):
+    with patch('requests.Session.get', return_value=response):
         pedido = servicio.obtener_pedido_por_id('pedido-2')
 
     assert pedido is None
@@ -36,15 +36,56 @@ def test_obtener_pedido_por_id_error_servidor(servicio):
     response = MagicMock()
     response.status_code = 500
 
-    with patch('infraestructura.servicio_pedidos.requests.get', return_value=response):
+    with patch('requests.Session.get', return_value=response):
         pedido = servicio.obtener_pedido_por_id('pedido-3')
 
     assert pedido is None
 
 
 def test_obtener_pedido_por_id_excepcion(servicio):
-    with patch('infraestructura.servicio_pedidos.requests.get', side_effect=Exception('fallo')):
+    with patch('requests.Session.get', side_effect=Exception('fallo')):
         pedido = servicio.obtener_pedido_por_id('pedido-4')
 
     assert pedido is None
 
+
+
+def test_obtener_estados_pedidos_una_llamada_por_lote(servicio):
+    response = MagicMock()
+    response.status_code = 200
+    response.json.return_value = {'estados': {'p1': 'confirmado', 'p2': 'en_transito'}}
+
+    with patch('requests.Session.post', return_value=response) as mock_post:
+        estados = servicio.obtener_estados_pedidos(['p1', 'p2', 'p1', None])
+
+    mock_post.assert_called_once()
+    assert mock_post.call_args.kwargs['json'] == {'pedido_ids': ['p1', 'p2']}
+    assert estados == {'p1': 'confirmado', 'p2': 'en_transito'}
+
+
+def test_obtener_estados_pedidos_divide_en_lotes(servicio):
+    response = MagicMock()
+    response.status_code = 200
+    response.json.return_value = {'estados': {}}
+    pedido_ids = [f'p{i}' for i in range(TAMANO_LOTE_ESTADOS + 1)]
+
+    with patch('requests.Session.post', return_value=response) as mock_post:
+        servicio.obtener_estados_pedidos(pedido_ids)
+
+    assert mock_post.call_count == 2
+    assert len(mock_post.call_args_list[1].kwargs['json']['pedido_ids']) == 1
+
+
+def test_obtener_estados_pedidos_sin_ids_no_llama(servicio):
+    with patch('requests.Session.post') as mock_post:
+        estados = servicio.obtener_estados_pedidos([])
+
+    mock_post.assert_not_called()
+    assert estados == {}
+
+
+def test_obtener_estados_pedidos_error(servicio):
+    with patch('requests.Session.post', side_effect=Exception('fallo')):
+        estados = servicio.obtener_estados_pedidos(['p1'])
+
+    assert estados == {}
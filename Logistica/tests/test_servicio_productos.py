@@ -6,14 +6,15 @@ import requests
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from infraestructura.servicio_productos import ServicioProductos
+from infraestructura.servicio_productos import ServicioProductos, TIMEOUT_LISTADO
+from seedwork.infraestructura.cliente_http import TIMEOUT_POR_DEFECTO
 from .conftest import get_service_url
 
 class TestServicioProductos:
     def setup_method(self):
         self.servicio = ServicioProductos()
 
-    @patch('infraestructura.servicio_productos.requests.get')
+    @patch('requests.Session.get')
     def test_obtener_producto_por_id_exitoso(self, mock_get):
         # Mock de respuesta exitosa
         mock_response = Mock()
@@ -30,9 +31,9 @@ class TestServicioProductos:
         assert resultado is not None
         assert resultado["id"] == "prod-1"
         assert resultado["nombre"] == "Producto Test"
-        mock_get.assert_called_once_with("http://localhost:5000/productos/api/productos/prod-1", timeout=30)
+        mock_get.assert_called_once_with("http://localhost:5000/productos/api/productos/prod-1", timeout=TIMEOUT_POR_DEFECTO)
 
-    @patch('infraestructura.servicio_productos.requests.get')
+    @patch('requests.Session.get')
     def test_obtener_producto_por_id_no_encontrado(self, mock_get):
         # Mock de respuesta 404
         mock_response = Mock()
@@ -42,9 +43,9 @@ class TestServicioProductos:
         resultado = self.servicio.obtener_producto_por_id("prod-inexistente")
         
         assert resultado is None
-        mock_get.assert_called_once_with("http://localhost:5000/productos/api/productos/prod-inexistente", timeout=30)
+        mock_get.assert_called_once_with("http://localhost:5000/productos/api/productos/prod-inexistente", timeout=TIMEOUT_POR_DEFECTO)
 
-    @patch('infraestructura.servicio_productos.requests.get')
+    @patch('requests.Session.get')
     def test_obtener_producto_por_id_error_servidor(self, mock_get):
         # Mock de error del servidor
         mock_response = Mock()
@@ -54,9 +55,9 @@ class TestServicioProductos:
         resultado = self.servicio.obtener_producto_por_id("prod-1")
         
         assert resultado is None
-        mock_get.assert_called_once_with("http://localhost:5000/productos/api/productos/prod-1", timeout=30)
+        mock_get.assert_called_once_with("http://localhost:5000/productos/api/productos/prod-1", timeout=TIMEOUT_POR_DEFECTO)
 
-    @patch('infraestructura.servicio_productos.requests.get')
+    @patch('requests.Session.get')
     def test_obtener_producto_por_id_excepcion(self, mock_get):
         # Mock de excepción
         mock_get.side_effect = requests.exceptions.ConnectionError("Error de conexión")
@@ -65,7 +66,7 @@ class TestServicioProductos:
         
         assert resultado is None
 
-    @patch('infraestructura.servicio_productos.requests.get')
+    @patch('requests.Session.get')
     def test_buscar_productos_exitoso(self, mock_get):
         # Mock de respuesta exitosa
         mock_response = Mock()
@@ -83,10 +84,10 @@ class TestServicioProductos:
         mock_get.assert_called_once_with(
             "http://localhost:5000/productos/api/productos",
             params={'q': 'test', 'limite': 10},
-            timeout=30
+            timeout=TIMEOUT_POR_DEFECTO
         )
 
-    @patch('infraestructura.servicio_productos.requests.get')
+    @patch('requests.Session.get')
     def test_buscar_productos_error_servidor(self, mock_get):
         # Mock de error del servidor
         mock_response = Mock()
@@ -99,10 +100,10 @@ class TestServicioProductos:
         mock_get.assert_called_once_with(
             "http://localhost:5000/productos/api/productos",
             params={'q': 'test', 'limite': 50},
-            timeout=30
+            timeout=TIMEOUT_POR_DEFECTO
         )
 
-    @patch('infraestructura.servicio_productos.requests.get')
+    @patch('requests.Session.get')
     def test_buscar_productos_excepcion(self, mock_get):
         # Mock de excepción
         mock_get.side_effect = requests.exceptions.Timeout("Timeout")
@@ -111,7 +112,7 @@ class TestServicioProductos:
         
         assert resultado == []
 
-    @patch('infraestructura.servicio_productos.requests.get')
+    @patch('requests.Session.get')
     def test_obtener_todos_productos_exitoso(self, mock_get):
         # Mock de respuesta exitosa con formato paginado
         mock_response = Mock()
@@ -131,13 +132,14 @@ class TestServicioProductos:
         
         assert len(resultado) == 2
         assert resultado[0]["id"] == "prod-1"
+        assert TIMEOUT_LISTADO[1] == 30
         mock_get.assert_called_once_with(
             "http://localhost:5000/productos/api/productos", 
             params={'page': 1, 'page_size': 1000}, 
-            timeout=30
+            timeout=TIMEOUT_LISTADO
         )
 
-    @patch('infraestructura.servicio_productos.requests.get')
+    @patch('requests.Session.get')
     def test_obtener_todos_productos_error_servidor(self, mock_get):
         # Mock de error del servidor
         mock_response = Mock()
@@ -150,10 +152,10 @@ class TestServicioProductos:
         mock_get.assert_called_once_with(
             "http://localhost:5000/productos/api/productos", 
             params={'page': 1, 'page_size': 1000}, 
-            timeout=30
+            timeout=TIMEOUT_LISTADO
         )
 
-    @patch('infraestructura.servicio_productos.requests.get')
+    @patch('requests.Session.get')
     def test_obtener_todos_productos_excepcion(self, mock_get):
         # Mock de excepción
         mock_get.side_effect = Exception("Error general")
@@ -46,6 +46,7 @@ def create_app(configuracion=None):
                     "POST /productos/api/productos/", 
                     "GET /productos/api/productos/",
                     "GET /productos/api/productos/<id>",
+                    "POST /productos/api/productos/por-ids",
                     "POST /productos/api/categorias/",
                     "GET /productos/api/categorias/"
                 ]
@@ -61,15 +62,19 @@ def create_app(configuracion=None):
 
         @app.route("/productos/health")
         def productos_health():
+            from seedwork.infraestructura.cliente_http import obtener_cliente_http
             return {
                 "status": "up",
                 "service": "productos",
                 "version": "1.0.0",
                 "mode": "simplified",
+                "metricas_http": obtener_cliente_http().metricas.instantanea(),
+                "resiliencia_http": obtener_cliente_http().estado_resiliencia(),
                 "endpoints": [
                     "POST /productos/api/productos/", 
                     "GET /productos/api/productos/",
                     "GET /productos/api/productos/<id>",
+                    "POST /productos/api/productos/por-ids",
                     "POST /productos/api/categorias/",
                     "GET /productos/api/categorias/"
                 ]
@@ -7,10 +7,11 @@ from aplicacion.comandos.crear_producto import CrearProducto
 from aplicacion.comandos.crear_producto_con_inventario import CrearProductoConInventario
 from aplicacion.consultas.obtener_productos import ObtenerProductos
 from aplicacion.consultas.obtener_producto_por_id import ObtenerProductoPorId
+from aplicacion.consultas.obtener_productos_por_ids import ObtenerProductosPorIds
 from seedwork.aplicacion.comandos import ejecutar_comando
 from seedwork.aplicacion.consultas import ejecutar_consulta
 from aplicacion.mapeadores import MapeadorProductoDTOJson, MapeadorProductoAgregacionDTOJson
-from seedwork.presentacion.paginacion import paginar_resultados, extraer_parametros_paginacion
+from seedwork.presentacion.paginacion import paginar_resultados, extraer_parametros_paginacion, extraer_cursor, CursorInvalido
 from aplicacion.dto import CargaMasivaJobDTO
 from aplicacion.servicios.servicio_carga_masiva import ServicioCargaMasiva
 from infraestructura.servicio_gcp_storage import get_storage_service
@@ -22,6 +23,8 @@ logger = logging.getLogger(__name__)
 
 bp = api.crear_blueprint('producto', '/productos/api/productos')
 
+MAX_PRODUCTOS_POR_CONSULTA = 500
+
 # Endpoint para crear producto
 @bp.route('/', methods=['POST'])
 def crear_producto():
@@ -136,6 +139,22 @@ def obtener_productos():
     try:
         # Obtener parámetros de paginación
         page, page_size = extraer_parametros_paginacion(request.args)
+        max_page_size = 10000 if page_size > 100 else 100
+        mapeador = MapeadorProductoAgregacionDTOJson()
+        
+        # Modo cursor (opcional): la página se resuelve en la base de datos y solo se agregan sus productos
+        cursor = extraer_cursor(request.args)
+        if cursor is not None:
+            consulta = ObtenerProductos(cursor=cursor, page_size=page_size, max_page_size=max_page_size)
+            try:
+                pagina = ejecutar_consulta(consulta)
+            except CursorInvalido as e:
+                return Response(json.dumps({'error': str(e)}), status=400, mimetype='application/json')
+            return Response(
+                json.dumps(pagina.con_items(mapeador.agregaciones_a_externo(pagina.items)).a_dict()), 
+                status=200, 
+                mimetype='application/json'
+            )
         
         # Crear consulta
         consulta = ObtenerProductos()
@@ -144,11 +163,9 @@ def obtener_productos():
         productos_agregacion = ejecutar_consulta(consulta)
         
         # Convertir agregaciones a JSON
-        mapeador = MapeadorProductoAgregacionDTOJson()
         productos_json = mapeador.agregaciones_a_externo(productos_agregacion)
         
         # Aplicar paginación
-        max_page_size = 10000 if page_size > 100 else 100
         resultado_paginado = paginar_resultados(productos_json, page=page, page_size=page_size, max_page_size=max_page_size)
         
         return Response(
@@ -196,6 +213,43 @@ def obtener_producto_por_id(producto_id):
             mimetype='application/json'
         )
 
+# Endpoint para obtener varios productos por ID en una sola llamada
+@bp.route('/por-ids', methods=['POST'])
+def obtener_productos_por_ids():
+    try:
+        datos = request.get_json(silent=True) or {}
+        producto_ids = datos.get('producto_ids')
+
+        if not isinstance(producto_ids, list) or not producto_ids:
+            return Response(
+                json.dumps({'error': 'producto_ids debe ser una lista no vacía'}), 
+                status=400, 
+                mimetype='application/json'
+            )
+
+        if len(producto_ids) > MAX_PRODUCTOS_POR_CONSULTA:
+            return Response(
+                json.dumps({'error': f'Máximo {MAX_PRODUCTOS_POR_CONSULTA} productos por consulta'}), 
+                status=400, 
+                mimetype='application/json'
+            )
+
+        productos = ejecutar_consulta(ObtenerProductosPorIds(producto_ids=producto_ids))
+
+        return Response(
+            json.dumps({'productos': productos}), 
+            status=200, 
+            mimetype='application/json'
+        )
+
+    except Exception as e:
+        logger.error(f"Error obteniendo productos por IDs: {e}")
+        return Response(
+            json.dumps({'error': f'Error interno del servidor: {str(e)}'}), 
+            status=500, 
+            mimetype='application/json'
+        )
+
 # Endpoint para cargar productos masivamente desde CSV
 @bp.route('/carga-masiva', methods=['POST'])
 def crear_carga_masiva():
@@ -217,12 +271,12 @@ def crear_carga_masiva():
                 mimetype='application/json'
             )
         
-        # Leer contenido del archivo
-        csv_content = file.read()
+        # El archivo se recorre desde su stream (en disco si es grande), sin leerlo completo en memoria
+        archivo = file.stream
         
-        # Validar archivo CSV
+        # Validar archivo CSV a partir de sus headers
         servicio_carga = ServicioCargaMasiva()
-        es_valido, mensaje = servicio_carga.validar_archivo_csv(file.filename, csv_content)
+        es_valido, mensaje = servicio_carga.validar_encabezado_csv(file.filename, archivo)
         
         if not es_valido:
             return Response(
@@ -232,7 +286,7 @@ def crear_carga_masiva():
             )
         
         # Contar filas
-        total_filas = servicio_carga.contar_filas(csv_content)
+        total_filas = servicio_carga.contar_filas_archivo(archivo)
         
         if total_filas == 0:
             return Response(
@@ -246,7 +300,7 @@ def crear_carga_masiva():
         
         # Guardar CSV original en GCP Storage
         servicio_storage = get_storage_service()
-        servicio_storage.guardar_csv_original(csv_content, job_id)
+        servicio_storage.guardar_csv_original(archivo, job_id)
         
         # Crear job en BD
         repositorio_job = RepositorioJobSQLite()
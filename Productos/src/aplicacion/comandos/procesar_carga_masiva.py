@@ -1,3 +1,5 @@
+import io
+import tempfile
 from dataclasses import dataclass
 from seedwork.aplicacion.comandos import Comando, ejecutar_comando
 import logging
@@ -32,55 +34,34 @@ class ProcesarCargaMasivaHandler:
                 job.status = 'processing'
                 self.repositorio_job.actualizar(job)
             
-            # 3. Descargar CSV original desde GCP
+            # 3. Descargar el CSV original a un archivo temporal para recorrerlo sin cargarlo en memoria
             logger.info(f"Descargando CSV original para job {comando.job_id}")
-            csv_content = self.servicio_storage.descargar_csv(comando.job_id)
-            
-            # 4. Parsear CSV para obtener filas normalizadas, headers originales y mapeo
-            filas_normalizadas, headers_originales, mapeo_headers = self.servicio_carga.parsear_csv(csv_content)
-            
-            # 5. Procesar cada fila con callback de progreso
-            def callback_progreso(filas_procesadas: int, total_filas: int):
-                """Callback para actualizar progreso en BD"""
-                try:
-                    job.filas_procesadas = filas_procesadas
-                    job.updated_at = self._get_current_datetime()
-                    self.repositorio_job.actualizar(job)
-                except Exception as e:
-                    logger.error(f"Error actualizando progreso: {e}")
-            
-            logger.info(f"Procesando {len(filas_normalizadas)} filas para job {comando.job_id}")
-            resultados = []
-            
-            for i, fila in enumerate(filas_normalizadas):
-                # Procesar fila
-                resultado = self.servicio_carga.procesar_fila(fila)
-                resultados.append(resultado)
+            with tempfile.TemporaryFile() as original, tempfile.TemporaryFile() as resultado:
+                self.servicio_storage.descargar_csv_en_archivo(comando.job_id, original)
+                original.seek(0)
                 
-                # Actualizar contadores
-                if resultado['status'] == 'creado' or resultado['status'] == 'actualizado':
-                    job.filas_exitosas += 1
-                elif resultado['status'] == 'rechazado':
-                    job.filas_rechazadas += 1
-                elif resultado['status'] == 'error':
-                    job.filas_error += 1
+                # 4. Leer headers originales; las filas normalizadas se leen a medida que se procesan
+                headers_originales, filas = self.servicio_carga.leer_filas(
+                    io.TextIOWrapper(original, encoding='utf-8', newline='')
+                )
+                salida = io.TextIOWrapper(resultado, encoding='utf-8', newline='')
+                writer = self.servicio_carga.iniciar_csv_resultado(salida, headers_originales)
                 
-                job.filas_procesadas = i + 1
+                # 5. Procesar por bloques: cada bloque se escribe en el CSV resultado y actualiza el progreso
+                logger.info(f"Procesando {job.total_filas} filas para job {comando.job_id}")
+                for filas_bloque, resultados_bloque in self.servicio_carga.procesar_en_bloques(filas):
+                    self.servicio_carga.escribir_filas_resultado(writer, filas_bloque, resultados_bloque)
+                    self._actualizar_progreso(job, resultados_bloque)
                 
-                # Actualizar BD cada 10 filas o al final
-                if (i + 1) % 10 == 0 or i == len(filas_normalizadas) - 1:
-                    job.updated_at = self._get_current_datetime()
-                    self.repositorio_job.actualizar(job)
-            
-            # 6. Generar CSV resultado
-            logger.info(f"Generando CSV resultado para job {comando.job_id}")
-            csv_resultado = self.servicio_carga.generar_csv_resultado(
-                filas_normalizadas, resultados, headers_originales, mapeo_headers
-            )
-            
-            # 7. Subir CSV resultado a GCP
-            logger.info(f"Subiendo CSV resultado a GCP para job {comando.job_id}")
-            result_url = self.servicio_storage.guardar_csv_resultado(csv_resultado, comando.job_id)
+                # 6. El conteo al crear el job es una estimación por líneas; aquí se conoce el total exacto
+                job.total_filas = job.filas_procesadas
+                salida.flush()
+                salida.detach()
+                resultado.seek(0)
+                
+                # 7. Subir CSV resultado a GCP
+                logger.info(f"Subiendo CSV resultado a GCP para job {comando.job_id}")
+                result_url = self.servicio_storage.guardar_csv_resultado(resultado, comando.job_id)
             
             # 8. Actualizar job como completado
             job.status = 'completed'
@@ -106,6 +87,22 @@ class ProcesarCargaMasivaHandler:
             
             raise
     
+    def _actualizar_progreso(self, job: CargaMasivaJobDTO, resultados_bloque: list):
+        """Actualiza contadores y progreso en BD al terminar un bloque"""
+        for resultado in resultados_bloque:
+            if resultado['status'] == 'creado' or resultado['status'] == 'actualizado':
+                job.filas_exitosas += 1
+            elif resultado['status'] == 'rechazado':
+                job.filas_rechazadas += 1
+            elif resultado['status'] == 'error':
+                job.filas_error += 1
+        job.filas_procesadas += len(resultados_bloque)
+        job.updated_at = self._get_current_datetime()
+        try:
+            self.repositorio_job.actualizar(job)
+        except Exception as e:
+            logger.error(f"Error actualizando progreso: {e}")
+    
     def _get_current_datetime(self):
         """Obtiene la fecha actual"""
         from datetime import datetime
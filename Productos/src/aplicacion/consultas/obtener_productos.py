@@ -1,18 +1,21 @@
 from dataclasses import dataclass
 from seedwork.aplicacion.consultas import Consulta, ejecutar_consulta
 import logging
-import requests
 from aplicacion.dto import ProductoDTO
 from aplicacion.dto_agregacion import ProductoAgregacionDTO
 from infraestructura.repositorios import RepositorioProductoSQLite, RepositorioCategoriaSQLite
 from infraestructura.servicio_proveedores import ServicioProveedores
+from seedwork.infraestructura.cliente_http import obtener_cliente_http
+from seedwork.presentacion.paginacion import PaginaCursor
 
 logger = logging.getLogger(__name__)
 
 @dataclass
 class ObtenerProductos(Consulta):
     """Consulta para obtener todos los productos con agregación completa"""
-    pass
+    cursor: str = None  # Si se indica (vacío = primera página), se pagina por cursor y se retorna una PaginaCursor
+    page_size: int = 100
+    max_page_size: int = 100
 
 class ObtenerProductosHandler:
     def __init__(self, repositorio=None, repositorio_categoria=None, servicio_proveedores=None):
@@ -29,10 +32,9 @@ class ObtenerProductosHandler:
             page_size = 1000  # Tamaño grande para minimizar requests
             
             while True:
-                response = requests.get(
+                response = obtener_cliente_http().get(
                     f"{base_url}/proveedores", 
-                    params={'page': page, 'page_size': page_size},
-                    timeout=10
+                    params={'page': page, 'page_size': page_size}
                 )
                 
                 if response.status_code != 200:
@@ -70,7 +72,10 @@ class ObtenerProductosHandler:
             logger.error(f"Error obteniendo todos los proveedores: {e}")
             return {}
     
-    def handle(self, consulta: ObtenerProductos) -> list[ProductoAgregacionDTO]:
+    def handle(self, consulta: ObtenerProductos):
+        if consulta.cursor is not None:
+            return self._handle_por_cursor(consulta)
+        
         try:
             # 1. Obtener todos los productos del repositorio
             productos = self.repositorio.obtener_todos()
@@ -84,51 +89,7 @@ class ObtenerProductosHandler:
             proveedores_dict = self._obtener_todos_proveedores()
             
             # 4. Construir agregaciones completas usando diccionarios en memoria
-            agregaciones = []
-            productos_sin_categoria = 0
-            productos_sin_proveedor = 0
-            
-            for producto in productos:
-                try:
-                    # Obtener categoría del diccionario (O(1))
-                    categoria = categorias_dict.get(producto.categoria_id)
-                    if not categoria:
-                        productos_sin_categoria += 1
-                        logger.warning(f"Categoría {producto.categoria_id} no encontrada para producto {producto.id}")
-                        continue
-                    
-                    # Obtener proveedor del diccionario (O(1))
-                    proveedor = proveedores_dict.get(producto.proveedor_id)
-                    if not proveedor:
-                        productos_sin_proveedor += 1
-                        logger.warning(f"Proveedor {producto.proveedor_id} no encontrado para producto {producto.id}")
-                        continue
-                    
-                    # Construir agregación completa
-                    agregacion = ProductoAgregacionDTO(
-                        id=producto.id,
-                        nombre=producto.nombre,
-                        descripcion=producto.descripcion,
-                        precio=producto.precio,
-                        categoria_id=categoria.id,
-                        categoria_nombre=categoria.nombre,
-                        categoria_descripcion=categoria.descripcion,
-                        proveedor_id=proveedor['id'],
-                        proveedor_nombre=proveedor['nombre'],
-                        proveedor_email=proveedor['email'],
-                        proveedor_direccion=proveedor['direccion']
-                    )
-                    
-                    agregaciones.append(agregacion)
-                    
-                except Exception as e:
-                    logger.warning(f"Error construyendo agregación para producto {producto.id}: {e}")
-                    continue
-            
-            if productos_sin_categoria > 0:
-                logger.warning(f"⚠️ {productos_sin_categoria} productos sin categoría")
-            if productos_sin_proveedor > 0:
-                logger.warning(f"⚠️ {productos_sin_proveedor} productos sin proveedor")
+            agregaciones = self._construir_agregaciones(productos, categorias_dict, proveedores_dict)
             
             logger.info(f"✅ Construidas {len(agregaciones)} agregaciones de {len(productos)} productos")
             return agregaciones
@@ -137,6 +98,71 @@ class ObtenerProductosHandler:
             logger.error(f"Error obteniendo productos con agregación: {e}")
             raise
 
+    def _handle_por_cursor(self, consulta: ObtenerProductos) -> PaginaCursor:
+        """Pagina por cursor en la base de datos y solo agrega los productos de la página"""
+        pagina = self.repositorio.obtener_pagina_por_cursor(
+            cursor=consulta.cursor, page_size=consulta.page_size, max_page_size=consulta.max_page_size
+        )
+        productos = pagina.items
+        
+        categorias_dict = {str(cat.id): cat for cat in self.repositorio_categoria.obtener_todos()}
+        
+        # Solo los proveedores de la página, con el endpoint en lote si está disponible
+        proveedores_dict = self.servicio_proveedores.obtener_proveedores_por_ids([p.proveedor_id for p in productos])
+        if proveedores_dict is None:
+            proveedores_dict = self._obtener_todos_proveedores()
+        
+        return pagina.con_items(self._construir_agregaciones(productos, categorias_dict, proveedores_dict))
+    
+    def _construir_agregaciones(self, productos, categorias_dict: dict, proveedores_dict: dict) -> list[ProductoAgregacionDTO]:
+        agregaciones = []
+        productos_sin_categoria = 0
+        productos_sin_proveedor = 0
+        
+        for producto in productos:
+            try:
+                # Obtener categoría del diccionario (O(1))
+                categoria = categorias_dict.get(producto.categoria_id)
+                if not categoria:
+                    productos_sin_categoria += 1
+                    logger.warning(f"Categoría {producto.categoria_id} no encontrada para producto {producto.id}")
+                    continue
+                
+                # Obtener proveedor del diccionario (O(1))
+                proveedor = proveedores_dict.get(producto.proveedor_id)
+                if not proveedor:
+                    productos_sin_proveedor += 1
+                    logger.warning(f"Proveedor {producto.proveedor_id} no encontrado para producto {producto.id}")
+                    continue
+                
+                # Construir agregación completa
+                agregacion = ProductoAgregacionDTO(
+                    id=producto.id,
+                    nombre=producto.nombre,
+                    descripcion=producto.descripcion,
+                    precio=producto.precio,
+                    categoria_id=categoria.id,
+                    categoria_nombre=categoria.nombre,
+                    categoria_descripcion=categoria.descripcion,
+                    proveedor_id=proveedor['id'],
+                    proveedor_nombre=proveedor['nombre'],
+                    proveedor_email=proveedor['email'],
+                    proveedor_direccion=proveedor['direccion']
+                )
+                
+                agregaciones.append(agregacion)
+                
+            except Exception as e:
+                logger.warning(f"Error construyendo agregación para producto {producto.id}: {e}")
+                continue
+        
+        if productos_sin_categoria > 0:
+            logger.warning(f"⚠️ {productos_sin_categoria} productos sin categoría")
+        if productos_sin_proveedor > 0:
+            logger.warning(f"⚠️ {productos_sin_proveedor} productos sin proveedor")
+        
+        return agregaciones
+
 @ejecutar_consulta.register
 def _(consulta: ObtenerProductos):
     handler = ObtenerProductosHandler()
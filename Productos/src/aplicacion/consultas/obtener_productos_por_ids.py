@@ -0,0 +1,42 @@
+from dataclasses import dataclass, field
+from seedwork.aplicacion.consultas import Consulta, ejecutar_consulta
+from infraestructura.repositorios import RepositorioProductoSQLite
+import logging
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class ObtenerProductosPorIds(Consulta):
+    producto_ids: list[str] = field(default_factory=list)
+
+class ObtenerProductosPorIdsHandler:
+    def __init__(self, repositorio=None):
+        self.repositorio = repositorio or RepositorioProductoSQLite()
+
+    def handle(self, consulta: ObtenerProductosPorIds) -> dict:
+        """Obtener un diccionario {producto_id: datos básicos} para validar pedidos en lote.
+
+        No consulta categoría ni proveedor: quien valida un pedido solo necesita nombre y precio.
+        """
+        producto_ids = list(dict.fromkeys(str(p).strip() for p in consulta.producto_ids if p))
+        if not producto_ids:
+            return {}
+
+        productos = self.repositorio.obtener_por_ids(producto_ids)
+        logger.info(f"Productos encontrados: {len(productos)} de {len(producto_ids)} solicitados")
+        return {
+            str(producto.id): {
+                'id': str(producto.id),
+                'nombre': producto.nombre,
+                'descripcion': producto.descripcion,
+                'precio': producto.precio,
+                'categoria_id': producto.categoria_id,
+                'proveedor_id': producto.proveedor_id
+            }
+            for producto in productos
+        }
+
+@ejecutar_consulta.register
+def _(consulta: ObtenerProductosPorIds):
+    handler = ObtenerProductosPorIdsHandler()
+    return handler.handle(consulta)
@@ -2,11 +2,23 @@ import csv
 import io
 import logging
 import re
-from typing import List, Dict, Tuple, Any
+import uuid
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, TextIO, Tuple
 from aplicacion.comandos.crear_producto_con_inventario import CrearProductoConInventario
 from aplicacion.comandos.actualizar_producto_con_inventario import ActualizarProductoConInventario
 from aplicacion.comandos.crear_categoria import CrearCategoria
+from aplicacion.dto import ProductoDTO
+from dominio.entidades import Producto
+from dominio.eventos import InventarioAsignado
+from dominio.fabricas import FabricaProducto
+from dominio.objetos_valor import Nombre, Descripcion, Precio, Categoria
+from dominio.reglas import (
+    NombreProductoNoPuedeSerVacio, DescripcionProductoNoPuedeSerVacio, PrecioProductoNoPuedeSerVacio,
+    PrecioProductoNoPuedeSerMenorACero, PrecioProductoDebeSerNumerico,
+    CategoriaProductoNoPuedeSerVacia, CategoriaIdNoPuedeSerVacio, ProveedorIdNoPuedeSerVacio
+)
 from seedwork.aplicacion.comandos import ejecutar_comando
+from seedwork.dominio.eventos import despachador_eventos
 from infraestructura.repositorios import RepositorioProductoSQLite, RepositorioCategoriaSQLite
 from infraestructura.servicio_proveedores import ServicioProveedores
 
@@ -16,6 +28,8 @@ class ServicioCargaMasiva:
     """Servicio para procesar carga masiva de productos desde CSV"""
     
     REQUIRED_COLUMNS = ['nombre', 'descripcion', 'precio', 'stock', 'fecha_vencimiento', 'categoria', 'proveedor']
+    TAMANO_BLOQUE = 500  # Filas por transacción en `procesar_en_bloques`
+    TAMANO_MAX_ENCABEZADO = 64 * 1024  # Bytes leídos para validar los headers
     
     def __init__(self, repositorio_producto=None, repositorio_categoria=None, servicio_proveedores=None):
         self.repositorio_producto = repositorio_producto or RepositorioProductoSQLite()
@@ -24,14 +38,21 @@ class ServicioCargaMasiva:
     
     def validar_archivo_csv(self, filename: str, content: bytes) -> Tuple[bool, str]:
         """Valida que el archivo sea CSV"""
+        return self.validar_encabezado_csv(filename, io.BytesIO(content))
+    
+    def validar_encabezado_csv(self, filename: str, archivo: BinaryIO) -> Tuple[bool, str]:
+        """
+        Valida la extensión y las columnas leyendo solo la primera línea del archivo.
+        El archivo queda al inicio para las lecturas siguientes.
+        """
         if not filename.lower().endswith('.csv'):
             return False, "El archivo debe tener extensión .csv"
         
         try:
-            # Intentar parsear el CSV
-            content_str = content.decode('utf-8')
-            reader = csv.DictReader(io.StringIO(content_str))
-            headers = reader.fieldnames
+            archivo.seek(0)
+            primera_linea = archivo.readline(self.TAMANO_MAX_ENCABEZADO)
+            archivo.seek(0)
+            headers = next(csv.reader([primera_linea.decode('utf-8')]), None)
             
             if not headers:
                 return False, "El archivo CSV está vacío o no tiene headers"
@@ -55,35 +76,54 @@ class ServicioCargaMasiva:
         """
         try:
             content_str = content.decode('utf-8')
-            reader = csv.DictReader(io.StringIO(content_str))
-            
-            # Guardar headers originales y crear mapeo
-            headers_originales = list(reader.fieldnames) if reader.fieldnames else []
-            mapeo_headers = {}  # {header_normalizado: header_original}
+            headers_originales, filas = self.leer_filas(io.StringIO(content_str))
             
-            for header_original in headers_originales:
-                header_normalizado = header_original.lower().strip()
-                mapeo_headers[header_normalizado] = header_original
+            # {header_normalizado: header_original}
+            mapeo_headers = {h.lower().strip(): h for h in headers_originales}
             
-            filas = []
+            return list(filas), headers_originales, mapeo_headers
+        except Exception as e:
+            logger.error(f"Error parseando CSV: {e}")
+            raise ValueError(f"Error parseando CSV: {str(e)}")
+    
+    def leer_filas(self, archivo: TextIO) -> Tuple[List[str], Iterator[Dict[str, str]]]:
+        """
+        Retorna los headers originales y un generador de filas con keys normalizadas,
+        que lee el archivo a medida que se recorre en lugar de cargarlo completo.
+        """
+        try:
+            reader = csv.DictReader(archivo)
+            headers_originales = list(reader.fieldnames) if reader.fieldnames else []
+        except Exception as e:
+            logger.error(f"Error parseando CSV: {e}")
+            raise ValueError(f"Error parseando CSV: {str(e)}")
+        return headers_originales, self._iterar_filas(reader)
+    
+    def _iterar_filas(self, reader: csv.DictReader) -> Iterator[Dict[str, str]]:
+        try:
             for row in reader:
                 # Normalizar nombres de columnas para búsqueda
-                fila_normalizada = {}
-                for key, value in row.items():
-                    key_normalizada = key.lower().strip()
-                    fila_normalizada[key_normalizada] = value.strip() if value else ''
-                filas.append(fila_normalizada)
-            
-            return filas, headers_originales, mapeo_headers
+                yield {key.lower().strip(): value.strip() if value else '' for key, value in row.items()}
         except Exception as e:
             logger.error(f"Error parseando CSV: {e}")
             raise ValueError(f"Error parseando CSV: {str(e)}")
     
     def contar_filas(self, content: bytes) -> int:
         """Cuenta el número total de filas en el CSV (sin contar header)"""
+        return self.contar_filas_archivo(io.BytesIO(content))
+    
+    def contar_filas_archivo(self, archivo: BinaryIO) -> int:
+        """
+        Cuenta las filas de datos recorriendo las líneas del archivo, sin parsearlas.
+        Las líneas en blanco se ignoran como en `csv.DictReader`; un valor entre comillas con
+        saltos de línea cuenta más de una vez, por lo que el total exacto se fija al procesar.
+        El archivo queda al inicio para las lecturas siguientes.
+        """
         try:
-            filas, _, _ = self.parsear_csv(content)
-            return len(filas)
+            archivo.seek(0)
+            lineas = sum(1 for linea in archivo if linea.strip())
+            archivo.seek(0)
+            return max(lineas - 1, 0)
         except Exception as e:
             logger.error(f"Error contando filas: {e}")
             return 0
@@ -100,28 +140,12 @@ class ServicioCargaMasiva:
         Retorna: {'status': 'creado'|'actualizado'|'rechazado'|'error', 'mensaje': str, 'fila': dict}
         """
         try:
-            # Extraer datos de la fila
-            nombre = fila.get('nombre', '').strip()
-            descripcion = fila.get('descripcion', '').strip()
-            precio_str = fila.get('precio', '').strip()
-            stock_str = fila.get('stock', '').strip()
-            fecha_vencimiento = fila.get('fecha_vencimiento', '').strip()
-            categoria_nombre = fila.get('categoria', '').strip()
-            proveedor_nombre = fila.get('proveedor', '').strip()
-            
-            # Validaciones básicas
-            if not nombre:
-                return {'status': 'error', 'mensaje': 'Nombre es requerido', 'fila': fila}
-            
-            try:
-                precio = float(precio_str)
-            except (ValueError, TypeError):
-                return {'status': 'error', 'mensaje': f'Precio inválido: {precio_str}', 'fila': fila}
-            
-            try:
-                stock = int(stock_str)
-            except (ValueError, TypeError):
-                return {'status': 'error', 'mensaje': f'Stock inválido: {stock_str}', 'fila': fila}
+            datos, error = self._validar_fila(fila)
+            if error:
+                return error
+            nombre, descripcion, precio, stock = datos['nombre'], datos['descripcion'], datos['precio'], datos['stock']
+            fecha_vencimiento, categoria_nombre = datos['fecha_vencimiento'], datos['categoria']
+            proveedor_nombre = datos['proveedor']
             
             # 1. Buscar o crear categoría
             categoria = self.repositorio_categoria.obtener_por_nombre(categoria_nombre)
@@ -191,22 +215,250 @@ class ServicioCargaMasiva:
             logger.error(f"Error procesando fila: {e}")
             return {'status': 'error', 'mensaje': f'Error inesperado: {str(e)}', 'fila': fila}
     
+    def _validar_fila(self, fila: Dict[str, str]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Extrae y valida los campos básicos de una fila: (datos, None) o (None, resultado de error)"""
+        nombre = fila.get('nombre', '').strip()
+        descripcion = fila.get('descripcion', '').strip()
+        precio_str = fila.get('precio', '').strip()
+        stock_str = fila.get('stock', '').strip()
+        fecha_vencimiento = fila.get('fecha_vencimiento', '').strip()
+        categoria_nombre = fila.get('categoria', '').strip()
+        proveedor_nombre = fila.get('proveedor', '').strip()
+        
+        if not nombre:
+            return None, {'status': 'error', 'mensaje': 'Nombre es requerido', 'fila': fila}
+        
+        try:
+            precio = float(precio_str)
+        except (ValueError, TypeError):
+            return None, {'status': 'error', 'mensaje': f'Precio inválido: {precio_str}', 'fila': fila}
+        
+        try:
+            stock = int(stock_str)
+        except (ValueError, TypeError):
+            return None, {'status': 'error', 'mensaje': f'Stock inválido: {stock_str}', 'fila': fila}
+        
+        return {
+            'nombre': nombre,
+            'descripcion': descripcion,
+            'precio': precio,
+            'stock': stock,
+            'fecha_vencimiento': fecha_vencimiento,
+            'categoria': categoria_nombre,
+            'proveedor': proveedor_nombre
+        }, None
+    
+    def procesar_filas(self, filas: List[Dict[str, str]], callback_progreso=None) -> List[Dict[str, Any]]:
+        """
+        Procesa todas las filas en lote y retorna un resultado por fila, en el mismo orden
+        y con los mismos status y mensajes que `procesar_fila`.
+        callback_progreso: función(filas_procesadas, total_filas, resultados_del_bloque)
+        """
+        total_filas = len(filas)
+        resultados = []
+        for _, resultados_bloque in self.procesar_en_bloques(filas):
+            resultados.extend(resultados_bloque)
+            if callback_progreso:
+                callback_progreso(len(resultados), total_filas, resultados_bloque)
+        return resultados
+    
+    def procesar_en_bloques(self, filas: Iterable[Dict[str, str]]) -> Iterator[Tuple[List[Dict[str, str]], List[Dict[str, Any]]]]:
+        """
+        Consume las filas a medida que llegan y entrega (filas_del_bloque, resultados_del_bloque)
+        por cada bloque de TAMANO_BLOQUE filas, después de confirmarlo.
+        
+        Los productos de cada bloque se buscan y guardan en una transacción y sus eventos se
+        publican en lote. Categorías y proveedores se resuelven solo la primera vez que aparecen
+        y quedan en caché para los bloques siguientes.
+        """
+        cache = {'categorias': {}, 'errores_categoria': {}, 'proveedores': {}}
+        bloque = []
+        for fila in filas:
+            bloque.append(fila)
+            if len(bloque) == self.TAMANO_BLOQUE:
+                yield bloque, self._procesar_bloque(bloque, cache)
+                bloque = []
+        if bloque:
+            yield bloque, self._procesar_bloque(bloque, cache)
+    
+    def _procesar_bloque(self, filas: List[Dict[str, str]], cache: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        resultados = [None] * len(filas)
+        
+        # 1. Validaciones básicas de cada fila
+        datos = {}
+        for i, fila in enumerate(filas):
+            datos_fila, error = self._validar_fila(fila)
+            if error:
+                resultados[i] = error
+            else:
+                datos[i] = datos_fila
+        
+        # 2. Categorías y proveedores que aún no están en caché
+        categorias, errores_categoria = cache['categorias'], cache['errores_categoria']
+        proveedores = cache['proveedores']
+        nuevas, errores = self._resolver_categorias(
+            [d['categoria'] for d in datos.values() if d['categoria'] not in categorias and d['categoria'] not in errores_categoria]
+        )
+        categorias.update(nuevas)
+        errores_categoria.update(errores)
+        pendientes = list(dict.fromkeys(d['proveedor'] for d in datos.values() if d['proveedor'] not in proveedores))
+        sin_resolver = set()
+        if pendientes:
+            encontrados = self.servicio_proveedores.obtener_proveedores_por_nombres(pendientes)
+            if encontrados is None:
+                # Falla de Usuarios: no se guarda nada en caché y el siguiente bloque vuelve a consultarlos
+                sin_resolver = set(pendientes)
+            else:
+                # El listado se recorrió completo: los ausentes no existen
+                proveedores.update({nombre: encontrados.get(nombre) for nombre in pendientes})
+        
+        for i, d in list(datos.items()):
+            if d['categoria'] in errores_categoria:
+                resultados[i] = {'status': 'error', 'mensaje': f"Error creando categoría: {errores_categoria[d['categoria']]}", 'fila': filas[i]}
+                del datos[i]
+                continue
+            if d['proveedor'] in sin_resolver:
+                resultados[i] = {'status': 'error', 'mensaje': f"No se pudo consultar el proveedor: {d['proveedor']}", 'fila': filas[i]}
+                del datos[i]
+                continue
+            proveedor = proveedores.get(d['proveedor'])
+            if not proveedor:
+                resultados[i] = {'status': 'rechazado', 'mensaje': f"Proveedor no encontrado: {d['proveedor']}", 'fila': filas[i]}
+                del datos[i]
+                continue
+            categoria = categorias.get(d['categoria'])
+            d['categoria_id'] = str(categoria.id) if categoria else ''
+            d['proveedor_id'] = proveedor.get('id')
+        
+        # 3. Productos del bloque
+        if datos:
+            self._guardar_bloque(list(datos), datos, filas, resultados)
+        return resultados
+    
+    def _resolver_categorias(self, nombres: List[str]) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        """
+        Busca las categorías en una consulta y crea una sola vez cada una que falte.
+        Retorna ({nombre: categoría}, {nombre: mensaje de error al crearla}).
+        """
+        nombres = [nombre for nombre in dict.fromkeys(nombres) if self.normalizar_nombre(nombre)]
+        if not nombres:
+            return {}, {}
+        
+        categorias = self.repositorio_categoria.obtener_por_nombres(nombres)
+        creadas, errores = {}, {}
+        for nombre in nombres:
+            if nombre in categorias:
+                continue
+            normalizado = self.normalizar_nombre(nombre)
+            if normalizado not in creadas:
+                try:
+                    creadas[normalizado] = ejecutar_comando(CrearCategoria(
+                        nombre=nombre,
+                        descripcion=f"Categoría creada automáticamente: {nombre}"
+                    ))
+                    logger.info(f"Categoría creada: {nombre}")
+                except Exception as e:
+                    errores[nombre] = str(e)
+                    continue
+            categorias[nombre] = creadas[normalizado]
+        return categorias, errores
+    
+    def _guardar_bloque(self, indices: List[int], datos: Dict[int, Dict[str, Any]], filas: List[Dict[str, str]],
+                        resultados: List[Dict[str, Any]]):
+        """Crea o actualiza los productos de un bloque en una transacción y publica sus eventos en lote"""
+        existentes = self.repositorio_producto.obtener_por_nombres([datos[i]['nombre'] for i in indices])
+        en_bloque = {}  # {nombre normalizado: producto ya visto en este bloque}
+        nuevos, actualizados, eventos = {}, {}, []
+        
+        for i in indices:
+            d = datos[i]
+            normalizado = self.normalizar_nombre(d['nombre'])
+            existente = en_bloque.get(normalizado) or existentes.get(d['nombre'])
+            producto_id = existente.id if existente else uuid.uuid4()
+            
+            try:
+                producto = self._validar_producto(producto_id, d)
+            except Exception as e:
+                accion = 'actualizando' if existente else 'creando'
+                resultados[i] = {'status': 'error', 'mensaje': f'Error {accion} producto: {str(e)}', 'fila': filas[i]}
+                continue
+            
+            producto_dto = ProductoDTO(
+                id=producto_id,
+                nombre=d['nombre'],
+                descripcion=d['descripcion'],
+                precio=d['precio'],
+                categoria=d['categoria'],
+                categoria_id=d['categoria_id'],
+                proveedor_id=d['proveedor_id']
+            )
+            # Un producto creado en este mismo bloque se inserta con sus últimos datos
+            if producto_id in nuevos or not existente:
+                nuevos[producto_id] = producto_dto
+            else:
+                actualizados[producto_id] = producto_dto
+            en_bloque[normalizado] = producto_dto
+            
+            if not existente:
+                eventos.append(producto.disparar_evento_creacion())
+            eventos.append(InventarioAsignado(
+                producto_id=producto_id,
+                stock=d['stock'],
+                fecha_vencimiento=d['fecha_vencimiento']
+            ))
+            resultados[i] = (
+                {'status': 'actualizado', 'mensaje': 'Producto actualizado exitosamente', 'fila': filas[i]} if existente
+                else {'status': 'creado', 'mensaje': 'Producto creado exitosamente', 'fila': filas[i]}
+            )
+        
+        try:
+            self.repositorio_producto.guardar_lote(list(nuevos.values()), list(actualizados.values()))
+        except Exception as e:
+            # El bloque se revirtió completo: se reprocesa fila a fila para obtener el resultado de cada una
+            logger.warning(f"Bloque de carga masiva revertido, se procesa fila a fila: {e}")
+            for i in indices:
+                resultados[i] = self.procesar_fila(filas[i])
+            return
+        
+        try:
+            despachador_eventos.publicar_eventos(eventos)
+        except Exception as e:
+            logger.error(f"Error publicando eventos de carga masiva: {e}")
+    
+    def _validar_producto(self, producto_id: uuid.UUID, datos: Dict[str, Any]) -> Producto:
+        """Aplica las mismas reglas de negocio que los comandos de creación y actualización"""
+        producto = Producto(
+            id=producto_id,
+            nombre=Nombre(datos['nombre']),
+            descripcion=Descripcion(datos['descripcion']),
+            precio=Precio(datos['precio']),
+            categoria=Categoria(datos['categoria']),
+            categoria_id=datos['categoria_id'],
+            proveedor_id=datos['proveedor_id']
+        )
+        
+        fabrica = FabricaProducto()
+        fabrica.validar_regla(NombreProductoNoPuedeSerVacio(producto.nombre))
+        fabrica.validar_regla(DescripcionProductoNoPuedeSerVacio(producto.descripcion))
+        fabrica.validar_regla(PrecioProductoNoPuedeSerVacio(producto.precio))
+        fabrica.validar_regla(PrecioProductoNoPuedeSerMenorACero(producto.precio))
+        fabrica.validar_regla(PrecioProductoDebeSerNumerico(producto.precio))
+        fabrica.validar_regla(CategoriaProductoNoPuedeSerVacia(producto.categoria))
+        fabrica.validar_regla(CategoriaIdNoPuedeSerVacio(producto.categoria_id))
+        fabrica.validar_regla(ProveedorIdNoPuedeSerVacio(producto.proveedor_id))
+        return producto
+    
     def procesar_csv(self, content: bytes, callback_progreso=None) -> Tuple[List[Dict[str, any]], List[Dict[str, str]], List[str], Dict[str, str]]:
         """
         Procesa todo el CSV y retorna lista de resultados, filas, headers originales y mapeo
         callback_progreso: función(filas_procesadas, total_filas) que se llama periódicamente
         """
         filas, headers_originales, mapeo_headers = self.parsear_csv(content)
-        resultados = []
-        total_filas = len(filas)
         
-        for i, fila in enumerate(filas):
-            resultado = self.procesar_fila(fila, callback_progreso)
-            resultados.append(resultado)
-            
-            # Llamar callback de progreso si está disponible
-            if callback_progreso:
-                callback_progreso(i + 1, total_filas)
+        progreso = None
+        if callback_progreso:
+            progreso = lambda filas_procesadas, total_filas, _: callback_progreso(filas_procesadas, total_filas)
+        resultados = self.procesar_filas(filas, progreso)
         
         return resultados, filas, headers_originales, mapeo_headers
     
@@ -215,43 +467,8 @@ class ServicioCargaMasiva:
         """Genera un CSV con las filas originales más columnas 'status' y 'mensaje'"""
         try:
             output = io.StringIO()
-            
-            # Usar headers originales y agregar status y mensaje al final
-            headers = headers_originales.copy() if headers_originales else []
-            if 'status' not in headers:
-                headers.append('status')
-            if 'mensaje' not in headers:
-                headers.append('mensaje')
-            
-            writer = csv.DictWriter(output, fieldnames=headers)
-            writer.writeheader()
-            
-            # Escribir filas con status y mensaje
-            for fila_normalizada, resultado in zip(filas_normalizadas, resultados):
-                # Construir fila con headers originales
-                fila_resultado = {}
-                for header_original in headers:
-                    if header_original == 'status':
-                        fila_resultado[header_original] = resultado.get('status', 'error')
-                    elif header_original == 'mensaje':
-                        # Mostrar mensaje solo si hay error o rechazo, o si es exitoso mostrar un mensaje breve
-                        status = resultado.get('status', 'error')
-                        mensaje = resultado.get('mensaje', '')
-                        
-                        # Si no hay mensaje pero el status es exitoso, poner mensaje vacío o un mensaje genérico
-                        if status in ['creado', 'actualizado']:
-                            # Para casos exitosos, podemos poner el mensaje o dejarlo vacío
-                            # El mensaje ya viene en el resultado, así que lo usamos
-                            fila_resultado[header_original] = mensaje if mensaje else 'OK'
-                        else:
-                            # Para errores y rechazos, siempre mostrar el mensaje
-                            fila_resultado[header_original] = mensaje if mensaje else f'Error: {status}'
-                    else:
-                        # Buscar el valor usando el header normalizado
-                        header_normalizado = header_original.lower().strip()
-                        fila_resultado[header_original] = fila_normalizada.get(header_normalizado, '')
-                
-                writer.writerow(fila_resultado)
+            writer = self.iniciar_csv_resultado(output, headers_originales)
+            self.escribir_filas_resultado(writer, filas_normalizadas, resultados)
             
             csv_bytes = output.getvalue().encode('utf-8')
             output.close()
@@ -260,4 +477,45 @@ class ServicioCargaMasiva:
         except Exception as e:
             logger.error(f"Error generando CSV resultado: {e}")
             raise ValueError(f"Error generando CSV resultado: {str(e)}")
-
+    
+    def iniciar_csv_resultado(self, destino: TextIO, headers_originales: List[str]) -> csv.DictWriter:
+        """
+        Escribe el header del CSV resultado en `destino` y retorna el writer para
+        agregar las filas a medida que se procesan (ver `escribir_filas_resultado`).
+        """
+        # Usar headers originales y agregar status y mensaje al final
+        headers = headers_originales.copy() if headers_originales else []
+        if 'status' not in headers:
+            headers.append('status')
+        if 'mensaje' not in headers:
+            headers.append('mensaje')
+        
+        writer = csv.DictWriter(destino, fieldnames=headers)
+        writer.writeheader()
+        return writer
+    
+    def escribir_filas_resultado(self, writer: csv.DictWriter, filas_normalizadas: List[Dict[str, str]],
+                                 resultados: List[Dict[str, any]]):
+        """Escribe las filas con su status y mensaje en el CSV resultado"""
+        for fila_normalizada, resultado in zip(filas_normalizadas, resultados):
+            # Construir fila con headers originales
+            fila_resultado = {}
+            for header_original in writer.fieldnames:
+                if header_original == 'status':
+                    fila_resultado[header_original] = resultado.get('status', 'error')
+                elif header_original == 'mensaje':
+                    status = resultado.get('status', 'error')
+                    mensaje = resultado.get('mensaje', '')
+                    
+                    if status in ['creado', 'actualizado']:
+                        # Para casos exitosos se usa el mensaje del resultado o uno genérico
+                        fila_resultado[header_original] = mensaje if mensaje else 'OK'
+                    else:
+                        # Para errores y rechazos, siempre mostrar el mensaje
+                        fila_resultado[header_original] = mensaje if mensaje else f'Error: {status}'
+                else:
+                    # Buscar el valor usando el header normalizado
+                    header_normalizado = header_original.lower().strip()
+                    fila_resultado[header_original] = fila_normalizada.get(header_normalizado, '')
+            
+            writer.writerow(fila_resultado)
@@ -23,6 +23,9 @@ def init_db(app: Flask):
     with app.app_context():
         db.create_all()
         
+        from config.migraciones import ejecutar_migraciones
+        ejecutar_migraciones(db)
+        
         # Ejecutar seed data
         from config.seed import seed_data
         seed_data(app)
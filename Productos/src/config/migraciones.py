@@ -0,0 +1,110 @@
+"""
+Migraciones de esquema para tablas existentes.
+
+`db.create_all()` solo crea tablas nuevas; los índices añadidos a tablas que ya existen
+en producción se aplican aquí. Cada paso es idempotente y se ejecuta en cada arranque
+después de `create_all`. En PostgreSQL un advisory lock serializa las réplicas que
+arrancan a la vez, para que solo una altere el esquema.
+"""
+import logging
+
+from sqlalchemy import inspect, text
+
+from infraestructura.modelos import normalizar_nombre
+
+logger = logging.getLogger(__name__)
+
+# Clave del advisory lock de PostgreSQL que serializa réplicas migrando a la vez
+CLAVE_BLOQUEO_MIGRACIONES = 72100318
+
+# (nombre, tabla, columnas)
+INDICES = [
+    ('ix_productos_created_at_id', 'productos', ['created_at', 'id']),
+]
+
+# Tablas con columna `nombre_normalizado` e índice único: (tabla, índice)
+NOMBRES_NORMALIZADOS = [
+    ('categorias', 'uq_categorias_nombre_normalizado'),
+    ('productos', 'uq_productos_nombre_normalizado'),
+]
+
+
+def ejecutar_migraciones(db):
+    """Aplica todas las migraciones pendientes sobre la base de datos configurada."""
+    conexion_bloqueo = _adquirir_bloqueo(db)
+    try:
+        crear_indices(db)
+        agregar_nombres_normalizados(db)
+    finally:
+        _liberar_bloqueo(conexion_bloqueo)
+
+
+def _adquirir_bloqueo(db):
+    if db.engine.dialect.name != 'postgresql':
+        return None
+    conexion = db.engine.connect()
+    conexion.execute(text("SELECT pg_advisory_lock(:clave)"), {'clave': CLAVE_BLOQUEO_MIGRACIONES})
+    return conexion
+
+
+def _liberar_bloqueo(conexion):
+    if conexion is None:
+        return
+    try:
+        conexion.execute(text("SELECT pg_advisory_unlock(:clave)"), {'clave': CLAVE_BLOQUEO_MIGRACIONES})
+    finally:
+        conexion.close()
+
+
+def crear_indices(db):
+    """Crea los índices declarados en los modelos que aún no existen en tablas creadas antes."""
+    tablas = set(inspect(db.engine).get_table_names())
+    with db.engine.begin() as conexion:
+        for nombre, tabla, columnas in INDICES:
+            if tabla in tablas:
+                conexion.execute(text(f"CREATE INDEX IF NOT EXISTS {nombre} ON {tabla} ({', '.join(columnas)})"))
+
+
+def agregar_nombres_normalizados(db):
+    """
+    Agrega y completa `nombre_normalizado` en tablas creadas antes de la columna y crea su índice único.
+
+    Si dos filas existentes comparten nombre normalizado, solo la más antigua lo recibe;
+    las demás quedan en NULL (el índice único admite varios NULL) y se reportan en el log.
+    """
+    inspector = inspect(db.engine)
+    tablas = set(inspector.get_table_names())
+    for tabla, indice in NOMBRES_NORMALIZADOS:
+        if tabla not in tablas:
+            continue
+        columnas = {columna['name'] for columna in inspector.get_columns(tabla)}
+        with db.engine.begin() as conexion:
+            if 'nombre_normalizado' not in columnas:
+                # IF NOT EXISTS en PostgreSQL por si otro proceso sin el bloqueo ya la agregó
+                si_no_existe = 'IF NOT EXISTS ' if conexion.dialect.name == 'postgresql' else ''
+                conexion.execute(text(f"ALTER TABLE {tabla} ADD COLUMN {si_no_existe}nombre_normalizado VARCHAR(255)"))
+
+            usados = set(conexion.execute(text(
+                f"SELECT nombre_normalizado FROM {tabla} WHERE nombre_normalizado IS NOT NULL"
+            )).scalars())
+            pendientes = conexion.execute(text(
+                f"SELECT id, nombre FROM {tabla} WHERE nombre_normalizado IS NULL ORDER BY created_at, id"
+            )).all()
+
+            actualizaciones = []
+            for id_, nombre in pendientes:
+                normalizado = normalizar_nombre(nombre)
+                if not normalizado:
+                    continue
+                if normalizado in usados:
+                    logger.warning(f"{tabla}: '{nombre}' ({id_}) repite un nombre normalizado existente; se omite")
+                    continue
+                usados.add(normalizado)
+                actualizaciones.append({'id': id_, 'nombre_normalizado': normalizado})
+
+            if actualizaciones:
+                conexion.execute(
+                    text(f"UPDATE {tabla} SET nombre_normalizado = :nombre_normalizado WHERE id = :id"),
+                    actualizaciones
+                )
+            conexion.execute(text(f"CREATE UNIQUE INDEX IF NOT EXISTS {indice} ON {tabla} (nombre_normalizado)"))
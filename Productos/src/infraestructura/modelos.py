@@ -1,16 +1,36 @@
 from config.db import db
+from sqlalchemy.orm import validates
 import uuid
+import re
 from datetime import datetime
 
+
+def normalizar_nombre(nombre: str) -> str:
+    """Normaliza un nombre para comparación: lowercase y sin espacios"""
+    if not nombre:
+        return ""
+    return re.sub(r'\s+', '', nombre.lower().strip())
+
+
 class CategoriaModel(db.Model):
     __tablename__ = 'categorias'
+    __table_args__ = (
+        # Búsqueda por nombre normalizado (carga masiva) y unicidad del nombre
+        db.Index('uq_categorias_nombre_normalizado', 'nombre_normalizado', unique=True),
+    )
     
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     nombre = db.Column(db.String(255), nullable=False)
+    nombre_normalizado = db.Column(db.String(255), nullable=True)
     descripcion = db.Column(db.Text, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    @validates('nombre')
+    def _actualizar_nombre_normalizado(self, key, nombre):
+        self.nombre_normalizado = normalizar_nombre(nombre) or None
+        return nombre
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -22,9 +42,16 @@ class CategoriaModel(db.Model):
 
 class ProductoModel(db.Model):
     __tablename__ = 'productos'
+    __table_args__ = (
+        # Clave de la paginación por cursor del listado de productos
+        db.Index('ix_productos_created_at_id', 'created_at', 'id'),
+        # Búsqueda por nombre normalizado (carga masiva) y unicidad del nombre
+        db.Index('uq_productos_nombre_normalizado', 'nombre_normalizado', unique=True),
+    )
     
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     nombre = db.Column(db.String(255), nullable=False)
+    nombre_normalizado = db.Column(db.String(255), nullable=True)
     descripcion = db.Column(db.Text, nullable=False)
     precio = db.Column(db.Float, nullable=False)
     categoria = db.Column(db.String(255), nullable=False)
@@ -33,6 +60,11 @@ class ProductoModel(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    @validates('nombre')
+    def _actualizar_nombre_normalizado(self, key, nombre):
+        self.nombre_normalizado = normalizar_nombre(nombre) or None
+        return nombre
+    
     def to_dict(self):
         return {
             'id': self.id,
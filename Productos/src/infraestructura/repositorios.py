@@ -1,9 +1,11 @@
 from config.db import db
-from infraestructura.modelos import ProductoModel, CategoriaModel, CargaMasivaJobModel
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from infraestructura.modelos import ProductoModel, CategoriaModel, CargaMasivaJobModel, normalizar_nombre
 from aplicacion.dto import ProductoDTO, CategoriaDTO, CargaMasivaJobDTO
+from seedwork.presentacion.paginacion import PaginaCursor, paginar_consulta_por_cursor
 from datetime import datetime
 import uuid
-import re
 import logging
 
 logger = logging.getLogger(__name__)
@@ -22,7 +24,7 @@ class RepositorioProductoSQLite:
         )
         
         db.session.add(producto_model)
-        db.session.commit()
+        self._confirmar(producto_dto.nombre)
         
         return producto_dto
     
@@ -42,6 +44,26 @@ class RepositorioProductoSQLite:
             proveedor_id=producto_model.proveedor_id
         )
     
+    def obtener_por_ids(self, producto_ids: list[str]) -> list[ProductoDTO]:
+        """Obtener varios productos por ID en una sola consulta (los IDs inexistentes se omiten)"""
+        producto_ids = list(dict.fromkeys(str(p) for p in producto_ids if p))
+        if not producto_ids:
+            return []
+
+        productos_model = ProductoModel.query.filter(ProductoModel.id.in_(producto_ids)).all()
+        return [
+            ProductoDTO(
+                id=uuid.UUID(producto_model.id),
+                nombre=producto_model.nombre,
+                descripcion=producto_model.descripcion,
+                precio=producto_model.precio,
+                categoria=producto_model.categoria,
+                categoria_id=producto_model.categoria_id,
+                proveedor_id=producto_model.proveedor_id
+            )
+            for producto_model in productos_model
+        ]
+
     def obtener_todos(self) -> list[ProductoDTO]:
         """Obtener todos los productos"""
         productos_model = ProductoModel.query.all()
@@ -60,24 +82,54 @@ class RepositorioProductoSQLite:
         
         return productos_dto
     
+    def obtener_pagina_por_cursor(self, cursor: str = None, page_size: int = 100, max_page_size: int = 100) -> PaginaCursor:
+        """Obtener una página de productos (más recientes primero) navegando por cursor sobre (created_at, id)"""
+        pagina = paginar_consulta_por_cursor(
+            ProductoModel.query, [ProductoModel.created_at, ProductoModel.id],
+            cursor=cursor, page_size=page_size, max_page_size=max_page_size
+        )
+        return pagina.con_items([
+            ProductoDTO(
+                id=uuid.UUID(producto_model.id),
+                nombre=producto_model.nombre,
+                descripcion=producto_model.descripcion,
+                precio=producto_model.precio,
+                categoria=producto_model.categoria,
+                categoria_id=producto_model.categoria_id,
+                proveedor_id=producto_model.proveedor_id
+            )
+            for producto_model in pagina.items
+        ])
+    
     def obtener_por_nombre(self, nombre: str) -> ProductoDTO:
-        """Obtener un producto por nombre (comparación normalizada)"""
-        nombre_normalizado = self._normalizar_nombre(nombre)
-        productos = ProductoModel.query.all()
+        """Obtener un producto por nombre (comparación normalizada, por índice)"""
+        nombre_normalizado = normalizar_nombre(nombre)
+        if not nombre_normalizado:
+            return None
         
-        for producto_model in productos:
-            if self._normalizar_nombre(producto_model.nombre) == nombre_normalizado:
-                return ProductoDTO(
-                    id=uuid.UUID(producto_model.id),
-                    nombre=producto_model.nombre,
-                    descripcion=producto_model.descripcion,
-                    precio=producto_model.precio,
-                    categoria=producto_model.categoria,
-                    categoria_id=producto_model.categoria_id,
-                    proveedor_id=producto_model.proveedor_id
-                )
+        producto_model = ProductoModel.query.filter_by(nombre_normalizado=nombre_normalizado).first()
+        return self._modelo_a_dto(producto_model) if producto_model else None
+    
+    def obtener_por_nombres(self, nombres: list[str]) -> dict[str, ProductoDTO]:
+        """
+        Obtener varios productos por nombre en una sola consulta.
+        
+        Retorna {nombre recibido: producto} solo para los nombres encontrados; la
+        comparación es la misma normalizada de `obtener_por_nombre`.
+        """
+        normalizados = {nombre: normalizar_nombre(nombre) for nombre in nombres if normalizar_nombre(nombre)}
+        if not normalizados:
+            return {}
         
-        return None
+        productos_model = ProductoModel.query.filter(
+            ProductoModel.nombre_normalizado.in_(set(normalizados.values()))
+        ).all()
+        por_normalizado = {p.nombre_normalizado: self._modelo_a_dto(p) for p in productos_model}
+        return {
+            nombre: por_normalizado[normalizado]
+            for nombre, normalizado in normalizados.items()
+            if normalizado in por_normalizado
+        }
     
     def actualizar(self, producto_dto: ProductoDTO) -> ProductoDTO:
         """Actualizar un producto existente"""
@@ -93,15 +145,72 @@ class RepositorioProductoSQLite:
         producto_model.proveedor_id = producto_dto.proveedor_id
         producto_model.updated_at = datetime.utcnow()
         
-        db.session.commit()
+        self._confirmar(producto_dto.nombre)
         
         return producto_dto
     
-    def _normalizar_nombre(self, nombre: str) -> str:
-        """Normaliza un nombre para comparación: lowercase y sin espacios"""
-        if not nombre:
-            return ""
-        return re.sub(r'\s+', '', nombre.lower().strip())
+    def guardar_lote(self, nuevos: list[ProductoDTO], actualizados: list[ProductoDTO]):
+        """
+        Inserta y actualiza varios productos en una sola transacción.
+        
+        Las actualizaciones se envían como un UPDATE por clave primaria en lote. Si algo
+        falla se revierte todo el lote y se propaga el error.
+        """
+        ahora = datetime.utcnow()
+        try:
+            db.session.add_all([
+                ProductoModel(
+                    id=str(producto_dto.id),
+                    nombre=producto_dto.nombre,
+                    descripcion=producto_dto.descripcion,
+                    precio=producto_dto.precio,
+                    categoria=producto_dto.categoria,
+                    categoria_id=producto_dto.categoria_id,
+                    proveedor_id=producto_dto.proveedor_id
+                )
+                for producto_dto in nuevos
+            ])
+            if actualizados:
+                # El UPDATE en lote no pasa por @validates: el nombre normalizado se envía explícito
+                db.session.execute(update(ProductoModel), [
+                    {
+                        'id': str(producto_dto.id),
+                        'nombre': producto_dto.nombre,
+                        'nombre_normalizado': normalizar_nombre(producto_dto.nombre) or None,
+                        'descripcion': producto_dto.descripcion,
+                        'precio': producto_dto.precio,
+                        'categoria': producto_dto.categoria,
+                        'categoria_id': producto_dto.categoria_id,
+                        'proveedor_id': producto_dto.proveedor_id,
+                        'updated_at': ahora
+                    }
+                    for producto_dto in actualizados
+                ])
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+    
+    def _confirmar(self, nombre: str):
+        """Confirma la transacción; un nombre normalizado repetido se reporta como ValueError"""
+        try:
+            db.session.commit()
+        except IntegrityError as e:
+            db.session.rollback()
+            if 'nombre_normalizado' in str(e.orig):
+                raise ValueError(f"Ya existe un producto con el nombre '{nombre}'") from e
+            raise
+    
+    def _modelo_a_dto(self, producto_model: ProductoModel) -> ProductoDTO:
+        return ProductoDTO(
+            id=uuid.UUID(producto_model.id),
+            nombre=producto_model.nombre,
+            descripcion=producto_model.descripcion,
+            precio=producto_model.precio,
+            categoria=producto_model.categoria,
+            categoria_id=producto_model.categoria_id,
+            proveedor_id=producto_model.proveedor_id
+        )
 
 class RepositorioCategoriaSQLite:
     def crear(self, categoria_dto: CategoriaDTO) -> CategoriaDTO:
@@ -113,7 +222,7 @@ class RepositorioCategoriaSQLite:
         )
         
         db.session.add(categoria_model)
-        db.session.commit()
+        self._confirmar(categoria_dto.nombre)
         
         return categoria_dto
     
@@ -144,25 +253,46 @@ class RepositorioCategoriaSQLite:
         return categorias_dto
     
     def obtener_por_nombre(self, nombre: str) -> CategoriaDTO:
-        """Obtener una categoría por nombre (comparación normalizada)"""
-        nombre_normalizado = self._normalizar_nombre(nombre)
-        categorias = CategoriaModel.query.all()
+        """Obtener una categoría por nombre (comparación normalizada, por índice)"""
+        nombre_normalizado = normalizar_nombre(nombre)
+        if not nombre_normalizado:
+            return None
         
-        for categoria_model in categorias:
-            if self._normalizar_nombre(categoria_model.nombre) == nombre_normalizado:
-                return CategoriaDTO(
-                    id=uuid.UUID(categoria_model.id),
-                    nombre=categoria_model.nombre,
-                    descripcion=categoria_model.descripcion
-                )
+        categoria_model = CategoriaModel.query.filter_by(nombre_normalizado=nombre_normalizado).first()
+        return self._modelo_a_dto(categoria_model) if categoria_model else None
+    
+    def obtener_por_nombres(self, nombres: list[str]) -> dict[str, CategoriaDTO]:
+        """Obtener varias categorías por nombre en una sola consulta: {nombre recibido: categoría}"""
+        normalizados = {nombre: normalizar_nombre(nombre) for nombre in nombres if normalizar_nombre(nombre)}
+        if not normalizados:
+            return {}
         
-        return None
+        categorias_model = CategoriaModel.query.filter(
+            CategoriaModel.nombre_normalizado.in_(set(normalizados.values()))
+        ).all()
+        por_normalizado = {c.nombre_normalizado: self._modelo_a_dto(c) for c in categorias_model}
+        return {
+            nombre: por_normalizado[normalizado]
+            for nombre, normalizado in normalizados.items()
+            if normalizado in por_normalizado
+        }
     
-    def _normalizar_nombre(self, nombre: str) -> str:
-        """Normaliza un nombre para comparación: lowercase y sin espacios"""
-        if not nombre:
-            return ""
-        return re.sub(r'\s+', '', nombre.lower().strip())
+    def _confirmar(self, nombre: str):
+        """Confirma la transacción; un nombre normalizado repetido se reporta como ValueError"""
+        try:
+            db.session.commit()
+        except IntegrityError as e:
+            db.session.rollback()
+            if 'nombre_normalizado' in str(e.orig):
+                raise ValueError(f"Ya existe una categoría con el nombre '{nombre}'") from e
+            raise
+    
+    def _modelo_a_dto(self, categoria_model: CategoriaModel) -> CategoriaDTO:
+        return CategoriaDTO(
+            id=uuid.UUID(categoria_model.id),
+            nombre=categoria_model.nombre,
+            descripcion=categoria_model.descripcion
+        )
 
 class RepositorioJobSQLite:
     def crear(self, job_dto: CargaMasivaJobDTO) -> CargaMasivaJobDTO:
@@ -1,5 +1,6 @@
 import os
 import uuid
+from typing import BinaryIO, Union
 from google.cloud import storage
 import logging
 
@@ -30,8 +31,11 @@ class GCPStorageService:
             self.bucket = None
             self.bucket_name = bucket_name
     
-    def guardar_csv_original(self, csv_content: bytes, job_id: str) -> str:
-        """Guarda el CSV original en GCP Storage y retorna la URL"""
+    def guardar_csv_original(self, csv_content: Union[bytes, BinaryIO], job_id: str) -> str:
+        """
+        Guarda el CSV original en GCP Storage y retorna la URL.
+        Acepta bytes o un archivo abierto en modo binario, que se sube por partes desde el inicio.
+        """
         if not self.client or not self.bucket:
             raise RuntimeError("GCP Storage no está inicializado. Verifique las credenciales.")
         
@@ -39,7 +43,7 @@ class GCPStorageService:
             blob_name = f"productos-carga-masiva/{job_id}/original.csv"
             
             blob = self.bucket.blob(blob_name)
-            blob.upload_from_string(csv_content, content_type='text/csv')
+            self._subir_csv(blob, csv_content)
             
             logger.info(f"CSV original subido exitosamente: {blob_name}")
             return blob.public_url
@@ -47,8 +51,11 @@ class GCPStorageService:
             logger.error(f"Error subiendo CSV original a GCP: {e}")
             raise
     
-    def guardar_csv_resultado(self, csv_content: bytes, job_id: str) -> str:
-        """Guarda el CSV resultado en GCP Storage y retorna la URL"""
+    def guardar_csv_resultado(self, csv_content: Union[bytes, BinaryIO], job_id: str) -> str:
+        """
+        Guarda el CSV resultado en GCP Storage y retorna la URL.
+        Acepta bytes o un archivo abierto en modo binario, que se sube por partes desde el inicio.
+        """
         if not self.client or not self.bucket:
             raise RuntimeError("GCP Storage no está inicializado. Verifique las credenciales.")
         
@@ -56,7 +63,7 @@ class GCPStorageService:
             blob_name = f"productos-carga-masiva/{job_id}/resultado.csv"
             
             blob = self.bucket.blob(blob_name)
-            blob.upload_from_string(csv_content, content_type='text/csv')
+            self._subir_csv(blob, csv_content)
             
             logger.info(f"CSV resultado subido exitosamente: {blob_name}")
             return blob.public_url
@@ -83,6 +90,30 @@ class GCPStorageService:
             logger.error(f"Error descargando CSV desde GCP: {e}")
             raise
     
+    def descargar_csv_en_archivo(self, job_id: str, destino: BinaryIO) -> None:
+        """Descarga el CSV original en un archivo abierto en modo binario, sin cargarlo en memoria"""
+        if not self.client or not self.bucket:
+            raise RuntimeError("GCP Storage no está inicializado. Verifique las credenciales.")
+        
+        try:
+            blob_name = f"productos-carga-masiva/{job_id}/original.csv"
+            blob = self.bucket.blob(blob_name)
+            
+            if not blob.exists():
+                raise FileNotFoundError(f"CSV no encontrado: {blob_name}")
+            
+            blob.download_to_file(destino)
+            logger.info(f"CSV descargado exitosamente: {blob_name}")
+        except Exception as e:
+            logger.error(f"Error descargando CSV desde GCP: {e}")
+            raise
+    
+    def _subir_csv(self, blob, csv_content: Union[bytes, BinaryIO]):
+        if hasattr(csv_content, 'read'):
+            blob.upload_from_file(csv_content, content_type='text/csv', rewind=True)
+        else:
+            blob.upload_from_string(csv_content, content_type='text/csv')
+    
     def eliminar_archivo(self, url: str) -> bool:
         """Elimina un archivo de GCP Storage"""
         try:
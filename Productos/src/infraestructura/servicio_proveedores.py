@@ -1,19 +1,26 @@
-import requests
 import logging
 import os
 import re
+from seedwork.infraestructura.cliente_http import obtener_cliente_http
 
 logger = logging.getLogger(__name__)
 
+MAX_IDS_POR_CONSULTA = 500
+
+
+class ProveedoresNoDisponibles(Exception):
+    """El listado de proveedores no se pudo recorrer completo (error HTTP o respuesta inesperada)."""
+
 class ServicioProveedores:
     def __init__(self, base_url=None):
         # Usar variable de entorno o fallback a localhost
         self.base_url = base_url or os.getenv('USUARIOS_SERVICE_URL', 'http://localhost:5001/usuarios/api')
+        self._http = obtener_cliente_http()
     
     def obtener_proveedor_por_id(self, proveedor_id: str) -> dict:
         """Obtiene un proveedor específico por ID"""
         try:
-            response = requests.get(f"{self.base_url}/proveedores/{proveedor_id}")
+            response = self._http.get(f"{self.base_url}/proveedores/{proveedor_id}")
             if response.status_code == 200:
                 return response.json()
             elif response.status_code == 404:
@@ -25,55 +32,105 @@ class ServicioProveedores:
             logger.error(f"Error obteniendo proveedor {proveedor_id}: {e}")
             return None
     
+    def obtener_proveedores_por_ids(self, proveedor_ids: list[str]) -> dict:
+        """
+        Obtiene varios proveedores con el endpoint de consulta en lote, indexados por ID.
+        
+        Retorna None si el endpoint no está disponible, para que el llamador use otro camino.
+        """
+        proveedor_ids = list(dict.fromkeys(str(i) for i in proveedor_ids if i))
+        if not proveedor_ids:
+            return {}
+        
+        resultado = {}
+        try:
+            for inicio in range(0, len(proveedor_ids), MAX_IDS_POR_CONSULTA):
+                cuerpo = {'ids': proveedor_ids[inicio:inicio + MAX_IDS_POR_CONSULTA]}
+                response = self._http.post(f"{self.base_url}/proveedores/bulk", json=cuerpo)
+                if response.status_code != 200:
+                    logger.warning(f"Consulta en lote de proveedores no disponible: {response.status_code}")
+                    return None
+                resultado.update(response.json().get('proveedores', {}))
+            return resultado
+        except Exception as e:
+            logger.error(f"Error obteniendo proveedores en lote: {e}")
+            return None
+    
     def obtener_proveedor_por_nombre(self, nombre: str) -> dict:
         """Obtiene un proveedor por nombre (comparación normalizada)"""
         try:
             nombre_normalizado = self._normalizar_nombre(nombre)
             
-            # Obtener todos los proveedores (puede requerir múltiples requests si hay paginación)
-            page = 1
-            page_size = 100  # Tamaño de página razonable
-            
-            while True:
-                response = requests.get(f"{self.base_url}/proveedores", params={'page': page, 'page_size': page_size})
-                if response.status_code != 200:
-                    logger.error(f"Error consultando proveedores: {response.status_code}")
-                    return None
-                
-                proveedores_data = response.json()
-                # Si la respuesta tiene paginación, obtener los datos
-                if isinstance(proveedores_data, dict) and 'items' in proveedores_data:
-                    # Formato paginado: {'items': [...], 'pagination': {...}}
-                    proveedores = proveedores_data['items']
-                    pagination = proveedores_data.get('pagination', {})
-                    total_pages = pagination.get('total_pages', 1)
-                elif isinstance(proveedores_data, dict) and 'data' in proveedores_data:
-                    # Formato alternativo con 'data'
-                    proveedores = proveedores_data['data']
-                    total_pages = proveedores_data.get('total_pages', 1)
-                elif isinstance(proveedores_data, list):
-                    # Formato simple de lista
-                    proveedores = proveedores_data
-                    total_pages = 1
-                else:
-                    logger.error(f"Formato de respuesta inesperado: {type(proveedores_data)}. Contenido: {proveedores_data}")
-                    return None
-                
-                # Buscar proveedor por nombre normalizado en esta página
+            # Recorrer las páginas hasta encontrarlo
+            for proveedores in self._paginas_proveedores():
                 for proveedor in proveedores:
                     if self._normalizar_nombre(proveedor.get('nombre', '')) == nombre_normalizado:
                         return proveedor
-                
-                # Si no se encontró y hay más páginas, continuar
-                if page >= total_pages:
-                    break
-                page += 1
             
             return None
         except Exception as e:
             logger.error(f"Error obteniendo proveedor por nombre {nombre}: {e}")
             return None
     
+    def obtener_proveedores_por_nombres(self, nombres: list[str]) -> dict:
+        """
+        Obtiene varios proveedores por nombre recorriendo el listado una sola vez.
+        
+        Retorna {nombre recibido: proveedor} solo para los nombres encontrados, con la
+        misma comparación normalizada de `obtener_proveedor_por_nombre`. Retorna None si el
+        listado falla antes de resolver todos los nombres: un nombre ausente no significa
+        entonces que el proveedor no exista.
+        """
+        pendientes = {}
+        for nombre in nombres:
+            pendientes.setdefault(self._normalizar_nombre(nombre), []).append(nombre)
+        
+        resultado = {}
+        try:
+            for proveedores in self._paginas_proveedores():
+                for proveedor in proveedores:
+                    for nombre in pendientes.pop(self._normalizar_nombre(proveedor.get('nombre', '')), []):
+                        resultado[nombre] = proveedor
+                if not pendientes:
+                    break
+        except Exception as e:
+            logger.error(f"Error obteniendo proveedores por nombre: {e}")
+            return None
+        return resultado
+    
+    def _paginas_proveedores(self, page_size: int = 100):
+        """Recorre el listado paginado de proveedores; lanza ProveedoresNoDisponibles si una página falla"""
+        page = 1
+        while True:
+            response = self._http.get(f"{self.base_url}/proveedores", params={'page': page, 'page_size': page_size})
+            if response.status_code != 200:
+                raise ProveedoresNoDisponibles(f"Error consultando proveedores: {response.status_code}")
+            
+            proveedores_data = response.json()
+            # Si la respuesta tiene paginación, obtener los datos
+            if isinstance(proveedores_data, dict) and 'items' in proveedores_data:
+                # Formato paginado: {'items': [...], 'pagination': {...}}
+                proveedores = proveedores_data['items']
+                total_pages = proveedores_data.get('pagination', {}).get('total_pages', 1)
+            elif isinstance(proveedores_data, dict) and 'data' in proveedores_data:
+                # Formato alternativo con 'data'
+                proveedores = proveedores_data['data']
+                total_pages = proveedores_data.get('total_pages', 1)
+            elif isinstance(proveedores_data, list):
+                # Formato simple de lista
+                proveedores = proveedores_data
+                total_pages = 1
+            else:
+                raise ProveedoresNoDisponibles(
+                    f"Formato de respuesta inesperado: {type(proveedores_data)}. Contenido: {proveedores_data}"
+                )
+            
+            yield proveedores
+            
+            if page >= total_pages:
+                return
+            page += 1
+    
     def validar_proveedor_existe(self, proveedor_id: str) -> bool:
         """Valida que un proveedor existe"""
         proveedor = self.obtener_proveedor_por_id(proveedor_id)
@@ -50,6 +50,11 @@ class PublicadorEventos(ABC):
     def publicar(self, evento: EventoDominio):
         """Publica un evento de dominio"""
         pass
+    
+    def publicar_lote(self, eventos: List[EventoDominio]):
+        """Publica varios eventos; los publicadores que pueden enviarlos juntos lo sobrescriben"""
+        for evento in eventos:
+            self.publicar(evento)
 
 
 class DespachadorEventos:
@@ -80,7 +85,23 @@ class DespachadorEventos:
             print(f"📤 Despachador: Enviando a publicador: {publicador.__class__.__name__}")
             publicador.publicar(evento)
         
-        # Distribuir a manejadores locales
+        self._distribuir_localmente(evento)
+    
+    def publicar_eventos(self, eventos: List[EventoDominio]):
+        """Publica varios eventos en lote a cada publicador y luego los distribuye a los manejadores"""
+        if not eventos:
+            return
+        print(f"📡 Despachador: Recibido lote de {len(eventos)} eventos")
+        
+        for publicador in self._publicadores:
+            print(f"📤 Despachador: Enviando lote a publicador: {publicador.__class__.__name__}")
+            publicador.publicar_lote(eventos)
+        
+        for evento in eventos:
+            self._distribuir_localmente(evento)
+    
+    def _distribuir_localmente(self, evento: EventoDominio):
+        """Distribuye un evento a los manejadores locales registrados para su tipo"""
         tipo_evento = evento.__class__.__name__
         print(f"🏠 Despachador: Buscando manejadores locales para {tipo_evento}")
         if tipo_evento in self._manejadores:
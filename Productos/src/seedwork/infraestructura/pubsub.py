@@ -3,7 +3,7 @@
 import json
 import logging
 import os
-from typing import Dict, Any
+from typing import Dict, Any, List
 from google.cloud import pubsub_v1
 from google.auth.exceptions import DefaultCredentialsError
 from seedwork.dominio.eventos import PublicadorEventos, EventoDominio
@@ -114,6 +114,40 @@ class PublicadorPubSub(PublicadorEventos):
             print(f"❌ PubSub: Error publicando evento {evento.__class__.__name__}: {e}")
             logger.warning(f"Error publicando evento {evento.__class__.__name__}: {e}")
     
+    def publicar_lote(self, eventos: List[EventoDominio]):
+        """
+        Publica varios eventos sin esperar la confirmación de cada uno.
+        
+        El cliente de Pub/Sub agrupa los mensajes pendientes en lotes; las confirmaciones
+        se esperan al final.
+        """
+        if not self._publisher:
+            logger.debug(f"Publicador Pub/Sub no disponible, {len(eventos)} eventos no publicados")
+            return
+        
+        try:
+            if not self._topics_creados:
+                self.crear_topics()
+                self._topics_creados = True
+            
+            futuros = []
+            for evento in eventos:
+                topic_path = self._publisher.topic_path(self.project_id, self._get_topic_name(evento))
+                mensaje_data = json.dumps(evento.to_dict()).encode('utf-8')
+                futuros.append((evento, self._publisher.publish(topic_path, mensaje_data)))
+        except Exception as e:
+            logger.warning(f"Error publicando lote de eventos: {e}")
+            return
+        
+        fallidos = 0
+        for evento, futuro in futuros:
+            try:
+                futuro.result()
+            except Exception as e:
+                fallidos += 1
+                logger.warning(f"Error publicando evento {evento.__class__.__name__} {evento.id}: {e}")
+        logger.info(f"Lote de {len(eventos)} eventos publicado ({fallidos} con error)")
+    
     def _get_topic_name(self, evento: EventoDominio) -> str:
         """Determina el nombre del topic basado en el tipo de evento"""
         tipo_evento = evento.__class__.__name__
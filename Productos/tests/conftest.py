@@ -44,6 +44,13 @@ SERVICE_URLS = {
     'logistica_service': f"{BASE_URLS['logistica']}{API_ROUTES['logistica']['inventario']}"
 }
 
+@pytest.fixture(autouse=True)
+def reiniciar_cliente_http():
+    """Evita que el estado de los circuit breakers del cliente HTTP compartido pase de un test a otro"""
+    from seedwork.infraestructura.cliente_http import obtener_cliente_http
+    obtener_cliente_http().reiniciar()
+    yield
+
 @pytest.fixture(scope='session')
 def app():
     # Configurar entorno de testing
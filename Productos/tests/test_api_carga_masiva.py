@@ -46,6 +46,9 @@ Paracetamol,5000"""
             assert 'job_id' in data
             assert data['status'] == 'pending'
             assert data['total_filas'] == 1
+            # El CSV se sube desde el stream del archivo, no como bytes leídos en memoria
+            archivo_subido = mock_storage_instance.guardar_csv_original.call_args[0][0]
+            assert hasattr(archivo_subido, 'read')
     
     def test_crear_carga_masiva_sin_archivo(self, client):
         """Test creación sin archivo"""
@@ -59,7 +62,7 @@ Paracetamol,5000"""
         """Test creación con archivo inválido"""
         with patch('src.api.producto.ServicioCargaMasiva') as mock_servicio:
             mock_instance = Mock()
-            mock_instance.validar_archivo_csv.return_value = (False, "Falta columna requerida")
+            mock_instance.validar_encabezado_csv.return_value = (False, "Falta columna requerida")
             mock_servicio.return_value = mock_instance
             
             response = client.post(
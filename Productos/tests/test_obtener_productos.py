@@ -91,6 +91,40 @@ class TestObtenerProductos:
         assert resultado[0].categoria_nombre == "Medicamentos"
         assert resultado[0].proveedor_nombre == "Farmacia Central"
     
+    def test_obtener_productos_por_cursor_solo_agrega_la_pagina(self):
+        """Con cursor, solo se consultan en lote los proveedores de los productos de la página"""
+        from seedwork.presentacion.paginacion import PaginaCursor
+        producto = ProductoDTO(
+            id=uuid.uuid4(), nombre="Paracetamol", descripcion="Analgésico", precio=25000.0,
+            categoria="Medicamentos", categoria_id=self.categoria_id, proveedor_id=self.proveedor_id
+        )
+        categoria = CategoriaDTO(id=uuid.UUID(self.categoria_id), nombre="Medicamentos", descripcion="Generales")
+        proveedor = {'id': self.proveedor_id, 'nombre': 'Farmacia Central', 'email': 'f@c.com', 'direccion': 'Calle 1'}
+        
+        mock_repo_producto = Mock()
+        mock_repo_producto.obtener_pagina_por_cursor.return_value = PaginaCursor(
+            items=[producto], page_size=1, next_cursor='siguiente'
+        )
+        mock_repo_categoria = Mock()
+        mock_repo_categoria.obtener_todos.return_value = [categoria]
+        mock_servicio_proveedores = Mock()
+        mock_servicio_proveedores.obtener_proveedores_por_ids.return_value = {self.proveedor_id: proveedor}
+        
+        handler = ObtenerProductosHandler(
+            repositorio=mock_repo_producto,
+            repositorio_categoria=mock_repo_categoria,
+            servicio_proveedores=mock_servicio_proveedores
+        )
+        handler._obtener_todos_proveedores = Mock()
+        
+        pagina = handler.handle(ObtenerProductos(cursor='', page_size=1))
+        
+        mock_repo_producto.obtener_todos.assert_not_called()
+        handler._obtener_todos_proveedores.assert_not_called()
+        mock_servicio_proveedores.obtener_proveedores_por_ids.assert_called_once_with([self.proveedor_id])
+        assert [p.proveedor_nombre for p in pagina.items] == ['Farmacia Central']
+        assert pagina.next_cursor == 'siguiente'
+    
     def test_obtener_productos_vacio(self):
         """Test obtener productos cuando no hay productos"""
         # Arrange
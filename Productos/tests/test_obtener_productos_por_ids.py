@@ -0,0 +1,52 @@
+import pytest
+import sys
+import os
+import uuid
+from unittest.mock import Mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from aplicacion.consultas.obtener_productos_por_ids import ObtenerProductosPorIdsHandler, ObtenerProductosPorIds
+from aplicacion.dto import ProductoDTO
+
+
+class TestObtenerProductosPorIds:
+    """Test para obtener varios productos por ID"""
+
+    def test_obtener_productos_por_ids_exitoso(self):
+        """Test que retorna un diccionario indexado por ID con una sola consulta al repositorio"""
+        # Arrange
+        producto_id = uuid.uuid4()
+        repositorio = Mock()
+        repositorio.obtener_por_ids.return_value = [ProductoDTO(
+            id=producto_id,
+            nombre="Paracetamol",
+            descripcion="Analgésico",
+            precio=25000.0,
+            categoria="Medicamentos",
+            categoria_id="cat-1",
+            proveedor_id="prov-1"
+        )]
+        handler = ObtenerProductosPorIdsHandler(repositorio=repositorio)
+
+        # Act
+        resultado = handler.handle(ObtenerProductosPorIds(producto_ids=[str(producto_id), str(producto_id), 'otro']))
+
+        # Assert
+        repositorio.obtener_por_ids.assert_called_once_with([str(producto_id), 'otro'])
+        assert resultado[str(producto_id)]['nombre'] == "Paracetamol"
+        assert resultado[str(producto_id)]['precio'] == 25000.0
+        assert 'otro' not in resultado
+
+    def test_obtener_productos_por_ids_lista_vacia(self):
+        """Test que una lista vacía no consulta el repositorio"""
+        # Arrange
+        repositorio = Mock()
+        handler = ObtenerProductosPorIdsHandler(repositorio=repositorio)
+
+        # Act
+        resultado = handler.handle(ObtenerProductosPorIds(producto_ids=[]))
+
+        # Assert
+        assert resultado == {}
+        repositorio.obtener_por_ids.assert_not_called()
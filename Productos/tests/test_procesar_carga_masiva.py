@@ -30,10 +30,21 @@ class TestProcesarCargaMasivaHandler:
     def mock_servicio_storage(self):
         """Mock del servicio de storage"""
         mock_storage = Mock()
-        mock_storage.descargar_csv.return_value = b"nombre,descripcion,precio,stock,fecha_vencimiento,categoria,proveedor\nProducto,Desc,1000,10,2025-12-31,Medicinas,Proveedor"
+        mock_storage.descargar_csv_en_archivo.side_effect = lambda job_id, destino: destino.write(
+            b"nombre,descripcion,precio,stock,fecha_vencimiento,categoria,proveedor\nProducto,Desc,1000,10,2025-12-31,Medicinas,Proveedor"
+        )
         mock_storage.guardar_csv_resultado.return_value = "https://storage.googleapis.com/result.csv"
         return mock_storage
     
+    def simular_procesar_en_bloques(self, resultados, tamano_bloque=10):
+        """Simula `procesar_en_bloques` entregando las filas y resultados de cada bloque"""
+        def procesar_en_bloques(filas):
+            filas = list(filas)
+            for inicio in range(0, len(filas), tamano_bloque):
+                fin = min(inicio + tamano_bloque, len(filas))
+                yield filas[inicio:fin], resultados[inicio:fin]
+        return procesar_en_bloques
+    
     def test_handle_job_no_encontrado(self, mock_repositorio, mock_servicio_carga, mock_servicio_storage):
         """Test cuando el job no existe"""
         mock_repositorio.obtener_por_id.return_value = None
@@ -57,21 +68,17 @@ class TestProcesarCargaMasivaHandler:
         )
         mock_repositorio.obtener_por_id.return_value = job
         
-        # Mock parsear CSV
+        # Mock leer CSV
         filas_normalizadas = [{'nombre': 'Producto', 'precio': '1000', 'stock': '10', 'fecha_vencimiento': '2025-12-31', 'categoria': 'Medicinas', 'proveedor': 'Proveedor', 'descripcion': 'Desc'}]
         headers_originales = ['nombre', 'descripcion', 'precio', 'stock', 'fecha_vencimiento', 'categoria', 'proveedor']
-        mapeo_headers = {h.lower().strip(): h for h in headers_originales}
         
-        mock_servicio_carga.parsear_csv.return_value = (filas_normalizadas, headers_originales, mapeo_headers)
+        mock_servicio_carga.leer_filas.return_value = (headers_originales, iter(filas_normalizadas))
         
-        # Mock procesar fila
-        mock_servicio_carga.procesar_fila.return_value = {
+        # Mock procesar por bloques
+        mock_servicio_carga.procesar_en_bloques.side_effect = self.simular_procesar_en_bloques([{
             'status': 'creado',
             'mensaje': 'Producto creado exitosamente'
-        }
-        
-        # Mock generar CSV resultado
-        mock_servicio_carga.generar_csv_resultado.return_value = b"nombre,status\nProducto,creado"
+        }])
         
         handler = ProcesarCargaMasivaHandler(
             repositorio_job=mock_repositorio,
@@ -86,7 +93,8 @@ class TestProcesarCargaMasivaHandler:
         assert resultado.filas_exitosas == 1
         assert resultado.filas_procesadas == 1
         assert resultado.result_url == "https://storage.googleapis.com/result.csv"
-        mock_servicio_storage.descargar_csv.assert_called_once()
+        mock_servicio_storage.descargar_csv_en_archivo.assert_called_once()
+        mock_servicio_carga.escribir_filas_resultado.assert_called_once()
         mock_servicio_storage.guardar_csv_resultado.assert_called_once()
     
     def test_handle_actualizar_status_a_processing(self, mock_repositorio, mock_servicio_carga, mock_servicio_storage):
@@ -97,14 +105,12 @@ class TestProcesarCargaMasivaHandler:
         )
         mock_repositorio.obtener_por_id.return_value = job
         
-        # Mock parsear CSV
+        # Mock leer CSV
         filas_normalizadas = [{'nombre': 'Producto', 'precio': '1000'}]
         headers_originales = ['nombre', 'precio']
-        mapeo_headers = {}
         
-        mock_servicio_carga.parsear_csv.return_value = (filas_normalizadas, headers_originales, mapeo_headers)
-        mock_servicio_carga.procesar_fila.return_value = {'status': 'creado'}
-        mock_servicio_carga.generar_csv_resultado.return_value = b"content"
+        mock_servicio_carga.leer_filas.return_value = (headers_originales, iter(filas_normalizadas))
+        mock_servicio_carga.procesar_en_bloques.side_effect = self.simular_procesar_en_bloques([{'status': 'creado'}])
         
         handler = ProcesarCargaMasivaHandler(
             repositorio_job=mock_repositorio,
@@ -131,14 +137,12 @@ class TestProcesarCargaMasivaHandler:
             {'nombre': 'Producto2', 'precio': '2000'}
         ]
         headers_originales = ['nombre', 'precio']
-        mapeo_headers = {}
         
-        mock_servicio_carga.parsear_csv.return_value = (filas_normalizadas, headers_originales, mapeo_headers)
-        mock_servicio_carga.procesar_fila.side_effect = [
+        mock_servicio_carga.leer_filas.return_value = (headers_originales, iter(filas_normalizadas))
+        mock_servicio_carga.procesar_en_bloques.side_effect = self.simular_procesar_en_bloques([
             {'status': 'creado'},
             {'status': 'rechazado'}
-        ]
-        mock_servicio_carga.generar_csv_resultado.return_value = b"content"
+        ])
         
         handler = ProcesarCargaMasivaHandler(
             repositorio_job=mock_repositorio,
@@ -161,7 +165,7 @@ class TestProcesarCargaMasivaHandler:
         )
         mock_repositorio.obtener_por_id.return_value = job
         
-        mock_servicio_storage.descargar_csv.side_effect = Exception("Error descargando CSV")
+        mock_servicio_storage.descargar_csv_en_archivo.side_effect = Exception("Error descargando CSV")
         
         handler = ProcesarCargaMasivaHandler(
             repositorio_job=mock_repositorio,
@@ -183,8 +187,8 @@ class TestProcesarCargaMasivaHandler:
             if job_actualizado:
                 assert job_actualizado.status == 'failed'
     
-    def test_handle_actualizar_cada_10_filas(self, mock_repositorio, mock_servicio_carga, mock_servicio_storage):
-        """Test que actualiza BD cada 10 filas"""
+    def test_handle_actualizar_progreso_por_bloque(self, mock_repositorio, mock_servicio_carga, mock_servicio_storage):
+        """Test que actualiza BD al terminar cada bloque de filas"""
         job = CargaMasivaJobDTO(
             status='processing',
             total_filas=15
@@ -194,11 +198,14 @@ class TestProcesarCargaMasivaHandler:
         # Crear 15 filas
         filas_normalizadas = [{'nombre': f'Producto{i}', 'precio': '1000'} for i in range(15)]
         headers_originales = ['nombre', 'precio']
-        mapeo_headers = {}
         
-        mock_servicio_carga.parsear_csv.return_value = (filas_normalizadas, headers_originales, mapeo_headers)
-        mock_servicio_carga.procesar_fila.return_value = {'status': 'creado'}
-        mock_servicio_carga.generar_csv_resultado.return_value = b"content"
+        mock_servicio_carga.leer_filas.return_value = (headers_originales, iter(filas_normalizadas))
+        mock_servicio_carga.procesar_en_bloques.side_effect = self.simular_procesar_en_bloques(
+            [{'status': 'creado'}] * 14 + [{'status': 'error'}]
+        )
+        
+        progreso = []
+        mock_repositorio.actualizar.side_effect = lambda j: progreso.append((j.filas_procesadas, j.status))
         
         handler = ProcesarCargaMasivaHandler(
             repositorio_job=mock_repositorio,
@@ -207,8 +214,54 @@ class TestProcesarCargaMasivaHandler:
         )
         
         comando = ProcesarCargaMasiva(job_id=str(uuid.uuid4()))
-        handler.handle(comando)
+        resultado = handler.handle(comando)
         
-        # Debería actualizar al menos 2 veces (en fila 10 y al final)
-        assert mock_repositorio.actualizar.call_count >= 2
+        # Un guardado por bloque (10 y 15 filas) y el final
+        assert progreso == [(10, 'processing'), (15, 'processing'), (15, 'completed')]
+        assert resultado.filas_exitosas == 14
+        assert resultado.filas_error == 1
 
+    def test_handle_escribe_csv_resultado_por_bloques(self, mock_repositorio, mock_servicio_storage):
+        """Test que lee el CSV como stream y sube el resultado escrito bloque a bloque"""
+        job = CargaMasivaJobDTO(status='processing', total_filas=4)
+        mock_repositorio.obtener_por_id.return_value = job
+        csv_original = (
+            "Nombre,descripcion,precio,stock,fecha_vencimiento,categoria,proveedor\n"
+            + "".join(f"Producto {i},Desc,1000,10,2025-12-31,Medicinas,Proveedor\n" for i in range(3))
+            + "\n"
+        ).encode('utf-8')
+        mock_servicio_storage.descargar_csv_en_archivo.side_effect = lambda job_id, destino: destino.write(csv_original)
+        subido = {}
+        def guardar_csv_resultado(archivo, job_id):
+            subido['contenido'] = archivo.read().decode('utf-8')
+            return "https://storage.googleapis.com/result.csv"
+        mock_servicio_storage.guardar_csv_resultado.side_effect = guardar_csv_resultado
+        
+        servicio_carga = ServicioCargaMasiva(
+            repositorio_producto=Mock(), repositorio_categoria=Mock(), servicio_proveedores=Mock()
+        )
+        servicio_carga.TAMANO_BLOQUE = 2
+        bloques = []
+        def procesar_bloque(filas, cache):
+            bloques.append([f['nombre'] for f in filas])
+            return [{'status': 'creado', 'mensaje': 'Producto creado exitosamente', 'fila': f} for f in filas]
+        
+        handler = ProcesarCargaMasivaHandler(
+            repositorio_job=mock_repositorio,
+            servicio_carga=servicio_carga,
+            servicio_storage=mock_servicio_storage
+        )
+        with patch.object(servicio_carga, '_procesar_bloque', side_effect=procesar_bloque):
+            resultado = handler.handle(ProcesarCargaMasiva(job_id=str(uuid.uuid4())))
+        
+        assert bloques == [['Producto 0', 'Producto 1'], ['Producto 2']]
+        assert subido['contenido'].splitlines() == [
+            'Nombre,descripcion,precio,stock,fecha_vencimiento,categoria,proveedor,status,mensaje',
+            'Producto 0,Desc,1000,10,2025-12-31,Medicinas,Proveedor,creado,Producto creado exitosamente',
+            'Producto 1,Desc,1000,10,2025-12-31,Medicinas,Proveedor,creado,Producto creado exitosamente',
+            'Producto 2,Desc,1000,10,2025-12-31,Medicinas,Proveedor,creado,Producto creado exitosamente',
+        ]
+        # El total estimado al crear el job se corrige con las filas realmente leídas
+        assert resultado.total_filas == 3
+        assert resultado.filas_exitosas == 3
+        assert resultado.status == 'completed'
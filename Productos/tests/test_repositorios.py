@@ -1,16 +1,19 @@
 import pytest
+import dataclasses
 import sys
 import os
 import uuid
 from datetime import datetime, timedelta
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, inspect, text
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from config.db import db
 from infraestructura.repositorios import RepositorioProductoSQLite, RepositorioCategoriaSQLite
 from aplicacion.dto import ProductoDTO, CategoriaDTO
+from config.migraciones import ejecutar_migraciones
 
 
 class TestRepositorios:
@@ -126,6 +129,57 @@ class TestRepositorios:
         assert "Paracetamol" in nombres
         assert "Ibuprofeno" in nombres
     
+    def test_obtener_productos_por_ids(self):
+        """Test obtener varios productos por ID en una sola consulta"""
+        # Arrange
+        repositorio = RepositorioProductoSQLite()
+        ids = [uuid.uuid4() for _ in range(3)]
+        
+        with self.app.app_context():
+            for indice, producto_id in enumerate(ids):
+                repositorio.crear(ProductoDTO(
+                    id=producto_id,
+                    nombre=f"Producto {indice}",
+                    descripcion="Descripción",
+                    precio=1000.0 * (indice + 1),
+                    categoria="Medicamentos",
+                    categoria_id=str(uuid.uuid4()),
+                    proveedor_id=str(uuid.uuid4())
+                ))
+            
+            # Act
+            resultado = repositorio.obtener_por_ids([str(ids[0]), str(ids[2]), str(uuid.uuid4())])
+            vacio = repositorio.obtener_por_ids([])
+        
+        # Assert
+        assert {p.id for p in resultado} == {ids[0], ids[2]}
+        assert vacio == []
+    
+    def test_obtener_pagina_por_cursor(self):
+        """Test recorrer los productos por cursor, más recientes primero"""
+        repositorio = RepositorioProductoSQLite()
+        ids = [uuid.uuid4() for _ in range(3)]
+        
+        with self.app.app_context():
+            for indice, producto_id in enumerate(ids):
+                repositorio.crear(ProductoDTO(
+                    id=producto_id,
+                    nombre=f"Producto {indice}",
+                    descripcion="Descripción",
+                    precio=1000.0,
+                    categoria="Medicamentos",
+                    categoria_id=str(uuid.uuid4()),
+                    proveedor_id=str(uuid.uuid4())
+                ))
+            
+            primera = repositorio.obtener_pagina_por_cursor(cursor='', page_size=2)
+            segunda = repositorio.obtener_pagina_por_cursor(cursor=primera.next_cursor, page_size=2)
+        
+        assert [p.id for p in primera.items] == [ids[2], ids[1]]
+        assert [p.id for p in segunda.items] == [ids[0]]
+        assert segunda.next_cursor is None
+        assert segunda.prev_cursor is not None
+    
     def test_crear_categoria_en_db(self):
         """Test crear categoría en base de datos"""
         # Arrange
@@ -206,3 +260,146 @@ class TestRepositorios:
         nombres = [c.nombre for c in resultado]
         assert "Medicamentos" in nombres
         assert "Suplementos" in nombres
+    
+    def crear_producto(self, repositorio, nombre):
+        producto_dto = ProductoDTO(
+            id=uuid.uuid4(),
+            nombre=nombre,
+            descripcion="Descripción",
+            precio=1000.0,
+            categoria="Medicamentos",
+            categoria_id=str(uuid.uuid4()),
+            proveedor_id=str(uuid.uuid4())
+        )
+        return repositorio.crear(producto_dto)
+    
+    def test_obtener_producto_por_nombre_normalizado(self):
+        """Test la búsqueda por nombre ignora mayúsculas y espacios"""
+        repositorio = RepositorioProductoSQLite()
+        
+        with self.app.app_context():
+            creado = self.crear_producto(repositorio, "Tensiómetro Digital")
+            
+            resultado = repositorio.obtener_por_nombre("  tensiómetro   DIGITAL ")
+            inexistente = repositorio.obtener_por_nombre("Estetoscopio")
+            vacio = repositorio.obtener_por_nombre("   ")
+        
+        assert resultado.id == creado.id
+        assert inexistente is None
+        assert vacio is None
+    
+    def test_obtener_productos_por_nombres_en_una_consulta(self):
+        """Test resolver varios nombres con una sola consulta"""
+        repositorio = RepositorioProductoSQLite()
+        
+        with self.app.app_context():
+            bisturi = self.crear_producto(repositorio, "Bisturí")
+            gasas = self.crear_producto(repositorio, "Gasas Estériles")
+            
+            consultas = []
+            contar = lambda *args, **kwargs: consultas.append(args[2])
+            event.listen(db.engine, 'before_cursor_execute', contar)
+            try:
+                resultado = repositorio.obtener_por_nombres(["bisturí", "GASAS estériles", "Jeringas", ""])
+            finally:
+                event.remove(db.engine, 'before_cursor_execute', contar)
+        
+        assert len(consultas) == 1
+        assert set(resultado) == {"bisturí", "GASAS estériles"}
+        assert resultado["bisturí"].id == bisturi.id
+        assert resultado["GASAS estériles"].id == gasas.id
+    
+    def test_nombre_normalizado_repetido_lanza_value_error(self):
+        """Test el índice único rechaza nombres que solo difieren en mayúsculas o espacios"""
+        repositorio = RepositorioProductoSQLite()
+        repositorio_categoria = RepositorioCategoriaSQLite()
+        
+        with self.app.app_context():
+            self.crear_producto(repositorio, "Alcohol en Gel")
+            with pytest.raises(ValueError):
+                self.crear_producto(repositorio, "alcohol engel")
+            
+            repositorio_categoria.crear(CategoriaDTO(id=uuid.uuid4(), nombre="Consumibles", descripcion="D"))
+            with pytest.raises(ValueError):
+                repositorio_categoria.crear(CategoriaDTO(id=uuid.uuid4(), nombre=" CONSUMIBLES", descripcion="D"))
+            
+            # La sesión sigue utilizable después del rollback
+            assert len(repositorio.obtener_todos()) == 1
+    
+    def test_actualizar_producto_mantiene_nombre_normalizado(self):
+        """Test renombrar un producto actualiza la búsqueda por nombre"""
+        repositorio = RepositorioProductoSQLite()
+        
+        with self.app.app_context():
+            producto = self.crear_producto(repositorio, "Pinzas")
+            repositorio.actualizar(dataclasses.replace(producto, nombre="Pinzas Quirúrgicas"))
+            
+            assert repositorio.obtener_por_nombre("pinzas") is None
+            assert repositorio.obtener_por_nombre("pinzasquirúrgicas").id == producto.id
+    
+    def test_obtener_categorias_por_nombres(self):
+        """Test resolver varias categorías por nombre normalizado"""
+        repositorio = RepositorioCategoriaSQLite()
+        
+        with self.app.app_context():
+            repositorio.crear(CategoriaDTO(id=uuid.uuid4(), nombre="Equipos Médicos", descripcion="D"))
+            
+            resultado = repositorio.obtener_por_nombres(["equipos médicos", "Otra"])
+            categoria = repositorio.obtener_por_nombre("EQUIPOS  MÉDICOS")
+        
+        assert list(resultado) == ["equipos médicos"]
+        assert categoria.nombre == "Equipos Médicos"
+
+
+def test_migracion_completa_nombres_normalizados_en_tablas_existentes():
+    """Las tablas creadas antes de la columna la reciben, con backfill e índice único"""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+
+    with app.app_context():
+        c1, c2, c3 = (str(uuid.uuid4()) for _ in range(3))
+        with db.engine.begin() as conexion:
+            conexion.execute(text(
+                "CREATE TABLE categorias (id VARCHAR(36) PRIMARY KEY, nombre VARCHAR(255) NOT NULL, "
+                "descripcion TEXT NOT NULL, created_at DATETIME, updated_at DATETIME)"
+            ))
+            conexion.execute(text(
+                "INSERT INTO categorias (id, nombre, descripcion, created_at) VALUES "
+                "(:c1, 'Consumibles', 'D', '2024-01-01'), (:c2, ' consumibles ', 'D', '2024-02-01'), "
+                "(:c3, 'Equipos Médicos', 'D', '2024-03-01')"
+            ), {'c1': c1, 'c2': c2, 'c3': c3})
+
+        ejecutar_migraciones(db)
+        ejecutar_migraciones(db)
+
+        with db.engine.connect() as conexion:
+            filas = dict(conexion.execute(text("SELECT id, nombre_normalizado FROM categorias")).all())
+        indices = {i['name']: i for i in inspect(db.engine).get_indexes('categorias')}
+        categoria = RepositorioCategoriaSQLite().obtener_por_nombre("CONSUMIBLES")
+        db.session.remove()
+
+    # El duplicado más reciente queda sin nombre normalizado en lugar de romper el índice
+    assert filas == {c1: 'consumibles', c2: None, c3: 'equiposmédicos'}
+    assert indices['uq_categorias_nombre_normalizado']['unique']
+    assert categoria.nombre == 'Consumibles'
+
+
+def test_migraciones_se_serializan_con_advisory_lock_en_postgresql(monkeypatch):
+    """Las réplicas que arrancan a la vez esperan el bloqueo antes de alterar el esquema"""
+    from unittest.mock import MagicMock
+    import config.migraciones as migraciones
+
+    base_datos = MagicMock()
+    base_datos.engine.dialect.name = 'postgresql'
+    conexion = base_datos.engine.connect.return_value
+    monkeypatch.setattr(migraciones, 'crear_indices', MagicMock())
+    monkeypatch.setattr(migraciones, 'agregar_nombres_normalizados', MagicMock(side_effect=RuntimeError('fallo')))
+
+    with pytest.raises(RuntimeError):
+        migraciones.ejecutar_migraciones(base_datos)
+
+    sentencias = [str(llamada.args[0]) for llamada in conexion.execute.call_args_list]
+    assert sentencias == ['SELECT pg_advisory_lock(:clave)', 'SELECT pg_advisory_unlock(:clave)']
+    conexion.close.assert_called_once()
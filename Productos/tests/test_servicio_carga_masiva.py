@@ -4,7 +4,10 @@ import csv
 import io
 import sys
 import os
+import uuid
 from unittest.mock import Mock, patch, MagicMock
+from flask import Flask
+from sqlalchemy import event
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
@@ -12,6 +15,9 @@ from aplicacion.servicios.servicio_carga_masiva import ServicioCargaMasiva
 from aplicacion.dto import ProductoDTO, CategoriaDTO
 from infraestructura.repositorios import RepositorioProductoSQLite, RepositorioCategoriaSQLite
 from infraestructura.servicio_proveedores import ServicioProveedores
+from infraestructura.modelos import ProductoModel, CategoriaModel
+from config.db import db
+from seedwork.dominio.eventos import despachador_eventos
 
 
 class TestServicioCargaMasiva:
@@ -77,6 +83,63 @@ Producto 2,Desc 2,2000,20,2025-12-31,Medicinas,Proveedor"""
         total = servicio.contar_filas(csv_content)
         assert total == 2
     
+    def test_validar_encabezado_csv_lee_solo_la_primera_linea(self, servicio):
+        """Test que los headers se validan sin leer el resto del archivo"""
+        archivo = io.BytesIO(
+            b"nombre,descripcion,precio,stock,fecha_vencimiento,categoria,proveedor\r\n"
+            b"\xff\xfe contenido que no se alcanza a decodificar"
+        )
+        
+        es_valido, mensaje = servicio.validar_encabezado_csv("test.csv", archivo)
+        
+        assert es_valido is True
+        assert archivo.tell() == 0
+    
+    def test_contar_filas_archivo_ignora_lineas_en_blanco(self, servicio):
+        """Test conteo por líneas desde un archivo, como csv.DictReader"""
+        archivo = io.BytesIO(
+            b"nombre,precio\r\nProducto 1,1000\r\n\r\nProducto 2,2000\r\n  \n"
+        )
+        
+        assert servicio.contar_filas_archivo(archivo) == 2
+        assert archivo.tell() == 0
+    
+    def test_leer_filas_igual_a_parsear_csv(self, servicio):
+        """Test que el generador de filas entrega lo mismo que parsear_csv"""
+        csv_content = b"""Nombre , Precio
+ Producto 1 ,1000
+
+Producto 2,"2,000"
+"""
+        filas, headers, _ = servicio.parsear_csv(csv_content)
+        
+        headers_stream, filas_stream = servicio.leer_filas(io.StringIO(csv_content.decode('utf-8'), newline=''))
+        
+        assert headers_stream == headers == ['Nombre ', ' Precio']
+        assert not isinstance(filas_stream, list)
+        assert list(filas_stream) == filas == [
+            {'nombre': 'Producto 1', 'precio': '1000'},
+            {'nombre': 'Producto 2', 'precio': '2,000'}
+        ]
+    
+    def test_escribir_csv_resultado_por_bloques_igual_a_generar(self, servicio):
+        """Test que escribir el resultado por bloques produce el mismo CSV que generarlo completo"""
+        headers = ['Nombre', 'precio']
+        filas = [{'nombre': f'Producto {i}', 'precio': '1000'} for i in range(3)]
+        resultados = [
+            {'status': 'creado', 'mensaje': 'Producto creado exitosamente'},
+            {'status': 'rechazado', 'mensaje': 'Proveedor no encontrado: X'},
+            {'status': 'error', 'mensaje': ''}
+        ]
+        
+        destino = io.StringIO()
+        writer = servicio.iniciar_csv_resultado(destino, headers)
+        servicio.escribir_filas_resultado(writer, filas[:2], resultados[:2])
+        servicio.escribir_filas_resultado(writer, filas[2:], resultados[2:])
+        
+        assert destino.getvalue().encode('utf-8') == servicio.generar_csv_resultado(filas, resultados, headers, {})
+        assert destino.getvalue().splitlines()[-1] == 'Producto 2,1000,error,Error: error'
+    
     def test_procesar_fila_producto_creado_exitoso(self, servicio):
         """Test procesamiento de fila - producto creado"""
         fila = {
@@ -232,3 +295,168 @@ Producto 2,Desc 2,2000,20,2025-12-31,Medicinas,Proveedor"""
         assert 'mensaje' in csv_str
         assert 'creado' in csv_str
 
+
+class TestProcesarFilasEnLote:
+    """La carga en lote produce los mismos resultados por fila que el procesamiento fila a fila"""
+    
+    PROVEEDORES = {'proveedor test': {'id': 'prov-1', 'nombre': 'Proveedor Test', 'email': 'p@test.com', 'direccion': 'Calle 1'}}
+    
+    @pytest.fixture(autouse=True)
+    def setup_db(self):
+        self.app = Flask(__name__)
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+        self.app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        db.init_app(self.app)
+        
+        with self.app.app_context():
+            db.create_all()
+            yield
+            db.session.remove()
+            db.drop_all()
+    
+    def buscar_proveedor(self, nombre):
+        return self.PROVEEDORES.get(nombre.lower())
+    
+    def crear_servicio(self):
+        servicio_proveedores = Mock(spec=ServicioProveedores)
+        servicio_proveedores.obtener_proveedor_por_nombre.side_effect = self.buscar_proveedor
+        servicio_proveedores.obtener_proveedores_por_nombres.side_effect = lambda nombres: {
+            nombre: self.buscar_proveedor(nombre) for nombre in nombres if self.buscar_proveedor(nombre)
+        }
+        servicio = ServicioCargaMasiva(servicio_proveedores=servicio_proveedores)
+        servicio.TAMANO_BLOQUE = 3
+        return servicio
+    
+    def filas(self):
+        def fila(nombre, precio='1000', stock='5', descripcion='Desc', categoria='Medicinas', proveedor='Proveedor Test'):
+            return {'nombre': nombre, 'descripcion': descripcion, 'precio': precio, 'stock': stock,
+                    'fecha_vencimiento': '2030-12-31', 'categoria': categoria, 'proveedor': proveedor}
+        return [
+            fila('Paracetamol'),
+            fila('Ibuprofeno', categoria='Analgésicos'),
+            fila('  paracetamol ', precio='1200'),              # repetido en el mismo bloque
+            fila('Existente', precio='3000'),                    # ya estaba en la base de datos
+            fila('Sin proveedor', proveedor='Desconocido'),
+            fila('Precio malo', precio='abc'),
+            fila('Sin descripcion', descripcion=''),
+            fila(''),
+            fila('PARACETAMOL', stock='9', categoria='medicinas'),  # repetido en otro bloque
+            fila('Jeringas', categoria='analgésicos'),
+        ]
+    
+    def sembrar(self):
+        db.session.add(CategoriaModel(id=str(uuid.uuid4()), nombre='Medicinas', descripcion='D'))
+        db.session.add(ProductoModel(
+            id=str(uuid.uuid4()), nombre='Existente', descripcion='D', precio=1.0,
+            categoria='Medicinas', categoria_id='x', proveedor_id='prov-1'
+        ))
+        db.session.commit()
+    
+    def estado_base_de_datos(self):
+        productos = sorted(
+            (p.nombre_normalizado, p.nombre, p.precio, p.categoria) for p in ProductoModel.query.all()
+        )
+        categorias = sorted(c.nombre_normalizado for c in CategoriaModel.query.all())
+        return productos, categorias
+    
+    def procesar(self, en_lote):
+        self.sembrar()
+        servicio = self.crear_servicio()
+        eventos = []
+        with patch.object(ServicioProveedores, 'obtener_proveedor_por_id', return_value=self.PROVEEDORES['proveedor test']), \
+                patch.object(despachador_eventos, 'publicar_evento', side_effect=eventos.append), \
+                patch.object(despachador_eventos, 'publicar_eventos', side_effect=eventos.extend):
+            if en_lote:
+                resultados = servicio.procesar_filas(self.filas())
+            else:
+                resultados = [servicio.procesar_fila(f) for f in self.filas()]
+        return resultados, eventos, servicio
+    
+    def test_resultados_iguales_a_fila_a_fila(self):
+        esperados, eventos_esperados, _ = self.procesar(en_lote=False)
+        estado_esperado = self.estado_base_de_datos()
+        db.drop_all()
+        db.create_all()
+        
+        resultados, eventos, servicio = self.procesar(en_lote=True)
+        
+        assert [(r['status'], r['mensaje']) for r in resultados] == [(r['status'], r['mensaje']) for r in esperados]
+        assert [r['fila'] for r in resultados] == self.filas()
+        assert self.estado_base_de_datos() == estado_esperado
+        assert sorted(e.__class__.__name__ for e in eventos) == sorted(e.__class__.__name__ for e in eventos_esperados)
+        # Cada proveedor se busca una sola vez para todo el archivo, aunque aparezca en varios bloques
+        nombres_buscados = [
+            nombre for llamada in servicio.servicio_proveedores.obtener_proveedores_por_nombres.call_args_list
+            for nombre in llamada[0][0]
+        ]
+        assert len(nombres_buscados) == len(set(nombres_buscados))
+        servicio.servicio_proveedores.obtener_proveedor_por_nombre.assert_not_called()
+    
+    def test_consultas_por_bloque_y_no_por_fila(self):
+        self.sembrar()
+        servicio = self.crear_servicio()
+        servicio.TAMANO_BLOQUE = 500
+        filas = [dict(self.filas()[0], nombre=f'Producto {i}') for i in range(200)]
+        
+        consultas = []
+        contar = lambda *args, **kwargs: consultas.append(args[2])
+        event.listen(db.engine, 'before_cursor_execute', contar)
+        try:
+            with patch.object(despachador_eventos, 'publicar_eventos') as publicar_eventos:
+                resultados = servicio.procesar_filas(filas)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', contar)
+        
+        assert {r['status'] for r in resultados} == {'creado'}
+        assert ProductoModel.query.count() == 201
+        # categorías + productos existentes del bloque + inserts del bloque (sin una consulta por fila)
+        assert len(consultas) < 10
+        publicar_eventos.assert_called_once()
+        assert len(publicar_eventos.call_args[0][0]) == 400
+    
+    def test_fallo_de_usuarios_no_queda_en_cache_para_los_bloques_siguientes(self):
+        self.sembrar()
+        servicio = self.crear_servicio()
+        buscar = servicio.servicio_proveedores.obtener_proveedores_por_nombres.side_effect
+        respuestas = iter([lambda nombres: None, buscar])
+        servicio.servicio_proveedores.obtener_proveedores_por_nombres.side_effect = lambda nombres: next(respuestas)(nombres)
+        filas = [dict(self.filas()[0], nombre=f'Producto {i}') for i in range(6)]
+        
+        with patch.object(despachador_eventos, 'publicar_eventos'):
+            resultados = servicio.procesar_filas(filas)
+        
+        assert [r['status'] for r in resultados] == ['error'] * 3 + ['creado'] * 3
+        assert resultados[0]['mensaje'] == 'No se pudo consultar el proveedor: Proveedor Test'
+        assert servicio.servicio_proveedores.obtener_proveedores_por_nombres.call_count == 2
+    
+    def test_procesar_en_bloques_consume_las_filas_por_bloque(self):
+        self.sembrar()
+        servicio = self.crear_servicio()
+        leidas = []
+        def filas():
+            for fila in self.filas():
+                leidas.append(fila['nombre'])
+                yield fila
+        
+        with patch.object(despachador_eventos, 'publicar_eventos'):
+            bloques = servicio.procesar_en_bloques(filas())
+            filas_bloque, resultados_bloque = next(bloques)
+            # Solo se leyó el primer bloque
+            assert len(leidas) == servicio.TAMANO_BLOQUE
+            assert [r['fila'] for r in resultados_bloque] == filas_bloque
+            restantes = [resultado for _, resultados in bloques for resultado in resultados]
+        
+        assert len(leidas) == len(self.filas())
+        assert len(resultados_bloque) + len(restantes) == len(self.filas())
+    
+    def test_bloque_fallido_se_reprocesa_fila_a_fila(self):
+        self.sembrar()
+        servicio = self.crear_servicio()
+        servicio.repositorio_producto.guardar_lote = Mock(side_effect=Exception('conflicto'))
+        servicio.procesar_fila = Mock(return_value={'status': 'error', 'mensaje': 'fila a fila', 'fila': {}})
+        
+        with patch.object(despachador_eventos, 'publicar_eventos') as publicar_eventos:
+            resultados = servicio.procesar_filas(self.filas()[:2])
+        
+        assert [r['mensaje'] for r in resultados] == ['fila a fila', 'fila a fila']
+        publicar_eventos.assert_not_called()
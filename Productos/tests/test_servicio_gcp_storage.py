@@ -1,4 +1,5 @@
 """Tests para GCPStorageService"""
+import io
 import pytest
 import sys
 import os
@@ -129,6 +130,48 @@ class TestGCPStorageService:
         assert content == b"nombre,precio\nProducto,1000"
         mock_blob.exists.assert_called_once()
     
+    @patch('infraestructura.servicio_gcp_storage.storage.Client')
+    def test_guardar_csv_resultado_desde_archivo(self, mock_client_class):
+        """Test subir el CSV resultado desde un archivo sin leerlo en memoria"""
+        mock_client = Mock()
+        mock_bucket = Mock()
+        mock_blob = Mock()
+        mock_blob.public_url = 'https://storage.googleapis.com/result-url'
+        
+        mock_bucket.blob.return_value = mock_blob
+        mock_client.bucket.return_value = mock_bucket
+        mock_client_class.return_value = mock_client
+        
+        servicio = GCPStorageService(bucket_name='test-bucket')
+        archivo = io.BytesIO(b"nombre,status\nProducto,creado")
+        
+        url = servicio.guardar_csv_resultado(archivo, "test-job-id")
+        
+        assert url == 'https://storage.googleapis.com/result-url'
+        mock_blob.upload_from_file.assert_called_once_with(archivo, content_type='text/csv', rewind=True)
+        mock_blob.upload_from_string.assert_not_called()
+    
+    @patch('infraestructura.servicio_gcp_storage.storage.Client')
+    def test_descargar_csv_en_archivo_exitoso(self, mock_client_class):
+        """Test descargar el CSV original en un archivo"""
+        mock_client = Mock()
+        mock_bucket = Mock()
+        mock_blob = Mock()
+        mock_blob.exists.return_value = True
+        
+        mock_bucket.blob.return_value = mock_blob
+        mock_client.bucket.return_value = mock_bucket
+        mock_client_class.return_value = mock_client
+        
+        servicio = GCPStorageService(bucket_name='test-bucket')
+        destino = io.BytesIO()
+        
+        servicio.descargar_csv_en_archivo("test-job-id", destino)
+        
+        mock_bucket.blob.assert_called_once_with("productos-carga-masiva/test-job-id/original.csv")
+        mock_blob.download_to_file.assert_called_once_with(destino)
+        mock_blob.download_as_bytes.assert_not_called()
+    
     @patch('infraestructura.servicio_gcp_storage.storage.Client')
     def test_descargar_csv_no_encontrado(self, mock_client_class):
         """Test descargar CSV que no existe"""
@@ -7,6 +7,7 @@ import requests
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from infraestructura.servicio_proveedores import ServicioProveedores
+from seedwork.infraestructura.cliente_http import TIMEOUT_POR_DEFECTO
 from .conftest import get_service_url
 
 
@@ -16,7 +17,7 @@ class TestServicioProveedores:
         """Setup para cada test"""
         self.servicio = ServicioProveedores()
     
-    @patch('infraestructura.servicio_proveedores.requests.get')
+    @patch('requests.Session.get')
     def test_obtener_proveedor_por_id_exitoso(self, mock_get):
         """Test obtener proveedor por ID exitoso"""
         # Arrange
@@ -38,9 +39,9 @@ class TestServicioProveedores:
         
         # Assert
         assert resultado == proveedor_data
-        mock_get.assert_called_once_with(f"{get_service_url('usuarios_service')}/{proveedor_id}")
+        mock_get.assert_called_once_with(f"{get_service_url('usuarios_service')}/{proveedor_id}", timeout=TIMEOUT_POR_DEFECTO)
     
-    @patch('infraestructura.servicio_proveedores.requests.get')
+    @patch('requests.Session.get')
     def test_obtener_proveedor_por_id_no_encontrado(self, mock_get):
         """Test obtener proveedor por ID cuando no existe"""
         # Arrange
@@ -55,9 +56,9 @@ class TestServicioProveedores:
         
         # Assert
         assert resultado is None
-        mock_get.assert_called_once_with(f"{get_service_url('usuarios_service')}/{proveedor_id}")
+        mock_get.assert_called_once_with(f"{get_service_url('usuarios_service')}/{proveedor_id}", timeout=TIMEOUT_POR_DEFECTO)
     
-    @patch('infraestructura.servicio_proveedores.requests.get')
+    @patch('requests.Session.get')
     def test_obtener_proveedor_por_id_error_servidor(self, mock_get):
         """Test obtener proveedor por ID con error de servidor"""
         # Arrange
@@ -72,9 +73,9 @@ class TestServicioProveedores:
         
         # Assert
         assert resultado is None
-        mock_get.assert_called_once_with(f"{get_service_url('usuarios_service')}/{proveedor_id}")
+        mock_get.assert_called_once_with(f"{get_service_url('usuarios_service')}/{proveedor_id}", timeout=TIMEOUT_POR_DEFECTO)
     
-    @patch('infraestructura.servicio_proveedores.requests.get')
+    @patch('requests.Session.get')
     def test_obtener_proveedor_por_id_excepcion_requests(self, mock_get):
         """Test obtener proveedor por ID con excepción de requests"""
         # Arrange
@@ -86,9 +87,9 @@ class TestServicioProveedores:
         
         # Assert
         assert resultado is None
-        mock_get.assert_called_once_with(f"{get_service_url('usuarios_service')}/{proveedor_id}")
+        mock_get.assert_called_once_with(f"{get_service_url('usuarios_service')}/{proveedor_id}", timeout=TIMEOUT_POR_DEFECTO)
     
-    @patch('infraestructura.servicio_proveedores.requests.get')
+    @patch('requests.Session.get')
     def test_validar_proveedor_existe_exitoso(self, mock_get):
         """Test validar que proveedor existe exitosamente"""
         # Arrange
@@ -110,9 +111,9 @@ class TestServicioProveedores:
         
         # Assert
         assert resultado is True
-        mock_get.assert_called_once_with(f"{get_service_url('usuarios_service')}/{proveedor_id}")
+        mock_get.assert_called_once_with(f"{get_service_url('usuarios_service')}/{proveedor_id}", timeout=TIMEOUT_POR_DEFECTO)
     
-    @patch('infraestructura.servicio_proveedores.requests.get')
+    @patch('requests.Session.get')
     def test_validar_proveedor_existe_no_existe(self, mock_get):
         """Test validar que proveedor no existe"""
         # Arrange
@@ -127,9 +128,9 @@ class TestServicioProveedores:
         
         # Assert
         assert resultado is False
-        mock_get.assert_called_once_with(f"{get_service_url('usuarios_service')}/{proveedor_id}")
+        mock_get.assert_called_once_with(f"{get_service_url('usuarios_service')}/{proveedor_id}", timeout=TIMEOUT_POR_DEFECTO)
     
-    @patch('infraestructura.servicio_proveedores.requests.get')
+    @patch('requests.Session.get')
     def test_validar_proveedor_existe_error_servidor(self, mock_get):
         """Test validar proveedor con error de servidor"""
         # Arrange
@@ -144,9 +145,9 @@ class TestServicioProveedores:
         
         # Assert
         assert resultado is False
-        mock_get.assert_called_once_with(f"{get_service_url('usuarios_service')}/{proveedor_id}")
+        mock_get.assert_called_once_with(f"{get_service_url('usuarios_service')}/{proveedor_id}", timeout=TIMEOUT_POR_DEFECTO)
     
-    @patch('infraestructura.servicio_proveedores.requests.get')
+    @patch('requests.Session.get')
     def test_validar_proveedor_existe_excepcion_requests(self, mock_get):
         """Test validar proveedor con excepción de requests"""
         # Arrange
@@ -158,4 +159,4 @@ class TestServicioProveedores:
         
         # Assert
         assert resultado is False
-        mock_get.assert_called_once_with(f"{get_service_url('usuarios_service')}/{proveedor_id}")
+        mock_get.assert_called_once_with(f"{get_service_url('usuarios_service')}/{proveedor_id}", timeout=TIMEOUT_POR_DEFECTO)
@@ -45,7 +45,7 @@ class TestServicioProveedoresNormalizacion:
         
         assert norm1 == norm2
     
-    @patch('infraestructura.servicio_proveedores.requests.get')
+    @patch('requests.Session.get')
     def test_obtener_proveedor_por_nombre_formato_paginado(self, mock_get, servicio):
         """Test obtener proveedor con formato paginado"""
         # Mock respuesta paginada
@@ -72,7 +72,7 @@ class TestServicioProveedoresNormalizacion:
         assert resultado['id'] == '123'
         mock_get.assert_called_once()
     
-    @patch('infraestructura.servicio_proveedores.requests.get')
+    @patch('requests.Session.get')
     def test_obtener_proveedor_por_nombre_formato_lista(self, mock_get, servicio):
         """Test obtener proveedor con formato de lista"""
         # Mock respuesta como lista
@@ -88,7 +88,7 @@ class TestServicioProveedoresNormalizacion:
         assert resultado is not None
         assert resultado['id'] == '123'
     
-    @patch('infraestructura.servicio_proveedores.requests.get')
+    @patch('requests.Session.get')
     def test_obtener_proveedor_por_nombre_no_encontrado(self, mock_get, servicio):
         """Test cuando el proveedor no se encuentra"""
         # Mock respuesta vacía
@@ -111,3 +111,36 @@ class TestServicioProveedoresNormalizacion:
         
         assert resultado is None
 
+    
+    @patch('requests.Session.get')
+    def test_obtener_proveedores_por_nombres_recorre_el_listado_una_vez(self, mock_get, servicio):
+        """Test resolver varios nombres recorriendo las páginas una sola vez"""
+        def pagina(items, page):
+            response = Mock()
+            response.status_code = 200
+            response.json.return_value = {'items': items, 'pagination': {'page': page, 'total_pages': 3}}
+            return response
+        mock_get.side_effect = [
+            pagina([{'id': '1', 'nombre': 'Distribuidora MediPro S.A.S'}], 1),
+            pagina([{'id': '2', 'nombre': 'Farma Sur'}], 2),
+            pagina([{'id': '3', 'nombre': 'Otro'}], 3),
+        ]
+        
+        resultado = servicio.obtener_proveedores_por_nombres(
+            ["Distribuidora MediPro S.A.S.", "FARMA SUR", "farma sur", "Inexistente"]
+        )
+        
+        assert {nombre: p['id'] for nombre, p in resultado.items()} == {
+            "Distribuidora MediPro S.A.S.": '1', "FARMA SUR": '2', "farma sur": '2'
+        }
+        assert mock_get.call_count == 3
+    
+    @patch('requests.Session.get')
+    def test_obtener_proveedores_por_nombres_retorna_none_si_el_listado_falla(self, mock_get, servicio):
+        """Test una página fallida no se confunde con proveedores inexistentes"""
+        primera = Mock()
+        primera.status_code = 200
+        primera.json.return_value = {'items': [{'id': '1', 'nombre': 'Farma Sur'}], 'pagination': {'page': 1, 'total_pages': 2}}
+        mock_get.side_effect = [primera, Mock(status_code=500)]
+        
+        assert servicio.obtener_proveedores_por_nombres(["Farma Sur", "Otro"]) is None
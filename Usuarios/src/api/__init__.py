@@ -58,12 +58,15 @@ def create_app(configuracion=None):
                 "endpoints": [
                     "POST /usuarios/api/proveedores/", 
                     "GET /usuarios/api/proveedores/",
+                    "POST /usuarios/api/proveedores/bulk",
                     "POST /usuarios/api/vendedores/", 
                     "GET /usuarios/api/vendedores/",
                     "GET /usuarios/api/vendedores/<id>",
+                    "POST /usuarios/api/vendedores/bulk",
                     "POST /usuarios/api/clientes/", 
                     "GET /usuarios/api/clientes/",
                     "GET /usuarios/api/clientes/<id>",
+                    "POST /usuarios/api/clientes/bulk",
                     "PUT /usuarios/api/clientes/<id>/estado",
                     "GET /usuarios/api/repartidores/",
                     "POST /usuarios/api/auth/registro-proveedor",
@@ -92,12 +95,15 @@ def create_app(configuracion=None):
                 "endpoints": [
                     "POST /usuarios/api/proveedores/", 
                     "GET /usuarios/api/proveedores/",
+                    "POST /usuarios/api/proveedores/bulk",
                     "POST /usuarios/api/vendedores/", 
                     "GET /usuarios/api/vendedores/",
                     "GET /usuarios/api/vendedores/<id>",
+                    "POST /usuarios/api/vendedores/bulk",
                     "POST /usuarios/api/clientes/", 
                     "GET /usuarios/api/clientes/",
                     "GET /usuarios/api/clientes/<id>",
+                    "POST /usuarios/api/clientes/bulk",
                     "PUT /usuarios/api/clientes/<id>/estado",
                     "GET /usuarios/api/repartidores/",
                     "POST /usuarios/api/auth/registro-proveedor",
@@ -5,9 +5,11 @@ from aplicacion.comandos.crear_cliente import CrearCliente
 from aplicacion.comandos.modificar_estado_cliente import ModificarEstadoCliente
 from aplicacion.consultas.obtener_clientes import ObtenerClientes
 from aplicacion.consultas.obtener_cliente_por_id import ObtenerClientePorId
+from aplicacion.consultas.obtener_clientes_por_ids import ObtenerClientesPorIds
 from seedwork.aplicacion.comandos import ejecutar_comando
 from seedwork.aplicacion.consultas import ejecutar_consulta
 from aplicacion.mapeadores import MapeadorClienteDTOJson
+from seedwork.presentacion.consulta_en_lote import extraer_ids_y_campos, indexar_por_id
 from seedwork.presentacion.paginacion import paginar_resultados, extraer_parametros_paginacion
 
 import logging
@@ -16,6 +18,8 @@ logger = logging.getLogger(__name__)
 
 bp = api.crear_blueprint('cliente', '/usuarios/api/clientes')
 
+CAMPOS_CLIENTES = ('nombre', 'email', 'identificacion', 'telefono', 'direccion', 'estado')
+
 # Endpoint para crear cliente
 @bp.route('/', methods=['POST'])
 def crear_cliente():
@@ -98,6 +102,43 @@ def obtener_clientes():
             mimetype='application/json'
         )
 
+# Endpoint para obtener varios clientes por ID en una sola llamada
+@bp.route('/bulk', methods=['POST'])
+def obtener_clientes_por_ids():
+    try:
+        try:
+            cliente_ids, campos = extraer_ids_y_campos(request.get_json(silent=True), CAMPOS_CLIENTES)
+        except ValueError as e:
+            return Response(
+                json.dumps({'error': str(e)}), 
+                status=400, 
+                mimetype='application/json'
+            )
+        
+        # Ejecutar consulta
+        clientes = ejecutar_consulta(ObtenerClientesPorIds(cliente_ids=cliente_ids))
+        
+        # Convertir DTOs a JSON y dejar solo los campos pedidos
+        mapeador = MapeadorClienteDTOJson()
+        clientes_por_id = indexar_por_id(mapeador.dtos_a_externo(clientes), campos)
+        
+        return Response(
+            json.dumps({
+                'clientes': clientes_por_id,
+                'no_encontrados': [i for i in cliente_ids if i not in clientes_por_id]
+            }), 
+            status=200, 
+            mimetype='application/json'
+        )
+        
+    except Exception as e:
+        logger.error(f"Error obteniendo clientes por IDs: {e}")
+        return Response(
+            json.dumps({'error': f'Error interno del servidor: {str(e)}'}), 
+            status=500, 
+            mimetype='application/json'
+        )
+
 # Endpoint para obtener cliente por ID
 @bp.route('/<cliente_id>', methods=['GET'])
 def obtener_cliente_por_id(cliente_id):
@@ -4,9 +4,11 @@ from flask import request, Response
 from aplicacion.comandos.crear_proveedor import CrearProveedor
 from aplicacion.consultas.obtener_proveedores import ObtenerProveedores
 from aplicacion.consultas.obtener_proveedor_por_id import ObtenerProveedorPorId
+from aplicacion.consultas.obtener_proveedores_por_ids import ObtenerProveedoresPorIds
 from seedwork.aplicacion.comandos import ejecutar_comando
 from seedwork.aplicacion.consultas import ejecutar_consulta
 from aplicacion.mapeadores import MapeadorProveedorDTOJson
+from seedwork.presentacion.consulta_en_lote import extraer_ids_y_campos, indexar_por_id
 from seedwork.presentacion.paginacion import paginar_resultados, extraer_parametros_paginacion
 import logging
 
@@ -14,6 +16,8 @@ logger = logging.getLogger(__name__)
 
 bp = api.crear_blueprint('proveedor', '/usuarios/api/proveedores')
 
+CAMPOS_PROVEEDORES = ('nombre', 'email', 'identificacion', 'telefono', 'direccion')
+
 @bp.route('/', methods=['POST'])
 def crear_proveedor():
     try:
@@ -60,6 +64,27 @@ def obtener_proveedores():
         logger.error(f"Error obteniendo proveedores: {e}")
         return Response(json.dumps({'error': f'Error interno del servidor: {str(e)}'}), status=500, mimetype='application/json')
 
+@bp.route('/bulk', methods=['POST'])
+def obtener_proveedores_por_ids():
+    try:
+        try:
+            proveedor_ids, campos = extraer_ids_y_campos(request.get_json(silent=True), CAMPOS_PROVEEDORES)
+        except ValueError as e:
+            return Response(json.dumps({'error': str(e)}), status=400, mimetype='application/json')
+        
+        proveedores = ejecutar_consulta(ObtenerProveedoresPorIds(proveedor_ids=proveedor_ids))
+        
+        mapeador = MapeadorProveedorDTOJson()
+        proveedores_por_id = indexar_por_id([mapeador.dto_a_externo(p) for p in proveedores], campos)
+        
+        return Response(json.dumps({
+            'proveedores': proveedores_por_id,
+            'no_encontrados': [i for i in proveedor_ids if i not in proveedores_por_id]
+        }), status=200, mimetype='application/json')
+    except Exception as e:
+        logger.error(f"Error obteniendo proveedores por IDs: {e}")
+        return Response(json.dumps({'error': f'Error interno del servidor: {str(e)}'}), status=500, mimetype='application/json')
+
 @bp.route('/<proveedor_id>', methods=['GET'])
 def obtener_proveedor_por_id(proveedor_id):
     try:
@@ -4,9 +4,11 @@ from flask import request, Response, Blueprint
 from aplicacion.comandos.crear_vendedor import CrearVendedor
 from aplicacion.consultas.obtener_vendedores import ObtenerVendedores
 from aplicacion.consultas.obtener_vendedor_por_id import ObtenerVendedorPorId
+from aplicacion.consultas.obtener_vendedores_por_ids import ObtenerVendedoresPorIds
 from seedwork.aplicacion.comandos import ejecutar_comando
 from seedwork.aplicacion.consultas import ejecutar_consulta
 from aplicacion.mapeadores import MapeadorVendedorDTOJson
+from seedwork.presentacion.consulta_en_lote import extraer_ids_y_campos, indexar_por_id
 from seedwork.presentacion.paginacion import paginar_resultados, extraer_parametros_paginacion
 
 import logging
@@ -15,6 +17,8 @@ logger = logging.getLogger(__name__)
 
 bp = api.crear_blueprint('vendedor', '/usuarios/api/vendedores')
 
+CAMPOS_VENDEDORES = ('nombre', 'email', 'identificacion', 'telefono', 'direccion')
+
 # Endpoint para crear vendedor
 @bp.route('/', methods=['POST'])
 def crear_vendedor():
@@ -94,6 +98,43 @@ def obtener_vendedores():
             mimetype='application/json'
         )
 
+# Endpoint para obtener varios vendedores por ID en una sola llamada
+@bp.route('/bulk', methods=['POST'])
+def obtener_vendedores_por_ids():
+    try:
+        try:
+            vendedor_ids, campos = extraer_ids_y_campos(request.get_json(silent=True), CAMPOS_VENDEDORES)
+        except ValueError as e:
+            return Response(
+                json.dumps({'error': str(e)}), 
+                status=400, 
+                mimetype='application/json'
+            )
+        
+        # Ejecutar consulta
+        vendedores = ejecutar_consulta(ObtenerVendedoresPorIds(vendedor_ids=vendedor_ids))
+        
+        # Convertir DTOs a JSON y dejar solo los campos pedidos
+        mapeador = MapeadorVendedorDTOJson()
+        vendedores_por_id = indexar_por_id(mapeador.dtos_a_externo(vendedores), campos)
+        
+        return Response(
+            json.dumps({
+                'vendedores': vendedores_por_id,
+                'no_encontrados': [i for i in vendedor_ids if i not in vendedores_por_id]
+            }), 
+            status=200, 
+            mimetype='application/json'
+        )
+        
+    except Exception as e:
+        logger.error(f"Error obteniendo vendedores por IDs: {e}")
+        return Response(
+            json.dumps({'error': f'Error interno del servidor: {str(e)}'}), 
+            status=500, 
+            mimetype='application/json'
+        )
+
 # Endpoint para obtener vendedor por ID
 @bp.route('/<vendedor_id>', methods=['GET'])
 def obtener_vendedor_por_id(vendedor_id):
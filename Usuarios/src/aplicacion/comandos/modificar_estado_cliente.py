@@ -3,10 +3,12 @@ from seedwork.aplicacion.comandos import Comando, ejecutar_comando
 import uuid
 import logging
 from aplicacion.dto import ClienteDTO
+from dominio.eventos import ClienteActualizado
 from dominio.objetos_valor import Estado
 from infraestructura.repositorios import RepositorioClienteSQLite
 from infraestructura.modelos import ClienteModel
 from config.db import db
+from seedwork.dominio.eventos import despachador_eventos
 
 logger = logging.getLogger(__name__)
 
@@ -51,6 +53,16 @@ class ModificarEstadoClienteHandler:
             
             logger.info(f"Estado del cliente {comando.cliente_id} actualizado a {comando.nuevo_estado}")
             
+            # Notificar el cambio para que los servicios que cachean clientes lo invaliden
+            despachador_eventos.publicar_evento(ClienteActualizado(
+                cliente_id=cliente_actualizado.id,
+                nombre=cliente_actualizado.nombre,
+                email=cliente_actualizado.email,
+                telefono=cliente_actualizado.telefono,
+                direccion=cliente_actualizado.direccion,
+                estado=cliente_actualizado.estado
+            ))
+            
             return cliente_actualizado
             
         except Exception as e:
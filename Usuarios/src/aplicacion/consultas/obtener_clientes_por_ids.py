@@ -0,0 +1,31 @@
+from dataclasses import dataclass, field
+from seedwork.aplicacion.consultas import Consulta, ejecutar_consulta
+import logging
+from aplicacion.dto import ClienteDTO
+from infraestructura.repositorios import RepositorioClienteSQLite
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class ObtenerClientesPorIds(Consulta):
+    """Consulta para obtener varios clientes por ID en una sola llamada"""
+    cliente_ids: list[str] = field(default_factory=list)
+
+class ObtenerClientesPorIdsHandler:
+    def __init__(self, repositorio=None):
+        self.repositorio = repositorio or RepositorioClienteSQLite()
+    
+    def handle(self, consulta: ObtenerClientesPorIds) -> list[ClienteDTO]:
+        try:
+            clientes = self.repositorio.obtener_por_ids(consulta.cliente_ids)
+            logger.info(f"Clientes encontrados: {len(clientes)} de {len(consulta.cliente_ids)} solicitados")
+            return clientes
+            
+        except Exception as e:
+            logger.error(f"Error obteniendo clientes por IDs: {e}")
+            raise
+
+@ejecutar_consulta.register
+def _(consulta: ObtenerClientesPorIds):
+    handler = ObtenerClientesPorIdsHandler()
+    return handler.handle(consulta)
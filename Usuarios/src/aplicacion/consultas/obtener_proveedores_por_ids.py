@@ -0,0 +1,31 @@
+from dataclasses import dataclass, field
+from seedwork.aplicacion.consultas import Consulta, ejecutar_consulta
+import logging
+from aplicacion.dto import ProveedorDTO
+from infraestructura.repositorios import RepositorioProveedorSQLite
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class ObtenerProveedoresPorIds(Consulta):
+    """Consulta para obtener varios proveedores por ID en una sola llamada"""
+    proveedor_ids: list[str] = field(default_factory=list)
+
+class ObtenerProveedoresPorIdsHandler:
+    def __init__(self, repositorio=None):
+        self.repositorio = repositorio or RepositorioProveedorSQLite()
+    
+    def handle(self, consulta: ObtenerProveedoresPorIds) -> list[ProveedorDTO]:
+        try:
+            proveedores = self.repositorio.obtener_por_ids(consulta.proveedor_ids)
+            logger.info(f"Proveedores encontrados: {len(proveedores)} de {len(consulta.proveedor_ids)} solicitados")
+            return proveedores
+            
+        except Exception as e:
+            logger.error(f"Error obteniendo proveedores por IDs: {e}")
+            raise
+
+@ejecutar_consulta.register
+def _(consulta: ObtenerProveedoresPorIds):
+    handler = ObtenerProveedoresPorIdsHandler()
+    return handler.handle(consulta)
@@ -0,0 +1,31 @@
+from dataclasses import dataclass, field
+from seedwork.aplicacion.consultas import Consulta, ejecutar_consulta
+import logging
+from aplicacion.dto import VendedorDTO
+from infraestructura.repositorios import RepositorioVendedorSQLite
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class ObtenerVendedoresPorIds(Consulta):
+    """Consulta para obtener varios vendedores por ID en una sola llamada"""
+    vendedor_ids: list[str] = field(default_factory=list)
+
+class ObtenerVendedoresPorIdsHandler:
+    def __init__(self, repositorio=None):
+        self.repositorio = repositorio or RepositorioVendedorSQLite()
+    
+    def handle(self, consulta: ObtenerVendedoresPorIds) -> list[VendedorDTO]:
+        try:
+            vendedores = self.repositorio.obtener_por_ids(consulta.vendedor_ids)
+            logger.info(f"Vendedores encontrados: {len(vendedores)} de {len(consulta.vendedor_ids)} solicitados")
+            return vendedores
+            
+        except Exception as e:
+            logger.error(f"Error obteniendo vendedores por IDs: {e}")
+            raise
+
+@ejecutar_consulta.register
+def _(consulta: ObtenerVendedoresPorIds):
+    handler = ObtenerVendedoresPorIdsHandler()
+    return handler.handle(consulta)
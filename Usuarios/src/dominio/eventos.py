@@ -53,6 +53,42 @@ class ClienteCreado(EventoDominio):
             'estado': self.estado
         }
 
+@dataclass
+class ClienteActualizado(EventoDominio):
+    cliente_id: uuid.UUID = None
+    nombre: str = ""
+    email: str = ""
+    telefono: str = ""
+    direccion: str = ""
+    estado: str = ""
+    
+    def _get_datos_evento(self) -> dict:
+        return {
+            'cliente_id': str(self.cliente_id),
+            'nombre': self.nombre,
+            'email': self.email,
+            'telefono': self.telefono,
+            'direccion': self.direccion,
+            'estado': self.estado
+        }
+
+@dataclass
+class VendedorActualizado(EventoDominio):
+    vendedor_id: uuid.UUID = None
+    nombre: str = ""
+    email: str = ""
+    telefono: str = ""
+    direccion: str = ""
+    
+    def _get_datos_evento(self) -> dict:
+        return {
+            'vendedor_id': str(self.vendedor_id),
+            'nombre': self.nombre,
+            'email': self.email,
+            'telefono': self.telefono,
+            'direccion': self.direccion
+        }
+
 @dataclass
 class AdministradorCreado(EventoDominio):
     administrador_id: uuid.UUID = None
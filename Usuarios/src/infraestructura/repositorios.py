@@ -46,6 +46,22 @@ class RepositorioProveedorSQLite:
             ) for p in proveedores_model
         ]
 
+    def obtener_por_ids(self, proveedor_ids: list[str]) -> list[ProveedorDTO]:
+        """Obtener varios proveedores con una sola consulta IN"""
+        if not proveedor_ids:
+            return []
+        proveedores_model = ProveedorModel.query.filter(ProveedorModel.id.in_(proveedor_ids)).all()
+        return [
+            ProveedorDTO(
+                id=uuid.UUID(p.id),
+                nombre=p.nombre,
+                email=p.email,
+                identificacion=p.identificacion,
+                telefono=p.telefono,
+                direccion=p.direccion
+            ) for p in proveedores_model
+        ]
+
 class RepositorioVendedorSQLite:
     def crear(self, vendedor_dto: VendedorDTO) -> VendedorDTO:
         vendedor_model = VendedorModel(
@@ -88,6 +104,22 @@ class RepositorioVendedorSQLite:
             ) for v in vendedores_model
         ]
 
+    def obtener_por_ids(self, vendedor_ids: list[str]) -> list[VendedorDTO]:
+        """Obtener varios vendedores con una sola consulta IN"""
+        if not vendedor_ids:
+            return []
+        vendedores_model = VendedorModel.query.filter(VendedorModel.id.in_(vendedor_ids)).all()
+        return [
+            VendedorDTO(
+                id=uuid.UUID(v.id),
+                nombre=v.nombre,
+                email=v.email,
+                identificacion=v.identificacion,
+                telefono=v.telefono,
+                direccion=v.direccion
+            ) for v in vendedores_model
+        ]
+
 class RepositorioClienteSQLite:
     def crear(self, cliente_dto: ClienteDTO) -> ClienteDTO:
         cliente_model = ClienteModel(
@@ -147,6 +179,23 @@ class RepositorioClienteSQLite:
             ) for c in clientes_model
         ]
 
+    def obtener_por_ids(self, cliente_ids: list[str]) -> list[ClienteDTO]:
+        """Obtener varios clientes con una sola consulta IN"""
+        if not cliente_ids:
+            return []
+        clientes_model = ClienteModel.query.filter(ClienteModel.id.in_(cliente_ids)).all()
+        return [
+            ClienteDTO(
+                id=uuid.UUID(c.id),
+                nombre=c.nombre,
+                email=c.email,
+                identificacion=c.identificacion,
+                telefono=c.telefono,
+                direccion=c.direccion,
+                estado=c.estado
+            ) for c in clientes_model
+        ]
+
 class RepositorioAdministradorSQLite:
     def crear(self, administrador_dto: AdministradorDTO) -> AdministradorDTO:
         administrador_model = AdministradorModel(
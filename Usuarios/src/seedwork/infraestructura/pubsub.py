@@ -121,7 +121,9 @@ class PublicadorPubSub(PublicadorEventos):
         
         topic_mapping = {
             'ProductoStockActualizado': 'productos-stock-actualizado',
-            'PedidoCreado': 'pedidos-creados'
+            'PedidoCreado': 'pedidos-creados',
+            'ClienteActualizado': 'usuarios-actualizados',
+            'VendedorActualizado': 'usuarios-actualizados'
         }
         
         return topic_mapping.get(tipo_evento, 'productos-stock-actualizado')
@@ -135,7 +137,8 @@ class PublicadorPubSub(PublicadorEventos):
         
         topics = [
             'productos-stock-actualizado',
-            'pedidos-creados'
+            'pedidos-creados',
+            'usuarios-actualizados'
         ]
         
         print(f"📁 PubSub: Creando {len(topics)} topics...")
@@ -0,0 +1,64 @@
+"""
+Utilidades para endpoints que resuelven varios recursos por ID en una sola llamada
+"""
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+MAX_IDS_POR_CONSULTA = 500
+
+
+def extraer_ids_y_campos(
+    datos: Optional[Dict[str, Any]],
+    campos_permitidos: Iterable[str],
+    max_ids: int = MAX_IDS_POR_CONSULTA
+) -> Tuple[List[str], Optional[List[str]]]:
+    """
+    Valida el cuerpo de una consulta en lote.
+
+    Args:
+        datos: Cuerpo JSON, con la forma {'ids': [...], 'campos': [...]}.
+            ``campos`` es opcional y también acepta un string separado por comas.
+        campos_permitidos: Campos que el recurso puede retornar
+        max_ids: Cantidad máxima de IDs distintos por consulta
+
+    Returns:
+        Tupla (ids sin duplicados en el orden recibido, campos o None para todos)
+
+    Raises:
+        ValueError: Si el cuerpo no es válido
+    """
+    datos = datos or {}
+    ids = datos.get('ids')
+    if not isinstance(ids, list) or not ids:
+        raise ValueError('ids debe ser una lista no vacía')
+
+    ids = list(dict.fromkeys(str(i).strip() for i in ids if i is not None and str(i).strip()))
+    if not ids:
+        raise ValueError('ids debe ser una lista no vacía')
+    if len(ids) > max_ids:
+        raise ValueError(f'Máximo {max_ids} ids por consulta')
+
+    campos = datos.get('campos')
+    if campos is None:
+        return ids, None
+    if isinstance(campos, str):
+        campos = [c.strip() for c in campos.split(',') if c.strip()]
+    if not isinstance(campos, list) or not campos:
+        raise ValueError('campos debe ser una lista no vacía')
+
+    campos_permitidos = set(campos_permitidos)
+    desconocidos = [c for c in campos if c not in campos_permitidos]
+    if desconocidos:
+        raise ValueError(f"Campos no válidos: {', '.join(desconocidos)}")
+
+    return ids, campos
+
+
+def indexar_por_id(items: List[Dict[str, Any]], campos: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Indexa los items por 'id' conservando solo los campos pedidos ('id' siempre se incluye).
+    """
+    if campos is None:
+        return {item['id']: item for item in items}
+
+    seleccion = ['id'] + [c for c in campos if c != 'id']
+    return {item['id']: {c: item.get(c) for c in seleccion} for item in items}
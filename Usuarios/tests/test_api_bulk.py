@@ -0,0 +1,105 @@
+import pytest
+import json
+import uuid
+from unittest.mock import patch
+from .conftest import get_usuarios_url
+
+from aplicacion.dto import ClienteDTO, VendedorDTO, ProveedorDTO
+from infraestructura.repositorios import RepositorioClienteSQLite, RepositorioVendedorSQLite, RepositorioProveedorSQLite
+
+
+def _datos(prefijo, i):
+    sufijo = uuid.uuid4().hex[:8]
+    return dict(
+        nombre=f"{prefijo} {i}",
+        email=f"{prefijo.lower()}{i}-{sufijo}@email.com",
+        identificacion=f"{sufijo}{i}",
+        telefono="3001234567",
+        direccion="Calle 123 #45-67"
+    )
+
+
+class TestAPIBulk:
+    """Test para los endpoints de consulta de usuarios en lote"""
+
+    def test_clientes_bulk_retorna_encontrados_y_no_encontrados(self, client, app_context):
+        # Arrange
+        repositorio = RepositorioClienteSQLite()
+        ids = [uuid.uuid4() for _ in range(3)]
+        for i, cliente_id in enumerate(ids):
+            repositorio.crear(ClienteDTO(id=cliente_id, estado='ACTIVO', **_datos('Cliente', i)))
+        inexistente = str(uuid.uuid4())
+
+        # Act
+        response = client.post(get_usuarios_url('clientes') + '/bulk',
+                               data=json.dumps({'ids': [str(ids[0]), str(ids[1]), str(ids[0]), inexistente]}),
+                               content_type='application/json')
+
+        # Assert
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert set(data['clientes']) == {str(ids[0]), str(ids[1])}
+        assert data['clientes'][str(ids[1])]['nombre'] == 'Cliente 1'
+        assert data['clientes'][str(ids[1])]['estado'] == 'ACTIVO'
+        assert data['no_encontrados'] == [inexistente]
+
+    def test_vendedores_bulk_con_seleccion_de_campos(self, client, app_context):
+        # Arrange
+        repositorio = RepositorioVendedorSQLite()
+        vendedor_id = uuid.uuid4()
+        repositorio.crear(VendedorDTO(id=vendedor_id, **_datos('Vendedor', 1)))
+
+        # Act
+        response = client.post(get_usuarios_url('vendedores') + '/bulk',
+                               data=json.dumps({'ids': [str(vendedor_id)], 'campos': 'nombre,email'}),
+                               content_type='application/json')
+
+        # Assert
+        assert response.status_code == 200
+        vendedor = json.loads(response.data)['vendedores'][str(vendedor_id)]
+        assert set(vendedor) == {'id', 'nombre', 'email'}
+        assert vendedor['nombre'] == 'Vendedor 1'
+
+    def test_proveedores_bulk_con_seleccion_de_campos(self, client, app_context):
+        # Arrange
+        repositorio = RepositorioProveedorSQLite()
+        proveedor_id = uuid.uuid4()
+        repositorio.crear(ProveedorDTO(id=proveedor_id, **_datos('Proveedor', 1)))
+
+        # Act
+        response = client.post(get_usuarios_url('proveedores') + '/bulk',
+                               data=json.dumps({'ids': [str(proveedor_id)], 'campos': ['nombre']}),
+                               content_type='application/json')
+
+        # Assert
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['proveedores'] == {str(proveedor_id): {'id': str(proveedor_id), 'nombre': 'Proveedor 1'}}
+        assert data['no_encontrados'] == []
+
+    @pytest.mark.parametrize('cuerpo', [
+        None,
+        {'ids': []},
+        {'ids': 'abc'},
+        {'ids': ['a'], 'campos': ['password']},
+        {'ids': [str(i) for i in range(501)]}
+    ])
+    def test_bulk_valida_el_cuerpo(self, client, cuerpo):
+        # Act
+        response = client.post(get_usuarios_url('clientes') + '/bulk',
+                               data=json.dumps(cuerpo) if cuerpo is not None else None,
+                               content_type='application/json')
+
+        # Assert
+        assert response.status_code == 400
+        assert 'error' in json.loads(response.data)
+
+    def test_bulk_resuelve_con_una_sola_consulta(self, client):
+        with patch('infraestructura.repositorios.RepositorioClienteSQLite.obtener_por_ids', return_value=[]) as mock_obtener:
+            response = client.post(get_usuarios_url('clientes') + '/bulk',
+                                   data=json.dumps({'ids': ['a', 'b', 'a']}),
+                                   content_type='application/json')
+
+        assert response.status_code == 200
+        mock_obtener.assert_called_once_with(['a', 'b'])
+        assert json.loads(response.data)['no_encontrados'] == ['a', 'b']
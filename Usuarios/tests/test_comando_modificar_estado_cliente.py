@@ -0,0 +1,54 @@
+"""
+Tests para el comando ModificarEstadoCliente
+"""
+import pytest
+from unittest.mock import patch
+from aplicacion.comandos.modificar_estado_cliente import ModificarEstadoCliente, ModificarEstadoClienteHandler
+from aplicacion.dto import ClienteDTO
+from dominio.eventos import ClienteActualizado
+from infraestructura.modelos import ClienteModel
+from infraestructura.repositorios import RepositorioClienteSQLite
+from config.db import db
+
+
+class TestComandoModificarEstadoCliente:
+    """Tests para el comando de modificación de estado de cliente"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, app_context):
+        """Setup para cada test"""
+        with app_context.app_context():
+            ClienteModel.query.delete()
+            db.session.commit()
+            self.cliente = RepositorioClienteSQLite().crear(ClienteDTO(
+                nombre="Hospital San Ignacio",
+                email="contacto@sanignacio.com",
+                identificacion="8601234567",
+                telefono="3115566778",
+                direccion="Cra 11 # 89 - 76"
+            ))
+
+    def test_modificar_estado_publica_cliente_actualizado(self, app_context):
+        """El cambio de estado se notifica para invalidar las cachés de clientes"""
+        with app_context.app_context():
+            with patch('aplicacion.comandos.modificar_estado_cliente.despachador_eventos') as mock_despachador:
+                resultado = ModificarEstadoClienteHandler().handle(
+                    ModificarEstadoCliente(cliente_id=str(self.cliente.id), nuevo_estado='INACTIVO')
+                )
+
+            assert resultado.estado == 'INACTIVO'
+            evento = mock_despachador.publicar_evento.call_args.args[0]
+            assert isinstance(evento, ClienteActualizado)
+            assert evento.to_dict()['datos']['cliente_id'] == str(self.cliente.id)
+            assert evento.to_dict()['datos']['estado'] == 'INACTIVO'
+
+    def test_cliente_inexistente_no_publica_evento(self, app_context):
+        """Si el cliente no existe no se notifica ningún cambio"""
+        with app_context.app_context():
+            with patch('aplicacion.comandos.modificar_estado_cliente.despachador_eventos') as mock_despachador:
+                with pytest.raises(ValueError):
+                    ModificarEstadoClienteHandler().handle(
+                        ModificarEstadoCliente(cliente_id='no-existe', nuevo_estado='INACTIVO')
+                    )
+
+            mock_despachador.publicar_evento.assert_not_called()
@@ -7,7 +7,7 @@ from unittest.mock import Mock, patch
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from dominio.eventos import ClienteCreado, VendedorCreado, ProveedorCreado
+from dominio.eventos import ClienteCreado, VendedorCreado, ProveedorCreado, VendedorActualizado
 from seedwork.dominio.eventos import (
     EventoDominio, 
     ManejadorEvento, 
@@ -115,6 +115,20 @@ class TestEventos:
         assert dict_result['telefono'] == "0987654321"
         assert dict_result['direccion'] == "Avenida 456 #78-90"
     
+    def test_vendedor_actualizado_to_dict(self):
+        """Test serialización de VendedorActualizado para Pub/Sub"""
+        # Arrange
+        vendedor_id = uuid.uuid4()
+        evento = VendedorActualizado(vendedor_id=vendedor_id, nombre="María García")
+        
+        # Act
+        dict_result = evento.to_dict()
+        
+        # Assert
+        assert dict_result['tipo_evento'] == 'VendedorActualizado'
+        assert dict_result['datos']['vendedor_id'] == str(vendedor_id)
+        assert dict_result['datos']['nombre'] == "María García"
+    
     def test_proveedor_creado_creacion(self):
         """Test creación de evento ProveedorCreado"""
         # Arrange
@@ -145,3 +145,27 @@ class TestRepositorioCliente:
             # Assert
             assert resultado is not None
             assert len(resultado) == 0
+    
+    def test_obtener_clientes_por_ids(self):
+        """Test obtener varios clientes con una sola consulta"""
+        # Arrange
+        repositorio = RepositorioClienteSQLite()
+        ids = [uuid.uuid4() for _ in range(3)]
+        
+        with self.app.app_context():
+            for i, cliente_id in enumerate(ids):
+                repositorio.crear(ClienteDTO(
+                    id=cliente_id,
+                    nombre=f"Cliente {i}",
+                    email=f"cliente{i}@email.com",
+                    telefono="1234567890",
+                    direccion="Calle 123 #45-67",
+                    identificacion=f"100123456{i}"
+                ))
+            
+            # Act
+            resultado = repositorio.obtener_por_ids([str(ids[0]), str(ids[2]), str(uuid.uuid4())])
+            
+            # Assert
+            assert {c.id for c in resultado} == {ids[0], ids[2]}
+            assert repositorio.obtener_por_ids([]) == []
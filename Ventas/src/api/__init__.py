@@ -4,6 +4,7 @@ import logging
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
+import click
 from flask import Flask, jsonify
 from flask_swagger import swagger
 
@@ -51,6 +52,16 @@ def create_app(configuracion=None):
         app.register_blueprint(sugerencias.bp_visitas)
         app.register_blueprint(sugerencias.bp_clientes)
 
+        @app.cli.command('reconstruir-resumenes-ventas')
+        def reconstruir_resumenes_ventas():
+            """Recalcula las tablas de resumen de ventas a partir de los pedidos"""
+            from infraestructura.repositorios import RepositorioResumenVentasSQLite
+            filas = RepositorioResumenVentasSQLite().reconstruir()
+            click.echo(f"✅ Resúmenes de ventas reconstruidos: {filas}")
+
+        # Invalidación de la caché de usuarios a partir de eventos de Usuarios
+        from aplicacion.eventos.consumidor_usuarios_actualizados import manejador as manejador_usuarios_actualizados
+
         @app.route("/")
         def root():
             return {
@@ -65,6 +76,7 @@ def create_app(configuracion=None):
                     "POST /ventas/api/pedidos/",
                     "GET /ventas/api/pedidos/?vendedor_id=<id>&cliente_id=<id>&estado=<estado>&page=1&page_size=20",
                     "GET /ventas/api/pedidos/<pedido_id>",
+                    "POST /ventas/api/pedidos/estados",
                     "POST /ventas/api/pedidos/<pedido_id>/items",
                     "PUT /ventas/api/pedidos/<pedido_id>/items/<item_id>",
                     "DELETE /ventas/api/pedidos/<pedido_id>/items/<item_id>",
@@ -96,11 +108,16 @@ def create_app(configuracion=None):
 
         @app.route("/ventas/health")
         def ventas_health():
+            from seedwork.infraestructura.cliente_http import obtener_cliente_http
+            from infraestructura.cache_usuarios import obtener_cache_usuarios
             return {
                 "status": "up",
                 "service": "ventas",
                 "version": "1.0.0",
                 "mode": "simplified",
+                "metricas_http": obtener_cliente_http().metricas.instantanea(),
+                "resiliencia_http": obtener_cliente_http().estado_resiliencia(),
+                "cache_usuarios": obtener_cache_usuarios().local.instantanea(),
                 "endpoints": [
                     "POST /ventas/api/visitas/", 
                     "GET /ventas/api/visitas/?estado=pendiente&fecha_inicio=2025-10-13&fecha_fin=2025-10-17&vendedor_id=<id>",
@@ -108,6 +125,7 @@ def create_app(configuracion=None):
                     "PUT /ventas/api/visitas/<visita_id>",
                     "POST /ventas/api/pedidos/",
                     "GET /ventas/api/pedidos/<pedido_id>",
+                    "POST /ventas/api/pedidos/estados",
                     "POST /ventas/api/pedidos/<pedido_id>/items",
                     "PUT /ventas/api/pedidos/<pedido_id>/items/<item_id>",
                     "DELETE /ventas/api/pedidos/<pedido_id>/items/<item_id>",
@@ -5,6 +5,7 @@ from aplicacion.consultas.obtener_informe_ventas import ObtenerInformeVentas
 from aplicacion.consultas.obtener_informe_ventas_por_vendedor import ObtenerInformeVentasPorVendedor
 from seedwork.aplicacion.consultas import ejecutar_consulta
 from seedwork.presentacion.paginacion import paginar_resultados, extraer_parametros_paginacion
+from seedwork.infraestructura.cliente_http import registrar_degradacion, anotar_degradacion
 import logging
 
 logging.basicConfig(level=logging.DEBUG)
@@ -28,7 +29,9 @@ def obtener_informe_ventas():
             fecha_fin=fecha_fin
         )
 
-        informe_resultado = ejecutar_consulta(consulta)
+        # Si Usuarios no responde, el informe se entrega sin los nombres y marcado como degradado
+        with registrar_degradacion() as servicios_degradados:
+            informe_resultado = ejecutar_consulta(consulta)
 
         if not informe_resultado:
             return Response(
@@ -37,6 +40,8 @@ def obtener_informe_ventas():
                 mimetype='application/json'
             )
 
+        anotar_degradacion(informe_resultado, servicios_degradados)
+
         return Response(
             json.dumps(informe_resultado, default=str),
             status=200,
@@ -64,7 +69,9 @@ def obtener_informe_ventas_por_vendedor():
             fecha_fin=fecha_fin
         )
 
-        informe_resultado = ejecutar_consulta(consulta)
+        # Si Usuarios no responde, el informe se entrega sin los nombres y marcado como degradado
+        with registrar_degradacion() as servicios_degradados:
+            informe_resultado = ejecutar_consulta(consulta)
 
         if not informe_resultado:
             resultado_paginado = paginar_resultados([], page=page, page_size=page_size)
@@ -75,6 +82,7 @@ def obtener_informe_ventas_por_vendedor():
             )
 
         resultado_paginado = paginar_resultados(informe_resultado, page=page, page_size=page_size)
+        anotar_degradacion(resultado_paginado, servicios_degradados)
 
         return Response(
             json.dumps(resultado_paginado, default=str),
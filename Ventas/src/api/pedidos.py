@@ -10,10 +10,11 @@ from aplicacion.comandos.cambiar_estado_pedido import CambiarEstadoPedido
 from aplicacion.comandos.crear_pedido_completo import CrearPedidoCompleto, ItemPedidoCompleto
 from aplicacion.consultas.obtener_pedido import ObtenerPedido
 from aplicacion.consultas.obtener_pedidos import ObtenerPedidos
+from aplicacion.consultas.obtener_estados_pedidos import ObtenerEstadosPedidos
 from aplicacion.servicios.validador_pedidos import ValidadorPedidos
 from seedwork.aplicacion.comandos import ejecutar_comando
 from seedwork.aplicacion.consultas import ejecutar_consulta
-from seedwork.presentacion.paginacion import paginar_resultados, extraer_parametros_paginacion
+from seedwork.presentacion.paginacion import extraer_parametros_paginacion, extraer_cursor, CursorInvalido
 from infraestructura.servicio_logistica import ServicioLogistica
 
 import logging
@@ -22,6 +23,9 @@ logger = logging.getLogger(__name__)
 
 bp = api.crear_blueprint('pedidos', '/ventas/api/pedidos')
 
+# Límite de IDs por llamada a /estados (los clientes deben paginar por encima de este valor)
+MAX_PEDIDOS_POR_CONSULTA_ESTADOS = 500
+
 @bp.route('/', methods=['POST'])
 def crear_pedido():
     """Crear un nuevo pedido en estado borrador"""
@@ -75,6 +79,44 @@ def crear_pedido():
             mimetype='application/json'
         )
 
+@bp.route('/estados', methods=['POST'])
+def obtener_estados_pedidos():
+    """Obtener el estado actual de varios pedidos en una sola llamada"""
+    try:
+        data = request.get_json(silent=True)
+
+        if not data or not isinstance(data.get('pedido_ids'), list):
+            return Response(
+                json.dumps({'error': 'Se requiere una lista "pedido_ids"'}),
+                status=400,
+                mimetype='application/json'
+            )
+
+        pedido_ids = data['pedido_ids']
+        if len(pedido_ids) > MAX_PEDIDOS_POR_CONSULTA_ESTADOS:
+            return Response(
+                json.dumps({'error': f'No se pueden consultar más de {MAX_PEDIDOS_POR_CONSULTA_ESTADOS} pedidos por llamada'}),
+                status=400,
+                mimetype='application/json'
+            )
+
+        consulta = ObtenerEstadosPedidos(pedido_ids=pedido_ids)
+        estados = ejecutar_consulta(consulta)
+
+        return Response(
+            json.dumps({'estados': estados}),
+            status=200,
+            mimetype='application/json'
+        )
+
+    except Exception as e:
+        logger.error(f"Error obteniendo estados de pedidos: {e}")
+        return Response(
+            json.dumps({'error': f'Error interno del servidor: {str(e)}'}),
+            status=500,
+            mimetype='application/json'
+        )
+
 @bp.route('/<pedido_id>', methods=['GET'])
 def obtener_pedido(pedido_id):
     """Obtener detalle de un pedido con sus items"""
@@ -119,20 +161,27 @@ def obtener_pedidos():
         consulta = ObtenerPedidos(
             vendedor_id=vendedor_id if vendedor_id else None,
             cliente_id=cliente_id if cliente_id else None,
-            estado=estado if estado else None
+            estado=estado if estado else None,
+            page=page,
+            page_size=page_size,
+            cursor=extraer_cursor(request.args)
         )
         
-        pedidos = ejecutar_consulta(consulta)
-        
-        # Aplicar paginación
-        resultado_paginado = paginar_resultados(pedidos, page=page, page_size=page_size)
+        # Filtros y paginación se resuelven en la base de datos
+        pagina = ejecutar_consulta(consulta)
         
         return Response(
-            json.dumps(resultado_paginado), 
+            json.dumps(pagina.a_dict()), 
             status=200, 
             mimetype='application/json'
         )
         
+    except CursorInvalido as e:
+        return Response(
+            json.dumps({'error': str(e)}), 
+            status=400, 
+            mimetype='application/json'
+        )
     except Exception as e:
         logger.error(f"Error obteniendo pedidos: {e}")
         return Response(
@@ -5,7 +5,7 @@ from aplicacion.comandos.crear_plan import CrearPlan, ClienteVisita
 from aplicacion.consultas.obtener_planes import ObtenerPlanes, ObtenerPlanesPorUsuario
 from seedwork.aplicacion.comandos import ejecutar_comando
 from seedwork.aplicacion.consultas import ejecutar_consulta
-from seedwork.presentacion.paginacion import paginar_resultados, extraer_parametros_paginacion
+from seedwork.presentacion.paginacion import extraer_parametros_paginacion
 import logging
 
 logging.basicConfig(level=logging.DEBUG)
@@ -69,19 +69,18 @@ def obtener_planes():
         user_id = request.args.get('user_id', '')
         rol = request.headers.get('X-User-Role', 'VENDEDOR')
 
+        # Paginación (se resuelve en la base de datos)
+        page, page_size = extraer_parametros_paginacion(request.args)
+
         if rol.upper() == 'ADMINISTRADOR' and not user_id:
-            consulta = ObtenerPlanes()
+            consulta = ObtenerPlanes(page=page, page_size=page_size)
         else:
-            consulta = ObtenerPlanesPorUsuario(user_id=user_id)
+            consulta = ObtenerPlanesPorUsuario(user_id=user_id, page=page, page_size=page_size)
 
-        planes = ejecutar_consulta(consulta)
-
-        # Paginación
-        page, page_size = extraer_parametros_paginacion(request.args)
-        resultado_paginado = paginar_resultados(planes, page=page, page_size=page_size)
+        pagina = ejecutar_consulta(consulta)
 
         return Response(
-            json.dumps(resultado_paginado),
+            json.dumps(pagina.a_dict()),
             status=200,
             mimetype='application/json'
         )
@@ -10,7 +10,7 @@ from aplicacion.consultas.obtener_visitas_por_vendedor import ObtenerVisitasPorV
 from aplicacion.consultas.obtener_evidencias_visita import ObtenerEvidenciasVisita
 from seedwork.aplicacion.comandos import ejecutar_comando
 from seedwork.aplicacion.consultas import ejecutar_consulta
-from seedwork.presentacion.paginacion import paginar_resultados, extraer_parametros_paginacion
+from seedwork.presentacion.paginacion import extraer_parametros_paginacion
 from aplicacion.mapeadores import MapeadorVisitaAgregacionDTOJson
 
 import logging
@@ -108,19 +108,19 @@ def obtener_visitas():
             estado=estado,
             vendedor_id=vendedor_id,
             fecha_inicio=fecha_inicio,
-            fecha_fin=fecha_fin
+            fecha_fin=fecha_fin,
+            page=page,
+            page_size=page_size
         )
         
-        visitas_agregacion = ejecutar_consulta(consulta)
+        # Filtros y paginación se resuelven en la base de datos; solo se agregan las visitas de la página
+        pagina = ejecutar_consulta(consulta)
         
         mapeador = MapeadorVisitaAgregacionDTOJson()
-        visitas_json = mapeador.agregaciones_a_externo(visitas_agregacion)
-        
-        # Aplicar paginación
-        resultado_paginado = paginar_resultados(visitas_json, page=page, page_size=page_size)
+        visitas_json = mapeador.agregaciones_a_externo(pagina.items)
         
         return Response(
-            json.dumps(resultado_paginado), 
+            json.dumps(pagina.con_items(visitas_json).a_dict()), 
             status=200, 
             mimetype='application/json'
         )
@@ -158,19 +158,19 @@ def obtener_visitas_por_vendedor(vendedor_id):
             vendedor_id=vendedor_id, 
             estado=estado,
             fecha_inicio=fecha_inicio,
-            fecha_fin=fecha_fin
+            fecha_fin=fecha_fin,
+            page=page,
+            page_size=page_size
         )
         
-        visitas_agregacion = ejecutar_consulta(consulta)
+        # Filtros y paginación se resuelven en la base de datos; solo se agregan las visitas de la página
+        pagina = ejecutar_consulta(consulta)
         
         mapeador = MapeadorVisitaAgregacionDTOJson()
-        visitas_json = mapeador.agregaciones_a_externo(visitas_agregacion)
-        
-        # Aplicar paginación
-        resultado_paginado = paginar_resultados(visitas_json, page=page, page_size=page_size)
+        visitas_json = mapeador.agregaciones_a_externo(pagina.items)
         
         return Response(
-            json.dumps(resultado_paginado), 
+            json.dumps(pagina.con_items(visitas_json).a_dict()), 
             status=200, 
             mimetype='application/json'
         )
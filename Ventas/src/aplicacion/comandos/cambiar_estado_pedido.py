@@ -76,6 +76,9 @@ class CambiarEstadoPedidoHandler:
             if comando.nuevo_estado == 'entregado':
                 evento_entrega = pedido_actualizado.disparar_evento_entrega()
                 despachador_eventos.publicar_evento(evento_entrega)
+
+            # Notificar el nuevo estado para las proyecciones de otros servicios (Logística)
+            despachador_eventos.publicar_evento(pedido_actualizado.disparar_evento_estado_actualizado())
             
             return {
                 'success': True,
@@ -143,10 +146,9 @@ class CambiarEstadoPedidoHandler:
             if not r.get('success', False):
                 return {'success': False, 'error': f"No se pudo consumir la reserva: {r.get('error', 'error desconocido')}"}
 
-            # 2) Si Logística OK → ahora sí marcamos el pedido como entregado
+            # 2) Si Logística OK → ahora sí marcamos el pedido como entregado (handle lo persiste)
             if pedido.marcar_entregado():
-                actualizado = self._repositorio.actualizar(pedido)
-                return {'success': True, 'pedido_id': str(actualizado.id), 'estado': actualizado.estado.estado}
+                return {'success': True}
 
             return {'success': False, 'error': 'No se pudo marcar el pedido como entregado'}
 
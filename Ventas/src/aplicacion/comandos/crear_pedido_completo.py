@@ -10,11 +10,16 @@ from dominio.entidades import Pedido, ItemPedido
 from dominio.objetos_valor import EstadoPedido, Precio, Cantidad
 from seedwork.dominio.eventos import despachador_eventos
 from dominio.eventos import PedidoCreado, PedidoConfirmado
+from concurrent.futures import ThreadPoolExecutor
 import logging
+import os
 import uuid
 
 logger = logging.getLogger(__name__)
 
+# Máximo de llamadas HTTP simultáneas cuando las consultas en lote no están disponibles
+MAX_CONSULTAS_CONCURRENTES = int(os.getenv('PEDIDO_MAX_CONSULTAS_CONCURRENTES', '8'))
+
 @dataclass
 class ItemPedidoCompleto:
     producto_id: str
@@ -57,8 +62,19 @@ class CrearPedidoCompletoHandler:
                         'error': 'Todos los items deben tener producto_id y cantidad > 0'
                     }
             
+            # Consultar cliente, vendedor, productos e inventario a la vez (una sola ronda de llamadas)
+            producto_ids = list(dict.fromkeys(item.producto_id for item in comando.items))
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                futuro_cliente = executor.submit(self._servicio_usuarios.obtener_cliente_por_id, comando.cliente_id)
+                futuro_vendedor = (
+                    executor.submit(self._servicio_usuarios.obtener_vendedor_por_id, comando.vendedor_id)
+                    if comando.vendedor_id else None
+                )
+                futuro_productos = executor.submit(self._obtener_productos, producto_ids)
+                futuro_inventarios = executor.submit(self._obtener_inventarios, producto_ids)
+            
             # Validar existencia de cliente
-            cliente = self._servicio_usuarios.obtener_cliente_por_id(comando.cliente_id)
+            cliente = futuro_cliente.result()
             if not cliente:
                 return {
                     'success': False,
@@ -66,14 +82,17 @@ class CrearPedidoCompletoHandler:
                 }
             
             # Validar existencia de vendedor si se proporciona
-            if comando.vendedor_id:
-                vendedor = self._servicio_usuarios.obtener_vendedor_por_id(comando.vendedor_id)
+            if futuro_vendedor:
+                vendedor = futuro_vendedor.result()
                 if not vendedor:
                     return {
                         'success': False,
                         'error': f'Vendedor {comando.vendedor_id} no existe'
                     }
             
+            productos = futuro_productos.result()
+            inventarios = futuro_inventarios.result()
+            
             # Normalizar vendedor_id: convertir None a string vacío para la entidad de dominio
             vendedor_id_final = comando.vendedor_id if comando.vendedor_id else ""
             
@@ -96,7 +115,7 @@ class CrearPedidoCompletoHandler:
                 cantidad_solicitada = item_data.cantidad
                 
                 # Consultar producto para obtener nombre y precio
-                producto = self._servicio_productos.obtener_producto_por_id(producto_id)
+                producto = productos.get(producto_id)
                 if not producto:
                     items_con_problemas.append({
                         'producto_id': producto_id,
@@ -122,7 +141,7 @@ class CrearPedidoCompletoHandler:
                     continue
                 
                 # Consultar inventario del producto
-                inventario = self._servicio_logistica.obtener_inventario_producto(producto_id)
+                inventario = inventarios.get(producto_id)
                 
                 if not inventario:
                     # Producto no existe en inventario
@@ -254,6 +273,32 @@ class CrearPedidoCompletoHandler:
                 'error': f'Error interno: {str(e)}'
             }
 
+    def _obtener_productos(self, producto_ids: List[str]) -> Dict[str, dict]:
+        """Obtener los productos en una llamada; si no hay consulta en lote, consultar en paralelo"""
+        productos = self._servicio_productos.obtener_productos_por_ids(producto_ids)
+        if productos is not None:
+            return productos
+        return self._consultar_en_paralelo(self._servicio_productos.obtener_producto_por_id, producto_ids)
+    
+    def _obtener_inventarios(self, producto_ids: List[str]) -> Dict[str, dict]:
+        """Obtener el inventario en una llamada; si no hay consulta en lote, consultar en paralelo"""
+        inventarios = self._servicio_logistica.obtener_inventarios_productos(producto_ids)
+        if inventarios is not None:
+            return inventarios
+        return self._consultar_en_paralelo(self._servicio_logistica.obtener_inventario_producto, producto_ids)
+    
+    def _consultar_en_paralelo(self, consulta, producto_ids: List[str]) -> Dict[str, dict]:
+        """Ejecutar una consulta individual por producto con un número acotado de hilos"""
+        if not producto_ids:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(MAX_CONSULTAS_CONCURRENTES, len(producto_ids))) as executor:
+            resultados = list(executor.map(consulta, producto_ids))
+        return {
+            producto_id: resultado
+            for producto_id, resultado in zip(producto_ids, resultados)
+            if resultado
+        }
+
 @comando.register(CrearPedidoCompleto)
 def ejecutar_crear_pedido_completo(comando: CrearPedidoCompleto):
     handler = CrearPedidoCompletoHandler()
@@ -0,0 +1,31 @@
+from dataclasses import dataclass, field
+from seedwork.aplicacion.consultas import Consulta
+from seedwork.aplicacion.consultas import ejecutar_consulta as consulta
+from infraestructura.repositorios import RepositorioPedidoSQLite
+import logging
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class ObtenerEstadosPedidos(Consulta):
+    """Consulta para obtener el estado actual de varios pedidos"""
+    pedido_ids: list[str] = field(default_factory=list)
+
+class ObtenerEstadosPedidosHandler:
+    def __init__(self):
+        self._repositorio: RepositorioPedidoSQLite = RepositorioPedidoSQLite()
+
+    def handle(self, consulta: ObtenerEstadosPedidos) -> dict[str, str]:
+        """Obtener un diccionario {pedido_id: estado}; los IDs inexistentes se omiten"""
+        pedido_ids = list(dict.fromkeys(str(p).strip() for p in consulta.pedido_ids if p))
+        if not pedido_ids:
+            return {}
+
+        estados = self._repositorio.obtener_estados_por_ids(pedido_ids)
+        logger.info(f"Estados resueltos para {len(estados)} de {len(pedido_ids)} pedidos")
+        return estados
+
+@consulta.register(ObtenerEstadosPedidos)
+def ejecutar_obtener_estados_pedidos(consulta: ObtenerEstadosPedidos):
+    handler = ObtenerEstadosPedidosHandler()
+    return handler.handle(consulta)
@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from seedwork.aplicacion.consultas import Consulta
 from seedwork.aplicacion.consultas import ejecutar_consulta as consulta
-from infraestructura.repositorios import RepositorioPedidoSQLite
+from infraestructura.repositorios import RepositorioInformeVentasSQLite
 from infraestructura.servicio_usuarios import ServicioUsuarios
 
 import logging
@@ -24,7 +24,7 @@ class ObtenerInformeVentas(Consulta):
 # ---------------------------------------------------------------
 class ObtenerInformeVentasHandler:
     def __init__(self):
-        self._repositorio: RepositorioPedidoSQLite = RepositorioPedidoSQLite()
+        self._repositorio: RepositorioInformeVentasSQLite = RepositorioInformeVentasSQLite()
         self._servicio_usuarios: ServicioUsuarios = ServicioUsuarios()
 
     def handle(self, consulta: ObtenerInformeVentas) -> dict:
@@ -35,15 +35,18 @@ class ObtenerInformeVentasHandler:
         - Ventas por mes
         - Ventas por cliente
         - Productos más vendidos
+
+        Los agregados se calculan en la base de datos; aquí solo se agregan los nombres
+        de los clientes, resueltos en una sola llamada al servicio de Usuarios.
         """
         try:
-            pedidos = self._repositorio.obtener_pedidos_confirmados(
+            resumen = self._repositorio.obtener_resumen(
                 fecha_inicio=consulta.fecha_inicio,
                 fecha_fin=consulta.fecha_fin,
                 vendedor_id=consulta.vendedor_id
             )
 
-            if not pedidos:
+            if not resumen["ventas_por_cliente"]:
                 logger.info("No se encontraron pedidos (confirmados, en_transito o entregados) en el rango dado.")
                 return {
                     "ventas_totales": 0,
@@ -53,82 +56,25 @@ class ObtenerInformeVentasHandler:
                     "productos_mas_vendidos": []
                 }
 
-            total_ventas = 0
-            total_productos_vendidos = 0
-            ventas_por_mes = {}
-            ventas_por_cliente = {}
-            productos_vendidos = {}
-
-            # -------------------------------------------------------
-            # Recorremos los pedidos (confirmados, en_transito y entregados) y acumulamos métricas
-            # -------------------------------------------------------
-            for pedido in pedidos:
-                total_ventas += pedido.total.valor
-
-                # 🧩 Ventas por cliente (id + nombre si disponible)
-                cliente_id = pedido.cliente_id
-                cliente_datos = self._servicio_usuarios.obtener_cliente_por_id(pedido.cliente_id)
-                cliente_nombre = cliente_datos.get("nombre") if cliente_datos else "Cliente desconocido"
-                if cliente_id not in ventas_por_cliente:
-                    ventas_por_cliente[cliente_id] = {
-                        "nombre": cliente_nombre,
-                        "cantidad_pedidos": 0,
-                        "monto_total": 0
-                    }
-                ventas_por_cliente[cliente_id]["cantidad_pedidos"] += 1  # cantidad de pedidos
-                ventas_por_cliente[cliente_id]["monto_total"] += pedido.total.valor
-
-
-
-                # 🗓️ Ventas por mes
-                fecha_pedido = getattr(pedido, "created_at", None) or getattr(pedido, "_created_at_model", None)
-                if fecha_pedido:
-                    mes_key = fecha_pedido.strftime("%Y-%m")
-                    ventas_por_mes[mes_key] = ventas_por_mes.get(mes_key, 0) + pedido.total.valor
-
-                # 🔢 Productos vendidos
-                for item in pedido.items:
-                    cantidad = item.cantidad.valor
-                    producto_id = item.producto_id
-                    producto_nombre = getattr(item, "nombre_producto", "Producto sin nombre")
-
-                    total_productos_vendidos += cantidad
-
-                    if producto_id not in productos_vendidos:
-                        productos_vendidos[producto_id] = {"nombre": producto_nombre, "cantidad": 0}
-                    productos_vendidos[producto_id]["cantidad"] += cantidad
-
-
-            # -------------------------------------------------------
-            # Productos más vendidos (Top 10)
-            # -------------------------------------------------------
-            productos_mas_vendidos = [
-                {
-                    "producto_id": pid,
-                    "nombre": datos["nombre"],
-                    "cantidad": datos["cantidad"]
-                }
-                for pid, datos in sorted(productos_vendidos.items(), key=lambda x: x[1]["cantidad"], reverse=True)[:10]
-            ]
-
-            # ✅ Ventas por cliente (convertimos a lista para el frontend)
+            # 🧩 Ventas por cliente (id + nombre si disponible)
+            nombres = self._obtener_nombres_clientes([v["cliente_id"] for v in resumen["ventas_por_cliente"]])
             ventas_por_cliente_formateadas = [
                 {
-                    "cliente_id": cid,
-                    "nombre": datos["nombre"],
-                    "cantidad_pedidos": datos["cantidad_pedidos"],
-                    "monto_total": datos["monto_total"]
+                    "cliente_id": venta["cliente_id"],
+                    "nombre": nombres.get(venta["cliente_id"]) or "Cliente desconocido",
+                    "cantidad_pedidos": venta["cantidad_pedidos"],
+                    "monto_total": venta["monto_total"]
                 }
-                for cid, datos in ventas_por_cliente.items()
+                for venta in resumen["ventas_por_cliente"]
             ]
 
             # ✅ Retorno final
             return {
-                "ventas_totales": total_ventas,
-                "total_productos_vendidos": total_productos_vendidos,
-                "ventas_por_mes": ventas_por_mes,
+                "ventas_totales": resumen["ventas_totales"],
+                "total_productos_vendidos": resumen["total_productos_vendidos"],
+                "ventas_por_mes": resumen["ventas_por_mes"],
                 "ventas_por_cliente": ventas_por_cliente_formateadas,
-                "productos_mas_vendidos": productos_mas_vendidos
+                "productos_mas_vendidos": resumen["productos_mas_vendidos"]
             }
 
         except Exception as e:
@@ -141,6 +87,17 @@ class ObtenerInformeVentasHandler:
                 "productos_mas_vendidos": []
             }
 
+    def _obtener_nombres_clientes(self, cliente_ids: list[str]) -> dict:
+        """Nombres por cliente_id; si la consulta en lote no está disponible se resuelven uno a uno (con caché)"""
+        clientes = self._servicio_usuarios.obtener_clientes_por_ids(cliente_ids, campos=["nombre"])
+        if clientes is None:
+            clientes = {}
+            for cliente_id in cliente_ids:
+                datos = self._servicio_usuarios.obtener_cliente_por_id(cliente_id)
+                if datos:
+                    clientes[cliente_id] = datos
+        return {cliente_id: datos.get("nombre") for cliente_id, datos in clientes.items()}
+
 
 # ---------------------------------------------------------------
 # Registro de la consulta en el seedwork
@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from seedwork.aplicacion.consultas import Consulta
 from seedwork.aplicacion.consultas import ejecutar_consulta as consulta
-from infraestructura.repositorios import RepositorioPedidoSQLite
+from infraestructura.repositorios import RepositorioInformeVentasSQLite
 from infraestructura.servicio_usuarios import ServicioUsuarios
 
 import logging
@@ -15,52 +15,30 @@ class ObtenerInformeVentasPorVendedor(Consulta):
 
 class ObtenerInformeVentasPorVendedorHandler:
     def __init__(self):
-        self._repositorio: RepositorioPedidoSQLite = RepositorioPedidoSQLite()
+        self._repositorio: RepositorioInformeVentasSQLite = RepositorioInformeVentasSQLite()
         self._servicio_usuarios: ServicioUsuarios = ServicioUsuarios()
 
     def handle(self, consulta: ObtenerInformeVentasPorVendedor) -> list[dict]:
         try:
-            pedidos = self._repositorio.obtener_pedidos_confirmados(
+            ventas_por_vendedor = self._repositorio.obtener_ventas_por_vendedor(
                 fecha_inicio=consulta.fecha_inicio,
                 fecha_fin=consulta.fecha_fin
             )
 
-            if not pedidos:
+            if not ventas_por_vendedor:
                 logger.info("No se encontraron pedidos (confirmados, en_transito o entregados) en el rango dado.")
                 return []
 
-            ventas_por_vendedor = {}
-
-            for pedido in pedidos:
-                if not pedido.vendedor_id:
-                    continue
-
-                vendedor_id = pedido.vendedor_id
-
-                if vendedor_id not in ventas_por_vendedor:
-                    vendedor_datos = self._servicio_usuarios.obtener_vendedor_por_id(vendedor_id)
-                    vendedor_nombre = vendedor_datos.get("nombre") if vendedor_datos else "Vendedor desconocido"
-
-                    ventas_por_vendedor[vendedor_id] = {
-                        "vendedor_id": vendedor_id,
-                        "vendedor_nombre": vendedor_nombre,
-                        "numero_pedidos": 0,
-                        "total_ventas": 0.0,
-                        "clientes_atendidos": set()
-                    }
-
-                ventas_por_vendedor[vendedor_id]["numero_pedidos"] += 1
-                ventas_por_vendedor[vendedor_id]["total_ventas"] += pedido.total.valor
-                ventas_por_vendedor[vendedor_id]["clientes_atendidos"].add(pedido.cliente_id)
+            nombres = self._obtener_nombres_vendedores([v["vendedor_id"] for v in ventas_por_vendedor])
 
             resultado = []
-            for vendedor_id, datos in ventas_por_vendedor.items():
+            for datos in ventas_por_vendedor:
                 resultado.append({
                     "vendedor_id": datos["vendedor_id"],
-                    "vendedor_nombre": datos["vendedor_nombre"],
+                    "vendedor_nombre": nombres.get(datos["vendedor_id"]) or "Vendedor desconocido",
                     "numero_pedidos": datos["numero_pedidos"],
                     "total_ventas": datos["total_ventas"],
-                    "clientes_atendidos": len(datos["clientes_atendidos"])
+                    "clientes_atendidos": datos["clientes_atendidos"]
                 })
 
             logger.info(f"Informe de ventas por vendedor generado: {len(resultado)} vendedores")
@@ -70,6 +48,17 @@ class ObtenerInformeVentasPorVendedorHandler:
             logger.error(f"Error generando informe de ventas por vendedor: {e}")
             return []
 
+    def _obtener_nombres_vendedores(self, vendedor_ids: list[str]) -> dict:
+        """Nombres por vendedor_id; si la consulta en lote no está disponible se resuelven uno a uno (con caché)"""
+        vendedores = self._servicio_usuarios.obtener_vendedores_por_ids(vendedor_ids, campos=["nombre"])
+        if vendedores is None:
+            vendedores = {}
+            for vendedor_id in vendedor_ids:
+                datos = self._servicio_usuarios.obtener_vendedor_por_id(vendedor_id)
+                if datos:
+                    vendedores[vendedor_id] = datos
+        return {vendedor_id: datos.get("nombre") for vendedor_id, datos in vendedores.items()}
+
 @consulta.register(ObtenerInformeVentasPorVendedor)
 def ejecutar_obtener_informe_ventas_por_vendedor(consulta: ObtenerInformeVentasPorVendedor):
     handler = ObtenerInformeVentasPorVendedorHandler()
@@ -2,6 +2,7 @@ from dataclasses import dataclass
 from seedwork.aplicacion.consultas import Consulta
 from seedwork.aplicacion.consultas import ejecutar_consulta as consulta
 from infraestructura.repositorios import RepositorioPedidoSQLite
+from seedwork.presentacion.paginacion import Pagina, PaginaCursor
 import logging
 
 logger = logging.getLogger(__name__)
@@ -12,13 +13,21 @@ class ObtenerPedidos(Consulta):
     vendedor_id: str = None  # Filtro opcional por vendedor
     cliente_id: str = None   # Filtro opcional por cliente
     estado: str = None       # Filtro opcional por estado
+    page: int = None         # Si se indica, se pagina en la base de datos y se retorna una Pagina
+    page_size: int = 100
+    cursor: str = None       # Si se indica (vacío = primera página), se pagina por cursor y se retorna una PaginaCursor
 
 class ObtenerPedidosHandler:
     def __init__(self):
         self._repositorio: RepositorioPedidoSQLite = RepositorioPedidoSQLite()
     
-    def handle(self, consulta: ObtenerPedidos) -> list[dict]:
+    def handle(self, consulta: ObtenerPedidos):
         """Obtener todos los pedidos con filtros opcionales"""
+        if consulta.cursor is not None:
+            return self._handle_por_cursor(consulta)
+        if consulta.page is not None:
+            return self._handle_paginado(consulta)
+        
         try:
             # Obtener todos los pedidos del repositorio
             pedidos = self._repositorio.obtener_todos()
@@ -34,28 +43,7 @@ class ObtenerPedidosHandler:
                 pedidos = [p for p in pedidos if p.estado.estado == consulta.estado]
             
             # Convertir a diccionarios para respuesta
-            pedidos_data = []
-            for pedido in pedidos:
-                items_data = []
-                for item in pedido.items:
-                    items_data.append({
-                        'id': str(item.id),
-                        'producto_id': item.producto_id,
-                        'nombre_producto': item.nombre_producto,
-                        'cantidad': item.cantidad.valor,
-                        'precio_unitario': item.precio_unitario.valor,
-                        'subtotal': item.calcular_subtotal()
-                    })
-                
-                pedidos_data.append({
-                    'id': str(pedido.id),
-                    'vendedor_id': pedido.vendedor_id,
-                    'cliente_id': pedido.cliente_id,
-                    'estado': pedido.estado.estado,
-                    'total': pedido.total.valor,
-                    'fecha_creacion': getattr(pedido, '_created_at_model', None).isoformat() if getattr(pedido, '_created_at_model', None) else None,
-                    'items': items_data
-                })
+            pedidos_data = [self._pedido_a_dict(pedido) for pedido in pedidos]
             
             logger.info(f"Retornando {len(pedidos_data)} pedidos")
             return pedidos_data
@@ -63,6 +51,57 @@ class ObtenerPedidosHandler:
         except Exception as e:
             logger.error(f"Error obteniendo pedidos: {e}")
             return []
+    
+    def _handle_paginado(self, consulta: ObtenerPedidos) -> Pagina:
+        """Filtra y pagina en la base de datos; solo se convierten los pedidos de la página"""
+        try:
+            pagina = self._repositorio.obtener_pagina(
+                page=consulta.page,
+                page_size=consulta.page_size,
+                vendedor_id=consulta.vendedor_id,
+                cliente_id=consulta.cliente_id,
+                estado=consulta.estado
+            )
+            logger.info(f"Retornando página {pagina.page} con {len(pagina.items)} de {pagina.total_items} pedidos")
+            return pagina.con_items([self._pedido_a_dict(pedido) for pedido in pagina.items])
+            
+        except Exception as e:
+            logger.error(f"Error obteniendo pedidos: {e}")
+            return Pagina(items=[], page=1, page_size=consulta.page_size, total_items=0)
+    
+    def _handle_por_cursor(self, consulta: ObtenerPedidos) -> PaginaCursor:
+        """Navega por cursor en la base de datos; un cursor inválido se propaga como CursorInvalido"""
+        pagina = self._repositorio.obtener_pagina_por_cursor(
+            cursor=consulta.cursor,
+            page_size=consulta.page_size,
+            vendedor_id=consulta.vendedor_id,
+            cliente_id=consulta.cliente_id,
+            estado=consulta.estado
+        )
+        logger.info(f"Retornando {len(pagina.items)} pedidos por cursor")
+        return pagina.con_items([self._pedido_a_dict(pedido) for pedido in pagina.items])
+    
+    def _pedido_a_dict(self, pedido) -> dict:
+        items_data = []
+        for item in pedido.items:
+            items_data.append({
+                'id': str(item.id),
+                'producto_id': item.producto_id,
+                'nombre_producto': item.nombre_producto,
+                'cantidad': item.cantidad.valor,
+                'precio_unitario': item.precio_unitario.valor,
+                'subtotal': item.calcular_subtotal()
+            })
+        
+        return {
+            'id': str(pedido.id),
+            'vendedor_id': pedido.vendedor_id,
+            'cliente_id': pedido.cliente_id,
+            'estado': pedido.estado.estado,
+            'total': pedido.total.valor,
+            'fecha_creacion': getattr(pedido, '_created_at_model', None).isoformat() if getattr(pedido, '_created_at_model', None) else None,
+            'items': items_data
+        }
 
 @consulta.register(ObtenerPedidos)
 def ejecutar_obtener_pedidos(consulta: ObtenerPedidos):
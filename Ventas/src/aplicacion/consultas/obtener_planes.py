@@ -2,6 +2,7 @@ from dataclasses import dataclass
 from seedwork.aplicacion.consultas import Consulta
 from seedwork.aplicacion.consultas import ejecutar_consulta as consulta
 from infraestructura.repositorios import RepositorioPlanes
+from seedwork.presentacion.paginacion import Pagina
 from datetime import datetime
 import logging
 
@@ -11,40 +12,53 @@ logger = logging.getLogger(__name__)
 @dataclass
 class ObtenerPlanes(Consulta):
     """Consulta para obtener todos los planes de visita"""
-    pass
+    page: int = None  # Si se indica, se pagina en la base de datos y se retorna una Pagina
+    page_size: int = 100
 
 
 @dataclass
 class ObtenerPlanesPorUsuario(Consulta):
     """Consulta para obtener los planes de un vendedor"""
     user_id: str
+    page: int = None
+    page_size: int = 100
+
+
+def _formatear_plan(plan: dict) -> dict:
+    """El repositorio retorna estructura completa; formateamos solo fecha_inicio/fin a YYYY-MM-DD"""
+    return {
+        "id": plan["id"],
+        "nombre": plan["nombre"],
+        "id_usuario": plan["id_usuario"],
+        "fecha_inicio": datetime.fromisoformat(plan["fecha_inicio"]).date().isoformat(),
+        "fecha_fin": datetime.fromisoformat(plan["fecha_fin"]).date().isoformat(),
+        # Mantener visitas tal como vienen (ya son objetos enriquecidos con fecha_programada ISO)
+        "visitas_clientes": plan.get("visitas_clientes", [])
+    }
+
+
+def _obtener_pagina_planes(repositorio: RepositorioPlanes, page: int, page_size: int, user_id: str = None) -> Pagina:
+    """Pagina en la base de datos; solo se formatean los planes de la página"""
+    try:
+        pagina = repositorio.obtener_pagina(page=page, page_size=page_size, user_id=user_id)
+        return pagina.con_items([_formatear_plan(plan) for plan in pagina.items])
+    except Exception as e:
+        logger.error(f"❌ Error obteniendo planes: {e}")
+        return Pagina(items=[], page=1, page_size=page_size, total_items=0)
 
 
 class ObtenerPlanesHandler:
     def __init__(self):
         self._repo = RepositorioPlanes()
 
-    def handle(self, consulta: ObtenerPlanes) -> list[dict]:
+    def handle(self, consulta: ObtenerPlanes):
         """Obtener todos los planes de visita"""
+        if consulta.page is not None:
+            return _obtener_pagina_planes(self._repo, consulta.page, consulta.page_size)
+
         try:
             planes = self._repo.obtener_todos()
-            # El repositorio retorna estructura completa; formateamos solo fecha_inicio/fin a YYYY-MM-DD
-            data = []
-            for plan in planes:
-                fecha_inicio = datetime.fromisoformat(plan["fecha_inicio"]).date().isoformat()
-                fecha_fin = datetime.fromisoformat(plan["fecha_fin"]).date().isoformat()
-
-                # Mantener visitas tal como vienen (ya son objetos enriquecidos con fecha_programada ISO)
-                visitas_clientes = plan.get("visitas_clientes", [])
-
-                data.append({
-                    "id": plan["id"],
-                    "nombre": plan["nombre"],
-                    "id_usuario": plan["id_usuario"],
-                    "fecha_inicio": fecha_inicio,
-                    "fecha_fin": fecha_fin,
-                    "visitas_clientes": visitas_clientes
-                })
+            data = [_formatear_plan(plan) for plan in planes]
             
             logger.info(f"✅ Retornando {len(data)} planes")
             return data
@@ -57,26 +71,14 @@ class ObtenerPlanesPorUsuarioHandler:
     def __init__(self):
         self._repo = RepositorioPlanes()
 
-    def handle(self, consulta: ObtenerPlanesPorUsuario) -> list[dict]:
+    def handle(self, consulta: ObtenerPlanesPorUsuario):
         """Obtener los planes de un vendedor específico"""
+        if consulta.page is not None:
+            return _obtener_pagina_planes(self._repo, consulta.page, consulta.page_size, user_id=consulta.user_id)
+
         try:
             planes = self._repo.obtener_por_usuario(consulta.user_id)
-            # El repositorio retorna estructura completa; formateamos solo fecha_inicio/fin a YYYY-MM-DD
-            data = []
-            for plan in planes:
-                fecha_inicio = datetime.fromisoformat(plan["fecha_inicio"]).date().isoformat()
-                fecha_fin = datetime.fromisoformat(plan["fecha_fin"]).date().isoformat()
-
-                visitas_clientes = plan.get("visitas_clientes", [])
-
-                data.append({
-                    "id": plan["id"],
-                    "nombre": plan["nombre"],
-                    "id_usuario": plan["id_usuario"],
-                    "fecha_inicio": fecha_inicio,
-                    "fecha_fin": fecha_fin,
-                    "visitas_clientes": visitas_clientes
-                })
+            data = [_formatear_plan(plan) for plan in planes]
             
             logger.info(f"✅ Retornando {len(data)} planes del usuario {consulta.user_id}")
             return data
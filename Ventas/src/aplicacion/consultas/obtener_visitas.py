@@ -6,6 +6,7 @@ from aplicacion.dto import VisitaDTO
 from aplicacion.dto_agregacion import VisitaAgregacionDTO
 from infraestructura.repositorios import RepositorioVisitaSQLite
 from infraestructura.servicio_usuarios import ServicioUsuarios
+from seedwork.presentacion.paginacion import Pagina
 
 logger = logging.getLogger(__name__)
 
@@ -16,81 +17,125 @@ class ObtenerVisitas(Consulta):
     fecha_inicio: datetime = None  # Filtro opcional por fecha inicio
     fecha_fin: datetime = None  # Filtro opcional por fecha fin
     vendedor_id: str = None  # Filtro opcional por vendedor
+    page: int = None  # Si se indica, se pagina en la base de datos y se retorna una Pagina
+    page_size: int = 100
 
 class ObtenerVisitasHandler:
     def __init__(self, repositorio=None, servicio_usuarios=None):
         self.repositorio = repositorio or RepositorioVisitaSQLite()
         self.servicio_usuarios = servicio_usuarios or ServicioUsuarios()
     
-    def handle(self, consulta: ObtenerVisitas) -> list[VisitaAgregacionDTO]:
+    def handle(self, consulta: ObtenerVisitas):
+        if consulta.page is not None:
+            return self._handle_paginado(consulta)
+        
         try:
-            # 1. Obtener todas las visitas del repositorio
-            visitas = self.repositorio.obtener_todos()
+            # Filtros resueltos en la base de datos
+            visitas = self.repositorio.obtener_filtradas(
+                estado=consulta.estado,
+                vendedor_id=consulta.vendedor_id,
+                fecha_inicio=consulta.fecha_inicio,
+                fecha_fin=consulta.fecha_fin
+            )
             
-            # 2. Aplicar filtro por estado si se especifica
-            if consulta.estado:
-                visitas = [v for v in visitas if v.estado == consulta.estado]
+            return self._construir_agregaciones(visitas)
             
-            # 3. Aplicar filtro por vendedor si se especifica
-            if consulta.vendedor_id:
-                visitas = [v for v in visitas if v.vendedor_id == consulta.vendedor_id]
+        except Exception as e:
+            logger.error(f"Error obteniendo visitas con agregación: {e}")
+            raise
+
+    def _handle_paginado(self, consulta: ObtenerVisitas) -> Pagina:
+        """Filtra y pagina en la base de datos; solo se agregan vendedor y cliente de las visitas de la página"""
+        try:
+            pagina = self.repositorio.obtener_pagina(
+                page=consulta.page,
+                page_size=consulta.page_size,
+                estado=consulta.estado,
+                vendedor_id=consulta.vendedor_id,
+                fecha_inicio=consulta.fecha_inicio,
+                fecha_fin=consulta.fecha_fin
+            )
+            return pagina.con_items(self._construir_agregaciones(pagina.items))
             
-            # 4. Aplicar filtro por rango de fechas si se especifica
-            if consulta.fecha_inicio and consulta.fecha_fin:
-                # Si ambas fechas son iguales → filtrar solo ese día
-                if consulta.fecha_inicio.date() == consulta.fecha_fin.date():
-                    visitas = [v for v in visitas if v.fecha_programada.date() == consulta.fecha_inicio.date()]
-                else:
-                    # Si son diferentes → rango normal
-                    visitas = [v for v in visitas if consulta.fecha_inicio.date() <= v.fecha_programada.date() <= consulta.fecha_fin.date()]
+        except Exception as e:
+            logger.error(f"Error obteniendo visitas con agregación: {e}")
+            raise
+    
+    def _construir_agregaciones(self, visitas) -> list[VisitaAgregacionDTO]:
+        return construir_agregaciones_visitas(visitas, self.servicio_usuarios)
+
+
+def construir_agregaciones_visitas(visitas, servicio_usuarios) -> list[VisitaAgregacionDTO]:
+    """
+    Agrega vendedor y cliente a cada visita.
+    
+    Vendedores y clientes se resuelven con una consulta en lote por recurso; si el
+    endpoint en lote no está disponible se resuelven uno a uno (con caché).
+    Las visitas cuyo vendedor o cliente no existe se omiten.
+    """
+    if not visitas:
+        return []
+    
+    vendedores = _resolver_por_ids(
+        servicio_usuarios.obtener_vendedores_por_ids,
+        servicio_usuarios.obtener_vendedor_por_id,
+        [visita.vendedor_id for visita in visitas]
+    )
+    clientes = _resolver_por_ids(
+        servicio_usuarios.obtener_clientes_por_ids,
+        servicio_usuarios.obtener_cliente_por_id,
+        [visita.cliente_id for visita in visitas]
+    )
+    
+    agregaciones = []
+    for visita in visitas:
+        try:
+            vendedor = vendedores.get(str(visita.vendedor_id))
+            if not vendedor:
+                logger.warning(f"Vendedor {visita.vendedor_id} no encontrado para visita {visita.id}")
+                continue
             
-            # 5. Construir agregaciones completas
-            agregaciones = []
-            for visita in visitas:
-                try:
-                    # Obtener vendedor
-                    vendedor = self.servicio_usuarios.obtener_vendedor_por_id(visita.vendedor_id)
-                    if not vendedor:
-                        logger.warning(f"Vendedor {visita.vendedor_id} no encontrado para visita {visita.id}")
-                        continue
-                    
-                    # Obtener cliente
-                    cliente = self.servicio_usuarios.obtener_cliente_por_id(visita.cliente_id)
-                    if not cliente:
-                        logger.warning(f"Cliente {visita.cliente_id} no encontrado para visita {visita.id}")
-                        continue
-                    
-                    # Construir agregación completa
-                    agregacion = VisitaAgregacionDTO(
-                        id=visita.id,
-                        fecha_programada=visita.fecha_programada,
-                        direccion=visita.direccion,
-                        telefono=visita.telefono,
-                        estado=visita.estado,
-                        descripcion=visita.descripcion,
-                        vendedor_id=vendedor['id'],
-                        vendedor_nombre=vendedor['nombre'],
-                        vendedor_email=vendedor['email'],
-                        vendedor_telefono=vendedor['telefono'],
-                        vendedor_direccion=vendedor['direccion'],
-                        cliente_id=cliente['id'],
-                        cliente_nombre=cliente['nombre'],
-                        cliente_email=cliente['email'],
-                        cliente_telefono=cliente['telefono'],
-                        cliente_direccion=cliente['direccion']
-                    )
-                    
-                    agregaciones.append(agregacion)
-                    
-                except Exception as e:
-                    logger.warning(f"Error construyendo agregación para visita {visita.id}: {e}")
-                    continue
+            cliente = clientes.get(str(visita.cliente_id))
+            if not cliente:
+                logger.warning(f"Cliente {visita.cliente_id} no encontrado para visita {visita.id}")
+                continue
             
-            return agregaciones
+            agregaciones.append(VisitaAgregacionDTO(
+                id=visita.id,
+                fecha_programada=visita.fecha_programada,
+                direccion=visita.direccion,
+                telefono=visita.telefono,
+                estado=visita.estado,
+                descripcion=visita.descripcion,
+                vendedor_id=vendedor['id'],
+                vendedor_nombre=vendedor['nombre'],
+                vendedor_email=vendedor['email'],
+                vendedor_telefono=vendedor['telefono'],
+                vendedor_direccion=vendedor['direccion'],
+                cliente_id=cliente['id'],
+                cliente_nombre=cliente['nombre'],
+                cliente_email=cliente['email'],
+                cliente_telefono=cliente['telefono'],
+                cliente_direccion=cliente['direccion']
+            ))
             
         except Exception as e:
-            logger.error(f"Error obteniendo visitas con agregación: {e}")
-            raise
+            logger.warning(f"Error construyendo agregación para visita {visita.id}: {e}")
+            continue
+    
+    return agregaciones
+
+
+def _resolver_por_ids(obtener_en_lote, obtener_uno, ids) -> dict:
+    ids = list(dict.fromkeys(str(i) for i in ids if i))
+    encontrados = obtener_en_lote(ids)
+    if encontrados is None:
+        encontrados = {}
+        for id_ in ids:
+            datos = obtener_uno(id_)
+            if datos:
+                encontrados[id_] = datos
+    return encontrados
 
 @ejecutar_consulta.register
 def _(consulta: ObtenerVisitas):
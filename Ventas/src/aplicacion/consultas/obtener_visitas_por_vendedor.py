@@ -4,8 +4,10 @@ from seedwork.aplicacion.consultas import Consulta, ejecutar_consulta
 import logging
 from aplicacion.dto import VisitaDTO
 from aplicacion.dto_agregacion import VisitaAgregacionDTO
+from aplicacion.consultas.obtener_visitas import construir_agregaciones_visitas
 from infraestructura.repositorios import RepositorioVisitaSQLite
 from infraestructura.servicio_usuarios import ServicioUsuarios
+from seedwork.presentacion.paginacion import Pagina
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +18,8 @@ class ObtenerVisitasPorVendedor(Consulta):
     estado: str = None  # Filtro opcional por estado
     fecha_inicio: datetime = None  # Filtro opcional por fecha inicio
     fecha_fin: datetime = None  # Filtro opcional por fecha fin
+    page: int = None  # Si se indica, se pagina en la base de datos y se retorna una Pagina
+    page_size: int = 100
 
 class ObtenerVisitasPorVendedorHandler:
     def __init__(self, repositorio=None, servicio_usuarios=None):
@@ -23,69 +27,36 @@ class ObtenerVisitasPorVendedorHandler:
         self.servicio_usuarios = servicio_usuarios or ServicioUsuarios()
     
     def handle(self, consulta: ObtenerVisitasPorVendedor) -> list[VisitaAgregacionDTO]:
+        if consulta.page is not None:
+            return self._handle_paginado(consulta)
+        
         try:
-            # 1. Obtener todas las visitas del repositorio
-            visitas = self.repositorio.obtener_todos()
+            # Filtros resueltos en la base de datos: una consulta por índice (vendedor_id, fecha_programada)
+            visitas_vendedor = self.repositorio.obtener_filtradas(
+                estado=consulta.estado,
+                vendedor_id=consulta.vendedor_id,
+                fecha_inicio=consulta.fecha_inicio,
+                fecha_fin=consulta.fecha_fin
+            )
             
-            # 2. Filtrar por vendedor_id
-            visitas_vendedor = [v for v in visitas if v.vendedor_id == consulta.vendedor_id]
+            return construir_agregaciones_visitas(visitas_vendedor, self.servicio_usuarios)
             
-            # 3. Aplicar filtro por estado si se especifica
-            if consulta.estado:
-                visitas_vendedor = [v for v in visitas_vendedor if v.estado == consulta.estado]
-            
-            # 4. Aplicar filtro por rango de fechas si se especifica
-            if consulta.fecha_inicio and consulta.fecha_fin:
-                # Si ambas fechas son iguales → filtrar solo ese día
-                if consulta.fecha_inicio.date() == consulta.fecha_fin.date():
-                    visitas_vendedor = [v for v in visitas_vendedor if v.fecha_programada.date() == consulta.fecha_inicio.date()]
-                else:
-                    # Si son diferentes → rango normal
-                    visitas_vendedor = [v for v in visitas_vendedor if consulta.fecha_inicio.date() <= v.fecha_programada.date() <= consulta.fecha_fin.date()]
-            
-            # 5. Construir agregaciones completas
-            agregaciones = []
-            for visita in visitas_vendedor:
-                try:
-                    # Obtener vendedor
-                    vendedor = self.servicio_usuarios.obtener_vendedor_por_id(visita.vendedor_id)
-                    if not vendedor:
-                        logger.warning(f"Vendedor {visita.vendedor_id} no encontrado para visita {visita.id}")
-                        continue
-                    
-                    # Obtener cliente
-                    cliente = self.servicio_usuarios.obtener_cliente_por_id(visita.cliente_id)
-                    if not cliente:
-                        logger.warning(f"Cliente {visita.cliente_id} no encontrado para visita {visita.id}")
-                        continue
-                    
-                    # Construir agregación completa
-                    agregacion = VisitaAgregacionDTO(
-                        id=visita.id,
-                        fecha_programada=visita.fecha_programada,
-                        direccion=visita.direccion,
-                        telefono=visita.telefono,
-                        estado=visita.estado,
-                        descripcion=visita.descripcion,
-                        vendedor_id=vendedor['id'],
-                        vendedor_nombre=vendedor['nombre'],
-                        vendedor_email=vendedor['email'],
-                        vendedor_telefono=vendedor['telefono'],
-                        vendedor_direccion=vendedor['direccion'],
-                        cliente_id=cliente['id'],
-                        cliente_nombre=cliente['nombre'],
-                        cliente_email=cliente['email'],
-                        cliente_telefono=cliente['telefono'],
-                        cliente_direccion=cliente['direccion']
-                    )
-                    
-                    agregaciones.append(agregacion)
-                    
-                except Exception as e:
-                    logger.warning(f"Error construyendo agregación para visita {visita.id}: {e}")
-                    continue
-            
-            return agregaciones
+        except Exception as e:
+            logger.error(f"Error obteniendo visitas por vendedor: {e}")
+            raise
+
+    def _handle_paginado(self, consulta: ObtenerVisitasPorVendedor) -> Pagina:
+        """Filtra y pagina en la base de datos; solo se agregan vendedor y cliente de las visitas de la página"""
+        try:
+            pagina = self.repositorio.obtener_pagina(
+                page=consulta.page,
+                page_size=consulta.page_size,
+                estado=consulta.estado,
+                vendedor_id=consulta.vendedor_id,
+                fecha_inicio=consulta.fecha_inicio,
+                fecha_fin=consulta.fecha_fin
+            )
+            return pagina.con_items(construir_agregaciones_visitas(pagina.items, self.servicio_usuarios))
             
         except Exception as e:
             logger.error(f"Error obteniendo visitas por vendedor: {e}")
@@ -0,0 +1,37 @@
+import logging
+
+from seedwork.dominio.eventos import ManejadorEvento
+from infraestructura.cache_usuarios import obtener_cache_usuarios
+
+logger = logging.getLogger(__name__)
+
+
+class ManejadorInvalidacionCacheUsuarios(ManejadorEvento):
+    """Invalida la caché de clientes y vendedores cuando Usuarios notifica un cambio."""
+
+    TIPO_POR_CAMPO = {
+        'cliente_id': 'cliente',
+        'vendedor_id': 'vendedor'
+    }
+
+    def __init__(self, cache=None):
+        self._cache = cache or obtener_cache_usuarios()
+
+    def manejar(self, evento):
+        for campo, tipo in self.TIPO_POR_CAMPO.items():
+            usuario_id = getattr(evento, campo, None)
+            if usuario_id:
+                self._cache.invalidar(tipo, str(usuario_id))
+                logger.info(f"Caché de {tipo} {usuario_id} invalidada por {evento.__class__.__name__}")
+
+
+from seedwork.dominio.eventos import despachador_eventos
+
+TIPOS_EVENTO_USUARIOS = (
+    'ClienteActualizado',
+    'VendedorActualizado'
+)
+
+manejador = ManejadorInvalidacionCacheUsuarios()
+for tipo_evento in TIPOS_EVENTO_USUARIOS:
+    despachador_eventos.registrar_manejador(tipo_evento, manejador)
@@ -27,11 +27,12 @@ class ServicioHistorialCliente:
             - frecuencia_compra: Frecuencia aproximada de compra
         """
         try:
-            # Obtener todos los pedidos del cliente
-            todos_los_pedidos = self.repositorio_pedidos.obtener_todos()
-            pedidos_cliente = [p for p in todos_los_pedidos if p.cliente_id == cliente_id]
+            # Solo se consultan las filas del cliente: conteo y fechas, últimos N pedidos y
+            # productos más comprados se resuelven en la base de datos
+            resumen = self.repositorio_pedidos.obtener_resumen_cliente(cliente_id)
+            total_pedidos = resumen['total_pedidos']
             
-            if not pedidos_cliente:
+            if not total_pedidos:
                 return {
                     'total_pedidos': 0,
                     'ultimos_pedidos': [],
@@ -39,15 +40,8 @@ class ServicioHistorialCliente:
                     'frecuencia_compra': 'Sin compras anteriores'
                 }
             
-            # Ordenar por fecha de creación (más recientes primero)
-            pedidos_ordenados = sorted(
-                pedidos_cliente,
-                key=lambda p: getattr(p, '_created_at_model', None) or getattr(p, 'created_at', None) or None,
-                reverse=True
-            )
-            
-            # Obtener últimos N pedidos
-            ultimos_pedidos = pedidos_ordenados[:limite]
+            # Obtener últimos N pedidos (más recientes primero)
+            ultimos_pedidos = self.repositorio_pedidos.obtener_ultimos_por_cliente(cliente_id, limite)
             
             # Procesar últimos pedidos para el resumen
             ultimos_pedidos_resumen = []
@@ -72,49 +66,17 @@ class ServicioHistorialCliente:
                     'items': items_resumen
                 })
             
-            # Calcular productos más comprados
-            productos_comprados = {}
-            for pedido in pedidos_cliente:
-                for item in pedido.items:
-                    producto_id = item.producto_id
-                    if producto_id not in productos_comprados:
-                        productos_comprados[producto_id] = {
-                            'producto_id': producto_id,
-                            'nombre': item.nombre_producto,
-                            'cantidad_total': 0,
-                            'veces_comprado': 0,
-                            'precio_promedio': 0.0
-                        }
-                    
-                    productos_comprados[producto_id]['cantidad_total'] += item.cantidad.valor
-                    productos_comprados[producto_id]['veces_comprado'] += 1
-                    # Calcular precio promedio
-                    precio_actual = productos_comprados[producto_id]['precio_promedio']
-                    veces = productos_comprados[producto_id]['veces_comprado']
-                    precio_nuevo = item.precio_unitario.valor
-                    productos_comprados[producto_id]['precio_promedio'] = (
-                        (precio_actual * (veces - 1) + precio_nuevo) / veces
-                    )
-            
-            # Ordenar productos por cantidad total (más comprados primero)
-            productos_mas_comprados = sorted(
-                productos_comprados.values(),
-                key=lambda x: x['cantidad_total'],
-                reverse=True
-            )[:10]  # Top 10 productos más comprados
+            # Top 10 productos más comprados (por cantidad total, sobre todos los pedidos del cliente)
+            productos_mas_comprados = self.repositorio_pedidos.obtener_productos_mas_comprados(cliente_id, limite=10)
             
             # Calcular frecuencia de compra
-            if len(pedidos_cliente) > 1:
-                fechas = [
-                    getattr(p, '_created_at_model', None)
-                    for p in pedidos_cliente
-                    if getattr(p, '_created_at_model', None) is not None
-                ]
-                if fechas:
-                    fechas_ordenadas = sorted(fechas)
-                    dias_entre = (fechas_ordenadas[-1] - fechas_ordenadas[0]).days
+            if total_pedidos > 1:
+                primera_compra = resumen['primera_compra']
+                ultima_compra = resumen['ultima_compra']
+                if primera_compra and ultima_compra:
+                    dias_entre = (ultima_compra - primera_compra).days
                     if dias_entre > 0:
-                        frecuencia = len(pedidos_cliente) / (dias_entre / 30)  # Pedidos por mes
+                        frecuencia = total_pedidos / (dias_entre / 30)  # Pedidos por mes
                         if frecuencia >= 4:
                             frecuencia_str = f"{frecuencia:.1f} pedidos por mes (frecuente)"
                         elif frecuencia >= 2:
@@ -129,7 +91,7 @@ class ServicioHistorialCliente:
                 frecuencia_str = "Cliente con una sola compra"
             
             return {
-                'total_pedidos': len(pedidos_cliente),
+                'total_pedidos': total_pedidos,
                 'ultimos_pedidos': ultimos_pedidos_resumen,
                 'productos_mas_comprados': productos_mas_comprados,
                 'frecuencia_compra': frecuencia_str
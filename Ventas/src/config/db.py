@@ -20,8 +20,16 @@ def init_db(app: Flask):
     
     # Crear tablas si no existen
     with app.app_context():
+        import infraestructura.modelos  # registra los modelos antes de crear las tablas
         db.create_all()
         
+        from config.migraciones import ejecutar_migraciones
+        ejecutar_migraciones(db)
+        
         # Ejecutar seed data
         from config.seed import seed_data
-        seed_data(app)
\ No newline at end of file
+        seed_data(app)
+        
+        # Backfill de los resúmenes de ventas la primera vez que existen las tablas
+        from infraestructura.repositorios import RepositorioResumenVentasSQLite
+        RepositorioResumenVentasSQLite().reconstruir_si_vacio()
\ No newline at end of file
@@ -0,0 +1,52 @@
+"""
+Migraciones de esquema para tablas existentes.
+
+`db.create_all()` solo crea tablas nuevas; los índices añadidos a tablas que ya existen
+en producción se aplican aquí. Cada paso es idempotente y se ejecuta en cada arranque
+después de `create_all`.
+"""
+import logging
+
+from sqlalchemy import inspect, text
+
+logger = logging.getLogger(__name__)
+
+# (nombre, tabla, columnas)
+INDICES_PEDIDOS = [
+    ('ix_items_pedido_pedido_id', 'items_pedido', ['pedido_id']),
+    ('ix_pedidos_cliente_id', 'pedidos', ['cliente_id']),
+    ('ix_pedidos_vendedor_id', 'pedidos', ['vendedor_id']),
+    ('ix_pedidos_estado', 'pedidos', ['estado']),
+    ('ix_pedidos_updated_at', 'pedidos', ['updated_at']),
+    ('ix_pedidos_created_at_id', 'pedidos', ['created_at', 'id']),
+    ('ix_pedidos_cliente_id_created_at', 'pedidos', ['cliente_id', 'created_at']),
+]
+
+INDICES_VISITAS = [
+    ('ix_visitas_vendedor_id_fecha_programada', 'visitas', ['vendedor_id', 'fecha_programada']),
+    ('ix_visitas_estado_fecha_programada', 'visitas', ['estado', 'fecha_programada']),
+]
+
+
+def ejecutar_migraciones(db):
+    """Aplica todas las migraciones pendientes sobre la base de datos configurada."""
+    crear_indices_pedidos(db)
+    crear_indices_visitas(db)
+
+
+def crear_indices_pedidos(db):
+    """Crea los índices de búsqueda de `pedidos` e `items_pedido` si aún no existen."""
+    _crear_indices(db, INDICES_PEDIDOS)
+
+
+def crear_indices_visitas(db):
+    """Crea los índices compuestos de `visitas` si aún no existen."""
+    _crear_indices(db, INDICES_VISITAS)
+
+
+def _crear_indices(db, indices):
+    tablas = set(inspect(db.engine).get_table_names())
+    with db.engine.begin() as conexion:
+        for nombre, tabla, columnas in indices:
+            if tabla in tablas:
+                conexion.execute(text(f"CREATE INDEX IF NOT EXISTS {nombre} ON {tabla} ({', '.join(columnas)})"))
@@ -3,7 +3,7 @@ from datetime import datetime, timedelta
 from typing import List
 from seedwork.dominio.entidades import Entidad, AgregacionRaiz
 from .objetos_valor import EstadoVisita, FechaProgramada, Direccion, Telefono, Descripcion, FechaRealizada, HoraRealizada, Novedades, PedidoGenerado, EstadoPedido, Cantidad, Precio
-from .eventos import VisitaCreada, PedidoCreado, PedidoConfirmado, PedidoEntregado, ItemAgregado, ItemQuitado
+from .eventos import VisitaCreada, PedidoCreado, PedidoConfirmado, PedidoEntregado, PedidoEstadoActualizado, ItemAgregado, ItemQuitado
 
 @dataclass
 class Visita(AgregacionRaiz):
@@ -179,6 +179,7 @@ class Pedido(AgregacionRaiz):
             })
         
         evento = PedidoConfirmado(
+            fecha_evento=datetime.utcnow(),
             pedido_id=self.id,
             vendedor_id=self.vendedor_id,
             cliente_id=self.cliente_id,
@@ -197,6 +198,7 @@ class Pedido(AgregacionRaiz):
             })
         
         evento = PedidoEntregado(
+            fecha_evento=datetime.utcnow(),
             pedido_id=self.id,
             vendedor_id=self.vendedor_id,
             cliente_id=self.cliente_id,
@@ -205,6 +207,15 @@ class Pedido(AgregacionRaiz):
         )
         return evento
 
+    def disparar_evento_estado_actualizado(self):
+        """Dispara el evento de cambio de estado del pedido"""
+        evento = PedidoEstadoActualizado(
+            pedido_id=self.id,
+            estado=self.estado.estado,
+            fecha_actualizacion=datetime.utcnow()
+        )
+        return evento
+
 @dataclass
 class EvidenciaVisita(AgregacionRaiz):
     visita_id: str = field(default="")
@@ -83,6 +83,19 @@ class PedidoEntregado(EventoDominio):
             'total': self.total
         }
 
+@dataclass
+class PedidoEstadoActualizado(EventoDominio):
+    pedido_id: uuid.UUID = None
+    estado: str = ""
+    fecha_actualizacion: datetime = None
+
+    def _get_datos_evento(self) -> dict:
+        return {
+            'pedido_id': str(self.pedido_id),
+            'estado': self.estado,
+            'fecha_actualizacion': self.fecha_actualizacion.isoformat() if self.fecha_actualizacion else None
+        }
+
 @dataclass
 class ItemAgregado(EventoDominio):
     pedido_id: uuid.UUID = None
@@ -126,4 +139,40 @@ class EvidenciaSubida(EventoDominio):
             'visita_id': self.visita_id,
             'vendedor_id': self.vendedor_id,
             'archivo_url': self.archivo_url
-        }
\ No newline at end of file
+        }
+
+@dataclass
+class ClienteActualizado(EventoDominio):
+    cliente_id: str = ""
+    nombre: str = ""
+    email: str = ""
+    telefono: str = ""
+    direccion: str = ""
+    estado: str = ""
+
+    def _get_datos_evento(self) -> dict:
+        return {
+            'cliente_id': self.cliente_id,
+            'nombre': self.nombre,
+            'email': self.email,
+            'telefono': self.telefono,
+            'direccion': self.direccion,
+            'estado': self.estado
+        }
+
+@dataclass
+class VendedorActualizado(EventoDominio):
+    vendedor_id: str = ""
+    nombre: str = ""
+    email: str = ""
+    telefono: str = ""
+    direccion: str = ""
+
+    def _get_datos_evento(self) -> dict:
+        return {
+            'vendedor_id': self.vendedor_id,
+            'nombre': self.nombre,
+            'email': self.email,
+            'telefono': self.telefono,
+            'direccion': self.direccion
+        }
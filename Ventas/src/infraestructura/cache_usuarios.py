@@ -0,0 +1,210 @@
+"""Caché de lecturas de clientes y vendedores del servicio de Usuarios
+
+Combina tres niveles, consultados en orden:
+1. Memoria del request en curso (``flask.g``): un mismo id se resuelve una sola
+   vez por request, incluidos los "no encontrado" y los fallos.
+2. Caché LRU en proceso con TTL, acotada en número de entradas.
+3. Backend compartido opcional (por ejemplo Redis) registrado con
+   ``configurar_backend_compartido``.
+
+Solo los resultados positivos se guardan más allá del request. Las entradas se
+invalidan con los eventos ClienteActualizado y VendedorActualizado que Usuarios
+publica en el topic ``usuarios-actualizados``; cada réplica tiene su propia
+suscripción y limpia su caché local y el backend compartido. El TTL
+(USUARIOS_CACHE_TTL_SEGUNDOS) acota la antigüedad si se pierde un evento.
+"""
+
+import os
+import time
+import logging
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+MAX_ENTRADAS_POR_DEFECTO = int(os.getenv('USUARIOS_CACHE_MAX_ENTRADAS', '1000'))
+TTL_SEGUNDOS_POR_DEFECTO = float(os.getenv('USUARIOS_CACHE_TTL_SEGUNDOS', '300'))
+
+_SIN_VALOR = object()
+
+
+class BackendCacheCompartido(ABC):
+    """Interfaz para un backend de caché compartido entre réplicas"""
+
+    @abstractmethod
+    def obtener(self, clave: str) -> Optional[dict]:
+        """Retorna el valor guardado o None si no existe"""
+        pass
+
+    @abstractmethod
+    def guardar(self, clave: str, valor: dict, ttl_segundos: float):
+        """Guarda un valor con expiración"""
+        pass
+
+    @abstractmethod
+    def invalidar(self, clave: str):
+        """Elimina un valor"""
+        pass
+
+
+class CacheLRUTTL:
+    """Caché LRU acotada con expiración por entrada, segura entre hilos"""
+
+    def __init__(self, max_entradas: int = MAX_ENTRADAS_POR_DEFECTO,
+                 ttl_segundos: float = TTL_SEGUNDOS_POR_DEFECTO,
+                 reloj: Callable[[], float] = time.monotonic):
+        self.max_entradas = max_entradas
+        self.ttl_segundos = ttl_segundos
+        self._reloj = reloj
+        self._entradas: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.expulsiones = 0
+
+    def obtener(self, clave: str) -> Any:
+        """Retorna el valor vigente o ``_SIN_VALOR``"""
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None:
+                self.fallos += 1
+                return _SIN_VALOR
+
+            valor, expira_en = entrada
+            if self._reloj() >= expira_en:
+                del self._entradas[clave]
+                self.fallos += 1
+                return _SIN_VALOR
+
+            self._entradas.move_to_end(clave)
+            self.aciertos += 1
+            return valor
+
+    def guardar(self, clave: str, valor: Any):
+        with self._lock:
+            self._entradas[clave] = (valor, self._reloj() + self.ttl_segundos)
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+                self.expulsiones += 1
+
+    def invalidar(self, clave: str):
+        with self._lock:
+            self._entradas.pop(clave, None)
+
+    def limpiar(self):
+        with self._lock:
+            self._entradas.clear()
+            self.aciertos = 0
+            self.fallos = 0
+            self.expulsiones = 0
+
+    def instantanea(self) -> dict:
+        with self._lock:
+            return {
+                'entradas': len(self._entradas),
+                'max_entradas': self.max_entradas,
+                'ttl_segundos': self.ttl_segundos,
+                'aciertos': self.aciertos,
+                'fallos': self.fallos,
+                'expulsiones': self.expulsiones
+            }
+
+
+def _memoria_request() -> Optional[dict]:
+    """Diccionario asociado al request en curso, o None fuera de un contexto de Flask"""
+    from flask import g, has_app_context
+    if not has_app_context():
+        return None
+    if not hasattr(g, '_cache_usuarios'):
+        g._cache_usuarios = {}
+    return g._cache_usuarios
+
+
+class CacheUsuarios:
+    """Caché de lectura para clientes y vendedores"""
+
+    def __init__(self, local: CacheLRUTTL = None, backend: BackendCacheCompartido = None):
+        self.local = local or CacheLRUTTL()
+        self.backend = backend
+
+    @staticmethod
+    def clave(tipo: str, usuario_id: str) -> str:
+        return f"{tipo}:{usuario_id}"
+
+    def obtener_o_cargar(self, tipo: str, usuario_id: str, cargar: Callable[[], Optional[dict]]) -> Optional[dict]:
+        """Resuelve un usuario desde la caché o invoca ``cargar`` una sola vez por request"""
+        clave = self.clave(tipo, usuario_id)
+        memoria = _memoria_request()
+        if memoria is not None and clave in memoria:
+            return memoria[clave]
+
+        valor = self.local.obtener(clave)
+        if valor is _SIN_VALOR:
+            valor = self._obtener_de_backend(clave)
+        if valor is _SIN_VALOR:
+            valor = cargar()
+            if valor is not None:
+                self.local.guardar(clave, valor)
+                self._guardar_en_backend(clave, valor)
+
+        if memoria is not None:
+            memoria[clave] = valor
+        return valor
+
+    def invalidar(self, tipo: str, usuario_id: str):
+        clave = self.clave(tipo, usuario_id)
+        self.local.invalidar(clave)
+        memoria = _memoria_request()
+        if memoria is not None:
+            memoria.pop(clave, None)
+        if self.backend is not None:
+            try:
+                self.backend.invalidar(clave)
+            except Exception as e:
+                logger.warning(f"Error invalidando {clave} en el backend de caché compartido: {e}")
+
+    def reiniciar(self):
+        self.local.limpiar()
+
+    def _obtener_de_backend(self, clave: str) -> Any:
+        if self.backend is None:
+            return _SIN_VALOR
+        try:
+            valor = self.backend.obtener(clave)
+        except Exception as e:
+            logger.warning(f"Error leyendo {clave} del backend de caché compartido: {e}")
+            return _SIN_VALOR
+        if valor is None:
+            return _SIN_VALOR
+        self.local.guardar(clave, valor)
+        return valor
+
+    def _guardar_en_backend(self, clave: str, valor: dict):
+        if self.backend is None:
+            return
+        try:
+            self.backend.guardar(clave, valor, self.local.ttl_segundos)
+        except Exception as e:
+            logger.warning(f"Error guardando {clave} en el backend de caché compartido: {e}")
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def obtener_cache_usuarios() -> CacheUsuarios:
+    """Retorna la caché de usuarios compartida del proceso"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = CacheUsuarios()
+    return _cache
+
+
+def configurar_backend_compartido(backend: Optional[BackendCacheCompartido]):
+    """Registra (o quita, con None) el backend compartido de la caché de usuarios"""
+    obtener_cache_usuarios().backend = backend
@@ -19,6 +19,12 @@ class PlanVisitaModel(db.Model):
 
 class VisitaModel(db.Model):
     __tablename__ = 'visitas'
+    __table_args__ = (
+        # Agenda de un vendedor por rango de fechas
+        db.Index('ix_visitas_vendedor_id_fecha_programada', 'vendedor_id', 'fecha_programada'),
+        # Listados por estado por rango de fechas
+        db.Index('ix_visitas_estado_fecha_programada', 'estado', 'fecha_programada'),
+    )
     
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     vendedor_id = db.Column(db.String(36), nullable=False)
@@ -57,14 +63,23 @@ class VisitaModel(db.Model):
 
 class PedidoModel(db.Model):
     __tablename__ = 'pedidos'
+    __table_args__ = (
+        # Orden estable de los listados y clave de la paginación por cursor
+        db.Index('ix_pedidos_created_at_id', 'created_at', 'id'),
+        # Historial de un cliente: sus últimos pedidos sin recorrer los de los demás
+        db.Index('ix_pedidos_cliente_id_created_at', 'cliente_id', 'created_at'),
+    )
     
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    vendedor_id = db.Column(db.String(36), nullable=True)  # Opcional: puede ser None para pedidos creados por clientes
-    cliente_id = db.Column(db.String(36), nullable=False)
-    estado = db.Column(db.String(20), nullable=False, default='borrador')
+    vendedor_id = db.Column(db.String(36), nullable=True, index=True)  # Opcional: puede ser None para pedidos creados por clientes
+    cliente_id = db.Column(db.String(36), nullable=False, index=True)
+    estado = db.Column(db.String(20), nullable=False, default='borrador', index=True)
     total = db.Column(db.Float, nullable=False, default=0.0)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+    
+    # Solo lectura: los items se escriben explícitamente desde el repositorio
+    items = db.relationship('ItemPedidoModel', viewonly=True, lazy='select')
     
     def to_dict(self):
         return {
@@ -81,7 +96,7 @@ class ItemPedidoModel(db.Model):
     __tablename__ = 'items_pedido'
     
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    pedido_id = db.Column(db.String(36), db.ForeignKey('pedidos.id'), nullable=False)
+    pedido_id = db.Column(db.String(36), db.ForeignKey('pedidos.id'), nullable=False, index=True)
     producto_id = db.Column(db.String(36), nullable=False)
     nombre_producto = db.Column(db.String(255), nullable=False)
     cantidad = db.Column(db.Integer, nullable=False)
@@ -148,4 +163,31 @@ class SugerenciaClienteModel(db.Model):
             'sugerencias_texto': self.sugerencias_texto,
             'modelo_usado': self.modelo_usado,
             'created_at': self.created_at.isoformat()
-        }
\ No newline at end of file
+        }
+class ResumenVentaClienteModel(db.Model):
+    """Ventas acumuladas por día, vendedor y cliente (pedidos confirmados, en tránsito o entregados)"""
+    __tablename__ = 'resumen_ventas_cliente'
+    __table_args__ = (
+        db.UniqueConstraint('dia', 'vendedor_id', 'cliente_id', name='uq_resumen_ventas_cliente'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    dia = db.Column(db.Date, nullable=False, index=True)
+    vendedor_id = db.Column(db.String(36), nullable=False, default='')  # '' para pedidos sin vendedor
+    cliente_id = db.Column(db.String(36), nullable=False)
+    cantidad_pedidos = db.Column(db.Integer, nullable=False, default=0)
+    monto_total = db.Column(db.Float, nullable=False, default=0.0)
+
+class ResumenVentaProductoModel(db.Model):
+    """Unidades vendidas por día, vendedor y producto"""
+    __tablename__ = 'resumen_ventas_producto'
+    __table_args__ = (
+        db.UniqueConstraint('dia', 'vendedor_id', 'producto_id', name='uq_resumen_ventas_producto'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    dia = db.Column(db.Date, nullable=False, index=True)
+    vendedor_id = db.Column(db.String(36), nullable=False, default='')
+    producto_id = db.Column(db.String(36), nullable=False)
+    nombre_producto = db.Column(db.String(255), nullable=False)
+    cantidad = db.Column(db.Integer, nullable=False, default=0)
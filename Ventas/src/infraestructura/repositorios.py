@@ -1,12 +1,20 @@
 from config.db import db
-from sqlalchemy.orm import joinedload
-from sqlalchemy import func, desc
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy import bindparam, func, desc, insert, text
 from sqlalchemy.sql import expression as sql_expr
-from infraestructura.modelos import VisitaModel, PedidoModel, ItemPedidoModel, EvidenciaVisitaModel, PlanVisitaModel, SugerenciaClienteModel
+from infraestructura.modelos import (
+    VisitaModel, PedidoModel, ItemPedidoModel, EvidenciaVisitaModel, PlanVisitaModel, SugerenciaClienteModel,
+    ResumenVentaClienteModel, ResumenVentaProductoModel
+)
 from aplicacion.dto import VisitaDTO, PedidoDTO, ItemPedidoDTO, EvidenciaVisitaDTO
 from dominio.entidades import Pedido, ItemPedido
 from dominio.objetos_valor import EstadoPedido, Cantidad, Precio
 import uuid
+import logging
+from datetime import datetime, timedelta
+from seedwork.presentacion.paginacion import Pagina, PaginaCursor, paginar_consulta, paginar_consulta_por_cursor
+
+logger = logging.getLogger(__name__)
 
 class RepositorioVisitaSQLite:
     def crear(self, visita_dto: VisitaDTO) -> VisitaDTO:
@@ -51,25 +59,63 @@ class RepositorioVisitaSQLite:
     def obtener_todos(self) -> list[VisitaDTO]:
         """Obtener todas las visitas"""
         visitas_model = VisitaModel.query.all()
-        visitas_dto = []
-        
-        for visita_model in visitas_model:
-            visitas_dto.append(VisitaDTO(
-                id=uuid.UUID(visita_model.id),
-                vendedor_id=visita_model.vendedor_id,
-                cliente_id=visita_model.cliente_id,
-                fecha_programada=visita_model.fecha_programada,
-                direccion=visita_model.direccion,
-                telefono=visita_model.telefono,
-                estado=visita_model.estado,
-                descripcion=visita_model.descripcion,
-                fecha_realizada=visita_model.fecha_realizada,
-                hora_realizada=visita_model.hora_realizada,
-                novedades=visita_model.novedades,
-                pedido_generado=visita_model.pedido_generado
-            ))
+        return [self._modelo_a_dto(visita_model) for visita_model in visitas_model]
+    
+    def obtener_pagina(self, page: int = 1, page_size: int = 100, estado: str = None, vendedor_id: str = None,
+                       fecha_inicio: datetime = None, fecha_fin: datetime = None) -> Pagina:
+        """
+        Obtener una página de visitas filtrando y paginando en la base de datos.
         
-        return visitas_dto
+        Las páginas siguen el mismo orden que `obtener_filtradas`, (fecha_programada, id),
+        que sirve el índice (vendedor_id, fecha_programada). El rango de fechas se aplica
+        por día y solo cuando se envían ambas fechas.
+        """
+        query = self._consulta_filtrada(estado, vendedor_id, fecha_inicio, fecha_fin)
+        query = query.order_by(VisitaModel.fecha_programada, VisitaModel.id)
+        pagina = paginar_consulta(query, page=page, page_size=page_size)
+        return pagina.con_items([self._modelo_a_dto(visita_model) for visita_model in pagina.items])
+    
+    def obtener_filtradas(self, estado: str = None, vendedor_id: str = None,
+                          fecha_inicio: datetime = None, fecha_fin: datetime = None) -> list[VisitaDTO]:
+        """
+        Obtener las visitas que cumplen los filtros, ordenadas por fecha programada.
+        
+        Los filtros se resuelven en una sola consulta apoyada en los índices
+        (vendedor_id, fecha_programada) y (estado, fecha_programada).
+        """
+        query = self._consulta_filtrada(estado, vendedor_id, fecha_inicio, fecha_fin)
+        query = query.order_by(VisitaModel.fecha_programada, VisitaModel.id)
+        return [self._modelo_a_dto(visita_model) for visita_model in query.all()]
+    
+    def _consulta_filtrada(self, estado: str = None, vendedor_id: str = None,
+                           fecha_inicio: datetime = None, fecha_fin: datetime = None):
+        """El rango de fechas se aplica por día y solo cuando se envían ambas fechas"""
+        query = VisitaModel.query
+        if estado:
+            query = query.filter(VisitaModel.estado == estado)
+        if vendedor_id:
+            query = query.filter(VisitaModel.vendedor_id == vendedor_id)
+        if fecha_inicio and fecha_fin:
+            desde = datetime.combine(fecha_inicio.date(), datetime.min.time())
+            hasta = datetime.combine(fecha_fin.date(), datetime.min.time()) + timedelta(days=1)
+            query = query.filter(VisitaModel.fecha_programada >= desde, VisitaModel.fecha_programada < hasta)
+        return query
+    
+    def _modelo_a_dto(self, visita_model: VisitaModel) -> VisitaDTO:
+        return VisitaDTO(
+            id=uuid.UUID(visita_model.id),
+            vendedor_id=visita_model.vendedor_id,
+            cliente_id=visita_model.cliente_id,
+            fecha_programada=visita_model.fecha_programada,
+            direccion=visita_model.direccion,
+            telefono=visita_model.telefono,
+            estado=visita_model.estado,
+            descripcion=visita_model.descripcion,
+            fecha_realizada=visita_model.fecha_realizada,
+            hora_realizada=visita_model.hora_realizada,
+            novedades=visita_model.novedades,
+            pedido_generado=visita_model.pedido_generado
+        )
     
     def actualizar(self, visita_dto: VisitaDTO) -> VisitaDTO:
         """Actualizar una visita existente"""
@@ -136,6 +182,10 @@ class RepositorioPedidoSQLite:
             )
             db.session.add(item_model)
         
+        # Pedidos creados ya confirmados (pedido completo) cuentan como venta desde el inicio
+        if RepositorioResumenVentasSQLite.es_venta(pedido_model.estado):
+            RepositorioResumenVentasSQLite().registrar_pedido(pedido_model, self._items_para_resumen(pedido.items), 1)
+        
         db.session.commit()
         return pedido
     
@@ -145,31 +195,229 @@ class RepositorioPedidoSQLite:
         logger = logging.getLogger(__name__)
         logger.info(f"Buscando pedido con ID: {pedido_id}")
         
-        pedido_model = db.session.get(PedidoModel, pedido_id)
+        pedido_model = db.session.get(PedidoModel, pedido_id, options=[selectinload(PedidoModel.items)])
         if not pedido_model:
             logger.warning(f"Pedido no encontrado: {pedido_id}")
-            # Listar todos los pedidos para debug
-            todos = PedidoModel.query.all()
-            logger.info(f"Pedidos en BD: {[p.id for p in todos]}")
             return None
         
         logger.info(f"Pedido encontrado: {pedido_id}")
         
-        # Obtener items del pedido
-        items_model = ItemPedidoModel.query.filter_by(pedido_id=pedido_id).all()
+        return self._modelo_a_entidad(pedido_model)
+    
+    def obtener_todos(self) -> list[Pedido]:
+        """Obtener todos los pedidos con sus items"""
+        import logging
+        logger = logging.getLogger(__name__)
+        logger.info("Obteniendo todos los pedidos")
         
-        # Crear entidades de dominio
-        items = []
-        for item_model in items_model:
-            item = ItemPedido(
-                id=uuid.UUID(item_model.id),
-                producto_id=item_model.producto_id,
-                nombre_producto=item_model.nombre_producto,
-                cantidad=Cantidad(item_model.cantidad),
-                precio_unitario=Precio(item_model.precio_unitario)
+        # Los items de todos los pedidos se cargan en una sola consulta adicional (IN)
+        pedidos_model = (
+            PedidoModel.query
+            .options(selectinload(PedidoModel.items))
+            .order_by(PedidoModel.created_at.desc())
+            .all()
+        )
+        pedidos = [self._modelo_a_entidad(pedido_model) for pedido_model in pedidos_model]
+        
+        logger.info(f"Encontrados {len(pedidos)} pedidos")
+        return pedidos
+    
+    def obtener_pagina(self, page: int = 1, page_size: int = 100, vendedor_id: str = None,
+                       cliente_id: str = None, estado: str = None) -> Pagina:
+        """Obtener una página de pedidos (más recientes primero) filtrando y paginando en la base de datos"""
+        query = self._consulta_filtrada(vendedor_id, cliente_id, estado)
+        query = query.order_by(PedidoModel.created_at.desc(), PedidoModel.id)
+        pagina = paginar_consulta(query, page=page, page_size=page_size)
+        return pagina.con_items([self._modelo_a_entidad(pedido_model) for pedido_model in pagina.items])
+    
+    def obtener_pagina_por_cursor(self, cursor: str = None, page_size: int = 100, vendedor_id: str = None,
+                                  cliente_id: str = None, estado: str = None) -> PaginaCursor:
+        """Obtener una página de pedidos (más recientes primero) navegando por cursor sobre (created_at, id)"""
+        query = self._consulta_filtrada(vendedor_id, cliente_id, estado)
+        pagina = paginar_consulta_por_cursor(
+            query, [PedidoModel.created_at, PedidoModel.id], cursor=cursor, page_size=page_size
+        )
+        return pagina.con_items([self._modelo_a_entidad(pedido_model) for pedido_model in pagina.items])
+    
+    def _consulta_filtrada(self, vendedor_id: str = None, cliente_id: str = None, estado: str = None):
+        query = PedidoModel.query.options(selectinload(PedidoModel.items))
+        if vendedor_id:
+            query = query.filter(PedidoModel.vendedor_id == vendedor_id)
+        if cliente_id:
+            query = query.filter(PedidoModel.cliente_id == cliente_id)
+        if estado:
+            query = query.filter(PedidoModel.estado == estado)
+        return query
+    
+    def obtener_ultimos_por_cliente(self, cliente_id: str, limite: int = 10) -> list[Pedido]:
+        """Obtener los últimos pedidos de un cliente (más recientes primero) con sus items"""
+        pedidos_model = (
+            PedidoModel.query
+            .options(selectinload(PedidoModel.items))
+            .filter(PedidoModel.cliente_id == cliente_id)
+            .order_by(PedidoModel.created_at.desc(), PedidoModel.id.desc())
+            .limit(limite)
+            .all()
+        )
+        return [self._modelo_a_entidad(pedido_model) for pedido_model in pedidos_model]
+    
+    def obtener_resumen_cliente(self, cliente_id: str) -> dict:
+        """Cantidad de pedidos del cliente y fechas de su primera y última compra, en una sola consulta"""
+        total, primera, ultima = (
+            db.session.query(func.count(PedidoModel.id), func.min(PedidoModel.created_at), func.max(PedidoModel.created_at))
+            .filter(PedidoModel.cliente_id == cliente_id)
+            .one()
+        )
+        return {'total_pedidos': total, 'primera_compra': primera, 'ultima_compra': ultima}
+    
+    def obtener_productos_mas_comprados(self, cliente_id: str, limite: int = 10) -> list[dict]:
+        """Productos más comprados por el cliente (por cantidad total), agregados en la base de datos"""
+        cantidad_total = func.sum(ItemPedidoModel.cantidad)
+        filas = (
+            db.session.query(
+                ItemPedidoModel.producto_id,
+                func.max(ItemPedidoModel.nombre_producto),
+                cantidad_total,
+                func.count(ItemPedidoModel.id),
+                func.avg(ItemPedidoModel.precio_unitario)
             )
-            items.append(item)
+            .join(PedidoModel, PedidoModel.id == ItemPedidoModel.pedido_id)
+            .filter(PedidoModel.cliente_id == cliente_id)
+            .group_by(ItemPedidoModel.producto_id)
+            .order_by(cantidad_total.desc(), ItemPedidoModel.producto_id)
+            .limit(limite)
+            .all()
+        )
+        return [
+            {
+                'producto_id': producto_id,
+                'nombre': nombre,
+                'cantidad_total': int(cantidad or 0),
+                'veces_comprado': veces,
+                'precio_promedio': float(precio_promedio or 0.0)
+            }
+            for producto_id, nombre, cantidad, veces, precio_promedio in filas
+        ]
+    
+    def obtener_estados_por_ids(self, pedido_ids: list[str]) -> dict[str, str]:
+        """Obtener el estado actual de varios pedidos en una sola consulta"""
+        if not pedido_ids:
+            return {}
+
+        filas = (
+            db.session.query(PedidoModel.id, PedidoModel.estado)
+            .filter(PedidoModel.id.in_(pedido_ids))
+            .all()
+        )
+        return {pedido_id: estado for pedido_id, estado in filas}
+
+    def actualizar(self, pedido: Pedido) -> Pedido:
+        """
+        Actualizar un pedido existente escribiendo solo lo que cambió.
+
+        Se compara contra el estado persistido que `obtener_por_id` dejó en la entidad: un cambio de
+        estado es un único UPDATE de `pedidos` (estado y updated_at) y de los items solo se insertan,
+        actualizan o eliminan las líneas que cambiaron. Sin cambios no se escribe nada.
+        """
+        pedido_id = str(pedido.id)
+        persistido = getattr(pedido, '_persistido', None)
+        if persistido is None:
+            pedido_model = db.session.get(PedidoModel, pedido_id, options=[selectinload(PedidoModel.items)])
+            if not pedido_model:
+                return None
+            persistido = self._estado_persistido(pedido_model)
+        
+        cambios = {
+            columna: valor
+            for columna, valor in (('estado', pedido.estado.estado), ('total', pedido.total.valor))
+            if persistido[columna] != valor
+        }
+        items = {
+            str(item.id): (item.producto_id, item.nombre_producto, item.cantidad.valor,
+                           item.precio_unitario.valor, item.calcular_subtotal())
+            for item in pedido.items
+        }
+        
+        try:
+            # Si el pedido entra o sale de los estados vendidos, o cambian el total o los items de un
+            # pedido vendido, se ajustan los resúmenes de ventas en la misma transacción: se resta el
+            # aporte anterior y se suma el nuevo
+            era_venta = RepositorioResumenVentasSQLite.es_venta(persistido['estado'])
+            es_venta = RepositorioResumenVentasSQLite.es_venta(pedido.estado.estado)
+            cambia_venta = era_venta and es_venta and ('total' in cambios or items != persistido['items'])
+            if era_venta != es_venta or cambia_venta:
+                pedido_model = db.session.get(PedidoModel, pedido_id)
+                if not pedido_model:
+                    return None
+                resumen_ventas = RepositorioResumenVentasSQLite()
+                if era_venta:
+                    resumen_ventas.registrar_pedido(
+                        pedido_model, [linea[:3] for linea in persistido['items'].values()], -1
+                    )
+                for columna, valor in cambios.items():
+                    setattr(pedido_model, columna, valor)
+                if es_venta:
+                    resumen_ventas.registrar_pedido(pedido_model, self._items_para_resumen(pedido.items), 1)
+            elif cambios:
+                tabla = PedidoModel.__table__
+                resultado = db.session.execute(
+                    tabla.update().where(tabla.c.id == pedido_id).values(updated_at=datetime.utcnow(), **cambios)
+                )
+                if resultado.rowcount == 0:
+                    db.session.rollback()
+                    return None
+            
+            self._sincronizar_items(pedido_id, persistido['items'], items)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
         
+        pedido._persistido = {'estado': pedido.estado.estado, 'total': pedido.total.valor, 'items': items}
+        return pedido
+    
+    def _sincronizar_items(self, pedido_id: str, anteriores: dict, actuales: dict) -> None:
+        """Inserta las líneas nuevas, actualiza las que cambiaron y elimina las que ya no están. No hace commit."""
+        tabla = ItemPedidoModel.__table__
+        columnas = ('producto_id', 'nombre_producto', 'cantidad', 'precio_unitario', 'subtotal')
+        ahora = datetime.utcnow()
+        
+        eliminados = [item_id for item_id in anteriores if item_id not in actuales]
+        nuevos = [item_id for item_id in actuales if item_id not in anteriores]
+        modificados = [item_id for item_id in actuales if item_id in anteriores and anteriores[item_id] != actuales[item_id]]
+        
+        if eliminados:
+            db.session.execute(tabla.delete().where(tabla.c.id.in_(eliminados)))
+        if nuevos:
+            db.session.execute(tabla.insert(), [
+                {'id': item_id, 'pedido_id': pedido_id, 'created_at': ahora, 'updated_at': ahora,
+                 **dict(zip(columnas, actuales[item_id]))}
+                for item_id in nuevos
+            ])
+        if modificados:
+            db.session.execute(
+                tabla.update()
+                .where(tabla.c.id == bindparam('b_id'))
+                .values(updated_at=ahora, **{columna: bindparam(f'b_{columna}') for columna in columnas}),
+                [
+                    {'b_id': item_id, **{f'b_{columna}': valor for columna, valor in zip(columnas, actuales[item_id])}}
+                    for item_id in modificados
+                ]
+            )
+    
+    def _estado_persistido(self, pedido_model: PedidoModel) -> dict:
+        """Estado guardado del pedido contra el que `actualizar` calcula qué cambió"""
+        return {
+            'estado': pedido_model.estado,
+            'total': pedido_model.total,
+            'items': {
+                item_model.id: (item_model.producto_id, item_model.nombre_producto, item_model.cantidad,
+                                item_model.precio_unitario, item_model.subtotal)
+                for item_model in pedido_model.items
+            }
+        }
+    
+    def _modelo_a_entidad(self, pedido_model: PedidoModel) -> Pedido:
         # Normalizar vendedor_id: convertir None a string vacío para la entidad de dominio
         vendedor_id_entidad = pedido_model.vendedor_id if pedido_model.vendedor_id else ""
         
@@ -177,96 +425,44 @@ class RepositorioPedidoSQLite:
             id=uuid.UUID(pedido_model.id),
             vendedor_id=vendedor_id_entidad,
             cliente_id=pedido_model.cliente_id,
-            items=items,
+            items=self._items_a_entidades(pedido_model.items),
             estado=EstadoPedido(pedido_model.estado),
             total=Precio(pedido_model.total)
         )
         # Propagar timestamp de creación del modelo hacia la entidad para respuestas
         pedido._created_at_model = pedido_model.created_at
-        
+        pedido._persistido = self._estado_persistido(pedido_model)
         return pedido
     
-    def obtener_todos(self) -> list[Pedido]:
-        """Obtener todos los pedidos con sus items"""
-        import logging
-        logger = logging.getLogger(__name__)
-        logger.info("Obteniendo todos los pedidos")
-        
-        pedidos_model = PedidoModel.query.order_by(PedidoModel.created_at.desc()).all()
-        pedidos = []
-        
-        for pedido_model in pedidos_model:
-            # Obtener items del pedido
-            items_model = ItemPedidoModel.query.filter_by(pedido_id=pedido_model.id).all()
-            
-            # Crear entidades de dominio para items
-            items = []
-            for item_model in items_model:
-                item = ItemPedido(
-                    id=uuid.UUID(item_model.id),
-                    producto_id=item_model.producto_id,
-                    nombre_producto=item_model.nombre_producto,
-                    cantidad=Cantidad(item_model.cantidad),
-                    precio_unitario=Precio(item_model.precio_unitario)
-                )
-                items.append(item)
-            
-            # Normalizar vendedor_id: convertir None a string vacío para la entidad de dominio
-            vendedor_id_entidad = pedido_model.vendedor_id if pedido_model.vendedor_id else ""
-            
-            # Crear entidad de dominio del pedido
-            pedido = Pedido(
-                id=uuid.UUID(pedido_model.id),
-                vendedor_id=vendedor_id_entidad,
-                cliente_id=pedido_model.cliente_id,
-                items=items,
-                estado=EstadoPedido(pedido_model.estado),
-                total=Precio(pedido_model.total)
+    def _items_a_entidades(self, items_model) -> list[ItemPedido]:
+        return [
+            ItemPedido(
+                id=uuid.UUID(item_model.id),
+                producto_id=item_model.producto_id,
+                nombre_producto=item_model.nombre_producto,
+                cantidad=Cantidad(item_model.cantidad),
+                precio_unitario=Precio(item_model.precio_unitario)
             )
-            # Propagar timestamp de creación
-            pedido._created_at_model = pedido_model.created_at
-            pedidos.append(pedido)
-        
-        logger.info(f"Encontrados {len(pedidos)} pedidos")
-        return pedidos
+            for item_model in items_model
+        ]
     
-    def actualizar(self, pedido: Pedido) -> Pedido:
-        """Actualizar un pedido existente"""
-        pedido_model = PedidoModel.query.get(str(pedido.id))
-        if not pedido_model:
-            return None
-        
-        # Actualizar datos del pedido
-        pedido_model.estado = pedido.estado.estado
-        pedido_model.total = pedido.total.valor
-        
-        # Eliminar items existentes
-        ItemPedidoModel.query.filter_by(pedido_id=str(pedido.id)).delete()
-        
-        # Crear nuevos items
-        for item in pedido.items:
-            item_model = ItemPedidoModel(
-                id=str(item.id),
-                pedido_id=str(pedido.id),
-                producto_id=item.producto_id,
-                nombre_producto=item.nombre_producto,
-                cantidad=item.cantidad.valor,
-                precio_unitario=item.precio_unitario.valor,
-                subtotal=item.calcular_subtotal()
-            )
-            db.session.add(item_model)
-        
-        db.session.commit()
-        return pedido
+    def _items_para_resumen(self, items) -> list:
+        return [(item.producto_id, item.nombre_producto, item.cantidad.valor) for item in items]
     
     def eliminar(self, pedido_id: str) -> bool:
         """Eliminar un pedido y sus items"""
         try:
+            pedido_model = PedidoModel.query.get(pedido_id)
+            if pedido_model and RepositorioResumenVentasSQLite.es_venta(pedido_model.estado):
+                items_model = ItemPedidoModel.query.filter_by(pedido_id=pedido_id).all()
+                RepositorioResumenVentasSQLite().registrar_pedido(
+                    pedido_model, [(i.producto_id, i.nombre_producto, i.cantidad) for i in items_model], -1
+                )
+            
             # Eliminar items primero
             ItemPedidoModel.query.filter_by(pedido_id=pedido_id).delete()
             
             # Eliminar pedido
-            pedido_model = PedidoModel.query.get(pedido_id)
             if pedido_model:
                 db.session.delete(pedido_model)
                 db.session.commit()
@@ -319,8 +515,8 @@ class RepositorioPedidoSQLite:
             except Exception as e:
                 logger.warning(f"⚠️ Formato inválido de fechas: {e}")
 
-        # Ejecutar consulta
-        pedidos_model = query.all()
+        # Ejecutar consulta (los items se cargan en una sola consulta adicional)
+        pedidos_model = query.options(selectinload(PedidoModel.items)).all()
 
         if not pedidos_model:
             logger.info("⚠️ No se encontraron pedidos (confirmados, en_transito o entregados) con los filtros aplicados")
@@ -329,17 +525,7 @@ class RepositorioPedidoSQLite:
         pedidos = []
 
         for pedido_model in pedidos_model:
-            # Obtener items asociados
-            items_model = ItemPedidoModel.query.filter_by(pedido_id=pedido_model.id).all()
-            items = []
-            for item_model in items_model:
-                items.append(ItemPedido(
-                    id=uuid.UUID(item_model.id),
-                    producto_id=item_model.producto_id,
-                    nombre_producto=item_model.nombre_producto,
-                    cantidad=Cantidad(item_model.cantidad),
-                    precio_unitario=Precio(item_model.precio_unitario)
-                ))
+            items = self._items_a_entidades(pedido_model.items)
 
             # Convertir total a float de forma segura
             try:
@@ -365,6 +551,245 @@ class RepositorioPedidoSQLite:
         logger.info(f"✅ Pedidos ENTREGADOS encontrados: {len(pedidos)}")
         return pedidos
 
+class RepositorioResumenVentasSQLite:
+    """Mantiene las tablas de resumen de ventas (por día, vendedor, cliente y producto).
+
+    Un pedido aporta a los resúmenes mientras está en un estado vendido. `registrar_pedido`
+    se ejecuta dentro de la transacción del repositorio de pedidos, de modo que el pedido y
+    sus resúmenes se confirman (o se revierten) juntos.
+    """
+
+    ESTADOS_VENDIDOS = ('confirmado', 'en_transito', 'entregado')
+
+    # Clave del advisory lock de PostgreSQL que serializa el backfill entre réplicas que arrancan a la vez
+    CLAVE_BLOQUEO_BACKFILL = 72100412
+
+    @classmethod
+    def es_venta(cls, estado: str) -> bool:
+        return estado in cls.ESTADOS_VENDIDOS
+
+    def registrar_pedido(self, pedido_model: PedidoModel, items: list, signo: int):
+        """Suma (signo=1) o resta (signo=-1) el aporte de un pedido. No hace commit.
+
+        Args:
+            items: Tuplas (producto_id, nombre_producto, cantidad)
+        """
+        fecha = pedido_model.created_at or pedido_model.updated_at or datetime.utcnow()
+        dia = fecha.date()
+        vendedor_id = pedido_model.vendedor_id or ''
+
+        self._acumular(
+            ResumenVentaClienteModel,
+            claves={'dia': dia, 'vendedor_id': vendedor_id, 'cliente_id': pedido_model.cliente_id},
+            incrementos={'cantidad_pedidos': signo, 'monto_total': signo * float(pedido_model.total or 0)}
+        )
+
+        cantidades = {}
+        for producto_id, nombre_producto, cantidad in items:
+            nombre_actual, cantidad_actual = cantidades.get(producto_id, (nombre_producto, 0))
+            cantidades[producto_id] = (nombre_actual, cantidad_actual + cantidad)
+
+        for producto_id, (nombre_producto, cantidad) in cantidades.items():
+            self._acumular(
+                ResumenVentaProductoModel,
+                claves={'dia': dia, 'vendedor_id': vendedor_id, 'producto_id': producto_id},
+                incrementos={'cantidad': signo * cantidad},
+                valores={'nombre_producto': nombre_producto}
+            )
+
+    def reconstruir(self) -> dict:
+        """Recalcula los resúmenes desde `pedidos` e `items_pedido` (backfill o corrección)"""
+        if self._es_postgresql():
+            # Bloquea a los escritores incrementales hasta el commit: un pedido confirmado antes del
+            # bloqueo ya está en `pedidos` y uno posterior suma su aporte sobre el resultado reconstruido
+            db.session.execute(text(
+                f"LOCK TABLE {ResumenVentaClienteModel.__tablename__}, {ResumenVentaProductoModel.__tablename__} "
+                "IN SHARE ROW EXCLUSIVE MODE"
+            ))
+
+        db.session.query(ResumenVentaClienteModel).delete(synchronize_session=False)
+        db.session.query(ResumenVentaProductoModel).delete(synchronize_session=False)
+
+        dia = func.date(func.coalesce(PedidoModel.created_at, PedidoModel.updated_at))
+        vendedor = func.coalesce(PedidoModel.vendedor_id, '')
+        vendidos = PedidoModel.estado.in_(self.ESTADOS_VENDIDOS)
+
+        por_cliente = db.session.query(
+            dia, vendedor, PedidoModel.cliente_id, func.count(PedidoModel.id), func.sum(PedidoModel.total)
+        ).filter(vendidos).group_by(dia, vendedor, PedidoModel.cliente_id)
+        db.session.execute(insert(ResumenVentaClienteModel).from_select(
+            ['dia', 'vendedor_id', 'cliente_id', 'cantidad_pedidos', 'monto_total'], por_cliente
+        ))
+
+        por_producto = db.session.query(
+            dia, vendedor, ItemPedidoModel.producto_id, func.max(ItemPedidoModel.nombre_producto), func.sum(ItemPedidoModel.cantidad)
+        ).join(PedidoModel, PedidoModel.id == ItemPedidoModel.pedido_id) \
+            .filter(vendidos).group_by(dia, vendedor, ItemPedidoModel.producto_id)
+        db.session.execute(insert(ResumenVentaProductoModel).from_select(
+            ['dia', 'vendedor_id', 'producto_id', 'nombre_producto', 'cantidad'], por_producto
+        ))
+
+        db.session.commit()
+        return {
+            'resumen_ventas_cliente': db.session.query(func.count(ResumenVentaClienteModel.id)).scalar(),
+            'resumen_ventas_producto': db.session.query(func.count(ResumenVentaProductoModel.id)).scalar()
+        }
+
+    def esta_vacio(self) -> bool:
+        return db.session.query(ResumenVentaClienteModel.id).first() is None
+
+    def reconstruir_si_vacio(self) -> bool:
+        """Backfill de arranque: reconstruye solo si no hay resúmenes, una réplica a la vez"""
+        if self._es_postgresql():
+            # Se libera con el commit (o rollback) de esta transacción
+            db.session.execute(text("SELECT pg_advisory_xact_lock(:clave)"), {'clave': self.CLAVE_BLOQUEO_BACKFILL})
+        try:
+            if not self.esta_vacio():
+                db.session.commit()
+                return False
+            self.reconstruir()
+            return True
+        except Exception:
+            db.session.rollback()
+            raise
+
+    def _es_postgresql(self) -> bool:
+        return db.session.get_bind().dialect.name == 'postgresql'
+
+    def _acumular(self, modelo, claves: dict, incrementos: dict, valores: dict = None):
+        """INSERT ... ON CONFLICT DO UPDATE: suma los incrementos de forma atómica"""
+        if self._es_postgresql():
+            from sqlalchemy.dialects.postgresql import insert as insert_dialecto
+        else:
+            from sqlalchemy.dialects.sqlite import insert as insert_dialecto
+
+        tabla = modelo.__table__
+        sentencia = insert_dialecto(tabla).values(**claves, **(valores or {}), **incrementos)
+        sentencia = sentencia.on_conflict_do_update(
+            index_elements=list(claves),
+            set_={columna: tabla.c[columna] + sentencia.excluded[columna] for columna in incrementos}
+        )
+        db.session.execute(sentencia)
+
+class RepositorioInformeVentasSQLite:
+    """Repositorio de lectura para los informes de ventas.
+
+    Lee las tablas de resumen que mantiene `RepositorioResumenVentasSQLite`: el costo depende
+    del número de días, vendedores, clientes y productos del rango, no del número de pedidos.
+    Los rangos de fecha se aplican sobre el día de creación del pedido.
+    """
+
+    LIMITE_PRODUCTOS_MAS_VENDIDOS = 10
+
+    def obtener_resumen(self, vendedor_id: str = None, fecha_inicio=None, fecha_fin=None) -> dict:
+        """Agregados del dashboard: totales, ventas por mes, por cliente y productos más vendidos"""
+        ventas = self._filtrar(
+            db.session.query(ResumenVentaClienteModel).filter(ResumenVentaClienteModel.cantidad_pedidos > 0),
+            ResumenVentaClienteModel, vendedor_id, fecha_inicio, fecha_fin
+        )
+
+        cantidad_pedidos, ventas_totales = ventas.with_entities(
+            func.coalesce(func.sum(ResumenVentaClienteModel.cantidad_pedidos), 0),
+            func.coalesce(func.sum(ResumenVentaClienteModel.monto_total), 0.0)
+        ).one()
+
+        if not cantidad_pedidos:
+            return {
+                'ventas_totales': 0,
+                'total_productos_vendidos': 0,
+                'ventas_por_mes': {},
+                'ventas_por_cliente': [],
+                'productos_mas_vendidos': []
+            }
+
+        mes = self._expresion_mes(ResumenVentaClienteModel.dia)
+        ventas_por_mes = ventas.with_entities(mes, func.sum(ResumenVentaClienteModel.monto_total)) \
+            .group_by(mes).order_by(mes).all()
+
+        monto_por_cliente = func.sum(ResumenVentaClienteModel.monto_total)
+        ventas_por_cliente = ventas.with_entities(
+            ResumenVentaClienteModel.cliente_id,
+            func.sum(ResumenVentaClienteModel.cantidad_pedidos),
+            monto_por_cliente
+        ).group_by(ResumenVentaClienteModel.cliente_id).order_by(desc(monto_por_cliente)).all()
+
+        productos = self._filtrar(
+            db.session.query(ResumenVentaProductoModel).filter(ResumenVentaProductoModel.cantidad > 0),
+            ResumenVentaProductoModel, vendedor_id, fecha_inicio, fecha_fin
+        )
+        total_productos_vendidos = productos.with_entities(
+            func.coalesce(func.sum(ResumenVentaProductoModel.cantidad), 0)
+        ).scalar()
+
+        cantidad_por_producto = func.sum(ResumenVentaProductoModel.cantidad)
+        productos_mas_vendidos = productos.with_entities(
+            ResumenVentaProductoModel.producto_id,
+            func.max(ResumenVentaProductoModel.nombre_producto),
+            cantidad_por_producto
+        ).group_by(ResumenVentaProductoModel.producto_id) \
+            .order_by(desc(cantidad_por_producto), ResumenVentaProductoModel.producto_id) \
+            .limit(self.LIMITE_PRODUCTOS_MAS_VENDIDOS).all()
+
+        return {
+            'ventas_totales': float(ventas_totales),
+            'total_productos_vendidos': int(total_productos_vendidos),
+            'ventas_por_mes': {clave: float(monto) for clave, monto in ventas_por_mes},
+            'ventas_por_cliente': [
+                {'cliente_id': cliente_id, 'cantidad_pedidos': int(cantidad), 'monto_total': float(monto)}
+                for cliente_id, cantidad, monto in ventas_por_cliente
+            ],
+            'productos_mas_vendidos': [
+                {'producto_id': producto_id, 'nombre': nombre, 'cantidad': int(cantidad)}
+                for producto_id, nombre, cantidad in productos_mas_vendidos
+            ]
+        }
+
+    def obtener_ventas_por_vendedor(self, fecha_inicio=None, fecha_fin=None) -> list[dict]:
+        """Pedidos, total vendido y clientes distintos por vendedor (omite pedidos sin vendedor)"""
+        total_ventas = func.sum(ResumenVentaClienteModel.monto_total)
+        ventas = self._filtrar(
+            db.session.query(
+                ResumenVentaClienteModel.vendedor_id,
+                func.sum(ResumenVentaClienteModel.cantidad_pedidos),
+                total_ventas,
+                func.count(func.distinct(ResumenVentaClienteModel.cliente_id))
+            ).filter(ResumenVentaClienteModel.cantidad_pedidos > 0, ResumenVentaClienteModel.vendedor_id != ''),
+            ResumenVentaClienteModel, None, fecha_inicio, fecha_fin
+        ).group_by(ResumenVentaClienteModel.vendedor_id).order_by(desc(total_ventas)).all()
+
+        return [
+            {
+                'vendedor_id': vendedor_id,
+                'numero_pedidos': int(numero_pedidos),
+                'total_ventas': float(total),
+                'clientes_atendidos': int(clientes)
+            }
+            for vendedor_id, numero_pedidos, total, clientes in ventas
+        ]
+
+    def _filtrar(self, query, modelo, vendedor_id, fecha_inicio, fecha_fin):
+        if vendedor_id:
+            query = query.filter(modelo.vendedor_id == vendedor_id)
+
+        if fecha_inicio or fecha_fin:
+            try:
+                inicio = datetime.fromisoformat(fecha_inicio).date() if fecha_inicio else None
+                fin = datetime.fromisoformat(fecha_fin).date() if fecha_fin else None
+                if inicio:
+                    query = query.filter(modelo.dia >= inicio)
+                if fin:
+                    query = query.filter(modelo.dia <= fin)
+            except Exception as e:
+                logger.warning(f"⚠️ Formato inválido de fechas: {e}")
+
+        return query
+
+    def _expresion_mes(self, columna):
+        """Clave 'YYYY-MM' calculada por el motor (date_trunc en PostgreSQL, strftime en SQLite)"""
+        if db.session.get_bind().dialect.name == 'postgresql':
+            return func.to_char(func.date_trunc('month', columna), 'YYYY-MM')
+        return func.strftime('%Y-%m', columna)
+
 class RepositorioSugerenciaCliente:
     def crear(self, sugerencia_dto) -> 'SugerenciaClienteDTO':
         """Crear una nueva sugerencia en SQLite"""
@@ -477,99 +902,60 @@ class RepositorioPlanes:
 
     def obtener_todos(self) -> list[dict]:
         """Obtener todos los planes incluyendo las visitas agrupadas por cliente"""
-        # Ordenar por la fecha de creación más reciente de sus visitas (fallback si no hay visitas)
-        subquery = (
-            db.session.query(VisitaModel.plan_id, func.max(VisitaModel.created_at).label('ultimo'))
-            .group_by(VisitaModel.plan_id)
-            .subquery()
-        )
-
-        # Ordenar con nulls last de forma portable
-        orden = sql_expr.nullslast(subquery.c.ultimo.desc())
-        planes = (
-            PlanVisitaModel.query
-            .options(joinedload(PlanVisitaModel.plan_visitas))
-            .outerjoin(subquery, subquery.c.plan_id == PlanVisitaModel.id)
-            .order_by(orden)
-            .all()
-        )
-        resultado = []
-
-        for plan in planes:
-            # Agrupar visitas por cliente con objetos de visita completos
-            visitas_por_cliente = {}
-            for visita in plan.plan_visitas:
-                if visita.cliente_id not in visitas_por_cliente:
-                    visitas_por_cliente[visita.cliente_id] = []
-                visitas_por_cliente[visita.cliente_id].append({
-                    "id": visita.id,
-                    "fecha_programada": visita.fecha_programada.isoformat(),
-                    "direccion": visita.direccion,
-                    "telefono": visita.telefono,
-                    "estado": visita.estado
-                })
-
-            visitas_clientes = [
-                {"id_cliente": cid, "visitas": visitas}
-                for cid, visitas in visitas_por_cliente.items()
-            ]
-
-            resultado.append({
-                "id": plan.id,
-                "nombre": plan.nombre,
-                "id_usuario": plan.id_usuario,
-                "fecha_inicio": plan.fecha_inicio.isoformat(),
-                "fecha_fin": plan.fecha_fin.isoformat(),
-                "visitas_clientes": visitas_clientes
-            })
-
-        return resultado
+        planes = self._consulta_planes().options(joinedload(PlanVisitaModel.plan_visitas)).all()
+        return [self._plan_a_dict(plan) for plan in planes]
 
     def obtener_por_usuario(self, user_id: str) -> list[dict]:
         """Obtener los planes de un usuario específico incluyendo las visitas agrupadas por cliente"""
+        planes = self._consulta_planes(user_id).options(joinedload(PlanVisitaModel.plan_visitas)).all()
+        return [self._plan_a_dict(plan) for plan in planes]
+
+    def obtener_pagina(self, page: int = 1, page_size: int = 100, user_id: str = None) -> Pagina:
+        """Obtener una página de planes (opcionalmente de un usuario) paginando en la base de datos"""
+        # Las visitas se cargan con un IN sobre los planes de la página, no con un JOIN que multiplique filas
+        query = self._consulta_planes(user_id).options(selectinload(PlanVisitaModel.plan_visitas))
+        pagina = paginar_consulta(query, page=page, page_size=page_size)
+        return pagina.con_items([self._plan_a_dict(plan) for plan in pagina.items])
+
+    def _consulta_planes(self, user_id: str = None):
+        # Ordenar por la fecha de creación más reciente de sus visitas (fallback si no hay visitas)
         subquery = (
             db.session.query(VisitaModel.plan_id, func.max(VisitaModel.created_at).label('ultimo'))
             .group_by(VisitaModel.plan_id)
             .subquery()
         )
 
+        # Ordenar con nulls last de forma portable; el id desempata para que la paginación sea estable
         orden = sql_expr.nullslast(subquery.c.ultimo.desc())
-        planes = (
-            PlanVisitaModel.query
-            .options(joinedload(PlanVisitaModel.plan_visitas))
-            .outerjoin(subquery, subquery.c.plan_id == PlanVisitaModel.id)
-            .filter(PlanVisitaModel.id_usuario == user_id)
-            .order_by(orden)
-            .all()
-        )
-        resultado = []
-
-        for plan in planes:
-            # Agrupar visitas por cliente con objetos de visita completos
-            visitas_por_cliente = {}
-            for visita in plan.plan_visitas:
-                if visita.cliente_id not in visitas_por_cliente:
-                    visitas_por_cliente[visita.cliente_id] = []
-                visitas_por_cliente[visita.cliente_id].append({
-                    "id": visita.id,
-                    "fecha_programada": visita.fecha_programada.isoformat(),
-                    "direccion": visita.direccion,
-                    "telefono": visita.telefono,
-                    "estado": visita.estado
-                })
-
-            visitas_clientes = [
-                {"id_cliente": cid, "visitas": visitas}
-                for cid, visitas in visitas_por_cliente.items()
-            ]
-
-            resultado.append({
-                "id": plan.id,
-                "nombre": plan.nombre,
-                "id_usuario": plan.id_usuario,
-                "fecha_inicio": plan.fecha_inicio.isoformat(),
-                "fecha_fin": plan.fecha_fin.isoformat(),
-                "visitas_clientes": visitas_clientes
+        query = PlanVisitaModel.query.outerjoin(subquery, subquery.c.plan_id == PlanVisitaModel.id)
+        if user_id is not None:
+            query = query.filter(PlanVisitaModel.id_usuario == user_id)
+        return query.order_by(orden, PlanVisitaModel.id)
+
+    def _plan_a_dict(self, plan: PlanVisitaModel) -> dict:
+        # Agrupar visitas por cliente con objetos de visita completos
+        visitas_por_cliente = {}
+        for visita in plan.plan_visitas:
+            if visita.cliente_id not in visitas_por_cliente:
+                visitas_por_cliente[visita.cliente_id] = []
+            visitas_por_cliente[visita.cliente_id].append({
+                "id": visita.id,
+                "fecha_programada": visita.fecha_programada.isoformat(),
+                "direccion": visita.direccion,
+                "telefono": visita.telefono,
+                "estado": visita.estado
             })
 
-        return resultado
\ No newline at end of file
+        visitas_clientes = [
+            {"id_cliente": cid, "visitas": visitas}
+            for cid, visitas in visitas_por_cliente.items()
+        ]
+
+        return {
+            "id": plan.id,
+            "nombre": plan.nombre,
+            "id_usuario": plan.id_usuario,
+            "fecha_inicio": plan.fecha_inicio.isoformat(),
+            "fecha_fin": plan.fecha_fin.isoformat(),
+            "visitas_clientes": visitas_clientes
+        }
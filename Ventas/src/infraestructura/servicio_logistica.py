@@ -1,12 +1,13 @@
-import requests
 import os
 import logging
+from seedwork.infraestructura.cliente_http import obtener_cliente_http
 
 logger = logging.getLogger(__name__)
 
 class ServicioLogistica:
     def __init__(self):
         self.base_url = os.getenv('LOGISTICA_SERVICE_URL', 'http://localhost:5003/logistica/api')
+        self._http = obtener_cliente_http()
     
     def buscar_productos(self, termino: str) -> list[dict]:
         """Buscar productos con inventario disponible"""
@@ -16,7 +17,7 @@ class ServicioLogistica:
                 'q': termino,
                 'limite': 50
             }
-            response = requests.get(url, params=params, timeout=5)
+            response = self._http.get(url, params=params)
             
             if response.status_code == 200:
                 return response.json()
@@ -33,7 +34,7 @@ class ServicioLogistica:
         try:
             url = f"{self.base_url}/inventario/producto/{producto_id}"
             logger.info(f"Consultando inventario en: {url}")
-            response = requests.get(url, timeout=5)
+            response = self._http.get(url)
             
             logger.info(f"Respuesta del servicio de Logística: {response.status_code}")
             
@@ -53,6 +54,26 @@ class ServicioLogistica:
             logger.error(f"Error consultando servicio de Logística para producto {producto_id}: {e}")
             return None
     
+    def obtener_inventarios_productos(self, producto_ids: list[str]) -> dict:
+        """Obtener el inventario de varios productos en una sola llamada como {producto_id: inventario}.
+
+        Los productos sin inventario no aparecen en el resultado. Retorna None si la consulta en lote
+        no está disponible, para que el llamador use la consulta individual.
+        """
+        try:
+            url = f"{self.base_url}/inventario/productos"
+            response = self._http.post(url, json={'producto_ids': list(producto_ids)})
+            
+            if response.status_code == 200:
+                return response.json().get('inventarios', {})
+            
+            logger.warning(f"Consulta de inventario en lote no disponible: {response.status_code}")
+            return None
+                
+        except Exception as e:
+            logger.error(f"Error consultando inventario en lote en Logística: {e}")
+            return None
+    
     def reservar_inventario(self, items: list[dict]) -> dict:
         """Reservar inventario para un pedido"""
         try:
@@ -60,7 +81,7 @@ class ServicioLogistica:
             data = {
                 'items': items
             }
-            response = requests.post(url, json=data, timeout=10)
+            response = self._http.post(url, json=data)
             
             if response.status_code == 200:
                 return response.json()
@@ -96,7 +117,7 @@ class ServicioLogistica:
             data = {'items': items}
             logger.info(f"Consumir reserva en Logística: {url} con data: {data}")
             
-            response = requests.post(url, json=data, timeout=10)
+            response = self._http.post(url, json=data)
             logger.info(f"Respuesta Logística (consumir_reserva): {response.status_code}")
             
             if response.status_code == 200:
@@ -1,6 +1,6 @@
-import requests
 import logging
 import os
+from seedwork.infraestructura.cliente_http import obtener_cliente_http
 
 logger = logging.getLogger(__name__)
 
@@ -8,11 +8,12 @@ class ServicioProductos:
     def __init__(self, base_url=None):
         # Usar variable de entorno o fallback a localhost
         self.base_url = base_url or os.getenv('PRODUCTOS_SERVICE_URL', 'http://localhost:5000/productos/api')
+        self._http = obtener_cliente_http()
     
     def obtener_producto_por_id(self, producto_id: str) -> dict:
         """Obtiene un producto específico por ID"""
         try:
-            response = requests.get(f"{self.base_url}/productos/{producto_id}")
+            response = self._http.get(f"{self.base_url}/productos/{producto_id}")
             if response.status_code == 200:
                 return response.json()
             elif response.status_code == 404:
@@ -25,6 +26,24 @@ class ServicioProductos:
             logger.error(f"Error obteniendo producto {producto_id}: {e}")
             return None
     
+    def obtener_productos_por_ids(self, producto_ids: list[str]) -> dict:
+        """Obtiene varios productos en una sola llamada como {producto_id: producto}.
+
+        Retorna None si la consulta en lote no está disponible, para que el llamador use la consulta individual.
+        """
+        try:
+            response = self._http.post(
+                f"{self.base_url}/productos/por-ids",
+                json={'producto_ids': list(producto_ids)}
+            )
+            if response.status_code == 200:
+                return response.json().get('productos', {})
+            logger.warning(f"Consulta de productos en lote no disponible: {response.status_code}")
+            return None
+        except Exception as e:
+            logger.error(f"Error obteniendo productos en lote: {e}")
+            return None
+    
     def validar_producto_existe(self, producto_id: str) -> bool:
         """Valida que un producto existe"""
         producto = self.obtener_producto_por_id(producto_id)
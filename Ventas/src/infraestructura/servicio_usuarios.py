@@ -1,18 +1,26 @@
-import requests
 import os
 import logging
+from seedwork.infraestructura.cliente_http import obtener_cliente_http
+from infraestructura.cache_usuarios import obtener_cache_usuarios
 
 logger = logging.getLogger(__name__)
 
+MAX_IDS_POR_CONSULTA = 500
+
 class ServicioUsuarios:
     def __init__(self):
         self.base_url = os.getenv('USUARIOS_SERVICE_URL', 'http://localhost:5001/usuarios/api')
+        self._http = obtener_cliente_http()
+        self._cache = obtener_cache_usuarios()
     
     def obtener_vendedor_por_id(self, vendedor_id: str) -> dict:
         """Obtener vendedor por ID desde el servicio de Usuarios"""
+        return self._cache.obtener_o_cargar('vendedor', vendedor_id, lambda: self._consultar_vendedor(vendedor_id))
+
+    def _consultar_vendedor(self, vendedor_id: str) -> dict:
         try:
             url = f"{self.base_url}/vendedores/{vendedor_id}"
-            response = requests.get(url, timeout=5)
+            response = self._http.get(url)
             
             if response.status_code == 200:
                 return response.json()
@@ -28,9 +36,12 @@ class ServicioUsuarios:
     
     def obtener_cliente_por_id(self, cliente_id: str) -> dict:
         """Obtener cliente por ID desde el servicio de Usuarios"""
+        return self._cache.obtener_o_cargar('cliente', cliente_id, lambda: self._consultar_cliente(cliente_id))
+
+    def _consultar_cliente(self, cliente_id: str) -> dict:
         try:
             url = f"{self.base_url}/clientes/{cliente_id}"
-            response = requests.get(url, timeout=5)
+            response = self._http.get(url)
             
             if response.status_code == 200:
                 return response.json()
@@ -48,7 +59,7 @@ class ServicioUsuarios:
         """Obtener todos los vendedores desde el servicio de Usuarios"""
         try:
             url = f"{self.base_url}/vendedores/"
-            response = requests.get(url, timeout=5)
+            response = self._http.get(url)
             
             if response.status_code == 200:
                 return response.json()
@@ -64,7 +75,7 @@ class ServicioUsuarios:
         """Obtener todos los clientes desde el servicio de Usuarios"""
         try:
             url = f"{self.base_url}/clientes/"
-            response = requests.get(url, timeout=5)
+            response = self._http.get(url)
             
             if response.status_code == 200:
                 return response.json()
@@ -75,3 +86,38 @@ class ServicioUsuarios:
         except Exception as e:
             logger.error(f"Error consultando servicio de usuarios para clientes: {e}")
             return []
+
+    def obtener_clientes_por_ids(self, cliente_ids: list[str], campos: list[str] = None) -> dict:
+        """Obtener varios clientes en una sola llamada: {cliente_id: datos}.
+
+        Retorna None si el endpoint en lote no está disponible, para que el llamador
+        recurra a `obtener_cliente_por_id`.
+        """
+        return self._obtener_por_ids('clientes', cliente_ids, campos)
+
+    def obtener_vendedores_por_ids(self, vendedor_ids: list[str], campos: list[str] = None) -> dict:
+        """Obtener varios vendedores en una sola llamada: {vendedor_id: datos}, o None si no está disponible"""
+        return self._obtener_por_ids('vendedores', vendedor_ids, campos)
+
+    def _obtener_por_ids(self, recurso: str, ids: list[str], campos: list[str] = None) -> dict:
+        ids = list(dict.fromkeys(str(i) for i in ids if i))
+        if not ids:
+            return {}
+
+        resultado = {}
+        try:
+            for inicio in range(0, len(ids), MAX_IDS_POR_CONSULTA):
+                cuerpo = {'ids': ids[inicio:inicio + MAX_IDS_POR_CONSULTA]}
+                if campos:
+                    cuerpo['campos'] = campos
+                response = self._http.post(f"{self.base_url}/{recurso}/bulk", json=cuerpo)
+
+                if response.status_code != 200:
+                    logger.warning(f"Consulta en lote de {recurso} no disponible: {response.status_code}")
+                    return None
+                resultado.update(response.json().get(recurso, {}))
+            return resultado
+
+        except Exception as e:
+            logger.error(f"Error consultando servicio de usuarios para {recurso} en lote: {e}")
+            return None
@@ -5,6 +5,7 @@ Punto de entrada principal para el microservicio de Ventas
 
 import os
 import sys
+import socket
 import logging
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -27,10 +28,24 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+def iniciar_consumidor_pubsub(app):
+    """Escucha los cambios de clientes y vendedores publicados por Usuarios"""
+    try:
+        from seedwork.infraestructura.consumidor_pubsub import ConsumidorPubSub
+
+        consumidor = ConsumidorPubSub(app=app)
+        # Una suscripción por réplica: cada una debe recibir todos los eventos para limpiar su caché en proceso
+        consumidor.suscribirse_a_topic('usuarios-actualizados', f"ventas-usuarios-actualizados-{socket.gethostname()}")
+        consumidor.iniciar_escucha()
+        logger.info("✅ Consumidor PubSub de usuarios-actualizados iniciado")
+    except Exception as e:
+        logger.error(f"❌ Error configurando consumidor PubSub: {e}")
+
 def main():
     """Función principal para ejecutar el microservicio"""
     try:
         app = create_app()
+        iniciar_consumidor_pubsub(app)
         
         port = int(os.getenv('PORT', 5002))
         host = os.getenv('HOST', '0.0.0.0')
@@ -69,16 +69,19 @@ class DespachadorEventos:
         """Registra un publicador de eventos"""
         self._publicadores.append(publicador)
     
-    def publicar_evento(self, evento: EventoDominio):
+    def publicar_evento(self, evento: EventoDominio, publicar_externamente: bool = True):
         """Publica un evento y lo distribuye a los manejadores"""
         print(f"📡 Despachador: Recibido evento {evento.__class__.__name__} con ID: {evento.id}")
         print(f"📋 Despachador: Datos del evento: {evento.to_dict()}")
         
-        # Publicar a sistemas externos
-        print(f"🔄 Despachador: Publicando a {len(self._publicadores)} publicadores externos")
-        for publicador in self._publicadores:
-            print(f"📤 Despachador: Enviando a publicador: {publicador.__class__.__name__}")
-            publicador.publicar(evento)
+        # Publicar a sistemas externos solo si se solicita
+        if publicar_externamente:
+            print(f"🔄 Despachador: Publicando a {len(self._publicadores)} publicadores externos")
+            for publicador in self._publicadores:
+                print(f"📤 Despachador: Enviando a publicador: {publicador.__class__.__name__}")
+                publicador.publicar(evento)
+        else:
+            print(f"⏭️ Despachador: Saltando publicación externa (evento de fuente externa)")
         
         # Distribuir a manejadores locales
         tipo_evento = evento.__class__.__name__
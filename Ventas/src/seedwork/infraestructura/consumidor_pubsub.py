@@ -11,7 +11,6 @@ from typing import Dict, Any
 from google.cloud import pubsub_v1
 from google.auth.exceptions import DefaultCredentialsError
 from seedwork.dominio.eventos import EventoDominio, despachador_eventos
-from seedwork.aplicacion.eventos import ejecutar_evento
 
 logger = logging.getLogger(__name__)
 
@@ -92,6 +91,40 @@ class ConsumidorPubSub:
             except Exception as e:
                 logger.warning(f"Error creando suscripción para {topic_name}: {e}")
     
+    def suscribirse_a_topic(self, topic_name: str, subscription_name: str):
+        """Crea (si no existe) una suscripción con nombre propio a un topic y la deja lista para escuchar"""
+        if not self._subscriber:
+            logger.error("Consumidor Pub/Sub no inicializado, no se puede suscribir.")
+            return
+
+        topic_path = self._subscriber.topic_path(self.project_id, topic_name)
+        subscription_path = self._subscriber.subscription_path(self.project_id, subscription_name)
+
+        # Validar que el topic existe
+        try:
+            publisher = pubsub_v1.PublisherClient()
+            publisher.create_topic(request={"name": topic_path})
+            logger.info(f"Topic '{topic_name}' creado exitosamente.")
+        except Exception as e:
+            if "already exists" in str(e).lower() or "409" in str(e):
+                logger.info(f"Topic '{topic_name}' ya existe.")
+            else:
+                logger.warning(f"Error creando topic '{topic_name}': {e}")
+
+        try:
+            # Intentar obtener la suscripción para ver si ya existe
+            self._subscriber.get_subscription(request={"subscription": subscription_path})
+            logger.info(f"Suscripción '{subscription_name}' al topic '{topic_name}' ya existe.")
+        except Exception:
+            # Si no existe, crearla
+            self._subscriber.create_subscription(
+                request={"name": subscription_path, "topic": topic_path}
+            )
+            logger.info(f"Suscripción '{subscription_name}' al topic '{topic_name}' creada.")
+
+        # Guardar referencia para poder iniciar escucha
+        self._subscriptions[topic_name] = subscription_path
+
     def _crear_suscripcion(self, topic_name: str):
         """Crea una suscripción para un topic específico"""
         if not self._subscriber:
@@ -156,12 +189,13 @@ class ConsumidorPubSub:
                         # Procesar el evento usando el sistema local con contexto de Flask
                         logger.info(f"🔄 Procesando evento {evento.__class__.__name__}")
                         
-                        # Usar el contexto de la aplicación Flask si está disponible
+                        # Usar el contexto de la aplicación Flask si está disponible; el evento viene
+                        # de otro servicio, así que solo se distribuye a los manejadores locales
                         if self.app:
                             with self.app.app_context():
-                                ejecutar_evento(evento)
+                                despachador_eventos.publicar_evento(evento, publicar_externamente=False)
                         else:
-                            ejecutar_evento(evento)
+                            despachador_eventos.publicar_evento(evento, publicar_externamente=False)
                         
                         logger.info(f"✅ Evento {evento.__class__.__name__} procesado exitosamente")
                     
@@ -212,6 +246,37 @@ class ConsumidorPubSub:
                 
                 return evento
             
+            elif tipo_evento == 'ClienteActualizado':
+                from dominio.eventos import ClienteActualizado
+                from datetime import datetime
+
+                datos_evento = data.get('datos', {})
+
+                return ClienteActualizado(
+                    fecha_evento=datetime.fromisoformat(data.get('fecha_evento')),
+                    cliente_id=datos_evento.get('cliente_id', ''),
+                    nombre=datos_evento.get('nombre', ''),
+                    email=datos_evento.get('email', ''),
+                    telefono=datos_evento.get('telefono', ''),
+                    direccion=datos_evento.get('direccion', ''),
+                    estado=datos_evento.get('estado', '')
+                )
+
+            elif tipo_evento == 'VendedorActualizado':
+                from dominio.eventos import VendedorActualizado
+                from datetime import datetime
+
+                datos_evento = data.get('datos', {})
+
+                return VendedorActualizado(
+                    fecha_evento=datetime.fromisoformat(data.get('fecha_evento')),
+                    vendedor_id=datos_evento.get('vendedor_id', ''),
+                    nombre=datos_evento.get('nombre', ''),
+                    email=datos_evento.get('email', ''),
+                    telefono=datos_evento.get('telefono', ''),
+                    direccion=datos_evento.get('direccion', '')
+                )
+
             else:
                 logger.warning(f"⚠️ Tipo de evento no reconocido: {tipo_evento}")
                 return None
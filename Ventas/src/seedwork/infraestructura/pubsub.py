@@ -122,7 +122,8 @@ class PublicadorPubSub(PublicadorEventos):
         topic_mapping = {
             'ProductoStockActualizado': 'productos-stock-actualizado',
             'PedidoCreado': 'pedidos-creados',
-            'PedidoConfirmado': 'pedidos-confirmados'
+            'PedidoConfirmado': 'pedidos-confirmados',
+            'PedidoEstadoActualizado': 'pedidos-estado-actualizado'
         }
         
         return topic_mapping.get(tipo_evento, 'productos-stock-actualizado')
@@ -137,7 +138,8 @@ class PublicadorPubSub(PublicadorEventos):
         topics = [
             'productos-stock-actualizado',
             'pedidos-creados',
-            'pedidos-confirmados'
+            'pedidos-confirmados',
+            'pedidos-estado-actualizado'
         ]
         
         print(f"📁 PubSub: Creando {len(topics)} topics...")
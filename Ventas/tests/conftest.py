@@ -44,6 +44,20 @@ SERVICE_URLS = {
     'logistica_service': f"{BASE_URLS['logistica']}{API_ROUTES['logistica']['inventario']}"
 }
 
+@pytest.fixture(autouse=True)
+def reiniciar_cliente_http():
+    """Evita que el estado de los circuit breakers del cliente HTTP compartido pase de un test a otro"""
+    from seedwork.infraestructura.cliente_http import obtener_cliente_http
+    obtener_cliente_http().reiniciar()
+    yield
+
+@pytest.fixture(autouse=True)
+def reiniciar_cache_usuarios():
+    """Evita que clientes y vendedores cacheados en un test respondan en otro"""
+    from infraestructura.cache_usuarios import obtener_cache_usuarios
+    obtener_cache_usuarios().reiniciar()
+    yield
+
 @pytest.fixture(scope='session')
 def app():
     os.environ['TESTING'] = 'True'
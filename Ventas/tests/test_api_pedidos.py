@@ -81,6 +81,35 @@ class TestAPIPedidos:
         assert 'pagination' in data
         assert isinstance(data['items'], list)
     
+    def test_obtener_pedidos_por_cursor(self):
+        """Test para recorrer los pedidos con el modo cursor"""
+        import uuid
+        from datetime import datetime, timedelta
+        from infraestructura.modelos import PedidoModel
+        ids = [str(uuid.uuid4()) for _ in range(3)]
+        with self.app.app_context():
+            for i, pedido_id in enumerate(ids):
+                db.session.add(PedidoModel(
+                    id=pedido_id, cliente_id='cliente-1', estado='borrador', total=0.0,
+                    created_at=datetime(2025, 11, 1) + timedelta(hours=i)
+                ))
+            db.session.commit()
+
+        primera = self.client.get('/ventas/api/pedidos/?cursor=&page_size=2').get_json()
+        segunda = self.client.get(f"/ventas/api/pedidos/?cursor={primera['pagination']['next_cursor']}&page_size=2").get_json()
+
+        assert [p['id'] for p in primera['items']] == [ids[2], ids[1]]
+        assert [p['id'] for p in segunda['items']] == [ids[0]]
+        assert segunda['pagination']['has_next'] is False
+        assert segunda['pagination']['has_prev'] is True
+
+    def test_obtener_pedidos_cursor_invalido(self):
+        """Test para validar error con un cursor inválido"""
+        response = self.client.get('/ventas/api/pedidos/?cursor=invalido')
+
+        assert response.status_code == 400
+        assert 'error' in response.get_json()
+    
     def test_obtener_pedidos_por_vendedor(self):
         """Test para obtener pedidos filtrados por vendedor"""
         vendedor_id = "550e8400-e29b-41d4-a716-446655440000"
@@ -150,7 +179,57 @@ class TestAPIPedidos:
         assert response.status_code == 200
         data = response.get_json()
         assert data['id'] == pedido_id
-    
+
+    @patch('aplicacion.comandos.crear_pedido.ServicioUsuarios')
+    def test_obtener_estados_pedidos(self, mock_servicio_usuarios_class):
+        """Test para obtener el estado de varios pedidos en una sola llamada"""
+        mock_servicio = MagicMock()
+        mock_servicio_usuarios_class.return_value = mock_servicio
+        mock_servicio.obtener_vendedor_por_id.return_value = {"id": "v1", "nombre": "Vendedor Test"}
+        mock_servicio.obtener_cliente_por_id.return_value = {"id": "c1", "nombre": "Cliente Test"}
+
+        pedido_ids = []
+        for _ in range(2):
+            create_response = self.client.post(
+                '/ventas/api/pedidos/',
+                data=json.dumps({
+                    "vendedor_id": "550e8400-e29b-41d4-a716-446655440000",
+                    "cliente_id": "550e8400-e29b-41d4-a716-446655440001"
+                }),
+                content_type='application/json'
+            )
+            pedido_ids.append(create_response.get_json()['pedido_id'])
+
+        response = self.client.post(
+            '/ventas/api/pedidos/estados',
+            data=json.dumps({"pedido_ids": pedido_ids + ['inexistente']}),
+            content_type='application/json'
+        )
+
+        assert response.status_code == 200
+        estados = response.get_json()['estados']
+        assert estados == {pedido_ids[0]: 'borrador', pedido_ids[1]: 'borrador'}
+
+    def test_obtener_estados_pedidos_sin_lista(self):
+        """Test para validar error cuando no se envía la lista de IDs"""
+        response = self.client.post(
+            '/ventas/api/pedidos/estados',
+            data=json.dumps({"pedido_ids": "no-es-lista"}),
+            content_type='application/json'
+        )
+
+        assert response.status_code == 400
+
+    def test_obtener_estados_pedidos_excede_limite(self):
+        """Test para validar el límite de IDs por llamada"""
+        response = self.client.post(
+            '/ventas/api/pedidos/estados',
+            data=json.dumps({"pedido_ids": [str(i) for i in range(501)]}),
+            content_type='application/json'
+        )
+
+        assert response.status_code == 400
+
     @patch('aplicacion.comandos.crear_pedido.ServicioUsuarios')
     def test_agregar_item_pedido(self, mock_servicio_usuarios_class):
         """Test para agregar un item a un pedido"""
@@ -0,0 +1,157 @@
+import pytest
+import sys
+import os
+import json
+from unittest.mock import Mock, patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from infraestructura.cache_usuarios import (
+    CacheLRUTTL, CacheUsuarios, BackendCacheCompartido, obtener_cache_usuarios
+)
+from infraestructura.servicio_usuarios import ServicioUsuarios
+from aplicacion.eventos.consumidor_usuarios_actualizados import ManejadorInvalidacionCacheUsuarios
+from dominio.eventos import ClienteActualizado, VendedorActualizado
+from seedwork.dominio.eventos import despachador_eventos
+from seedwork.infraestructura.consumidor_pubsub import ConsumidorPubSub
+
+
+def _respuesta(status_code, datos=None):
+    respuesta = Mock()
+    respuesta.status_code = status_code
+    respuesta.json.return_value = datos
+    return respuesta
+
+
+class BackendEnMemoria(BackendCacheCompartido):
+    def __init__(self):
+        self.valores = {}
+
+    def obtener(self, clave):
+        return self.valores.get(clave)
+
+    def guardar(self, clave, valor, ttl_segundos):
+        self.valores[clave] = valor
+
+    def invalidar(self, clave):
+        self.valores.pop(clave, None)
+
+
+class TestCacheLRUTTL:
+
+    def setup_method(self):
+        self.ahora = 0.0
+        self.cache = CacheLRUTTL(max_entradas=2, ttl_segundos=10, reloj=lambda: self.ahora)
+
+    def test_expulsa_la_entrada_menos_usada(self):
+        self.cache.guardar('a', 1)
+        self.cache.guardar('b', 2)
+        self.cache.obtener('a')
+        self.cache.guardar('c', 3)
+
+        assert self.cache.obtener('a') == 1
+        assert self.cache.obtener('c') == 3
+        assert self.cache.instantanea()['expulsiones'] == 1
+        assert self.cache.instantanea()['entradas'] == 2
+
+    def test_entrada_expira_despues_del_ttl(self):
+        self.cache.guardar('a', 1)
+        self.ahora = 10
+
+        assert self.cache.instantanea()['entradas'] == 1
+        self.cache.obtener('a')
+        assert self.cache.instantanea()['entradas'] == 0
+        assert self.cache.instantanea()['fallos'] == 1
+
+
+class TestCacheServicioUsuarios:
+
+    def setup_method(self):
+        self.servicio = ServicioUsuarios()
+
+    @patch('requests.Session.get')
+    def test_cliente_repetido_se_consulta_una_sola_vez(self, mock_get):
+        mock_get.return_value = _respuesta(200, {'id': 'cliente-1', 'nombre': 'Farmacia Uno'})
+
+        resultados = [self.servicio.obtener_cliente_por_id('cliente-1') for _ in range(50)]
+
+        assert all(r['nombre'] == 'Farmacia Uno' for r in resultados)
+        assert mock_get.call_count == 1
+
+    @patch('requests.Session.get')
+    def test_clientes_y_vendedores_no_comparten_claves(self, mock_get):
+        mock_get.side_effect = [_respuesta(200, {'id': 'x', 'tipo': 'cliente'}), _respuesta(200, {'id': 'x', 'tipo': 'vendedor'})]
+
+        assert self.servicio.obtener_cliente_por_id('x')['tipo'] == 'cliente'
+        assert self.servicio.obtener_vendedor_por_id('x')['tipo'] == 'vendedor'
+        assert mock_get.call_count == 2
+
+    @patch('requests.Session.get')
+    def test_no_encontrado_no_se_cachea_entre_requests(self, mock_get):
+        mock_get.side_effect = [_respuesta(404), _respuesta(200, {'id': 'cliente-1'})]
+
+        assert self.servicio.obtener_cliente_por_id('cliente-1') is None
+        assert self.servicio.obtener_cliente_por_id('cliente-1') == {'id': 'cliente-1'}
+
+    @patch('requests.Session.get')
+    def test_no_encontrado_se_resuelve_una_vez_por_request(self, mock_get, app):
+        mock_get.return_value = _respuesta(404)
+
+        with app.test_request_context():
+            for _ in range(20):
+                assert self.servicio.obtener_cliente_por_id('cliente-1') is None
+
+        assert mock_get.call_count == 1
+
+    @patch('requests.Session.get')
+    def test_backend_compartido_evita_la_consulta_http(self, mock_get):
+        backend = BackendEnMemoria()
+        backend.valores['cliente:cliente-1'] = {'id': 'cliente-1'}
+        self.servicio._cache = CacheUsuarios(local=CacheLRUTTL(), backend=backend)
+
+        assert self.servicio.obtener_cliente_por_id('cliente-1') == {'id': 'cliente-1'}
+        mock_get.assert_not_called()
+
+    @patch('requests.Session.get')
+    def test_evento_de_usuario_invalida_la_entrada(self, mock_get):
+        mock_get.side_effect = [_respuesta(200, {'id': 'cliente-1', 'estado': 'ACTIVO'}),
+                                _respuesta(200, {'id': 'cliente-1', 'estado': 'INACTIVO'})]
+        self.servicio.obtener_cliente_por_id('cliente-1')
+
+        ManejadorInvalidacionCacheUsuarios(obtener_cache_usuarios()).manejar(ClienteActualizado(cliente_id='cliente-1'))
+
+        assert self.servicio.obtener_cliente_por_id('cliente-1')['estado'] == 'INACTIVO'
+        assert mock_get.call_count == 2
+
+    def test_invalidacion_limpia_el_backend_compartido(self):
+        backend = BackendEnMemoria()
+        cache = CacheUsuarios(local=CacheLRUTTL(), backend=backend)
+        cache.obtener_o_cargar('vendedor', 'vendedor-1', lambda: {'id': 'vendedor-1'})
+
+        ManejadorInvalidacionCacheUsuarios(cache).manejar(VendedorActualizado(vendedor_id='vendedor-1'))
+
+        assert backend.valores == {}
+        assert cache.local.instantanea()['entradas'] == 0
+
+    def test_manejador_registrado_para_eventos_de_usuarios(self):
+        for tipo_evento in ('ClienteActualizado', 'VendedorActualizado'):
+            manejadores = despachador_eventos._manejadores.get(tipo_evento, [])
+            assert any(isinstance(m, ManejadorInvalidacionCacheUsuarios) for m in manejadores)
+
+    @patch('requests.Session.get')
+    @patch('seedwork.infraestructura.consumidor_pubsub.pubsub_v1.SubscriberClient')
+    def test_mensaje_pubsub_de_usuarios_invalida_la_entrada(self, mock_subscriber, mock_get, app):
+        mock_get.side_effect = [_respuesta(200, {'id': 'cliente-1', 'estado': 'ACTIVO'}),
+                                _respuesta(200, {'id': 'cliente-1', 'estado': 'INACTIVO'})]
+        self.servicio.obtener_cliente_por_id('cliente-1')
+        consumidor = ConsumidorPubSub(app=app)
+        consumidor._escuchar_suscripcion('ventas-usuarios-actualizados-sub', 'usuarios-actualizados')
+        callback = mock_subscriber.return_value.subscribe.call_args.kwargs['callback']
+        mensaje = Mock()
+        mensaje.data = json.dumps(ClienteActualizado(cliente_id='cliente-1', estado='INACTIVO').to_dict()).encode('utf-8')
+
+        callback(mensaje)
+
+        mensaje.ack.assert_called_once()
+        assert self.servicio.obtener_cliente_por_id('cliente-1')['estado'] == 'INACTIVO'
+        assert mock_get.call_count == 2
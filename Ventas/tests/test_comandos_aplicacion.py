@@ -11,6 +11,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 from aplicacion.comandos.crear_pedido import CrearPedido, CrearPedidoHandler
 from aplicacion.comandos.crear_visita import CrearVisita, CrearVisitaHandler
 from aplicacion.comandos.registrar_visita import RegistrarVisita, RegistrarVisitaHandler
+from aplicacion.comandos.cambiar_estado_pedido import CambiarEstadoPedido, CambiarEstadoPedidoHandler
 
 class TestCrearPedido:
     """Pruebas para el comando CrearPedido"""
@@ -126,3 +127,34 @@ class TestRegistrarVisita:
         assert comando.novedades == novedades
     
     
+
+
+class TestCambiarEstadoPedido:
+    """Pruebas para el comando CambiarEstadoPedido"""
+
+    @patch('aplicacion.comandos.cambiar_estado_pedido.despachador_eventos')
+    @patch('aplicacion.comandos.cambiar_estado_pedido.ServicioLogistica')
+    @patch('aplicacion.comandos.cambiar_estado_pedido.RepositorioPedidoSQLite')
+    def test_entrega_persiste_el_pedido_una_sola_vez(self, mock_repo_class, mock_logistica_class, mock_despachador):
+        """Test que marcar un pedido como entregado lo guarda con una sola llamada a actualizar"""
+        from dominio.entidades import Pedido, ItemPedido
+        from dominio.objetos_valor import EstadoPedido, Cantidad, Precio
+
+        pedido = Pedido(
+            cliente_id='cliente-1',
+            items=[ItemPedido(producto_id='prod-1', nombre_producto='Producto', cantidad=Cantidad(2), precio_unitario=Precio(5.0))],
+            estado=EstadoPedido('en_transito'),
+            total=Precio(10.0)
+        )
+        mock_repo_class.return_value.obtener_por_id.return_value = pedido
+        mock_repo_class.return_value.actualizar.side_effect = lambda p: p
+        mock_logistica_class.return_value.consumir_reserva.return_value = {'success': True}
+
+        resultado = CambiarEstadoPedidoHandler().handle(CambiarEstadoPedido(
+            pedido_id=str(pedido.id), nuevo_estado='entregado', usuario_id='u1', tipo_usuario='REPARTIDOR'
+        ))
+
+        assert resultado['success'] is True
+        assert resultado['estado_nuevo'] == 'entregado'
+        mock_repo_class.return_value.actualizar.assert_called_once_with(pedido)
+        mock_logistica_class.return_value.consumir_reserva.assert_called_once_with([{'producto_id': 'prod-1', 'cantidad': 2}])
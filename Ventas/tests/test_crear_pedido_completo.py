@@ -0,0 +1,108 @@
+import pytest
+from unittest.mock import Mock, patch
+
+# Configurar el path para importar los módulos
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from aplicacion.comandos.crear_pedido_completo import (
+    CrearPedidoCompleto, CrearPedidoCompletoHandler, ItemPedidoCompleto
+)
+
+
+def _inventario(producto_id, disponible):
+    return {'producto_id': producto_id, 'bodegas': [{'bodega_id': 'b1', 'total_disponible': disponible}]}
+
+
+class TestCrearPedidoCompleto:
+    """Pruebas para la validación en lote de CrearPedidoCompleto"""
+    
+    def setup_method(self):
+        """Configurar mocks para cada prueba"""
+        self.mock_repositorio = Mock()
+        self.mock_repositorio.crear.side_effect = lambda pedido: pedido
+        self.mock_servicio_productos = Mock()
+        self.mock_servicio_logistica = Mock()
+        self.mock_servicio_usuarios = Mock()
+        self.mock_servicio_usuarios.obtener_cliente_por_id.return_value = {'id': 'cliente-1'}
+        self.mock_servicio_usuarios.obtener_vendedor_por_id.return_value = {'id': 'vendedor-1'}
+        
+        self.handler = CrearPedidoCompletoHandler()
+        self.handler._repositorio = self.mock_repositorio
+        self.handler._servicio_productos = self.mock_servicio_productos
+        self.handler._servicio_logistica = self.mock_servicio_logistica
+        self.handler._servicio_usuarios = self.mock_servicio_usuarios
+        
+        self.comando = CrearPedidoCompleto(
+            vendedor_id='vendedor-1',
+            cliente_id='cliente-1',
+            items=[ItemPedidoCompleto(producto_id='prod-1', cantidad=2),
+                   ItemPedidoCompleto(producto_id='prod-2', cantidad=1)]
+        )
+    
+    @patch('aplicacion.comandos.crear_pedido_completo.despachador_eventos')
+    def test_usa_consultas_en_lote(self, mock_despachador):
+        """Test que productos e inventario se resuelven con una llamada en lote cada uno"""
+        self.mock_servicio_productos.obtener_productos_por_ids.return_value = {
+            'prod-1': {'id': 'prod-1', 'nombre': 'Paracetamol', 'precio': 10.0},
+            'prod-2': {'id': 'prod-2', 'nombre': 'Ibuprofeno', 'precio': 5.0}
+        }
+        self.mock_servicio_logistica.obtener_inventarios_productos.return_value = {
+            'prod-1': _inventario('prod-1', 10),
+            'prod-2': _inventario('prod-2', 10)
+        }
+        
+        resultado = self.handler.handle(self.comando)
+        
+        assert resultado['success'] == True
+        assert resultado['total'] == 25.0
+        self.mock_servicio_productos.obtener_productos_por_ids.assert_called_once_with(['prod-1', 'prod-2'])
+        self.mock_servicio_logistica.obtener_inventarios_productos.assert_called_once_with(['prod-1', 'prod-2'])
+        self.mock_servicio_productos.obtener_producto_por_id.assert_not_called()
+        self.mock_servicio_logistica.obtener_inventario_producto.assert_not_called()
+    
+    @patch('aplicacion.comandos.crear_pedido_completo.despachador_eventos')
+    def test_consulta_individual_si_no_hay_lote(self, mock_despachador):
+        """Test que se consulta producto por producto si el servicio no ofrece la consulta en lote"""
+        self.mock_servicio_productos.obtener_productos_por_ids.return_value = None
+        self.mock_servicio_logistica.obtener_inventarios_productos.return_value = None
+        self.mock_servicio_productos.obtener_producto_por_id.side_effect = (
+            lambda producto_id: {'id': producto_id, 'nombre': producto_id, 'precio': 10.0}
+        )
+        self.mock_servicio_logistica.obtener_inventario_producto.side_effect = (
+            lambda producto_id: _inventario(producto_id, 10)
+        )
+        
+        resultado = self.handler.handle(self.comando)
+        
+        assert resultado['success'] == True
+        assert self.mock_servicio_productos.obtener_producto_por_id.call_count == 2
+        assert self.mock_servicio_logistica.obtener_inventario_producto.call_count == 2
+    
+    def test_reporta_productos_con_problemas(self):
+        """Test que los productos inexistentes o sin stock se reportan con el resultado en lote"""
+        self.mock_servicio_productos.obtener_productos_por_ids.return_value = {
+            'prod-1': {'id': 'prod-1', 'nombre': 'Paracetamol', 'precio': 10.0}
+        }
+        self.mock_servicio_logistica.obtener_inventarios_productos.return_value = {
+            'prod-1': _inventario('prod-1', 1)
+        }
+        
+        resultado = self.handler.handle(self.comando)
+        
+        assert resultado['success'] == False
+        problemas = {item['producto_id']: item['problema'] for item in resultado['items_con_problemas']}
+        assert problemas == {'prod-1': 'stock_insuficiente', 'prod-2': 'no_existe'}
+        self.mock_repositorio.crear.assert_not_called()
+    
+    def test_cliente_inexistente(self):
+        """Test que un cliente inexistente impide crear el pedido"""
+        self.mock_servicio_usuarios.obtener_cliente_por_id.return_value = None
+        self.mock_servicio_productos.obtener_productos_por_ids.return_value = {}
+        self.mock_servicio_logistica.obtener_inventarios_productos.return_value = {}
+        
+        resultado = self.handler.handle(self.comando)
+        
+        assert resultado['success'] == False
+        assert 'Cliente cliente-1 no existe' in resultado['error']
@@ -302,7 +302,17 @@ class TestPedido:
         assert evento is not None
         assert evento.vendedor_id == vendedor_id
         assert evento.cliente_id == cliente_id
-    
+
+    def test_pedido_disparar_evento_estado_actualizado(self):
+        """Test que el evento de cambio de estado lleva el estado actual del pedido"""
+        pedido = Pedido(cliente_id=str(uuid.uuid4()), estado=EstadoPedido("en_transito"))
+
+        evento = pedido.disparar_evento_estado_actualizado()
+
+        assert evento.pedido_id == pedido.id
+        assert evento.estado == "en_transito"
+        assert evento.to_dict()['datos']['fecha_actualizacion'] is not None
+
     def test_pedido_agregar_item_nuevo(self):
         """Test agregar item nuevo al pedido"""
         pedido = Pedido()
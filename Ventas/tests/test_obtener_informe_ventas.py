@@ -0,0 +1,333 @@
+import pytest
+import sys
+import os
+from unittest.mock import Mock, patch
+from datetime import datetime
+from flask import Flask
+from sqlalchemy import event
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from aplicacion.consultas.obtener_informe_ventas import ObtenerInformeVentas, ObtenerInformeVentasHandler
+from config.db import db
+from infraestructura.modelos import PedidoModel, ItemPedidoModel, ResumenVentaClienteModel
+from infraestructura.repositorios import RepositorioInformeVentasSQLite, RepositorioResumenVentasSQLite, RepositorioPedidoSQLite
+from infraestructura.servicio_usuarios import ServicioUsuarios
+from dominio.entidades import Pedido, ItemPedido
+from dominio.objetos_valor import EstadoPedido, Cantidad, Precio
+import uuid
+
+
+def _crear_pedido(pedido_id, cliente_id, estado, items, created_at, vendedor_id='vendedor-1'):
+    total = sum(cantidad * precio for _, _, cantidad, precio in items)
+    db.session.add(PedidoModel(
+        id=pedido_id, vendedor_id=vendedor_id, cliente_id=cliente_id, estado=estado,
+        total=total, created_at=created_at, updated_at=created_at
+    ))
+    for i, (producto_id, nombre, cantidad, precio) in enumerate(items):
+        db.session.add(ItemPedidoModel(
+            id=f"{pedido_id}-item-{i}", pedido_id=pedido_id, producto_id=producto_id,
+            nombre_producto=nombre, cantidad=cantidad, precio_unitario=precio, subtotal=cantidad * precio
+        ))
+
+
+class TestRepositorioInformeVentas:
+    """Tests del repositorio de lectura del dashboard de ventas"""
+
+    def setup_method(self):
+        self.app = Flask(__name__)
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+        self.app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        db.init_app(self.app)
+
+        with self.app.app_context():
+            db.create_all()
+            _crear_pedido('p1', 'cliente-1', 'confirmado', [('prod-a', 'Acetaminofén', 10, 1.0), ('prod-b', 'Ibuprofeno', 2, 5.0)], datetime(2025, 1, 15))
+            _crear_pedido('p2', 'cliente-1', 'entregado', [('prod-a', 'Acetaminofén', 5, 1.0)], datetime(2025, 2, 3))
+            _crear_pedido('p3', 'cliente-2', 'en_transito', [('prod-b', 'Ibuprofeno', 1, 5.0)], datetime(2025, 2, 20), vendedor_id='vendedor-2')
+            _crear_pedido('p4', 'cliente-3', 'borrador', [('prod-c', 'Omeprazol', 100, 2.0)], datetime(2025, 2, 21))
+            db.session.commit()
+            RepositorioResumenVentasSQLite().reconstruir()
+
+        self.repositorio = RepositorioInformeVentasSQLite()
+
+    def teardown_method(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def test_resumen_agrega_en_base_de_datos(self):
+        with self.app.app_context():
+            resumen = self.repositorio.obtener_resumen()
+
+        assert resumen['ventas_totales'] == 30.0
+        assert resumen['total_productos_vendidos'] == 18
+        assert resumen['ventas_por_mes'] == {'2025-01': 20.0, '2025-02': 10.0}
+        assert resumen['ventas_por_cliente'] == [
+            {'cliente_id': 'cliente-1', 'cantidad_pedidos': 2, 'monto_total': 25.0},
+            {'cliente_id': 'cliente-2', 'cantidad_pedidos': 1, 'monto_total': 5.0}
+        ]
+        assert resumen['productos_mas_vendidos'] == [
+            {'producto_id': 'prod-a', 'nombre': 'Acetaminofén', 'cantidad': 15},
+            {'producto_id': 'prod-b', 'nombre': 'Ibuprofeno', 'cantidad': 3}
+        ]
+
+    def test_resumen_filtra_por_vendedor_y_fechas(self):
+        with self.app.app_context():
+            por_vendedor = self.repositorio.obtener_resumen(vendedor_id='vendedor-2')
+            por_fecha = self.repositorio.obtener_resumen(fecha_inicio='2025-02-01', fecha_fin='2025-02-10')
+
+        assert por_vendedor['ventas_totales'] == 5.0
+        assert [v['cliente_id'] for v in por_vendedor['ventas_por_cliente']] == ['cliente-2']
+        assert por_fecha['ventas_totales'] == 5.0
+        assert por_fecha['ventas_por_mes'] == {'2025-02': 5.0}
+
+    def test_resumen_vacio(self):
+        with self.app.app_context():
+            resumen = self.repositorio.obtener_resumen(vendedor_id='sin-ventas')
+
+        assert resumen['ventas_totales'] == 0
+        assert resumen['ventas_por_cliente'] == []
+
+    def test_numero_de_consultas_no_depende_del_numero_de_pedidos(self):
+        with self.app.app_context():
+            consultas = []
+            motor = db.engine
+
+            def contar(*args):
+                consultas.append(1)
+
+            event.listen(motor, 'before_cursor_execute', contar)
+            try:
+                self.repositorio.obtener_resumen()
+                consultas_pocos = len(consultas)
+
+                for i in range(50):
+                    _crear_pedido(f'extra-{i}', 'cliente-1', 'confirmado', [('prod-a', 'Acetaminofén', 1, 1.0)], datetime(2025, 1, 15))
+                db.session.commit()
+                RepositorioResumenVentasSQLite().reconstruir()
+
+                consultas.clear()
+                self.repositorio.obtener_resumen()
+                consultas_muchos = len(consultas)
+            finally:
+                event.remove(motor, 'before_cursor_execute', contar)
+
+        assert consultas_muchos == consultas_pocos <= 5
+
+    def test_ventas_por_vendedor(self):
+        with self.app.app_context():
+            _crear_pedido('p5', 'cliente-9', 'entregado', [('prod-a', 'Acetaminofén', 1, 1.0)], datetime(2025, 2, 1), vendedor_id=None)
+            db.session.commit()
+            RepositorioResumenVentasSQLite().reconstruir()
+
+            resultado = self.repositorio.obtener_ventas_por_vendedor()
+
+        assert resultado == [
+            {'vendedor_id': 'vendedor-1', 'numero_pedidos': 2, 'total_ventas': 25.0, 'clientes_atendidos': 1},
+            {'vendedor_id': 'vendedor-2', 'numero_pedidos': 1, 'total_ventas': 5.0, 'clientes_atendidos': 1}
+        ]
+
+
+class TestResumenVentasIncremental:
+    """Los resúmenes se mantienen al crear, confirmar, cambiar de estado o eliminar pedidos"""
+
+    def setup_method(self):
+        self.app = Flask(__name__)
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+        self.app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        db.init_app(self.app)
+        with self.app.app_context():
+            db.create_all()
+        self.repositorio_pedidos = RepositorioPedidoSQLite()
+        self.informes = RepositorioInformeVentasSQLite()
+
+    def teardown_method(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def _pedido(self, cliente_id='cliente-1', cantidad=3):
+        pedido = Pedido(id=uuid.uuid4(), vendedor_id='vendedor-1', cliente_id=cliente_id)
+        pedido.agregar_item(ItemPedido(
+            id=uuid.uuid4(), producto_id='prod-a', nombre_producto='Acetaminofén',
+            cantidad=Cantidad(cantidad), precio_unitario=Precio(2.0)
+        ))
+        return pedido
+
+    def test_confirmar_y_cambiar_estado_actualizan_resumenes(self):
+        with self.app.app_context():
+            pedido = self._pedido()
+            self.repositorio_pedidos.crear(pedido)
+            assert self.informes.obtener_resumen()['ventas_totales'] == 0
+
+            pedido.confirmar()
+            self.repositorio_pedidos.actualizar(pedido)
+            resumen = self.informes.obtener_resumen()
+            assert resumen['ventas_totales'] == 6.0
+            assert resumen['total_productos_vendidos'] == 3
+
+            pedido.marcar_en_transito()
+            self.repositorio_pedidos.actualizar(pedido)
+            assert self.informes.obtener_resumen()['ventas_por_cliente'] == [
+                {'cliente_id': 'cliente-1', 'cantidad_pedidos': 1, 'monto_total': 6.0}
+            ]
+
+    def test_cambios_en_pedido_vendido_ajustan_resumenes(self):
+        with self.app.app_context():
+            pedido = self._pedido()
+            pedido.confirmar()
+            self.repositorio_pedidos.crear(pedido)
+
+            pedido.items[0].actualizar_cantidad(5)
+            pedido.calcular_total()
+            self.repositorio_pedidos.actualizar(pedido)
+
+            resumen = self.informes.obtener_resumen()
+            assert resumen['ventas_totales'] == 10.0
+            assert resumen['total_productos_vendidos'] == 5
+            assert resumen['ventas_por_cliente'] == [
+                {'cliente_id': 'cliente-1', 'cantidad_pedidos': 1, 'monto_total': 10.0}
+            ]
+
+    def test_pedido_creado_confirmado_y_eliminado(self):
+        with self.app.app_context():
+            pedido = self._pedido(cantidad=2)
+            pedido.confirmar()
+            self.repositorio_pedidos.crear(pedido)
+            assert self.informes.obtener_resumen()['total_productos_vendidos'] == 2
+
+            self.repositorio_pedidos.eliminar(str(pedido.id))
+            resumen = self.informes.obtener_resumen()
+            assert resumen['ventas_totales'] == 0
+            assert resumen['ventas_por_cliente'] == []
+
+    def test_reconstruir_coincide_con_el_mantenimiento_incremental(self):
+        with self.app.app_context():
+            for cliente_id in ('cliente-1', 'cliente-2', 'cliente-1'):
+                pedido = self._pedido(cliente_id=cliente_id)
+                self.repositorio_pedidos.crear(pedido)
+                pedido.confirmar()
+                self.repositorio_pedidos.actualizar(pedido)
+            incremental = self.informes.obtener_resumen()
+
+            filas = RepositorioResumenVentasSQLite().reconstruir()
+
+            assert self.informes.obtener_resumen() == incremental
+            assert filas == {'resumen_ventas_cliente': 2, 'resumen_ventas_producto': 1}
+
+    def test_reconstruir_si_vacio_solo_rellena_tablas_vacias(self):
+        with self.app.app_context():
+            pedido = self._pedido()
+            pedido.confirmar()
+            self.repositorio_pedidos.crear(pedido)
+            resumen_ventas = RepositorioResumenVentasSQLite()
+            db.session.query(ResumenVentaClienteModel).delete()
+            db.session.commit()
+
+            assert resumen_ventas.reconstruir_si_vacio() is True
+            assert resumen_ventas.reconstruir_si_vacio() is False
+            assert self.informes.obtener_resumen()['ventas_totales'] == 6.0
+
+    def test_backfill_en_postgresql_toma_los_bloqueos_antes_de_leer(self):
+        with self.app.app_context():
+            resumen_ventas = RepositorioResumenVentasSQLite()
+            ejecutar = db.session.execute
+            bloqueos = []
+
+            def registrar(sentencia, *args, **kwargs):
+                sql = str(sentencia)
+                if sql.startswith(('SELECT pg_advisory', 'LOCK TABLE')):
+                    bloqueos.append(sql.split(' IN ')[0])
+                    return None
+                return ejecutar(sentencia, *args, **kwargs)
+
+            with patch.object(RepositorioResumenVentasSQLite, '_es_postgresql', return_value=True), \
+                    patch.object(db.session, 'execute', side_effect=registrar):
+                resumen_ventas.reconstruir_si_vacio()
+
+        assert bloqueos == [
+            'SELECT pg_advisory_xact_lock(:clave)',
+            'LOCK TABLE resumen_ventas_cliente, resumen_ventas_producto'
+        ]
+
+
+class TestObtenerInformeVentasHandler:
+    """Tests del handler del dashboard de ventas"""
+
+    def setup_method(self):
+        self.handler = ObtenerInformeVentasHandler()
+        self.handler._repositorio = Mock()
+        self.handler._servicio_usuarios = Mock()
+        self.handler._repositorio.obtener_resumen.return_value = {
+            'ventas_totales': 25.0,
+            'total_productos_vendidos': 15,
+            'ventas_por_mes': {'2025-01': 25.0},
+            'ventas_por_cliente': [
+                {'cliente_id': 'cliente-1', 'cantidad_pedidos': 2, 'monto_total': 20.0},
+                {'cliente_id': 'cliente-2', 'cantidad_pedidos': 1, 'monto_total': 5.0}
+            ],
+            'productos_mas_vendidos': [{'producto_id': 'prod-a', 'nombre': 'Acetaminofén', 'cantidad': 15}]
+        }
+
+    def test_resuelve_nombres_de_clientes_en_lote(self):
+        self.handler._servicio_usuarios.obtener_clientes_por_ids.return_value = {
+            'cliente-1': {'id': 'cliente-1', 'nombre': 'Farmacia Uno'}
+        }
+
+        resultado = self.handler.handle(ObtenerInformeVentas(vendedor_id='vendedor-1'))
+
+        self.handler._repositorio.obtener_resumen.assert_called_once_with(fecha_inicio=None, fecha_fin=None, vendedor_id='vendedor-1')
+        self.handler._servicio_usuarios.obtener_clientes_por_ids.assert_called_once_with(['cliente-1', 'cliente-2'], campos=['nombre'])
+        self.handler._servicio_usuarios.obtener_cliente_por_id.assert_not_called()
+        assert [c['nombre'] for c in resultado['ventas_por_cliente']] == ['Farmacia Uno', 'Cliente desconocido']
+        assert resultado['ventas_totales'] == 25.0
+        assert resultado['productos_mas_vendidos'][0]['cantidad'] == 15
+
+    def test_sin_consulta_en_lote_resuelve_uno_a_uno(self):
+        self.handler._servicio_usuarios.obtener_clientes_por_ids.return_value = None
+        self.handler._servicio_usuarios.obtener_cliente_por_id.side_effect = lambda cid: {'nombre': f'Nombre {cid}'}
+
+        resultado = self.handler.handle(ObtenerInformeVentas())
+
+        assert [c['nombre'] for c in resultado['ventas_por_cliente']] == ['Nombre cliente-1', 'Nombre cliente-2']
+        assert self.handler._servicio_usuarios.obtener_cliente_por_id.call_count == 2
+
+    def test_sin_pedidos_retorna_informe_vacio(self):
+        self.handler._repositorio.obtener_resumen.return_value = {
+            'ventas_totales': 0, 'total_productos_vendidos': 0, 'ventas_por_mes': {},
+            'ventas_por_cliente': [], 'productos_mas_vendidos': []
+        }
+
+        resultado = self.handler.handle(ObtenerInformeVentas())
+
+        assert resultado['ventas_totales'] == 0
+        self.handler._servicio_usuarios.obtener_clientes_por_ids.assert_not_called()
+
+
+class TestServicioUsuariosEnLote:
+
+    @patch('requests.Session.post')
+    def test_obtener_clientes_por_ids_usa_el_endpoint_bulk(self, mock_post):
+        respuesta = Mock(status_code=200)
+        respuesta.json.return_value = {'clientes': {'c1': {'id': 'c1', 'nombre': 'Uno'}}, 'no_encontrados': []}
+        mock_post.return_value = respuesta
+
+        resultado = ServicioUsuarios().obtener_clientes_por_ids(['c1', 'c1', 'c2'], campos=['nombre'])
+
+        assert resultado == {'c1': {'id': 'c1', 'nombre': 'Uno'}}
+        assert mock_post.call_args.kwargs['json'] == {'ids': ['c1', 'c2'], 'campos': ['nombre']}
+        assert mock_post.call_args.args[0].endswith('/clientes/bulk')
+
+    @patch('requests.Session.post')
+    def test_obtener_clientes_por_ids_retorna_none_si_no_existe_el_endpoint(self, mock_post):
+        mock_post.return_value = Mock(status_code=404)
+
+        assert ServicioUsuarios().obtener_clientes_por_ids(['c1']) is None
+
+
+def test_comando_reconstruir_resumenes_ventas(app):
+    resultado = app.test_cli_runner().invoke(args=['reconstruir-resumenes-ventas'])
+
+    assert resultado.exit_code == 0
+    assert 'Resúmenes de ventas reconstruidos' in resultado.output
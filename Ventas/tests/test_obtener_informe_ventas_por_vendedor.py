@@ -9,8 +9,6 @@ from flask import Flask
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from aplicacion.consultas.obtener_informe_ventas_por_vendedor import ObtenerInformeVentasPorVendedor, ObtenerInformeVentasPorVendedorHandler
-from dominio.entidades import Pedido, ItemPedido
-from dominio.objetos_valor import EstadoPedido, Cantidad, Precio
 from config.db import db
 
 
@@ -49,7 +47,7 @@ class TestObtenerInformeVentasPorVendedor:
         consulta = ObtenerInformeVentasPorVendedor()
         
         mock_repo = Mock()
-        mock_repo.obtener_pedidos_confirmados.return_value = []
+        mock_repo.obtener_ventas_por_vendedor.return_value = []
         
         handler = ObtenerInformeVentasPorVendedorHandler()
         handler._repositorio = mock_repo
@@ -57,7 +55,7 @@ class TestObtenerInformeVentasPorVendedor:
         resultado = handler.handle(consulta)
         
         assert resultado == []
-        mock_repo.obtener_pedidos_confirmados.assert_called_once_with(
+        mock_repo.obtener_ventas_por_vendedor.assert_called_once_with(
             fecha_inicio=None,
             fecha_fin=None
         )
@@ -65,73 +63,21 @@ class TestObtenerInformeVentasPorVendedor:
     def test_handler_con_resultados_exitoso(self):
         consulta = ObtenerInformeVentasPorVendedor()
         
-        pedido1 = Pedido(
-            id=uuid.uuid4(),
-            vendedor_id=self.vendedor_id,
-            cliente_id=self.cliente_id_1,
-            items=[
-                ItemPedido(
-                    id=uuid.uuid4(),
-                    producto_id=str(uuid.uuid4()),
-                    nombre_producto="Producto 1",
-                    cantidad=Cantidad(5),
-                    precio_unitario=Precio(10000.0)
-                )
-            ],
-            estado=EstadoPedido("entregado"),
-            total=Precio(50000.0)
-        )
-        pedido1._updated_at_model = datetime.now()
-        
-        pedido2 = Pedido(
-            id=uuid.uuid4(),
-            vendedor_id=self.vendedor_id,
-            cliente_id=self.cliente_id_2,
-            items=[
-                ItemPedido(
-                    id=uuid.uuid4(),
-                    producto_id=str(uuid.uuid4()),
-                    nombre_producto="Producto 2",
-                    cantidad=Cantidad(3),
-                    precio_unitario=Precio(20000.0)
-                )
-            ],
-            estado=EstadoPedido("entregado"),
-            total=Precio(60000.0)
-        )
-        pedido2._updated_at_model = datetime.now()
-        
-        pedido3 = Pedido(
-            id=uuid.uuid4(),
-            vendedor_id=self.vendedor_id,
-            cliente_id=self.cliente_id_1,
-            items=[
-                ItemPedido(
-                    id=uuid.uuid4(),
-                    producto_id=str(uuid.uuid4()),
-                    nombre_producto="Producto 3",
-                    cantidad=Cantidad(2),
-                    precio_unitario=Precio(15000.0)
-                )
-            ],
-            estado=EstadoPedido("entregado"),
-            total=Precio(30000.0)
-        )
-        pedido3._updated_at_model = datetime.now()
-        
         vendedor_mock = {
             'id': self.vendedor_id,
-            'nombre': 'Juan Pérez',
-            'email': 'juan.perez@empresa.com',
-            'telefono': '3001234567',
-            'direccion': 'Calle 123'
+            'nombre': 'Juan Pérez'
         }
         
         mock_repo = Mock()
         mock_servicio = Mock()
         
-        mock_repo.obtener_pedidos_confirmados.return_value = [pedido1, pedido2, pedido3]
-        mock_servicio.obtener_vendedor_por_id.return_value = vendedor_mock
+        mock_repo.obtener_ventas_por_vendedor.return_value = [{
+            'vendedor_id': self.vendedor_id,
+            'numero_pedidos': 3,
+            'total_ventas': 140000.0,
+            'clientes_atendidos': 2
+        }]
+        mock_servicio.obtener_vendedores_por_ids.return_value = {self.vendedor_id: vendedor_mock}
         
         handler = ObtenerInformeVentasPorVendedorHandler()
         handler._repositorio = mock_repo
@@ -145,45 +91,23 @@ class TestObtenerInformeVentasPorVendedor:
         assert resultado[0]["numero_pedidos"] == 3
         assert resultado[0]["total_ventas"] == 140000.0
         assert resultado[0]["clientes_atendidos"] == 2
+        mock_servicio.obtener_vendedores_por_ids.assert_called_once_with([self.vendedor_id], campos=["nombre"])
+        mock_servicio.obtener_vendedor_por_id.assert_not_called()
     
     def test_handler_agrupa_por_vendedor(self):
         consulta = ObtenerInformeVentasPorVendedor()
         
-        pedido1 = Pedido(
-            id=uuid.uuid4(),
-            vendedor_id=self.vendedor_id,
-            cliente_id=self.cliente_id_1,
-            items=[],
-            estado=EstadoPedido("entregado"),
-            total=Precio(50000.0)
-        )
-        pedido1._updated_at_model = datetime.now()
-        
-        pedido2 = Pedido(
-            id=uuid.uuid4(),
-            vendedor_id=self.vendedor_id_2,
-            cliente_id=self.cliente_id_2,
-            items=[],
-            estado=EstadoPedido("entregado"),
-            total=Precio(30000.0)
-        )
-        pedido2._updated_at_model = datetime.now()
-        
-        vendedor1_mock = {
-            'id': self.vendedor_id,
-            'nombre': 'Juan Pérez'
-        }
-        
-        vendedor2_mock = {
-            'id': self.vendedor_id_2,
-            'nombre': 'María García'
-        }
-        
         mock_repo = Mock()
         mock_servicio = Mock()
         
-        mock_repo.obtener_pedidos_confirmados.return_value = [pedido1, pedido2]
-        mock_servicio.obtener_vendedor_por_id.side_effect = [vendedor1_mock, vendedor2_mock]
+        mock_repo.obtener_ventas_por_vendedor.return_value = [
+            {'vendedor_id': self.vendedor_id, 'numero_pedidos': 1, 'total_ventas': 50000.0, 'clientes_atendidos': 1},
+            {'vendedor_id': self.vendedor_id_2, 'numero_pedidos': 1, 'total_ventas': 30000.0, 'clientes_atendidos': 1}
+        ]
+        mock_servicio.obtener_vendedores_por_ids.return_value = {
+            self.vendedor_id: {'id': self.vendedor_id, 'nombre': 'Juan Pérez'},
+            self.vendedor_id_2: {'id': self.vendedor_id_2, 'nombre': 'María García'}
+        }
         
         handler = ObtenerInformeVentasPorVendedorHandler()
         handler._repositorio = mock_repo
@@ -194,40 +118,19 @@ class TestObtenerInformeVentasPorVendedor:
         assert len(resultado) == 2
         assert resultado[0]["vendedor_id"] == self.vendedor_id
         assert resultado[1]["vendedor_id"] == self.vendedor_id_2
+        assert resultado[1]["vendedor_nombre"] == "María García"
     
-    def test_handler_ignora_pedidos_sin_vendedor(self):
+    def test_handler_sin_consulta_en_lote_resuelve_uno_a_uno(self):
         consulta = ObtenerInformeVentasPorVendedor()
         
-        pedido_con_vendedor = Pedido(
-            id=uuid.uuid4(),
-            vendedor_id=self.vendedor_id,
-            cliente_id=self.cliente_id_1,
-            items=[],
-            estado=EstadoPedido("entregado"),
-            total=Precio(50000.0)
-        )
-        pedido_con_vendedor._updated_at_model = datetime.now()
-        
-        pedido_sin_vendedor = Pedido(
-            id=uuid.uuid4(),
-            vendedor_id="",
-            cliente_id=self.cliente_id_2,
-            items=[],
-            estado=EstadoPedido("entregado"),
-            total=Precio(30000.0)
-        )
-        pedido_sin_vendedor._updated_at_model = datetime.now()
-        
-        vendedor_mock = {
-            'id': self.vendedor_id,
-            'nombre': 'Juan Pérez'
-        }
-        
         mock_repo = Mock()
         mock_servicio = Mock()
         
-        mock_repo.obtener_pedidos_confirmados.return_value = [pedido_con_vendedor, pedido_sin_vendedor]
-        mock_servicio.obtener_vendedor_por_id.return_value = vendedor_mock
+        mock_repo.obtener_ventas_por_vendedor.return_value = [
+            {'vendedor_id': self.vendedor_id, 'numero_pedidos': 1, 'total_ventas': 50000.0, 'clientes_atendidos': 1}
+        ]
+        mock_servicio.obtener_vendedores_por_ids.return_value = None
+        mock_servicio.obtener_vendedor_por_id.return_value = {'id': self.vendedor_id, 'nombre': 'Juan Pérez'}
         
         handler = ObtenerInformeVentasPorVendedorHandler()
         handler._repositorio = mock_repo
@@ -235,28 +138,19 @@ class TestObtenerInformeVentasPorVendedor:
         
         resultado = handler.handle(consulta)
         
-        assert len(resultado) == 1
-        assert resultado[0]["vendedor_id"] == self.vendedor_id
-        assert resultado[0]["numero_pedidos"] == 1
+        assert resultado[0]["vendedor_nombre"] == "Juan Pérez"
+        mock_servicio.obtener_vendedor_por_id.assert_called_once_with(self.vendedor_id)
     
     def test_handler_vendedor_no_encontrado(self):
         consulta = ObtenerInformeVentasPorVendedor()
         
-        pedido = Pedido(
-            id=uuid.uuid4(),
-            vendedor_id=self.vendedor_id,
-            cliente_id=self.cliente_id_1,
-            items=[],
-            estado=EstadoPedido("entregado"),
-            total=Precio(50000.0)
-        )
-        pedido._updated_at_model = datetime.now()
-        
         mock_repo = Mock()
         mock_servicio = Mock()
         
-        mock_repo.obtener_pedidos_confirmados.return_value = [pedido]
-        mock_servicio.obtener_vendedor_por_id.return_value = None
+        mock_repo.obtener_ventas_por_vendedor.return_value = [
+            {'vendedor_id': self.vendedor_id, 'numero_pedidos': 1, 'total_ventas': 50000.0, 'clientes_atendidos': 1}
+        ]
+        mock_servicio.obtener_vendedores_por_ids.return_value = {}
         
         handler = ObtenerInformeVentasPorVendedorHandler()
         handler._repositorio = mock_repo
@@ -276,14 +170,14 @@ class TestObtenerInformeVentasPorVendedor:
         )
         
         mock_repo = Mock()
-        mock_repo.obtener_pedidos_confirmados.return_value = []
+        mock_repo.obtener_ventas_por_vendedor.return_value = []
         
         handler = ObtenerInformeVentasPorVendedorHandler()
         handler._repositorio = mock_repo
         
         handler.handle(consulta)
         
-        mock_repo.obtener_pedidos_confirmados.assert_called_once_with(
+        mock_repo.obtener_ventas_por_vendedor.assert_called_once_with(
             fecha_inicio=fecha_inicio,
             fecha_fin=fecha_fin
         )
@@ -292,7 +186,7 @@ class TestObtenerInformeVentasPorVendedor:
         consulta = ObtenerInformeVentasPorVendedor()
         
         mock_repo = Mock()
-        mock_repo.obtener_pedidos_confirmados.side_effect = Exception("Error en repositorio")
+        mock_repo.obtener_ventas_por_vendedor.side_effect = Exception("Error en repositorio")
         
         handler = ObtenerInformeVentasPorVendedorHandler()
         handler._repositorio = mock_repo
@@ -300,4 +194,3 @@ class TestObtenerInformeVentasPorVendedor:
         resultado = handler.handle(consulta)
         
         assert resultado == []
-
@@ -279,3 +279,23 @@ class TestEjecutarObtenerPedidos:
             assert len(resultado) == 1
             assert resultado[0]['id'] == '123'
             mock_handler.handle.assert_called_once_with(consulta)
+
+    def test_handle_paginado_usa_la_pagina_del_repositorio(self):
+        """Con page, el handler delega filtros y paginación al repositorio y solo convierte la página"""
+        from seedwork.presentacion.paginacion import Pagina
+        handler = ObtenerPedidosHandler()
+        pedido = Pedido(
+            id=uuid.uuid4(), vendedor_id="vendedor-1", cliente_id="cliente-1", items=[],
+            estado=EstadoPedido("confirmado"), total=Precio(0.0)
+        )
+        handler._repositorio = Mock()
+        handler._repositorio.obtener_pagina.return_value = Pagina(items=[pedido], page=2, page_size=1, total_items=3)
+
+        pagina = handler.handle(ObtenerPedidos(vendedor_id="vendedor-1", estado="confirmado", page=2, page_size=1))
+
+        handler._repositorio.obtener_pagina.assert_called_once_with(
+            page=2, page_size=1, vendedor_id="vendedor-1", cliente_id=None, estado="confirmado"
+        )
+        handler._repositorio.obtener_todos.assert_not_called()
+        assert pagina.a_dict()['items'][0]['id'] == str(pedido.id)
+        assert pagina.a_dict()['pagination']['total_pages'] == 3
@@ -78,9 +78,11 @@ class TestObtenerVisitas:
         mock_repo = Mock()
         mock_servicio_usuarios = Mock()
         
-        mock_repo.obtener_todos.return_value = [visita1, visita2]
-        mock_servicio_usuarios.obtener_vendedor_por_id.return_value = vendedor_mock
-        mock_servicio_usuarios.obtener_cliente_por_id.side_effect = [cliente1_mock, cliente2_mock]
+        mock_repo.obtener_filtradas.return_value = [visita1, visita2]
+        mock_servicio_usuarios.obtener_vendedores_por_ids.return_value = {self.vendedor_id: vendedor_mock}
+        mock_servicio_usuarios.obtener_clientes_por_ids.return_value = {
+            self.cliente_id: cliente1_mock, visita2.cliente_id: cliente2_mock
+        }
         
         handler = ObtenerVisitasHandler(
             repositorio=mock_repo,
@@ -141,9 +143,10 @@ class TestObtenerVisitas:
         mock_repo = Mock()
         mock_servicio_usuarios = Mock()
         
-        mock_repo.obtener_todos.return_value = [visita1, visita2]
-        mock_servicio_usuarios.obtener_vendedor_por_id.return_value = vendedor_mock
-        mock_servicio_usuarios.obtener_cliente_por_id.return_value = cliente_mock
+        # El filtro por estado se resuelve en la base de datos
+        mock_repo.obtener_filtradas.return_value = [visita1]
+        mock_servicio_usuarios.obtener_vendedores_por_ids.return_value = {self.vendedor_id: vendedor_mock}
+        mock_servicio_usuarios.obtener_clientes_por_ids.return_value = {self.cliente_id: cliente_mock}
         
         handler = ObtenerVisitasHandler(
             repositorio=mock_repo,
@@ -156,6 +159,9 @@ class TestObtenerVisitas:
         
         assert len(resultado) == 1
         assert resultado[0].estado == "pendiente"
+        mock_repo.obtener_filtradas.assert_called_once_with(
+            estado="pendiente", vendedor_id=None, fecha_inicio=None, fecha_fin=None
+        )
     
     def test_obtener_visitas_vendedor_no_existe(self):
         consulta = ObtenerVisitas()
@@ -174,8 +180,9 @@ class TestObtenerVisitas:
         mock_repo = Mock()
         mock_servicio_usuarios = Mock()
         
-        mock_repo.obtener_todos.return_value = [visita]
-        mock_servicio_usuarios.obtener_vendedor_por_id.return_value = None
+        mock_repo.obtener_filtradas.return_value = [visita]
+        mock_servicio_usuarios.obtener_vendedores_por_ids.return_value = {}
+        mock_servicio_usuarios.obtener_clientes_por_ids.return_value = {}
         
         handler = ObtenerVisitasHandler(
             repositorio=mock_repo,
@@ -213,9 +220,9 @@ class TestObtenerVisitas:
         mock_repo = Mock()
         mock_servicio_usuarios = Mock()
         
-        mock_repo.obtener_todos.return_value = [visita]
-        mock_servicio_usuarios.obtener_vendedor_por_id.return_value = vendedor_mock
-        mock_servicio_usuarios.obtener_cliente_por_id.return_value = None
+        mock_repo.obtener_filtradas.return_value = [visita]
+        mock_servicio_usuarios.obtener_vendedores_por_ids.return_value = {self.vendedor_id: vendedor_mock}
+        mock_servicio_usuarios.obtener_clientes_por_ids.return_value = {}
         
         handler = ObtenerVisitasHandler(
             repositorio=mock_repo,
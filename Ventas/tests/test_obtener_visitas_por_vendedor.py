@@ -5,6 +5,7 @@ from unittest.mock import Mock
 from datetime import datetime, timedelta
 import uuid
 from flask import Flask
+from sqlalchemy import event
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
@@ -12,6 +13,8 @@ from aplicacion.consultas.obtener_visitas_por_vendedor import ObtenerVisitasPorV
 from aplicacion.dto import VisitaDTO
 from aplicacion.dto_agregacion import VisitaAgregacionDTO
 from config.db import db
+from infraestructura.modelos import VisitaModel
+from infraestructura.repositorios import RepositorioVisitaSQLite
 
 
 class TestObtenerVisitasPorVendedor:
@@ -89,9 +92,12 @@ class TestObtenerVisitasPorVendedor:
         mock_repo = Mock()
         mock_servicio_usuarios = Mock()
         
-        mock_repo.obtener_todos.return_value = [visita1, visita2, visita_otro_vendedor]
-        mock_servicio_usuarios.obtener_vendedor_por_id.return_value = vendedor_mock
-        mock_servicio_usuarios.obtener_cliente_por_id.side_effect = [cliente1_mock, cliente2_mock]
+        # El filtro por vendedor se resuelve en la base de datos
+        mock_repo.obtener_filtradas.return_value = [visita1, visita2]
+        mock_servicio_usuarios.obtener_vendedores_por_ids.return_value = {self.vendedor_id: vendedor_mock}
+        mock_servicio_usuarios.obtener_clientes_por_ids.return_value = {
+            self.cliente_id: cliente1_mock, visita2.cliente_id: cliente2_mock
+        }
         
         handler = ObtenerVisitasPorVendedorHandler(
             repositorio=mock_repo,
@@ -108,6 +114,9 @@ class TestObtenerVisitasPorVendedor:
         assert resultado[0].vendedor_nombre == "Juan Pérez"
         assert resultado[0].cliente_nombre == "Hospital San Ignacio"
         assert resultado[1].cliente_nombre == "Clínica Marly"
+        mock_repo.obtener_filtradas.assert_called_once_with(
+            estado=None, vendedor_id=self.vendedor_id, fecha_inicio=None, fecha_fin=None
+        )
     
     def test_obtener_visitas_por_vendedor_filtro_estado(self):
         consulta = ObtenerVisitasPorVendedor(vendedor_id=self.vendedor_id, estado="pendiente")
@@ -153,9 +162,9 @@ class TestObtenerVisitasPorVendedor:
         mock_repo = Mock()
         mock_servicio_usuarios = Mock()
         
-        mock_repo.obtener_todos.return_value = [visita1, visita2]
-        mock_servicio_usuarios.obtener_vendedor_por_id.return_value = vendedor_mock
-        mock_servicio_usuarios.obtener_cliente_por_id.return_value = cliente_mock
+        mock_repo.obtener_filtradas.return_value = [visita1]
+        mock_servicio_usuarios.obtener_vendedores_por_ids.return_value = {self.vendedor_id: vendedor_mock}
+        mock_servicio_usuarios.obtener_clientes_por_ids.return_value = {self.cliente_id: cliente_mock}
         
         handler = ObtenerVisitasPorVendedorHandler(
             repositorio=mock_repo,
@@ -168,23 +177,15 @@ class TestObtenerVisitasPorVendedor:
         
         assert len(resultado) == 1
         assert resultado[0].estado == "pendiente"
+        mock_repo.obtener_filtradas.assert_called_once_with(
+            estado="pendiente", vendedor_id=self.vendedor_id, fecha_inicio=None, fecha_fin=None
+        )
     
     def test_obtener_visitas_por_vendedor_sin_visitas(self):
         consulta = ObtenerVisitasPorVendedor(vendedor_id=self.vendedor_id)
         
-        visita_otro_vendedor = VisitaDTO(
-            id=uuid.uuid4(),
-            vendedor_id=str(uuid.uuid4()),
-            cliente_id=self.cliente_id,
-            fecha_programada=self.fecha_futura,
-            direccion="Calle 789",
-            telefono="3005555555",
-            estado="pendiente",
-            descripcion="Visita otro vendedor"
-        )
-        
         mock_repo = Mock()
-        mock_repo.obtener_todos.return_value = [visita_otro_vendedor]
+        mock_repo.obtener_filtradas.return_value = []
         
         handler = ObtenerVisitasPorVendedorHandler(repositorio=mock_repo)
         
@@ -211,8 +212,9 @@ class TestObtenerVisitasPorVendedor:
         mock_repo = Mock()
         mock_servicio_usuarios = Mock()
         
-        mock_repo.obtener_todos.return_value = [visita]
-        mock_servicio_usuarios.obtener_vendedor_por_id.return_value = None
+        mock_repo.obtener_filtradas.return_value = [visita]
+        mock_servicio_usuarios.obtener_vendedores_por_ids.return_value = {}
+        mock_servicio_usuarios.obtener_clientes_por_ids.return_value = {}
         
         handler = ObtenerVisitasPorVendedorHandler(
             repositorio=mock_repo,
@@ -223,4 +225,101 @@ class TestObtenerVisitasPorVendedor:
             db.create_all()
             resultado = handler.handle(consulta)
         
-        assert len(resultado) == 0
\ No newline at end of file
+        assert len(resultado) == 0
+
+
+class TestVisitasDelDiaEnBaseDeDatos:
+    """La agenda del día de un vendedor se filtra en SQL y resuelve usuarios en lote"""
+    
+    def setup_method(self):
+        self.app = Flask(__name__)
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+        self.app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        db.init_app(self.app)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        
+        self.vendedor_id = str(uuid.uuid4())
+        self.hoy = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        self.servicio_usuarios = Mock()
+        self.servicio_usuarios.obtener_vendedores_por_ids.side_effect = \
+            lambda ids: {i: self.usuario(i, 'Vendedor') for i in ids}
+        self.servicio_usuarios.obtener_clientes_por_ids.side_effect = \
+            lambda ids: {i: self.usuario(i, 'Cliente') for i in ids}
+        self.handler = ObtenerVisitasPorVendedorHandler(
+            repositorio=RepositorioVisitaSQLite(),
+            servicio_usuarios=self.servicio_usuarios
+        )
+    
+    def teardown_method(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+    
+    def usuario(self, id_, nombre):
+        return {'id': id_, 'nombre': nombre, 'email': f'{id_}@test.com', 'telefono': '300', 'direccion': 'Calle 1'}
+    
+    def crear_visita(self, vendedor_id, fecha_programada, estado='pendiente', cliente_id=None):
+        db.session.add(VisitaModel(
+            id=str(uuid.uuid4()), vendedor_id=vendedor_id, cliente_id=cliente_id or str(uuid.uuid4()),
+            fecha_programada=fecha_programada, direccion='Calle 1', telefono='300', estado=estado
+        ))
+        db.session.commit()
+    
+    def test_agenda_del_dia_una_consulta_y_dos_lookups_en_lote(self):
+        for hora in (15, 9, 11):
+            self.crear_visita(self.vendedor_id, self.hoy.replace(hour=hora))
+        self.crear_visita(self.vendedor_id, self.hoy.replace(hour=10), estado='completada')
+        self.crear_visita(self.vendedor_id, self.hoy + timedelta(days=1))
+        self.crear_visita(str(uuid.uuid4()), self.hoy.replace(hour=9))
+        
+        consultas = []
+        contar = lambda *args, **kwargs: consultas.append(args[2])
+        event.listen(db.engine, 'before_cursor_execute', contar)
+        try:
+            resultado = self.handler.handle(ObtenerVisitasPorVendedor(
+                vendedor_id=self.vendedor_id, estado='pendiente', fecha_inicio=self.hoy, fecha_fin=self.hoy
+            ))
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', contar)
+        
+        assert len(consultas) == 1
+        assert [v.fecha_programada.hour for v in resultado] == [9, 11, 15]
+        assert all(v.vendedor_id == self.vendedor_id for v in resultado)
+        assert self.servicio_usuarios.obtener_vendedores_por_ids.call_count == 1
+        assert self.servicio_usuarios.obtener_clientes_por_ids.call_count == 1
+        self.servicio_usuarios.obtener_vendedor_por_id.assert_not_called()
+        self.servicio_usuarios.obtener_cliente_por_id.assert_not_called()
+    
+    def test_consulta_en_lote_no_disponible_resuelve_uno_a_uno(self):
+        cliente_id = str(uuid.uuid4())
+        self.crear_visita(self.vendedor_id, self.hoy.replace(hour=9), cliente_id=cliente_id)
+        self.crear_visita(self.vendedor_id, self.hoy.replace(hour=10), cliente_id=cliente_id)
+        self.servicio_usuarios.obtener_vendedores_por_ids.side_effect = None
+        self.servicio_usuarios.obtener_vendedores_por_ids.return_value = None
+        self.servicio_usuarios.obtener_clientes_por_ids.side_effect = None
+        self.servicio_usuarios.obtener_clientes_por_ids.return_value = None
+        self.servicio_usuarios.obtener_vendedor_por_id.side_effect = lambda i: self.usuario(i, 'Vendedor')
+        self.servicio_usuarios.obtener_cliente_por_id.side_effect = lambda i: self.usuario(i, 'Cliente')
+        
+        resultado = self.handler.handle(ObtenerVisitasPorVendedor(vendedor_id=self.vendedor_id))
+        
+        assert len(resultado) == 2
+        # Un solo lookup por id distinto, no uno por visita
+        assert self.servicio_usuarios.obtener_vendedor_por_id.call_count == 1
+        assert self.servicio_usuarios.obtener_cliente_por_id.call_count == 1
+    
+    def test_paginado_filtra_en_base_de_datos(self):
+        # Se crean en orden inverso para que created_at no coincida con la fecha programada
+        for hora in reversed(range(8, 13)):
+            self.crear_visita(self.vendedor_id, self.hoy.replace(hour=hora))
+        self.crear_visita(str(uuid.uuid4()), self.hoy.replace(hour=9))
+        
+        pagina = self.handler.handle(ObtenerVisitasPorVendedor(
+            vendedor_id=self.vendedor_id, page=2, page_size=2
+        ))
+        
+        assert pagina.total_items == 5
+        assert pagina.total_pages == 3
+        assert [v.fecha_programada.hour for v in pagina.items] == [10, 11]
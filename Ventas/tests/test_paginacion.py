@@ -3,7 +3,13 @@ import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from seedwork.presentacion.paginacion import paginar_resultados, extraer_parametros_paginacion
+from datetime import datetime, timedelta
+from flask import Flask
+
+from seedwork.presentacion.paginacion import (
+    paginar_resultados, extraer_parametros_paginacion, extraer_cursor,
+    codificar_cursor, decodificar_cursor, paginar_lista_por_cursor, paginar_consulta_por_cursor
+)
 
 
 class TestPaginarResultados:
@@ -162,3 +168,102 @@ class TestExtraerParametrosPaginacion:
         assert page == 1
         assert page_size == 30
 
+
+class TestPaginacionPorCursor:
+    """Pruebas para el modo de paginación por cursor"""
+
+    def _items(self, cantidad=10):
+        base = datetime(2025, 11, 1)
+        # Varios items comparten created_at: el id desempata
+        return [{'id': f'id-{i:02d}', 'created_at': base + timedelta(hours=i // 3)} for i in range(cantidad)]
+
+    def _clave(self, item):
+        return (item['created_at'], item['id'])
+
+    def test_cursor_conserva_fechas_y_direccion(self):
+        clave = (datetime(2025, 11, 1, 8, 30), 'id-1')
+
+        assert decodificar_cursor(codificar_cursor(clave, 'anterior')) == (clave, 'anterior')
+
+    def test_cursor_invalido(self):
+        with pytest.raises(ValueError):
+            decodificar_cursor('no-es-un-cursor')
+
+    def test_extraer_cursor(self):
+        assert extraer_cursor({'page': '2'}) is None
+        assert extraer_cursor({'cursor': ''}) == ''
+        assert extraer_cursor({'cursor': ' abc '}) == 'abc'
+
+    def test_recorrer_hacia_adelante_y_hacia_atras(self):
+        items = self._items()
+
+        primera = paginar_lista_por_cursor(items, self._clave, page_size=4)
+        segunda = paginar_lista_por_cursor(items, self._clave, cursor=primera.next_cursor, page_size=4)
+        tercera = paginar_lista_por_cursor(items, self._clave, cursor=segunda.next_cursor, page_size=4)
+        de_vuelta = paginar_lista_por_cursor(items, self._clave, cursor=tercera.prev_cursor, page_size=4)
+
+        assert [i['id'] for i in primera.items] == ['id-09', 'id-08', 'id-07', 'id-06']
+        assert [i['id'] for i in segunda.items] == ['id-05', 'id-04', 'id-03', 'id-02']
+        assert [i['id'] for i in tercera.items] == ['id-01', 'id-00']
+        assert primera.prev_cursor is None and tercera.next_cursor is None
+        assert de_vuelta.items == segunda.items
+
+        resultado = segunda.a_dict()
+        assert resultado['pagination']['mode'] == 'cursor'
+        assert resultado['pagination']['has_next'] is True
+        assert resultado['pagination']['has_prev'] is True
+
+    def test_items_nuevos_no_desplazan_la_pagina_siguiente(self):
+        items = self._items()
+        primera = paginar_lista_por_cursor(items, self._clave, page_size=4)
+
+        items.append({'id': 'id-nuevo', 'created_at': datetime(2025, 12, 1)})
+        segunda = paginar_lista_por_cursor(items, self._clave, cursor=primera.next_cursor, page_size=4)
+
+        assert [i['id'] for i in segunda.items] == ['id-05', 'id-04', 'id-03', 'id-02']
+
+
+class TestPaginarConsultaPorCursor:
+    """Pruebas del keyset en la base de datos"""
+
+    def setup_method(self):
+        from config.db import db
+        from infraestructura.modelos import PedidoModel
+        self.db = db
+        self.modelo = PedidoModel
+        self.app = Flask(__name__)
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+        self.app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        db.init_app(self.app)
+        with self.app.app_context():
+            db.create_all()
+            base = datetime(2025, 11, 1)
+            for i in range(7):
+                db.session.add(PedidoModel(
+                    id=f'pedido-{i}', cliente_id='cliente-1', estado='borrador', total=0.0,
+                    created_at=base + timedelta(hours=i // 2)
+                ))
+            db.session.commit()
+
+    def teardown_method(self):
+        with self.app.app_context():
+            self.db.session.remove()
+            self.db.drop_all()
+
+    def test_keyset_recorre_toda_la_tabla_sin_repetir(self):
+        columnas = [self.modelo.created_at, self.modelo.id]
+        with self.app.app_context():
+            vistos = []
+            cursor = None
+            while True:
+                pagina = paginar_consulta_por_cursor(self.modelo.query, columnas, cursor=cursor, page_size=3)
+                vistos.extend(p.id for p in pagina.items)
+                if not pagina.next_cursor:
+                    break
+                cursor = pagina.next_cursor
+
+            anterior = paginar_consulta_por_cursor(self.modelo.query, columnas, cursor=pagina.prev_cursor, page_size=3)
+
+        assert vistos == ['pedido-6', 'pedido-5', 'pedido-4', 'pedido-3', 'pedido-2', 'pedido-1', 'pedido-0']
+        assert [p.id for p in anterior.items] == ['pedido-3', 'pedido-2', 'pedido-1']
+        assert anterior.next_cursor is not None
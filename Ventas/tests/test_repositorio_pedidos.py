@@ -0,0 +1,310 @@
+import pytest
+import sys
+import os
+import uuid
+from datetime import datetime, timedelta
+from flask import Flask
+from sqlalchemy import event, inspect, text
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from infraestructura.repositorios import RepositorioPedidoSQLite, RepositorioVisitaSQLite, RepositorioPlanes
+from infraestructura.modelos import PedidoModel, ItemPedidoModel, VisitaModel, PlanVisitaModel
+from config.db import db
+from config.migraciones import ejecutar_migraciones
+
+
+class ContadorConsultas:
+    def __init__(self, engine):
+        self.engine = engine
+        self.total = 0
+
+    def _contar(self, *args, **kwargs):
+        self.total += 1
+
+    def __enter__(self):
+        event.listen(self.engine, 'before_cursor_execute', self._contar)
+        return self
+
+    def __exit__(self, *args):
+        event.remove(self.engine, 'before_cursor_execute', self._contar)
+
+
+class TestConsultasRepositorioPedido:
+
+    def setup_method(self):
+        self.app = Flask(__name__)
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+        self.app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        db.init_app(self.app)
+        self.repositorio = RepositorioPedidoSQLite()
+        with self.app.app_context():
+            db.create_all()
+
+    def teardown_method(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def _crear_pedidos(self, cantidad, items_por_pedido=3, estado='confirmado'):
+        ahora = datetime.utcnow()
+        for i in range(cantidad):
+            pedido_id = str(uuid.uuid4())
+            db.session.add(PedidoModel(
+                id=pedido_id, vendedor_id='vendedor-1', cliente_id=f'cliente-{i}',
+                estado=estado, total=30.0, created_at=ahora - timedelta(minutes=i), updated_at=ahora
+            ))
+            for j in range(items_por_pedido):
+                db.session.add(ItemPedidoModel(
+                    id=str(uuid.uuid4()), pedido_id=pedido_id, producto_id=f'producto-{j}',
+                    nombre_producto=f'Producto {j}', cantidad=1, precio_unitario=10.0, subtotal=10.0
+                ))
+        db.session.commit()
+        db.session.expunge_all()
+
+    def _consultas_para(self, cantidad_pedidos, listar):
+        with self.app.app_context():
+            db.drop_all()
+            db.create_all()
+            self._crear_pedidos(cantidad_pedidos)
+            with ContadorConsultas(db.engine) as contador:
+                pedidos = listar()
+            assert len(pedidos) == cantidad_pedidos
+            assert all(len(p.items) == 3 for p in pedidos)
+            return contador.total
+
+    @pytest.mark.parametrize('metodo', ['obtener_todos', 'obtener_pedidos_confirmados'])
+    def test_cantidad_de_consultas_no_depende_de_los_pedidos(self, metodo):
+        listar = getattr(self.repositorio, metodo)
+
+        consultas_pocos = self._consultas_para(5, listar)
+        consultas_muchos = self._consultas_para(200, listar)
+
+        assert consultas_pocos == consultas_muchos
+        assert consultas_muchos <= 2
+
+    def test_obtener_por_id_inexistente_no_recorre_la_tabla(self):
+        with self.app.app_context():
+            self._crear_pedidos(3)
+            with ContadorConsultas(db.engine) as contador:
+                assert self.repositorio.obtener_por_id(str(uuid.uuid4())) is None
+            assert contador.total == 1
+
+    def test_obtener_por_id_con_items(self):
+        with self.app.app_context():
+            self._crear_pedidos(1, items_por_pedido=2)
+            pedido_id = PedidoModel.query.first().id
+            db.session.expunge_all()
+
+            pedido = self.repositorio.obtener_por_id(pedido_id)
+
+            assert str(pedido.id) == pedido_id
+            assert sorted(i.producto_id for i in pedido.items) == ['producto-0', 'producto-1']
+
+    def _sentencias_al_actualizar(self, modificar, estado='confirmado'):
+        self._crear_pedidos(1, items_por_pedido=3, estado=estado)
+        pedido = self.repositorio.obtener_por_id(PedidoModel.query.first().id)
+        modificar(pedido)
+
+        sentencias = []
+        registrar = lambda conn, cursor, sql, *args: sentencias.append(' '.join(sql.split()))
+        event.listen(db.engine, 'before_cursor_execute', registrar)
+        try:
+            self.repositorio.actualizar(pedido)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', registrar)
+        db.session.expunge_all()
+        return pedido, sentencias
+
+    def test_cambio_de_estado_es_un_solo_update_del_pedido(self):
+        with self.app.app_context():
+            pedido, sentencias = self._sentencias_al_actualizar(lambda p: p.marcar_en_transito())
+
+            assert len(sentencias) == 1
+            assert sentencias[0].startswith('UPDATE pedidos SET estado=?, updated_at=?')
+            assert PedidoModel.query.first().estado == 'en_transito'
+            assert ItemPedidoModel.query.count() == 3
+
+    def test_actualizar_sin_cambios_no_escribe(self):
+        with self.app.app_context():
+            _, sentencias = self._sentencias_al_actualizar(lambda p: None)
+
+            assert sentencias == []
+
+    def test_solo_se_escriben_los_items_que_cambian(self):
+        from dominio.entidades import ItemPedido
+        from dominio.objetos_valor import Cantidad, Precio
+
+        def modificar(pedido):
+            pedido.items[0].actualizar_cantidad(4)
+            del pedido.items[1]
+            pedido.agregar_item(ItemPedido(
+                producto_id='producto-nuevo', nombre_producto='Nuevo',
+                cantidad=Cantidad(2), precio_unitario=Precio(5.0)
+            ))
+
+        with self.app.app_context():
+            pedido, sentencias = self._sentencias_al_actualizar(modificar, estado='borrador')
+
+            assert [s.split()[0] for s in sentencias].count('INSERT') == 1
+            assert [s.split()[0] for s in sentencias].count('DELETE') == 1
+            assert len([s for s in sentencias if s.startswith('UPDATE items_pedido')]) == 1
+            items = {i.producto_id: i for i in ItemPedidoModel.query.all()}
+            assert sorted(items) == ['producto-0', 'producto-2', 'producto-nuevo']
+            assert items['producto-0'].cantidad == 4
+            assert items['producto-0'].subtotal == 40.0
+            assert PedidoModel.query.first().total == pedido.total.valor == 60.0
+
+
+class TestPaginacionEnBaseDeDatos:
+
+    def setup_method(self):
+        self.app = Flask(__name__)
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+        self.app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        db.init_app(self.app)
+        with self.app.app_context():
+            db.create_all()
+
+    def teardown_method(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def _crear_pedidos(self, cantidad, vendedor_id='vendedor-1', estado='borrador'):
+        ahora = datetime.utcnow()
+        for i in range(cantidad):
+            pedido_id = str(uuid.uuid4())
+            db.session.add(PedidoModel(
+                id=pedido_id, vendedor_id=vendedor_id, cliente_id='cliente-1', estado=estado,
+                total=10.0, created_at=ahora - timedelta(minutes=i)
+            ))
+            db.session.add(ItemPedidoModel(
+                id=str(uuid.uuid4()), pedido_id=pedido_id, producto_id='producto-1',
+                nombre_producto='Producto', cantidad=1, precio_unitario=10.0, subtotal=10.0
+            ))
+        db.session.commit()
+
+    def test_pagina_de_pedidos_filtrada_en_la_base_de_datos(self):
+        with self.app.app_context():
+            self._crear_pedidos(7, vendedor_id='vendedor-1', estado='confirmado')
+            self._crear_pedidos(4, vendedor_id='vendedor-2', estado='confirmado')
+            self._crear_pedidos(3, vendedor_id='vendedor-1', estado='borrador')
+
+            pagina = RepositorioPedidoSQLite().obtener_pagina(
+                page=2, page_size=5, vendedor_id='vendedor-1', estado='confirmado'
+            )
+
+            assert pagina.total_items == 7
+            assert pagina.total_pages == 2
+            assert len(pagina.items) == 2
+            assert all(p.vendedor_id == 'vendedor-1' and p.estado.estado == 'confirmado' for p in pagina.items)
+            assert all(len(p.items) == 1 for p in pagina.items)
+
+    def test_paginas_de_pedidos_no_se_solapan_y_page_se_ajusta_al_total(self):
+        with self.app.app_context():
+            self._crear_pedidos(5)
+            repositorio = RepositorioPedidoSQLite()
+
+            primera = repositorio.obtener_pagina(page=1, page_size=3)
+            segunda = repositorio.obtener_pagina(page=2, page_size=3)
+            fuera_de_rango = repositorio.obtener_pagina(page=9, page_size=3)
+
+            ids = [p.id for p in primera.items + segunda.items]
+            assert len(set(ids)) == 5
+            assert fuera_de_rango.page == 2
+            assert [p.id for p in fuera_de_rango.items] == [p.id for p in segunda.items]
+
+    def test_primera_pagina_no_depende_del_tamano_de_la_tabla(self):
+        with self.app.app_context():
+            self._crear_pedidos(300)
+            db.session.expunge_all()
+
+            with ContadorConsultas(db.engine) as contador:
+                pagina = RepositorioPedidoSQLite().obtener_pagina(page=1, page_size=10)
+
+            assert len(pagina.items) == 10
+            assert pagina.total_items == 300
+            # COUNT + página + items de la página
+            assert contador.total == 3
+
+    def test_pagina_de_visitas_filtra_por_dia_en_la_base_de_datos(self):
+        with self.app.app_context():
+            base = datetime(2025, 11, 10, 9, 0)
+            for dia in range(5):
+                db.session.add(VisitaModel(
+                    id=str(uuid.uuid4()), vendedor_id='vendedor-1', cliente_id='cliente-1',
+                    fecha_programada=base + timedelta(days=dia, hours=dia), direccion='Calle 1',
+                    telefono='3000000000', estado='pendiente' if dia % 2 == 0 else 'realizada'
+                ))
+            db.session.commit()
+            repositorio = RepositorioVisitaSQLite()
+
+            rango = repositorio.obtener_pagina(
+                fecha_inicio=datetime(2025, 11, 11, 23, 0), fecha_fin=datetime(2025, 11, 13)
+            )
+            mismo_dia = repositorio.obtener_pagina(fecha_inicio=datetime(2025, 11, 12), fecha_fin=datetime(2025, 11, 12))
+            pendientes = repositorio.obtener_pagina(estado='pendiente', page_size=2)
+
+            assert sorted(v.fecha_programada.day for v in rango.items) == [11, 12, 13]
+            assert [v.fecha_programada.day for v in mismo_dia.items] == [12]
+            assert pendientes.total_items == 3
+            assert len(pendientes.items) == 2
+
+    def test_pagina_de_planes_por_usuario(self):
+        with self.app.app_context():
+            for i in range(4):
+                db.session.add(PlanVisitaModel(
+                    id=f'plan-{i}', nombre=f'Plan {i}', id_usuario='user-1' if i < 3 else 'user-2',
+                    fecha_inicio=datetime(2025, 11, 1), fecha_fin=datetime(2025, 11, 30)
+                ))
+            db.session.add(VisitaModel(
+                id=str(uuid.uuid4()), vendedor_id='user-1', cliente_id='cliente-1', plan_id='plan-1',
+                fecha_programada=datetime(2025, 11, 10), direccion='Calle 1', telefono='3000000000'
+            ))
+            db.session.commit()
+
+            pagina = RepositorioPlanes().obtener_pagina(page=1, page_size=2, user_id='user-1')
+
+            assert pagina.total_items == 3
+            assert len(pagina.items) == 2
+            # Los planes con visitas más recientes van primero
+            assert pagina.items[0]['id'] == 'plan-1'
+            assert pagina.items[0]['visitas_clientes'][0]['id_cliente'] == 'cliente-1'
+
+
+def test_migracion_crea_indices_de_pedidos_en_tablas_existentes():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+
+    with app.app_context():
+        with db.engine.begin() as conexion:
+            conexion.execute(text(
+                "CREATE TABLE pedidos (id VARCHAR(36) PRIMARY KEY, vendedor_id VARCHAR(36), cliente_id VARCHAR(36) NOT NULL, "
+                "estado VARCHAR(20) NOT NULL, total FLOAT NOT NULL, created_at DATETIME, updated_at DATETIME)"
+            ))
+            conexion.execute(text(
+                "CREATE TABLE items_pedido (id VARCHAR(36) PRIMARY KEY, pedido_id VARCHAR(36) NOT NULL, "
+                "producto_id VARCHAR(36) NOT NULL, nombre_producto VARCHAR(255) NOT NULL, cantidad INTEGER NOT NULL, "
+                "precio_unitario FLOAT NOT NULL, subtotal FLOAT NOT NULL, created_at DATETIME, updated_at DATETIME)"
+            ))
+            conexion.execute(text(
+                "CREATE TABLE visitas (id VARCHAR(36) PRIMARY KEY, vendedor_id VARCHAR(36) NOT NULL, "
+                "cliente_id VARCHAR(36) NOT NULL, fecha_programada DATETIME NOT NULL, estado VARCHAR(20) NOT NULL)"
+            ))
+
+        ejecutar_migraciones(db)
+        ejecutar_migraciones(db)
+
+        inspector = inspect(db.engine)
+        indices_pedidos = {i['name'] for i in inspector.get_indexes('pedidos')}
+        indices_items = {i['name'] for i in inspector.get_indexes('items_pedido')}
+        assert {'ix_pedidos_cliente_id', 'ix_pedidos_vendedor_id', 'ix_pedidos_estado', 'ix_pedidos_updated_at',
+                'ix_pedidos_created_at_id', 'ix_pedidos_cliente_id_created_at'} <= indices_pedidos
+        assert 'ix_items_pedido_pedido_id' in indices_items
+        assert {'ix_visitas_vendedor_id_fecha_programada', 'ix_visitas_estado_fecha_programada'} <= {
+            i['name'] for i in inspector.get_indexes('visitas')
+        }
+        db.session.remove()
@@ -3,13 +3,17 @@ import pytest
 import uuid
 import sys
 import os
-from unittest.mock import Mock, patch
+from unittest.mock import Mock
 from datetime import datetime, timedelta
+from flask import Flask
+from sqlalchemy import event
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from aplicacion.servicios.servicio_historial_cliente import ServicioHistorialCliente
-from dominio.objetos_valor import EstadoPedido, Cantidad, Precio
+from infraestructura.repositorios import RepositorioPedidoSQLite
+from infraestructura.modelos import PedidoModel, ItemPedidoModel
+from config.db import db
 
 
 class TestServicioHistorialCliente:
@@ -17,34 +21,48 @@ class TestServicioHistorialCliente:
     
     def setup_method(self):
         """Configuración antes de cada test"""
-        self.servicio = ServicioHistorialCliente()
+        self.app = Flask(__name__)
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+        self.app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        db.init_app(self.app)
+        self.contexto = self.app.app_context()
+        self.contexto.push()
+        db.create_all()
+        self.servicio = ServicioHistorialCliente(repositorio_pedidos=RepositorioPedidoSQLite())
         self.cliente_id = str(uuid.uuid4())
     
-    def crear_mock_pedido(self, pedido_id, cliente_id, estado, total, items, fecha_creacion=None):
-        """Helper para crear un mock de pedido"""
-        mock_pedido = Mock()
-        mock_pedido.id = pedido_id
-        mock_pedido.cliente_id = cliente_id
-        mock_pedido.estado = EstadoPedido(estado)
-        mock_pedido.total = Precio(total)
-        mock_pedido.items = items
-        mock_pedido._created_at_model = fecha_creacion or datetime.now()
-        return mock_pedido
+    def teardown_method(self):
+        """Limpieza después de cada test"""
+        db.session.remove()
+        db.drop_all()
+        self.contexto.pop()
     
-    def crear_mock_item(self, producto_id, nombre, cantidad, precio_unitario):
-        """Helper para crear un mock de item"""
-        mock_item = Mock()
-        mock_item.producto_id = producto_id
-        mock_item.nombre_producto = nombre
-        mock_item.cantidad = Cantidad(cantidad)
-        mock_item.precio_unitario = Precio(precio_unitario)
-        return mock_item
+    def crear_pedido(self, cliente_id, estado, total, items, fecha_creacion=None, sin_fecha=False):
+        """Helper para persistir un pedido con sus items"""
+        pedido_id = str(uuid.uuid4())
+        db.session.add(PedidoModel(
+            id=pedido_id, cliente_id=cliente_id, estado=estado, total=total,
+            created_at=fecha_creacion or datetime.now()
+        ))
+        for producto_id, nombre, cantidad, precio_unitario in items:
+            db.session.add(ItemPedidoModel(
+                id=str(uuid.uuid4()), pedido_id=pedido_id, producto_id=producto_id, nombre_producto=nombre,
+                cantidad=cantidad, precio_unitario=precio_unitario, subtotal=cantidad * precio_unitario
+            ))
+        if sin_fecha:
+            # created_at tiene default en el modelo, se anula después de insertar
+            db.session.flush()
+            PedidoModel.query.filter_by(id=pedido_id).update({'created_at': None})
+        db.session.commit()
+        return pedido_id
+    
+    def crear_item(self, producto_id, nombre, cantidad, precio_unitario):
+        """Helper para describir un item de pedido"""
+        return (producto_id, nombre, cantidad, precio_unitario)
     
     def test_obtener_historial_sin_pedidos(self):
         """Test obtener historial de cliente sin pedidos"""
-        mock_repositorio = Mock()
-        mock_repositorio.obtener_todos.return_value = []
-        servicio = ServicioHistorialCliente(repositorio_pedidos=mock_repositorio)
+        servicio = self.servicio
         
         resultado = servicio.obtener_historial_cliente(self.cliente_id)
         
@@ -55,15 +73,12 @@ class TestServicioHistorialCliente:
     
     def test_obtener_historial_con_un_pedido(self):
         """Test obtener historial de cliente con un pedido"""
-        mock_repositorio = Mock()
-        
-        item1 = self.crear_mock_item('prod1', 'Producto 1', 2, 10.0)
-        pedido1 = self.crear_mock_pedido(
-            uuid.uuid4(), self.cliente_id, 'confirmado', 20.0, [item1]
+        item1 = self.crear_item('prod1', 'Producto 1', 2, 10.0)
+        pedido1 = self.crear_pedido(
+            self.cliente_id, 'confirmado', 20.0, [item1]
         )
         
-        mock_repositorio.obtener_todos.return_value = [pedido1]
-        servicio = ServicioHistorialCliente(repositorio_pedidos=mock_repositorio)
+        servicio = self.servicio
         
         resultado = servicio.obtener_historial_cliente(self.cliente_id)
         
@@ -75,28 +90,25 @@ class TestServicioHistorialCliente:
     
     def test_obtener_historial_con_multiples_pedidos(self):
         """Test obtener historial con múltiples pedidos"""
-        mock_repositorio = Mock()
-        
         fecha1 = datetime.now() - timedelta(days=30)
         fecha2 = datetime.now() - timedelta(days=15)
         fecha3 = datetime.now()
         
-        item1 = self.crear_mock_item('prod1', 'Producto 1', 2, 10.0)
-        item2 = self.crear_mock_item('prod2', 'Producto 2', 3, 15.0)
-        item3 = self.crear_mock_item('prod1', 'Producto 1', 1, 10.0)
+        item1 = self.crear_item('prod1', 'Producto 1', 2, 10.0)
+        item2 = self.crear_item('prod2', 'Producto 2', 3, 15.0)
+        item3 = self.crear_item('prod1', 'Producto 1', 1, 10.0)
         
-        pedido1 = self.crear_mock_pedido(
-            uuid.uuid4(), self.cliente_id, 'confirmado', 20.0, [item1], fecha1
+        pedido1 = self.crear_pedido(
+            self.cliente_id, 'confirmado', 20.0, [item1], fecha1
         )
-        pedido2 = self.crear_mock_pedido(
-            uuid.uuid4(), self.cliente_id, 'confirmado', 45.0, [item2], fecha2
+        pedido2 = self.crear_pedido(
+            self.cliente_id, 'confirmado', 45.0, [item2], fecha2
         )
-        pedido3 = self.crear_mock_pedido(
-            uuid.uuid4(), self.cliente_id, 'confirmado', 10.0, [item3], fecha3
+        pedido3 = self.crear_pedido(
+            self.cliente_id, 'confirmado', 10.0, [item3], fecha3
         )
         
-        mock_repositorio.obtener_todos.return_value = [pedido1, pedido2, pedido3]
-        servicio = ServicioHistorialCliente(repositorio_pedidos=mock_repositorio)
+        servicio = self.servicio
         
         resultado = servicio.obtener_historial_cliente(self.cliente_id)
         
@@ -115,40 +127,34 @@ class TestServicioHistorialCliente:
     
     def test_obtener_historial_filtrado_por_cliente(self):
         """Test que solo se obtienen pedidos del cliente correcto"""
-        mock_repositorio = Mock()
-        
         otro_cliente_id = str(uuid.uuid4())
-        item1 = self.crear_mock_item('prod1', 'Producto 1', 2, 10.0)
-        pedido_cliente = self.crear_mock_pedido(
-            uuid.uuid4(), self.cliente_id, 'confirmado', 20.0, [item1]
+        item1 = self.crear_item('prod1', 'Producto 1', 2, 10.0)
+        pedido_cliente = self.crear_pedido(
+            self.cliente_id, 'confirmado', 20.0, [item1]
         )
-        pedido_otro = self.crear_mock_pedido(
-            uuid.uuid4(), otro_cliente_id, 'confirmado', 30.0, [item1]
+        pedido_otro = self.crear_pedido(
+            otro_cliente_id, 'confirmado', 30.0, [item1]
         )
         
-        mock_repositorio.obtener_todos.return_value = [pedido_cliente, pedido_otro]
-        servicio = ServicioHistorialCliente(repositorio_pedidos=mock_repositorio)
+        servicio = self.servicio
         
         resultado = servicio.obtener_historial_cliente(self.cliente_id)
         
         assert resultado['total_pedidos'] == 1
-        assert resultado['ultimos_pedidos'][0]['id'] == str(pedido_cliente.id)
+        assert resultado['ultimos_pedidos'][0]['id'] == pedido_cliente
     
     def test_obtener_historial_con_limite(self):
         """Test obtener historial con límite de pedidos"""
-        mock_repositorio = Mock()
-        
         pedidos = []
         for i in range(15):
-            item = self.crear_mock_item(f'prod{i}', f'Producto {i}', 1, 10.0)
+            item = self.crear_item(f'prod{i}', f'Producto {i}', 1, 10.0)
             fecha = datetime.now() - timedelta(days=i)
-            pedido = self.crear_mock_pedido(
-                uuid.uuid4(), self.cliente_id, 'confirmado', 10.0, [item], fecha
+            pedido = self.crear_pedido(
+                self.cliente_id, 'confirmado', 10.0, [item], fecha
             )
             pedidos.append(pedido)
         
-        mock_repositorio.obtener_todos.return_value = pedidos
-        servicio = ServicioHistorialCliente(repositorio_pedidos=mock_repositorio)
+        servicio = self.servicio
         
         resultado = servicio.obtener_historial_cliente(self.cliente_id, limite=5)
         
@@ -157,20 +163,17 @@ class TestServicioHistorialCliente:
     
     def test_calcular_frecuencia_compra_frecuente(self):
         """Test calcular frecuencia de compra frecuente"""
-        mock_repositorio = Mock()
-        
         fecha_inicio = datetime.now() - timedelta(days=30)
         pedidos = []
         for i in range(5):  # 5 pedidos en 30 días = frecuente
             fecha = fecha_inicio + timedelta(days=i*7)
-            item = self.crear_mock_item('prod1', 'Producto 1', 1, 10.0)
-            pedido = self.crear_mock_pedido(
-                uuid.uuid4(), self.cliente_id, 'confirmado', 10.0, [item], fecha
+            item = self.crear_item('prod1', 'Producto 1', 1, 10.0)
+            pedido = self.crear_pedido(
+                self.cliente_id, 'confirmado', 10.0, [item], fecha
             )
             pedidos.append(pedido)
         
-        mock_repositorio.obtener_todos.return_value = pedidos
-        servicio = ServicioHistorialCliente(repositorio_pedidos=mock_repositorio)
+        servicio = self.servicio
         
         resultado = servicio.obtener_historial_cliente(self.cliente_id)
         
@@ -178,20 +181,17 @@ class TestServicioHistorialCliente:
     
     def test_calcular_frecuencia_compra_regular(self):
         """Test calcular frecuencia de compra regular"""
-        mock_repositorio = Mock()
-        
         fecha_inicio = datetime.now() - timedelta(days=60)
         pedidos = []
         for i in range(3):  # 3 pedidos en 60 días = regular
             fecha = fecha_inicio + timedelta(days=i*20)
-            item = self.crear_mock_item('prod1', 'Producto 1', 1, 10.0)
-            pedido = self.crear_mock_pedido(
-                uuid.uuid4(), self.cliente_id, 'confirmado', 10.0, [item], fecha
+            item = self.crear_item('prod1', 'Producto 1', 1, 10.0)
+            pedido = self.crear_pedido(
+                self.cliente_id, 'confirmado', 10.0, [item], fecha
             )
             pedidos.append(pedido)
         
-        mock_repositorio.obtener_todos.return_value = pedidos
-        servicio = ServicioHistorialCliente(repositorio_pedidos=mock_repositorio)
+        servicio = self.servicio
         
         resultado = servicio.obtener_historial_cliente(self.cliente_id)
         
@@ -199,20 +199,17 @@ class TestServicioHistorialCliente:
     
     def test_calcular_frecuencia_compra_ocasional(self):
         """Test calcular frecuencia de compra ocasional"""
-        mock_repositorio = Mock()
-        
         fecha_inicio = datetime.now() - timedelta(days=90)
         pedidos = []
         for i in range(2):  # 2 pedidos en 90 días = ocasional
             fecha = fecha_inicio + timedelta(days=i*45)
-            item = self.crear_mock_item('prod1', 'Producto 1', 1, 10.0)
-            pedido = self.crear_mock_pedido(
-                uuid.uuid4(), self.cliente_id, 'confirmado', 10.0, [item], fecha
+            item = self.crear_item('prod1', 'Producto 1', 1, 10.0)
+            pedido = self.crear_pedido(
+                self.cliente_id, 'confirmado', 10.0, [item], fecha
             )
             pedidos.append(pedido)
         
-        mock_repositorio.obtener_todos.return_value = pedidos
-        servicio = ServicioHistorialCliente(repositorio_pedidos=mock_repositorio)
+        servicio = self.servicio
         
         resultado = servicio.obtener_historial_cliente(self.cliente_id)
         
@@ -220,24 +217,21 @@ class TestServicioHistorialCliente:
     
     def test_productos_mas_comprados_ordenados(self):
         """Test que los productos más comprados están ordenados"""
-        mock_repositorio = Mock()
-        
-        item1 = self.crear_mock_item('prod1', 'Producto 1', 10, 10.0)  # Más cantidad
-        item2 = self.crear_mock_item('prod2', 'Producto 2', 5, 15.0)
-        item3 = self.crear_mock_item('prod3', 'Producto 3', 3, 20.0)
+        item1 = self.crear_item('prod1', 'Producto 1', 10, 10.0)  # Más cantidad
+        item2 = self.crear_item('prod2', 'Producto 2', 5, 15.0)
+        item3 = self.crear_item('prod3', 'Producto 3', 3, 20.0)
         
-        pedido1 = self.crear_mock_pedido(
-            uuid.uuid4(), self.cliente_id, 'confirmado', 100.0, [item1]
+        pedido1 = self.crear_pedido(
+            self.cliente_id, 'confirmado', 100.0, [item1]
         )
-        pedido2 = self.crear_mock_pedido(
-            uuid.uuid4(), self.cliente_id, 'confirmado', 75.0, [item2]
+        pedido2 = self.crear_pedido(
+            self.cliente_id, 'confirmado', 75.0, [item2]
         )
-        pedido3 = self.crear_mock_pedido(
-            uuid.uuid4(), self.cliente_id, 'confirmado', 60.0, [item3]
+        pedido3 = self.crear_pedido(
+            self.cliente_id, 'confirmado', 60.0, [item3]
         )
         
-        mock_repositorio.obtener_todos.return_value = [pedido1, pedido2, pedido3]
-        servicio = ServicioHistorialCliente(repositorio_pedidos=mock_repositorio)
+        servicio = self.servicio
         
         resultado = servicio.obtener_historial_cliente(self.cliente_id)
         
@@ -249,28 +243,46 @@ class TestServicioHistorialCliente:
     
     def test_historial_con_pedidos_sin_fecha(self):
         """Test historial con pedidos sin fecha de creación"""
-        mock_repositorio = Mock()
-        
-        item1 = self.crear_mock_item('prod1', 'Producto 1', 2, 10.0)
-        pedido = self.crear_mock_pedido(
-            uuid.uuid4(), self.cliente_id, 'confirmado', 20.0, [item1]
+        item1 = self.crear_item('prod1', 'Producto 1', 2, 10.0)
+        self.crear_pedido(
+            self.cliente_id, 'confirmado', 20.0, [item1], sin_fecha=True
         )
-        pedido._created_at_model = None  # Sin fecha
-        
-        mock_repositorio.obtener_todos.return_value = [pedido]
-        servicio = ServicioHistorialCliente(repositorio_pedidos=mock_repositorio)
         
-        resultado = servicio.obtener_historial_cliente(self.cliente_id)
+        resultado = self.servicio.obtener_historial_cliente(self.cliente_id)
         
         assert resultado['total_pedidos'] == 1
         assert resultado['ultimos_pedidos'][0]['fecha'] == 'Fecha no disponible'
         # Cuando hay un solo pedido, devuelve "Cliente con una sola compra"
         assert resultado['frecuencia_compra'] == 'Cliente con una sola compra'
     
+    def test_historial_solo_consulta_las_filas_del_cliente(self):
+        """Test que la cantidad de consultas no depende de los pedidos de otros clientes"""
+        for _ in range(30):
+            self.crear_pedido(str(uuid.uuid4()), 'confirmado', 10.0, [self.crear_item('prod9', 'Producto 9', 1, 10.0)])
+        self.crear_pedido(self.cliente_id, 'confirmado', 20.0, [self.crear_item('prod1', 'Producto 1', 2, 10.0)])
+        self.crear_pedido(self.cliente_id, 'entregado', 30.0, [self.crear_item('prod1', 'Producto 1', 3, 12.0)])
+        db.session.expunge_all()
+        
+        consultas = []
+        contar = lambda *args, **kwargs: consultas.append(args[2])
+        event.listen(db.engine, 'before_cursor_execute', contar)
+        try:
+            resultado = self.servicio.obtener_historial_cliente(self.cliente_id)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', contar)
+        
+        # resumen + últimos pedidos + sus items + productos más comprados
+        assert len(consultas) == 4
+        assert resultado['total_pedidos'] == 2
+        assert resultado['productos_mas_comprados'] == [{
+            'producto_id': 'prod1', 'nombre': 'Producto 1', 'cantidad_total': 5,
+            'veces_comprado': 2, 'precio_promedio': 11.0
+        }]
+    
     def test_historial_error_exception(self):
         """Test que maneja errores correctamente"""
         mock_repositorio = Mock()
-        mock_repositorio.obtener_todos.side_effect = Exception("Error de BD")
+        mock_repositorio.obtener_resumen_cliente.side_effect = Exception("Error de BD")
         
         servicio = ServicioHistorialCliente(repositorio_pedidos=mock_repositorio)
         
@@ -278,4 +290,3 @@ class TestServicioHistorialCliente:
         
         assert resultado['total_pedidos'] == 0
         assert resultado['frecuencia_compra'] == 'Error al obtener historial'
-
@@ -7,6 +7,7 @@ import requests
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from infraestructura.servicio_usuarios import ServicioUsuarios
+from seedwork.infraestructura.cliente_http import TIMEOUT_POR_DEFECTO
 from .conftest import get_service_url
 
 
@@ -15,7 +16,7 @@ class TestServicioUsuarios:
     def setup_method(self):
         self.servicio = ServicioUsuarios()
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_obtener_vendedor_por_id_exitoso(self, mock_get):
         vendedor_mock = {
             'id': 'vendedor123',
@@ -33,9 +34,9 @@ class TestServicioUsuarios:
         resultado = self.servicio.obtener_vendedor_por_id('vendedor123')
         
         assert resultado == vendedor_mock
-        mock_get.assert_called_once_with(f"{get_service_url('usuarios_service')}/vendedor123", timeout=5)
+        mock_get.assert_called_once_with(f"{get_service_url('usuarios_service')}/vendedor123", timeout=TIMEOUT_POR_DEFECTO)
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_obtener_vendedor_por_id_no_existe(self, mock_get):
         mock_response = Mock()
         mock_response.status_code = 404
@@ -44,9 +45,9 @@ class TestServicioUsuarios:
         resultado = self.servicio.obtener_vendedor_por_id('vendedor123')
         
         assert resultado is None
-        mock_get.assert_called_once_with(f"{get_service_url('usuarios_service')}/vendedor123", timeout=5)
+        mock_get.assert_called_once_with(f"{get_service_url('usuarios_service')}/vendedor123", timeout=TIMEOUT_POR_DEFECTO)
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_obtener_vendedor_por_id_error_servidor(self, mock_get):
         mock_response = Mock()
         mock_response.status_code = 500
@@ -55,18 +56,18 @@ class TestServicioUsuarios:
         resultado = self.servicio.obtener_vendedor_por_id('vendedor123')
         
         assert resultado is None
-        mock_get.assert_called_once_with(f"{get_service_url('usuarios_service')}/vendedor123", timeout=5)
+        mock_get.assert_called_once_with(f"{get_service_url('usuarios_service')}/vendedor123", timeout=TIMEOUT_POR_DEFECTO)
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_obtener_vendedor_por_id_exception(self, mock_get):
         mock_get.side_effect = requests.RequestException("Error de conexión")
         
         resultado = self.servicio.obtener_vendedor_por_id('vendedor123')
         
         assert resultado is None
-        mock_get.assert_called_once_with(f"{get_service_url('usuarios_service')}/vendedor123", timeout=5)
+        mock_get.assert_called_once_with(f"{get_service_url('usuarios_service')}/vendedor123", timeout=TIMEOUT_POR_DEFECTO)
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_obtener_cliente_por_id_exitoso(self, mock_get):
         cliente_mock = {
             'id': 'cliente456',
@@ -84,9 +85,9 @@ class TestServicioUsuarios:
         resultado = self.servicio.obtener_cliente_por_id('cliente456')
         
         assert resultado == cliente_mock
-        mock_get.assert_called_once_with(f"{get_service_url('usuarios_service').replace('/vendedores', '/clientes')}/cliente456", timeout=5)
+        mock_get.assert_called_once_with(f"{get_service_url('usuarios_service').replace('/vendedores', '/clientes')}/cliente456", timeout=TIMEOUT_POR_DEFECTO)
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_obtener_cliente_por_id_no_existe(self, mock_get):
         mock_response = Mock()
         mock_response.status_code = 404
@@ -95,9 +96,9 @@ class TestServicioUsuarios:
         resultado = self.servicio.obtener_cliente_por_id('cliente456')
         
         assert resultado is None
-        mock_get.assert_called_once_with(f"{get_service_url('usuarios_service').replace('/vendedores', '/clientes')}/cliente456", timeout=5)
+        mock_get.assert_called_once_with(f"{get_service_url('usuarios_service').replace('/vendedores', '/clientes')}/cliente456", timeout=TIMEOUT_POR_DEFECTO)
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_obtener_cliente_por_id_error_servidor(self, mock_get):
         mock_response = Mock()
         mock_response.status_code = 500
@@ -106,13 +107,13 @@ class TestServicioUsuarios:
         resultado = self.servicio.obtener_cliente_por_id('cliente456')
         
         assert resultado is None
-        mock_get.assert_called_once_with(f"{get_service_url('usuarios_service').replace('/vendedores', '/clientes')}/cliente456", timeout=5)
+        mock_get.assert_called_once_with(f"{get_service_url('usuarios_service').replace('/vendedores', '/clientes')}/cliente456", timeout=TIMEOUT_POR_DEFECTO)
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_obtener_cliente_por_id_exception(self, mock_get):
         mock_get.side_effect = requests.RequestException("Error de conexión")
         
         resultado = self.servicio.obtener_cliente_por_id('cliente456')
         
         assert resultado is None
-        mock_get.assert_called_once_with(f"{get_service_url('usuarios_service').replace('/vendedores', '/clientes')}/cliente456", timeout=5)
+        mock_get.assert_called_once_with(f"{get_service_url('usuarios_service').replace('/vendedores', '/clientes')}/cliente456", timeout=TIMEOUT_POR_DEFECTO)
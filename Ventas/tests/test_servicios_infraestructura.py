@@ -26,7 +26,7 @@ class TestServicioUsuarios:
             'email': 'juan@example.com'
         }
         
-        with patch('requests.get', return_value=mock_response):
+        with patch('requests.Session.get', return_value=mock_response):
             servicio = ServicioUsuarios()
             resultado = servicio.obtener_vendedor_por_id(vendedor_id)
             
@@ -40,7 +40,7 @@ class TestServicioUsuarios:
         mock_response = Mock()
         mock_response.status_code = 404
         
-        with patch('requests.get', return_value=mock_response):
+        with patch('requests.Session.get', return_value=mock_response):
             servicio = ServicioUsuarios()
             resultado = servicio.obtener_vendedor_por_id(vendedor_id)
             
@@ -52,7 +52,7 @@ class TestServicioUsuarios:
         mock_response = Mock()
         mock_response.status_code = 500
         
-        with patch('requests.get', return_value=mock_response):
+        with patch('requests.Session.get', return_value=mock_response):
             servicio = ServicioUsuarios()
             resultado = servicio.obtener_vendedor_por_id(vendedor_id)
             
@@ -62,7 +62,7 @@ class TestServicioUsuarios:
         """Test obtener vendedor con excepción"""
         vendedor_id = str(uuid.uuid4())
         
-        with patch('requests.get', side_effect=requests.RequestException("Error de conexión")):
+        with patch('requests.Session.get', side_effect=requests.RequestException("Error de conexión")):
             servicio = ServicioUsuarios()
             resultado = servicio.obtener_vendedor_por_id(vendedor_id)
             
@@ -79,7 +79,7 @@ class TestServicioUsuarios:
             'email': 'maria@example.com'
         }
         
-        with patch('requests.get', return_value=mock_response):
+        with patch('requests.Session.get', return_value=mock_response):
             servicio = ServicioUsuarios()
             resultado = servicio.obtener_cliente_por_id(cliente_id)
             
@@ -93,7 +93,7 @@ class TestServicioUsuarios:
         mock_response = Mock()
         mock_response.status_code = 404
         
-        with patch('requests.get', return_value=mock_response):
+        with patch('requests.Session.get', return_value=mock_response):
             servicio = ServicioUsuarios()
             resultado = servicio.obtener_cliente_por_id(cliente_id)
             
@@ -105,7 +105,7 @@ class TestServicioUsuarios:
         mock_response = Mock()
         mock_response.status_code = 500
         
-        with patch('requests.get', return_value=mock_response):
+        with patch('requests.Session.get', return_value=mock_response):
             servicio = ServicioUsuarios()
             resultado = servicio.obtener_cliente_por_id(cliente_id)
             
@@ -115,7 +115,7 @@ class TestServicioUsuarios:
         """Test obtener cliente con excepción"""
         cliente_id = str(uuid.uuid4())
         
-        with patch('requests.get', side_effect=requests.RequestException("Error de conexión")):
+        with patch('requests.Session.get', side_effect=requests.RequestException("Error de conexión")):
             servicio = ServicioUsuarios()
             resultado = servicio.obtener_cliente_por_id(cliente_id)
             
@@ -143,7 +143,7 @@ class TestServicioLogistica:
             }
         ]
         
-        with patch('requests.get', return_value=mock_response):
+        with patch('requests.Session.get', return_value=mock_response):
             servicio = ServicioLogistica()
             resultado = servicio.buscar_productos("Paracetamol")
             
@@ -156,7 +156,7 @@ class TestServicioLogistica:
         mock_response = Mock()
         mock_response.status_code = 500
         
-        with patch('requests.get', return_value=mock_response):
+        with patch('requests.Session.get', return_value=mock_response):
             servicio = ServicioLogistica()
             resultado = servicio.buscar_productos("Paracetamol")
             
@@ -164,12 +164,38 @@ class TestServicioLogistica:
     
     def test_buscar_productos_exception(self):
         """Test buscar productos con excepción"""
-        with patch('requests.get', side_effect=requests.RequestException("Error de conexión")):
+        with patch('requests.Session.get', side_effect=requests.RequestException("Error de conexión")):
             servicio = ServicioLogistica()
             resultado = servicio.buscar_productos("Paracetamol")
             
             assert resultado == []
 
+class TestServicioLogisticaEnLote:
+    """Pruebas para la consulta de inventario en lote"""
+    
+    def test_obtener_inventarios_productos_exitoso(self):
+        """Test obtener inventario de varios productos en una sola llamada"""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {'inventarios': {'prod-1': {'producto_id': 'prod-1', 'bodegas': []}}}
+        
+        with patch('requests.Session.post', return_value=mock_response) as mock_post:
+            servicio = ServicioLogistica()
+            resultado = servicio.obtener_inventarios_productos(['prod-1', 'prod-2'])
+            
+            assert mock_post.call_count == 1
+            assert mock_post.call_args.kwargs['json'] == {'producto_ids': ['prod-1', 'prod-2']}
+            assert list(resultado) == ['prod-1']
+    
+    def test_obtener_inventarios_productos_no_disponible(self):
+        """Test que retorna None si el endpoint en lote no existe"""
+        mock_response = Mock()
+        mock_response.status_code = 404
+        
+        with patch('requests.Session.post', return_value=mock_response):
+            servicio = ServicioLogistica()
+            assert servicio.obtener_inventarios_productos(['prod-1']) is None
+
 class TestServicioProductos:
     """Pruebas para el servicio de productos"""
     
@@ -185,7 +211,7 @@ class TestServicioProductos:
             'stock': 100
         }
         
-        with patch('requests.get', return_value=mock_response):
+        with patch('requests.Session.get', return_value=mock_response):
             servicio = ServicioProductos()
             resultado = servicio.obtener_producto_por_id(producto_id)
             
@@ -199,7 +225,7 @@ class TestServicioProductos:
         mock_response = Mock()
         mock_response.status_code = 404
         
-        with patch('requests.get', return_value=mock_response):
+        with patch('requests.Session.get', return_value=mock_response):
             servicio = ServicioProductos()
             resultado = servicio.obtener_producto_por_id(producto_id)
             
@@ -211,7 +237,7 @@ class TestServicioProductos:
         mock_response = Mock()
         mock_response.status_code = 500
         
-        with patch('requests.get', return_value=mock_response):
+        with patch('requests.Session.get', return_value=mock_response):
             servicio = ServicioProductos()
             resultado = servicio.obtener_producto_por_id(producto_id)
             
@@ -221,8 +247,27 @@ class TestServicioProductos:
         """Test obtener producto con excepción"""
         producto_id = str(uuid.uuid4())
         
-        with patch('requests.get', side_effect=requests.RequestException("Error de conexión")):
+        with patch('requests.Session.get', side_effect=requests.RequestException("Error de conexión")):
             servicio = ServicioProductos()
             resultado = servicio.obtener_producto_por_id(producto_id)
             
             assert resultado is None
+    
+    def test_obtener_productos_por_ids_exitoso(self):
+        """Test obtener varios productos en una sola llamada"""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {'productos': {'prod-1': {'id': 'prod-1', 'precio': 10.0}}}
+        
+        with patch('requests.Session.post', return_value=mock_response) as mock_post:
+            servicio = ServicioProductos()
+            resultado = servicio.obtener_productos_por_ids(['prod-1'])
+            
+            assert mock_post.call_count == 1
+            assert resultado == {'prod-1': {'id': 'prod-1', 'precio': 10.0}}
+    
+    def test_obtener_productos_por_ids_exception(self):
+        """Test que retorna None si la consulta en lote falla"""
+        with patch('requests.Session.post', side_effect=requests.RequestException("Error de conexión")):
+            servicio = ServicioProductos()
+            assert servicio.obtener_productos_por_ids(['prod-1']) is None